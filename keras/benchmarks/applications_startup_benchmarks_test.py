@@ -0,0 +1,88 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks on rebuilding the Keras applications from their JSON config."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow.compat.v2 as tf
+
+import time
+
+from keras import backend
+from keras.applications import densenet
+from keras.applications import efficientnet
+from keras.applications import inception_resnet_v2
+from keras.applications import inception_v3
+from keras.applications import mobilenet
+from keras.applications import mobilenet_v2
+from keras.applications import mobilenet_v3
+from keras.applications import nasnet
+from keras.applications import resnet
+from keras.applications import resnet_v2
+from keras.applications import vgg16
+from keras.applications import vgg19
+from keras.applications import xception
+from keras.saving import model_config
+
+APPLICATIONS = [
+    densenet.DenseNet121,
+    densenet.DenseNet201,
+    efficientnet.EfficientNetB0,
+    efficientnet.EfficientNetB7,
+    inception_resnet_v2.InceptionResNetV2,
+    inception_v3.InceptionV3,
+    mobilenet.MobileNet,
+    mobilenet_v2.MobileNetV2,
+    mobilenet_v3.MobileNetV3Large,
+    nasnet.NASNetMobile,
+    nasnet.NASNetLarge,
+    resnet.ResNet50,
+    resnet.ResNet152,
+    resnet_v2.ResNet152V2,
+    vgg16.VGG16,
+    vgg19.VGG19,
+    xception.Xception,
+]
+
+
+class ApplicationsStartupBenchmark(tf.test.Benchmark):
+  """Benchmarks `model_from_json` on the architecture of each application."""
+
+  def _run(self, app, trials=3):
+    json_string = app(weights=None).to_json()
+    backend.clear_session()
+
+    total_time = 0
+    for _ in range(trials):
+      start = time.time()
+      model = model_config.model_from_json(json_string)
+      total_time += time.time() - start
+      num_layers = len(model.layers)
+      backend.clear_session()
+
+    self.report_benchmark(
+        iters=trials,
+        wall_time=total_time / trials,
+        name='{}.model_from_json'.format(app.__name__),
+        extras={'num_layers': num_layers})
+
+  def benchmark_model_from_json(self):
+    for app in APPLICATIONS:
+      self._run(app)
+
+
+if __name__ == '__main__':
+  tf.test.main()
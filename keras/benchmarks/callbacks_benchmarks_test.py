@@ -0,0 +1,111 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks on the step time overhead of callbacks in `Model.fit`."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow.compat.v2 as tf
+
+import contextlib
+import io
+import sys
+import time
+
+import numpy as np
+import keras
+from keras import callbacks
+
+_NUM_SAMPLES = 64 * 1000
+_BATCH_SIZE = 32
+
+
+class NumpyLogsCallback(callbacks.Callback):
+  """A callback reading the logs of each batch as NumPy values."""
+
+  def on_train_batch_end(self, batch, logs=None):
+    self.last_loss = logs['loss']
+
+
+@contextlib.contextmanager
+def _silence_stdout():
+  stdout = sys.stdout
+  sys.stdout = io.StringIO()
+  try:
+    yield
+  finally:
+    sys.stdout = stdout
+
+
+class CallbacksOverheadBenchmark(tf.test.Benchmark):
+  """Benchmarks the time per step of a small model with different callbacks.
+
+  The model is small enough for the step time to be dominated by the overhead
+  of `fit`, so the time spent waiting for the logs of each batch shows.
+  """
+
+  def _get_model(self):
+    model = keras.Sequential([
+        keras.layers.Dense(16, activation='relu', input_shape=(8,)),
+        keras.layers.Dense(1),
+    ])
+    model.compile('sgd', 'mse', metrics=['mae'])
+    return model
+
+  def _run(self, name, verbose=0, callback_list=None):
+    x = np.random.random((_NUM_SAMPLES, 8)).astype(np.float32)
+    y = np.random.random((_NUM_SAMPLES, 1)).astype(np.float32)
+    model = self._get_model()
+    # Warm up, to trace the train function.
+    model.fit(x[:_BATCH_SIZE], y[:_BATCH_SIZE], batch_size=_BATCH_SIZE,
+              verbose=0)
+
+    with _silence_stdout():
+      start = time.time()
+      model.fit(x, y, batch_size=_BATCH_SIZE, epochs=1, verbose=verbose,
+                callbacks=callback_list)
+      total_time = time.time() - start
+
+    num_steps = _NUM_SAMPLES // _BATCH_SIZE
+    self.report_benchmark(
+        iters=num_steps,
+        wall_time=total_time / num_steps,
+        name=name,
+        metrics=[{
+            'name': 'steps_per_sec',
+            'value': float('{0:.3f}'.format(num_steps / total_time))
+        }])
+
+  def benchmark_no_callbacks(self):
+    self._run('no_callbacks')
+
+  def benchmark_progbar(self):
+    self._run('progbar', verbose=1)
+
+  def benchmark_progbar_update_freq_100(self):
+    progbar = callbacks.ProgbarLogger(count_mode='steps', update_freq=100)
+    self._run('progbar_update_freq_100', verbose=1, callback_list=[progbar])
+
+  def benchmark_progbar_update_interval_100ms(self):
+    progbar = callbacks.ProgbarLogger(count_mode='steps', update_interval=0.1)
+    self._run('progbar_update_interval_100ms', verbose=1,
+              callback_list=[progbar])
+
+  def benchmark_numpy_logs_callback(self):
+    self._run('numpy_logs_callback', callback_list=[NumpyLogsCallback()])
+
+
+if __name__ == '__main__':
+  tf.test.main()
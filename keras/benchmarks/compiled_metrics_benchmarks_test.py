@@ -0,0 +1,98 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks on the step time overhead of the metrics of `Model.compile`."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow.compat.v2 as tf
+
+import time
+
+import numpy as np
+from keras import metrics
+from keras.engine import compile_utils
+
+_BATCH_SIZE = 256
+_NUM_STEPS = 1000
+
+
+def _get_metrics():
+  """Returns 10 metrics commonly compiled together for a binary output."""
+  return [
+      metrics.BinaryAccuracy(),
+      metrics.BinaryCrossentropy(),
+      metrics.Precision(),
+      metrics.Recall(),
+      metrics.TruePositives(),
+      metrics.FalsePositives(),
+      metrics.TrueNegatives(),
+      metrics.FalseNegatives(),
+      metrics.AUC(),
+      metrics.AUC(curve='PR', name='pr_auc'),
+  ]
+
+
+class CompiledMetricsBenchmark(tf.test.Benchmark):
+  """Benchmarks the time per step to update 10 metrics.
+
+  `MetricsContainer` shares a single confusion matrix update between the
+  metrics with the same thresholds, while updating each metric separately
+  counts the confusion matrix once per metric.
+  """
+
+  def _run(self, name, update_fn):
+    y_true = tf.constant(
+        np.random.randint(0, 2, size=(_BATCH_SIZE, 1)), dtype=tf.float32)
+    y_pred = tf.constant(
+        np.random.random((_BATCH_SIZE, 1)), dtype=tf.float32)
+
+    @tf.function
+    def step():
+      update_fn(y_true, y_pred)
+
+    # Warm up, to trace the step function.
+    step()
+
+    start = time.time()
+    for _ in range(_NUM_STEPS):
+      step()
+    total_time = time.time() - start
+
+    self.report_benchmark(
+        iters=_NUM_STEPS,
+        wall_time=total_time / _NUM_STEPS,
+        name=name,
+        metrics=[{
+            'name': 'steps_per_sec',
+            'value': float('{0:.3f}'.format(_NUM_STEPS / total_time))
+        }])
+
+  def benchmark_separate_updates(self):
+    metric_objs = _get_metrics()
+
+    def update_fn(y_true, y_pred):
+      for metric_obj in metric_objs:
+        metric_obj.update_state(y_true, y_pred)
+
+    self._run('separate_updates', update_fn)
+
+  def benchmark_metrics_container(self):
+    metrics_container = compile_utils.MetricsContainer(_get_metrics())
+    self._run('metrics_container', metrics_container.update_state)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -0,0 +1,102 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks on `validation_split` and `class_weight` for in-memory data."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow.compat.v2 as tf
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from keras.engine import data_adapter
+
+_NUM_ROWS = 10 * 1000 * 1000
+_NUM_FEATURES = 16
+_NUM_CLASSES = 10
+_BATCH_SIZE = 4096
+
+
+class TabularDataAdapterBenchmark(tf.test.Benchmark):
+  """Benchmarks an epoch over a 10M row table, as `Model.fit` would."""
+
+  def _get_data(self):
+    x = np.random.random((_NUM_ROWS, _NUM_FEATURES)).astype(np.float32)
+    y = np.random.randint(0, _NUM_CLASSES, size=(_NUM_ROWS,))
+    class_weight = {c: 1. + c / _NUM_CLASSES for c in range(_NUM_CLASSES)}
+    return x, y, class_weight
+
+  def _run(self, lazy_split, fused_class_weight):
+    x, y, class_weight = self._get_data()
+
+    tracemalloc.start()
+    (train_x, train_y, _), (val_x, val_y, _) = (
+        data_adapter.train_validation_split((x, y, None),
+                                            validation_split=0.1,
+                                            lazy=lazy_split))
+    split_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.time()
+    adapter = data_adapter.TensorLikeDataAdapter(
+        train_x,
+        train_y,
+        batch_size=_BATCH_SIZE,
+        shuffle=True,
+        class_weight=class_weight if fused_class_weight else None)
+    dataset = adapter.get_dataset()
+    if not adapter.applies_class_weight():
+      dataset = dataset.map(data_adapter._make_class_weight_map_fn(  # pylint: disable=protected-access
+          class_weight))
+    num_batches = 0
+    for _ in dataset:
+      num_batches += 1
+    # Validation data is read as well, as at the end of each epoch of `fit`.
+    val_adapter = data_adapter.TensorLikeDataAdapter(
+        val_x, val_y, batch_size=_BATCH_SIZE)
+    for _ in val_adapter.get_dataset():
+      num_batches += 1
+    total_time = time.time() - start
+
+    self.report_benchmark(
+        iters=num_batches,
+        wall_time=total_time / num_batches,
+        metrics=[
+            {
+                "name": "rows_per_sec",
+                "value": float("{0:.3f}".format(_NUM_ROWS / total_time))
+            },
+            {
+                "name": "split_mb",
+                "value": float("{0:.3f}".format(split_bytes / 2**20))
+            },
+        ],
+        extras={"data_mb": (x.nbytes + y.nbytes) / 2**20})
+
+  def benchmark_eager_split_mapped_class_weight(self):
+    self._run(lazy_split=False, fused_class_weight=False)
+
+  def benchmark_lazy_split_mapped_class_weight(self):
+    self._run(lazy_split=True, fused_class_weight=False)
+
+  def benchmark_lazy_split_fused_class_weight(self):
+    self._run(lazy_split=True, fused_class_weight=True)
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -120,6 +120,27 @@ class MicroBenchmarksBase(tf.test.Benchmark):
     fn()
     self._run(fn, 100)
 
+  def benchmark_functional_model_call_overhead(self):
+
+    class OnlyOverheadLayer(tf.keras.layers.Layer):
+
+      def call(self, x):
+        return x
+
+    model_input = tf.keras.Input(shape=(1,))
+    model_output = model_input
+    # A residual stack, so the graph has merge layers and shared tensors.
+    for _ in range(20):
+      model_output = tf.keras.layers.Add()(
+          [OnlyOverheadLayer()(model_output), model_output])
+    model = tf.keras.Model(inputs=model_input, outputs=model_output)
+    x = tf.convert_to_tensor([[1.]])
+
+    def fn():
+      model(x)  # pylint: disable=not-callable
+
+    self._run(fn, 1000)
+
   def benchmark_model_predict_tensorlike_overhead(self):
 
     class OnlyOverheadLayer(tf.keras.layers.Layer):
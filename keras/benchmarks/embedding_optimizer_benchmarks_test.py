@@ -0,0 +1,89 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks on the step time of optimizers training large embeddings."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow.compat.v2 as tf
+
+import time
+
+import numpy as np
+import keras
+from keras.optimizer_v2 import adam
+from keras.optimizer_v2 import rmsprop
+
+_BATCH_SIZE = 256
+_OUTPUT_DIM = 16
+_NUM_STEPS = 50
+
+
+class EmbeddingOptimizerBenchmark(tf.test.Benchmark):
+  """Benchmarks the time per step of training an `Embedding` layer.
+
+  A batch only looks up a few hundred rows, so with `lazy_sparse=True` the
+  step time should not depend on the number of rows of the table.
+  """
+
+  def _run(self, name, optimizer, input_dim):
+    model = keras.Sequential([
+        keras.layers.Embedding(input_dim, _OUTPUT_DIM, input_length=1),
+        keras.layers.Flatten(),
+        keras.layers.Dense(1),
+    ])
+    model.compile(optimizer, 'mse')
+    x = np.random.randint(
+        0, input_dim, size=(_BATCH_SIZE * _NUM_STEPS, 1)).astype(np.int64)
+    y = np.random.random((_BATCH_SIZE * _NUM_STEPS, 1)).astype(np.float32)
+    # Warm up, to trace the train function and create the slots.
+    model.fit(x[:_BATCH_SIZE], y[:_BATCH_SIZE], batch_size=_BATCH_SIZE,
+              verbose=0)
+
+    start = time.time()
+    model.fit(x, y, batch_size=_BATCH_SIZE, epochs=1, verbose=0)
+    total_time = time.time() - start
+
+    self.report_benchmark(
+        iters=_NUM_STEPS,
+        wall_time=total_time / _NUM_STEPS,
+        name='{}_{}_rows'.format(name, input_dim),
+        metrics=[{
+            'name': 'steps_per_sec',
+            'value': float('{0:.3f}'.format(_NUM_STEPS / total_time))
+        }])
+
+  def _run_table_sizes(self, name, optimizer_fn):
+    for input_dim in [100 * 1000, 1000 * 1000, 10 * 1000 * 1000]:
+      self._run(name, optimizer_fn(), input_dim)
+      keras.backend.clear_session()
+
+  def benchmark_adam(self):
+    self._run_table_sizes('adam', adam.Adam)
+
+  def benchmark_adam_lazy_sparse(self):
+    self._run_table_sizes('adam_lazy_sparse',
+                          lambda: adam.Adam(lazy_sparse=True))
+
+  def benchmark_rmsprop(self):
+    self._run_table_sizes('rmsprop', rmsprop.RMSprop)
+
+  def benchmark_rmsprop_lazy_sparse(self):
+    self._run_table_sizes('rmsprop_lazy_sparse',
+                          lambda: rmsprop.RMSprop(lazy_sparse=True))
+
+
+if __name__ == '__main__':
+  tf.test.main()
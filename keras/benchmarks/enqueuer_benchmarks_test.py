@@ -0,0 +1,107 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks on the Keras `Sequence` enqueuers."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow.compat.v2 as tf
+
+import os
+import time
+
+import numpy as np
+
+from keras.utils import data_utils
+
+
+class ImageSequence(data_utils.Sequence):
+  """A `Sequence` of constant image batches of a given shape."""
+
+  def __init__(self, batch_shape, num_batches):
+    self.batch_shape = batch_shape
+    self.num_batches = num_batches
+
+  def __getitem__(self, index):
+    images = np.empty(self.batch_shape, dtype=np.float32)
+    images.fill(index)
+    return images, np.full((self.batch_shape[0],), index, dtype=np.int32)
+
+  def __len__(self):
+    return self.num_batches
+
+
+class OrderedEnqueuerBenchmark(tf.test.Benchmark):
+  """Compares the pickle and shared memory batch transports."""
+
+  def _run(self, batch_shape, shared_memory, num_batches=100, workers=8):
+    batch_bytes = int(np.prod(batch_shape)) * 4 + batch_shape[0] * 4
+    enqueuer = data_utils.OrderedEnqueuer(
+        ImageSequence(batch_shape, num_batches),
+        use_multiprocessing=True,
+        # Leave room for the alignment padding between arrays.
+        shared_memory_size=batch_bytes + 64 if shared_memory else None)
+    enqueuer.start(workers=workers, max_queue_size=10)
+    output = enqueuer.get()
+    # Warm up, which also starts the worker processes.
+    next(output)
+    start = time.time()
+    for _ in range(num_batches - 1):
+      next(output)
+    total_time = time.time() - start
+    enqueuer.stop()
+
+    iters = num_batches - 1
+    self.report_benchmark(
+        iters=iters,
+        wall_time=total_time / iters,
+        metrics=[
+            {
+                "name": "batches_per_sec",
+                "value": float("{0:.3f}".format(iters / total_time))
+            },
+            {
+                "name": "mb_per_sec",
+                "value": float("{0:.3f}".format(
+                    iters * batch_bytes / total_time / 2**20))
+            },
+        ],
+        extras={"batch_mb": batch_bytes / 2**20})
+
+  def benchmark_pickle_4mb(self):
+    self._run((16, 128, 128, 4), shared_memory=False)
+
+  def benchmark_shared_memory_4mb(self):
+    self._run((16, 128, 128, 4), shared_memory=True)
+
+  def benchmark_pickle_37mb(self):
+    self._run((64, 224, 224, 3), shared_memory=False)
+
+  def benchmark_shared_memory_37mb(self):
+    self._run((64, 224, 224, 3), shared_memory=True)
+
+  def benchmark_pickle_147mb(self):
+    self._run((256, 224, 224, 3), shared_memory=False)
+
+  def benchmark_shared_memory_147mb(self):
+    self._run((256, 224, 224, 3), shared_memory=True)
+
+
+if __name__ == "__main__":
+  # Avoid socket paths that are too long for multiprocessing under Bazel.
+  for var in ("TMPDIR", "TMP", "TEMP"):
+    if var in os.environ:
+      del os.environ[var]
+  tf.test.main()
@@ -0,0 +1,111 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks on the cost and error of `AUC` and `SketchedAUC`.
+
+The predictions are skewed like click-through rates: most of them are below
+0.01, so fall in the first few buckets of `AUC`.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow.compat.v2 as tf
+
+import time
+
+import numpy as np
+from keras import metrics
+
+_NUM_SAMPLES = 1000 * 1000
+_BATCH_SIZE = 4096
+
+
+def _get_skewed_data():
+  np.random.seed(1337)
+  logits = np.random.normal(-6., 1.5, size=(_NUM_SAMPLES,))
+  noise = np.random.normal(size=(_NUM_SAMPLES,))
+  y_true = np.random.random(_NUM_SAMPLES) < 1. / (1. + np.exp(-logits - noise))
+  y_pred = (1. / (1. + np.exp(-logits))).astype(np.float32)
+  return y_true.astype(np.float32), y_pred
+
+
+def _exact_auc(y_true, y_pred):
+  """Returns the exact ROC AUC, ties counting for one half."""
+  values, inverse = np.unique(y_pred, return_inverse=True)
+  positives = np.bincount(inverse, weights=y_true, minlength=len(values))
+  negatives = np.bincount(inverse, weights=1. - y_true, minlength=len(values))
+  negatives_below = np.cumsum(negatives) - negatives
+  return (np.sum(positives * (negatives_below + 0.5 * negatives)) /
+          (np.sum(positives) * np.sum(negatives)))
+
+
+class AUCBenchmark(tf.test.Benchmark):
+  """Benchmarks the update time, memory and error of AUC metrics."""
+
+  def _run(self, name, metric):
+    y_true, y_pred = _get_skewed_data()
+    expected = _exact_auc(y_true, y_pred)
+    dataset = tf.data.Dataset.from_tensor_slices(
+        (y_true, y_pred)).batch(_BATCH_SIZE).cache()
+
+    @tf.function
+    def update(labels, predictions):
+      metric.update_state(labels, predictions)
+
+    # Warm up, to trace the update function and fill the cache.
+    for labels, predictions in dataset.take(1):
+      update(labels, predictions)
+    metric.reset_states()
+
+    num_batches = 0
+    start = time.time()
+    for labels, predictions in dataset:
+      update(labels, predictions)
+      num_batches += 1
+    result = float(metric.result())
+    total_time = time.time() - start
+
+    self.report_benchmark(
+        iters=num_batches,
+        wall_time=total_time / num_batches,
+        name=name,
+        metrics=[{
+            'name': 'abs_error',
+            'value': abs(result - expected)
+        }],
+        extras={
+            'num_variable_elements':
+                sum(int(np.prod(v.shape)) for v in metric.variables)
+        })
+
+  def benchmark_auc_200_thresholds(self):
+    self._run('auc_200_thresholds', metrics.AUC(num_thresholds=200))
+
+  def benchmark_auc_2000_thresholds(self):
+    self._run('auc_2000_thresholds', metrics.AUC(num_thresholds=2000))
+
+  def benchmark_auc_20000_thresholds(self):
+    self._run('auc_20000_thresholds', metrics.AUC(num_thresholds=20000))
+
+  def benchmark_sketched_auc(self):
+    self._run('sketched_auc', metrics.SketchedAUC())
+
+  def benchmark_sketched_auc_relative_accuracy_1e_2(self):
+    self._run('sketched_auc_relative_accuracy_1e_2',
+              metrics.SketchedAUC(relative_accuracy=1e-2))
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -19,8 +19,12 @@ from __future__ import print_function
 
 import tensorflow.compat.v2 as tf
 
+import time
+
 from keras.benchmarks import benchmark_util
 from keras.optimizer_v2 import adam
+from keras.optimizer_v2 import gradient_descent
+from keras.optimizer_v2 import rmsprop
 from tensorflow.python.platform.benchmark import ParameterizedBenchmark
 
 
@@ -82,5 +86,95 @@ class KerasOptimizerBenchmark(
         iters=num_iters, wall_time=wall_time, metrics=metrics, extras=extras)
 
 
+_NUM_PARAMETERS = 2**16
+_NUM_STEPS = 100
+
+
+def _apply_gradients(optimizer_fn):
+  """Returns a benchmarked step applying gradients with an optimizer."""
+
+  def step_fn(variables, grads):
+    optimizer = optimizer_fn()
+    return lambda: optimizer.apply_gradients(zip(grads, variables))
+
+  return step_fn
+
+
+def _grouped_sgd(learning_rate):
+  """Returns a benchmarked step of SGD updating all the variables at once.
+
+  The update is computed by a single op on the concatenated gradients, and
+  split and assigned back to each variable, as a multi-tensor apply has to do
+  when the variables aren't views into a flat buffer.
+
+  Args:
+    learning_rate: The learning rate.
+  """
+
+  def step_fn(variables, grads):
+
+    def step():
+      updates = tf.split(
+          tf.concat(grads, axis=0) * learning_rate,
+          [var.shape[0] for var in variables])
+      return tf.group(
+          [var.assign_sub(update) for var, update in zip(variables, updates)])
+
+    return step
+
+  return step_fn
+
+
+class KerasOptimizerDispatchBenchmark(tf.test.Benchmark):
+  """Benchmarks the per-variable overhead of applying gradients.
+
+  The same number of parameters is split into more and more variables, and a
+  `tf.function` applying constant gradients to them is timed. The growth of
+  the step time with the number of variables is the overhead of updating each
+  variable with its own ops, which a multi-tensor apply would remove. See the
+  note in `OptimizerV2._distributed_apply`.
+  """
+
+  def _run(self, name, step_fn):
+    for num_variables in [1, 10, 100, 1000]:
+      size = _NUM_PARAMETERS // num_variables
+      variables = [tf.Variable(tf.zeros([size])) for _ in range(num_variables)]
+      grads = [tf.fill([size], 1e-3) for _ in range(num_variables)]
+      step = tf.function(step_fn(variables, grads))
+      # Warm up, to trace the step and create the slots.
+      step()
+
+      start = time.time()
+      for _ in range(_NUM_STEPS):
+        step()
+      wall_time = (time.time() - start) / _NUM_STEPS
+
+      self.report_benchmark(
+          iters=_NUM_STEPS,
+          wall_time=wall_time,
+          name='{}_{}_variables'.format(name, num_variables),
+          metrics=[{
+              'name': 'us_per_variable',
+              'value': float('{0:.3f}'.format(wall_time * 1e6 / num_variables))
+          }])
+
+  def benchmark_sgd(self):
+    self._run('sgd', _apply_gradients(
+        lambda: gradient_descent.SGD(learning_rate=0.01)))
+
+  def benchmark_sgd_grouped(self):
+    self._run('sgd_grouped', _grouped_sgd(learning_rate=0.01))
+
+  def benchmark_sgd_momentum(self):
+    self._run('sgd_momentum', _apply_gradients(
+        lambda: gradient_descent.SGD(learning_rate=0.01, momentum=0.9)))
+
+  def benchmark_adam(self):
+    self._run('adam', _apply_gradients(adam.Adam))
+
+  def benchmark_rmsprop(self):
+    self._run('rmsprop', _apply_gradients(rmsprop.RMSprop))
+
+
 if __name__ == "__main__":
   tf.test.main()
@@ -38,6 +38,7 @@ from keras import backend as K
 from keras.distribute import distributed_file_utils
 from keras.distribute import worker_training_state
 from keras.optimizer_v2 import learning_rate_schedule
+from keras.saving import async_checkpoint
 from keras.utils import generic_utils
 from keras.utils import tf_utils
 from keras.utils import version_utils
@@ -46,6 +47,7 @@ from keras.utils.generic_utils import Progbar
 from keras.utils.io_utils import path_to_string
 from keras.utils.mode_keys import ModeKeys
 from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.training import checkpoint_management
 from tensorflow.python.util.tf_export import keras_export
 from tensorflow.tools.docs import doc_controls
 
@@ -54,6 +56,11 @@ try:
 except ImportError:
   requests = None
 
+hdf5_format = generic_utils.LazyLoader(
+    'hdf5_format', globals(), 'keras.saving.hdf5_format')
+saving_utils = generic_utils.LazyLoader(
+    'saving_utils', globals(), 'keras.saving.saving_utils')
+
 
 # Note: `configure_callbacks` is only used in TF1.
 def configure_callbacks(callbacks,
@@ -936,12 +943,24 @@ class ProgbarLogger(Callback):
           Metrics in this list will be logged as-is.
           All others will be averaged over time (e.g. loss, etc).
           If not provided, defaults to the `Model`'s metrics.
+      update_freq: Minimum number of batches between two updates of the
+          progress bar. The logs of each batch are only copied from the device
+          to the host, which waits for the batch to finish, when the progress
+          bar is updated. In between, the logs of the metrics not in
+          `stateful_metrics` are summed on their device. Defaults to 1.
+      update_interval: Minimum number of seconds between two updates of the
+          progress bar, e.g. `0.1` to pull the logs to the host at most 10
+          times per second. Defaults to 0.
 
   Raises:
-      ValueError: In case of invalid `count_mode`.
+      ValueError: In case of invalid `count_mode` or `update_freq`.
   """
 
-  def __init__(self, count_mode='samples', stateful_metrics=None):
+  def __init__(self,
+               count_mode='samples',
+               stateful_metrics=None,
+               update_freq=1,
+               update_interval=0.):
     super(ProgbarLogger, self).__init__()
     self._supports_tf_logs = True
     if count_mode == 'samples':
@@ -950,6 +969,11 @@ class ProgbarLogger(Callback):
       self.use_steps = True
     else:
       raise ValueError('Unknown `count_mode`: ' + str(count_mode))
+    if update_freq < 1:
+      raise ValueError('`update_freq` should be at least 1, got ' +
+                       str(update_freq))
+    self.update_freq = update_freq
+    self.update_interval = update_interval
     # Defaults to all Model's metrics except for loss.
     self.stateful_metrics = set(stateful_metrics) if stateful_metrics else None
 
@@ -959,6 +983,11 @@ class ProgbarLogger(Callback):
     self.verbose = 1
     self.epochs = 1
 
+    # Logs of the batches since the last update of the progress bar.
+    self._pending_logs = {}
+    self._pending_batches = 0
+    self._last_update_time = 0.
+
     self._train_step, self._test_step, self._predict_step = None, None, None
     self._call_batch_hooks = True
 
@@ -1026,6 +1055,8 @@ class ProgbarLogger(Callback):
   def _reset_progbar(self):
     self.seen = 0
     self.progbar = None
+    self._pending_logs = {}
+    self._pending_batches = 0
 
   def _maybe_init_progbar(self):
     if self.stateful_metrics is None:
@@ -1066,9 +1097,37 @@ class ProgbarLogger(Callback):
       self.seen += add_seen
 
     if self.verbose == 1:
-      # Only block async when verbose = 1.
-      logs = tf_utils.to_numpy_or_python_type(logs)
-      self.progbar.update(self.seen, list(logs.items()), finalize=False)
+      self._add_pending_logs(logs)
+      now = time.time()
+      if (self._pending_batches >= self.update_freq and
+          now - self._last_update_time >= self.update_interval):
+        # Only block async when verbose = 1, and the progbar is updated.
+        self.progbar.update(
+            self.seen, self._pop_pending_logs(), finalize=False)
+        self._last_update_time = now
+
+  def _add_pending_logs(self, logs):
+    """Aggregates the logs of a batch, without copying them to the host."""
+    for k, v in logs.items():
+      if k in self._pending_logs and k not in self.stateful_metrics:
+        # Summed on the device the values are on.
+        self._pending_logs[k] = self._pending_logs[k] + v
+      else:
+        # Stateful metrics are already aggregated by the metric.
+        self._pending_logs[k] = v
+    self._pending_batches += 1
+
+  def _pop_pending_logs(self):
+    """Returns the aggregated logs as `Progbar` values, and resets them."""
+    logs = tf_utils.to_numpy_or_python_type(self._pending_logs)
+    num_batches = self._pending_batches
+    self._pending_logs = {}
+    self._pending_batches = 0
+    if num_batches == 1:
+      return list(logs.items())
+    # `Progbar` weights the values by the steps since its last update.
+    return [(k, v if k in self.stateful_metrics else v / num_batches)
+            for k, v in logs.items()]
 
   def _finalize_progbar(self, logs, counter):
     logs = tf_utils.to_numpy_or_python_type(logs or {})
@@ -1205,6 +1264,18 @@ class ModelCheckpoint(Callback):
       options: Optional `tf.train.CheckpointOptions` object if
         `save_weights_only` is true or optional `tf.saved_model.SaveOptions`
         object if `save_weights_only` is false.
+      async_save: If True, the values to save are copied to host memory when
+        saving, and written to disk in a background thread while training
+        continues. Files are written under a temporary name then renamed, so an
+        interrupted write never leaves a partial checkpoint at `filepath`.
+        Applies to weights and to full models saved as HDF5; full models saved
+        as a SavedModel are still saved on the training thread. Errors of a
+        write are raised by a later save, or at the end of training. Requires
+        eager execution. Defaults to False.
+      max_pending_saves: With `async_save=True`, the number of saves which can
+        be written in the background at the same time. Saving blocks while
+        this many saves are pending, which bounds the host memory used by the
+        copies. Defaults to 1.
       **kwargs: Additional arguments for backwards compatibility. Possible key
         is `period`.
   """
@@ -1218,6 +1289,8 @@ class ModelCheckpoint(Callback):
                mode='auto',
                save_freq='epoch',
                options=None,
+               async_save=False,
+               max_pending_saves=1,
                **kwargs):
     super(ModelCheckpoint, self).__init__()
     self._supports_tf_logs = True
@@ -1230,6 +1303,13 @@ class ModelCheckpoint(Callback):
     self.epochs_since_last_save = 0
     self._batches_seen_since_last_saving = 0
     self._last_batch_seen = 0
+    self.async_save = async_save
+    self.max_pending_saves = max_pending_saves
+    self._checkpoint_writer = None
+
+    if async_save and not tf.executing_eagerly():
+      raise ValueError('`async_save=True` is only supported when executing '
+                       'eagerly.')
 
     if save_weights_only:
       if options is None or isinstance(
@@ -1298,8 +1378,16 @@ class ModelCheckpoint(Callback):
         not model._is_graph_network and  # pylint: disable=protected-access
         model.__class__.__name__ != 'Sequential'):
       self.save_weights_only = True
+    if (self.async_save and not self.save_weights_only and
+        not saving_utils.is_hdf5_filepath(self.filepath)):
+      logging.warning('`async_save` only applies to weights and to HDF5 '
+                      'files. Models saved to %s as a SavedModel are saved '
+                      'synchronously.', self.filepath)
 
   def on_train_begin(self, logs=None):
+    if self.async_save:
+      self._checkpoint_writer = async_checkpoint.AsyncCheckpointWriter(
+          self.max_pending_saves)
     if self.load_weights_on_restart:
       filepath_to_load = (
           self._get_most_recently_modified_file_matching_pattern(self.filepath))
@@ -1314,6 +1402,14 @@ class ModelCheckpoint(Callback):
           raise ValueError('Error loading file from {}. Reason: {}'.format(
               filepath_to_load, e))
 
+  def on_train_end(self, logs=None):
+    if self._checkpoint_writer is not None:
+      # Wait for the saves still being written, and raise their errors.
+      writer, self._checkpoint_writer = self._checkpoint_writer, None
+      writer.close()
+      if hasattr(self, '_write_filepath'):
+        self._maybe_remove_file()
+
   def _implements_train_batch_hooks(self):
     # Only call batch hooks when saving on batch
     return self.save_freq != 'epoch'
@@ -1377,11 +1473,7 @@ class ModelCheckpoint(Callback):
                       ' saving model to %s' % (epoch + 1, self.monitor,
                                                self.best, current, filepath))
               self.best = current
-              if self.save_weights_only:
-                self.model.save_weights(
-                    filepath, overwrite=True, options=self._options)
-              else:
-                self.model.save(filepath, overwrite=True, options=self._options)
+              self._write_model(filepath)
             else:
               if self.verbose > 0:
                 print('\nEpoch %05d: %s did not improve from %0.5f' %
@@ -1389,11 +1481,7 @@ class ModelCheckpoint(Callback):
         else:
           if self.verbose > 0:
             print('\nEpoch %05d: saving model to %s' % (epoch + 1, filepath))
-          if self.save_weights_only:
-            self.model.save_weights(
-                filepath, overwrite=True, options=self._options)
-          else:
-            self.model.save(filepath, overwrite=True, options=self._options)
+          self._write_model(filepath)
 
         self._maybe_remove_file()
       except IOError as e:
@@ -1405,6 +1493,40 @@ class ModelCheckpoint(Callback):
         # Re-throw the error for any other causes.
         raise e
 
+  def _write_model(self, filepath):
+    """Saves the model, or only its weights, to `filepath`."""
+    if self._checkpoint_writer is None:
+      self._save_model_to_filepath(filepath)
+      return
+
+    strategy = self.model.distribute_strategy
+    if saving_utils.is_hdf5_filepath(filepath):
+      if self.save_weights_only:
+        write_fn = hdf5_format.save_weights_snapshot_to_hdf5_group
+        snapshot = hdf5_format.get_weights_snapshot(self.model.layers)
+      else:
+        write_fn = hdf5_format.save_model_snapshot_to_hdf5_group
+        snapshot = hdf5_format.get_model_snapshot(self.model)
+      self._checkpoint_writer.submit(_write_hdf5_snapshot, write_fn, snapshot,
+                                     filepath, strategy)
+    elif self.save_weights_only:
+      snapshot = async_checkpoint.snapshot_checkpoint(self.model)
+      self._checkpoint_writer.submit(_write_weights_checkpoint_snapshot,
+                                     snapshot, filepath, self._options,
+                                     strategy)
+    else:
+      # Exporting a SavedModel traces the functions of the model, which can't
+      # be done concurrently with training.
+      self._checkpoint_writer.wait()
+      self._save_model_to_filepath(filepath)
+      distributed_file_utils.remove_temp_dir_with_filepath(filepath, strategy)
+
+  def _save_model_to_filepath(self, filepath):
+    if self.save_weights_only:
+      self.model.save_weights(filepath, overwrite=True, options=self._options)
+    else:
+      self.model.save(filepath, overwrite=True, options=self._options)
+
   def _get_file_path(self, epoch, logs):
     """Returns the file path for checkpoint."""
     # pylint: disable=protected-access
@@ -1424,6 +1546,9 @@ class ModelCheckpoint(Callback):
     # Remove the checkpoint directory in multi-worker training where this worker
     # should not checkpoint. It is a dummy directory previously saved for sync
     # distributed training.
+    if self._checkpoint_writer is not None:
+      # The directory is removed once the saves pending to it are written.
+      return
     distributed_file_utils.remove_temp_dir_with_filepath(
         self._write_filepath, self.model.distribute_strategy)
 
@@ -1528,6 +1653,23 @@ class ModelCheckpoint(Callback):
       return file_path_with_largest_file_name
 
 
+def _write_hdf5_snapshot(write_fn, snapshot, filepath, strategy):
+  """Writes a model snapshot to a HDF5 file, in `ModelCheckpoint`."""
+  async_checkpoint.write_hdf5(write_fn, snapshot, filepath)
+  distributed_file_utils.remove_temp_dir_with_filepath(filepath, strategy)
+
+
+def _write_weights_checkpoint_snapshot(snapshot, filepath, options, strategy):
+  """Writes a model snapshot in the format of `Model.save_weights`."""
+  async_checkpoint.write_checkpoint(snapshot, filepath, options)
+  checkpoint_management.update_checkpoint_state_internal(
+      save_dir=os.path.dirname(filepath),
+      model_checkpoint_path=filepath,
+      save_relative_paths=True,
+      all_model_checkpoint_paths=[filepath])
+  distributed_file_utils.remove_temp_dir_with_filepath(filepath, strategy)
+
+
 @keras_export('keras.callbacks.experimental.BackupAndRestore', v1=[])
 class BackupAndRestore(Callback):
   """Callback to back up and restore the training state.
@@ -1584,11 +1726,17 @@ class BackupAndRestore(Callback):
         cannot be reused elsewhere to store other files, e.g. by
         BackupAndRestore callback of another training, or by another callback
         (ModelCheckpoint) of the same training.
+      async_save: If True, the training state is copied to host memory at the
+        end of each epoch, and written to `backup_dir` in a background thread
+        while the next epoch trains. A backup is only visible once it is
+        completely written, and the previous one is kept until then.
+        Defaults to False.
   """
 
-  def __init__(self, backup_dir):
+  def __init__(self, backup_dir, async_save=False):
     super(BackupAndRestore, self).__init__()
     self.backup_dir = backup_dir
+    self.async_save = async_save
     self._supports_tf_logs = True
     self._supported_strategies = (
         tf.distribute.MirroredStrategy,
@@ -1623,7 +1771,8 @@ class BackupAndRestore(Callback):
           'MirroredStrategy, MultiWorkerMirroredStrategy and TPUStrategy.' %
           type(self.model.distribute_strategy).__name__)
     self.model._training_state = (
-        worker_training_state.WorkerTrainingState(self.model, self.backup_dir))
+        worker_training_state.WorkerTrainingState(
+            self.model, self.backup_dir, async_save=self.async_save))
     self._training_state = self.model._training_state
     self._training_state.restore()
 
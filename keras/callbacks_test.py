@@ -952,6 +952,70 @@ class KerasCallbacksTest(keras_parameterized.TestCase):
     cb_list.on_predict_batch_end(logs)
     cb_list.on_predict_end(logs)
 
+  @parameterized.named_parameters(
+      ('h5_weights', 'checkpoint.h5', True),
+      ('h5_model', 'checkpoint.h5', False),
+      ('tf_weights', 'checkpoint', True),
+  )
+  def test_ModelCheckpoint_async_save(self, filename, save_weights_only):
+    if h5py is None:
+      return  # Skip test if models cannot be saved.
+    (model, train_ds, _,
+     _) = self._get_dummy_resource_for_model_checkpoint_testing()
+    temp_dir = self.get_temp_dir()
+    filepath = os.path.join(temp_dir, filename)
+    callback = keras.callbacks.ModelCheckpoint(
+        filepath=filepath,
+        save_weights_only=save_weights_only,
+        save_freq=1,
+        async_save=True,
+        max_pending_saves=2)
+    model.fit(train_ds, epochs=2, callbacks=[callback])
+
+    # All the saves are written by the end of `fit`, and renamed into place.
+    self.assertIsNone(callback._checkpoint_writer)
+    self.assertEmpty([f for f in os.listdir(temp_dir) if f.endswith('.tmp')])
+    self.assertTrue(callback._checkpoint_exists(filepath))
+
+    weights = model.get_weights()
+    model.set_weights([np.zeros_like(w) for w in weights])
+    model.load_weights(filepath)
+    self.assertAllClose(model.get_weights(), weights)
+
+  def test_BackupAndRestore_async_save(self):
+    (model, train_ds, _,
+     _) = self._get_dummy_resource_for_model_checkpoint_testing()
+    backup_dir = os.path.join(self.get_temp_dir(), 'backup')
+
+    class InterruptingCallback(keras.callbacks.Callback):
+
+      def on_epoch_begin(self, epoch, logs=None):
+        if epoch == 2:
+          raise RuntimeError('Interrupting!')
+
+    callback = keras.callbacks.BackupAndRestore(backup_dir, async_save=True)
+    with self.assertRaisesRegex(RuntimeError, 'Interrupting!'):
+      model.fit(
+          train_ds, epochs=4, callbacks=[callback, InterruptingCallback()])
+    callback._training_state.wait()
+    weights = model.get_weights()
+
+    model.set_weights([np.zeros_like(w) for w in weights])
+    restored = []
+
+    class RestoredWeights(keras.callbacks.Callback):
+
+      def on_epoch_begin(self, epoch, logs=None):
+        if not restored:
+          restored.append(self.model.get_weights())
+
+    history = model.fit(
+        train_ds, epochs=4, callbacks=[callback, RestoredWeights()])
+    # Training continues from the last backup, at the end of the second epoch.
+    self.assertLen(history.history['loss'], 2)
+    self.assertAllClose(restored[0], weights)
+    self.assertFalse(os.path.exists(os.path.join(backup_dir, 'chief')))
+
   def test_ProgbarLogger_verbose_2_nonblocking(self):
     # Should only cause a sync block on epoch end methods.
     callback = keras.callbacks.ProgbarLogger(count_mode='steps')
@@ -989,6 +1053,35 @@ class KerasCallbacksTest(keras_parameterized.TestCase):
       cb_list.on_epoch_end(0, logs)
     cb_list.on_train_end(logs)
 
+  def test_ProgbarLogger_update_freq(self):
+    callback = keras.callbacks.ProgbarLogger(
+        count_mode='steps', stateful_metrics=['mae'], update_freq=3)
+    model = keras.Sequential([keras.layers.Dense(1)])
+    cb_list = keras.callbacks.CallbackList([callback],
+                                           model=model,
+                                           epochs=1,
+                                           steps=6,
+                                           verbose=1)
+    cb_list.on_train_begin()
+    cb_list.on_epoch_begin(0)
+    updates = []
+
+    def update(current, values=None, finalize=None):
+      updates.append((current, dict(values), finalize))
+
+    with tf.compat.v1.test.mock.patch.object(callback.progbar, 'update',
+                                             update):
+      for batch in range(6):
+        # `loss` is averaged by the progbar, `mae` is a stateful metric.
+        logs = {'loss': tf.constant(float(batch)),
+                'mae': tf.constant(10. + batch)}
+        cb_list.on_train_batch_end(batch, logs)
+
+    # The logs are only pulled every 3 batches, and the losses of the batches
+    # in between are averaged.
+    self.assertEqual(updates, [(3, {'loss': 1., 'mae': 12.}, False),
+                               (6, {'loss': 4., 'mae': 15.}, False)])
+
   def test_EarlyStopping(self):
     with self.cached_session():
       np.random.seed(123)
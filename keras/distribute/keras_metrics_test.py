@@ -20,6 +20,7 @@ from __future__ import print_function
 import tensorflow.compat.v2 as tf
 
 from absl.testing import parameterized
+import numpy as np
 from keras import metrics
 
 
@@ -89,9 +90,14 @@ class KerasMetricsTest(tf.test.TestCase, parameterized.TestCase):
     with tf.Graph().as_default(), distribution.scope():
       metric = metric_init_fn()
 
+      def _update(inputs):
+        if isinstance(inputs, dict):
+          return metric(inputs["labels"], inputs["predictions"])
+        return metric(inputs)
+
       iterator = distribution.make_input_fn_iterator(lambda _: dataset_fn())
       updates = distribution.experimental_local_results(
-          distribution.run(metric, args=(iterator.get_next(),)))
+          distribution.run(_update, args=(iterator.get_next(),)))
       batches_per_update = distribution.num_replicas_in_sync
 
       self.evaluate(iterator.initializer)
@@ -120,6 +126,20 @@ class KerasMetricsTest(tf.test.TestCase, parameterized.TestCase):
 
     self._test_metric(distribution, _dataset_fn, metrics.Mean, _expected_fn)
 
+  @tf.__internal__.distribute.combinations.generate(all_combinations())
+  def testSketchedAUC(self, distribution):
+    def _expected_fn(num_batches):
+      # The AUC of all the examples consumed so far, which have no ties
+      # between positive and negative predictions.
+      examples = [(True, 1.0), (False, .75), (True, .25), (False, 0.)]
+      examples = [examples[i % 4] for i in range(3 * num_batches)]
+      positives = [p for label, p in examples if label]
+      negatives = [p for label, p in examples if not label]
+      return np.mean([p > n for p in positives for n in negatives])
+
+    self._test_metric(
+        distribution, _threshold_dataset_fn, metrics.SketchedAUC, _expected_fn)
+
 
 if __name__ == "__main__":
   tf.test.main()
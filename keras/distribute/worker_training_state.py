@@ -22,7 +22,9 @@ import tensorflow.compat.v2 as tf
 import os
 from keras import backend as K
 from keras.distribute import distributed_file_utils
+from keras.saving import async_checkpoint
 from keras.utils import mode_keys
+from tensorflow.python.training import checkpoint_management
 
 # Constant for `tf.keras.Model` attribute to store the epoch at which the most
 # recently saved checkpoint was saved.
@@ -39,7 +41,7 @@ class WorkerTrainingState(object):
   for fault-tolerance, also known as preemption-recovery purpose.
   """
 
-  def __init__(self, model, checkpoint_dir):
+  def __init__(self, model, checkpoint_dir, async_save=False):
     self._model = model
 
     # The epoch at which the checkpoint is saved. Used for fault-tolerance.
@@ -56,6 +58,7 @@ class WorkerTrainingState(object):
     # when backing up.
     checkpoint = tf.train.Checkpoint(
         model=self._model, ckpt_saved_epoch=self._ckpt_saved_epoch)
+    self._checkpoint = checkpoint
 
     # If this is single-worker training, checkpoint_dir are the same for
     # write_checkpoint_manager and read_checkpoint_manager.
@@ -80,6 +83,14 @@ class WorkerTrainingState(object):
       self.write_checkpoint_manager = tf.train.CheckpointManager(
           checkpoint, directory=write_checkpoint_dir, max_to_keep=1)
 
+    # With `async_save`, backups are written in a background thread instead of
+    # by `write_checkpoint_manager`.
+    if async_save:
+      self._checkpoint_writer = async_checkpoint.AsyncCheckpointWriter()
+      self._last_backup = self.write_checkpoint_manager.latest_checkpoint
+    else:
+      self._checkpoint_writer = None
+
   def back_up(self, epoch):
     """Back up the current state of training into a checkpoint file.
 
@@ -87,12 +98,44 @@ class WorkerTrainingState(object):
       epoch: The current epoch information to be saved.
     """
     K.set_value(self._ckpt_saved_epoch, epoch)
+    if self._checkpoint_writer is not None:
+      self._back_up_async()
     # Save the model plus CKPT_SAVED_EPOCH variable.
-    if self.write_checkpoint_manager.save():
+    elif self.write_checkpoint_manager.save():
       distributed_file_utils.remove_temp_dirpath(
           self.write_checkpoint_manager.directory,
           self._model.distribute_strategy)
 
+  def _back_up_async(self):
+    """Snapshots the training state, and writes it in the background."""
+    # Numbered as `write_checkpoint_manager.save()` does.
+    checkpoint_number = int(self._checkpoint.save_counter.assign_add(1))
+    file_prefix = os.path.join(self.write_checkpoint_manager.directory,
+                               'ckpt-%d' % checkpoint_number)
+    snapshot = async_checkpoint.snapshot_checkpoint(self._checkpoint)
+    self._checkpoint_writer.submit(self._write_backup, snapshot, file_prefix)
+
+  def _write_backup(self, snapshot, file_prefix):
+    """Writes a backup, then deletes the previous one."""
+    directory = self.write_checkpoint_manager.directory
+    async_checkpoint.write_checkpoint(snapshot, file_prefix)
+    checkpoint_management.update_checkpoint_state_internal(
+        save_dir=directory,
+        model_checkpoint_path=file_prefix,
+        save_relative_paths=True,
+        all_model_checkpoint_paths=[file_prefix])
+    if self._last_backup:
+      for filename in tf.io.gfile.glob(self._last_backup + '.*'):
+        tf.io.gfile.remove(filename)
+    self._last_backup = file_prefix
+    distributed_file_utils.remove_temp_dirpath(
+        directory, self._model.distribute_strategy)
+
+  def wait(self):
+    """Blocks until the backups being written in the background are written."""
+    if self._checkpoint_writer is not None:
+      self._checkpoint_writer.wait()
+
   def restore(self):
     """Restore the training state from the backed up checkpoint file.
 
@@ -108,6 +151,8 @@ class WorkerTrainingState(object):
     Delete the backup directories which should not exist after `fit()`
     successfully finishes.
     """
+    if self._checkpoint_writer is not None:
+      self._checkpoint_writer.close()
     if self.write_checkpoint_manager is self.read_checkpoint_manager:
       tf.io.gfile.rmtree(self.write_checkpoint_manager.directory)
 
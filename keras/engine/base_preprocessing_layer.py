@@ -21,6 +21,9 @@ import tensorflow.compat.v2 as tf
 
 import abc
 import collections
+import multiprocessing
+import queue
+import traceback
 
 import numpy as np
 import six
@@ -280,11 +283,16 @@ class CombinerPreprocessingLayer(PreprocessingLayer):
     self.state_variables = collections.OrderedDict()
     self._combiner = combiner
     self._adapt_accumulator = None
+    self._adapt_num_workers = 1
+    self._adapt_workers = None
 
   def reset_state(self):
     self._adapt_accumulator = None
 
   def update_state(self, data):
+    if self._adapt_workers is not None:
+      self._adapt_workers.compute(data)
+      return
     if self._adapt_accumulator is None:
       self._adapt_accumulator = self._get_accumulator()
     self._adapt_accumulator = self._combiner.compute(data,
@@ -297,20 +305,57 @@ class CombinerPreprocessingLayer(PreprocessingLayer):
     self._set_accumulator(merged_accumulator)
 
   def finalize_state(self):
+    if self._adapt_workers is not None:
+      accumulators = [self._adapt_accumulator, self._adapt_workers.result()]
+      accumulators = [a for a in accumulators if a is not None]
+      if accumulators:
+        self._adapt_accumulator = self._combiner.merge(accumulators)
     self._set_accumulator(self._adapt_accumulator)
 
-  def compile(self, run_eagerly=None, steps_per_execution=None):
+  def compile(self, run_eagerly=None, steps_per_execution=None,
+              num_workers=None):
+    """Configures the layer for `adapt`.
+
+    Arguments:
+      run_eagerly: Bool. Defaults to `True`. If `False`, the combiner runs in a
+        `tf.function`, which most combiners do not support.
+      steps_per_execution: Int. Defaults to 1. The number of batches to run
+        during each `tf.function` call.
+      num_workers: Int. Defaults to 1. If more than 1, `adapt` shards the
+        batches of data across this many local worker processes, which compute
+        partial accumulators with the combiner of the layer. The partial
+        accumulators are merged tree-wise in the workers, then merged into the
+        state of the layer. The combiner must be picklable, and the batches
+        must be arrays or tensors. As the workers are spawned, the entry point
+        of the program must be guarded by `if __name__ == '__main__':`.
+    """
     # TODO(omalleyt): Remove this once sublayers are switched to new APIs.
     if run_eagerly is None:
       run_eagerly = True
+    if num_workers is None:
+      num_workers = 1
+    if num_workers < 1:
+      raise ValueError(
+          '`num_workers` should be at least 1, got {}'.format(num_workers))
+    if num_workers > 1 and not run_eagerly:
+      raise ValueError('`num_workers` > 1 requires `run_eagerly=True`.')
     super(CombinerPreprocessingLayer, self).compile(
         run_eagerly=run_eagerly, steps_per_execution=steps_per_execution)
+    self._adapt_num_workers = num_workers
 
   def adapt(self, data, batch_size=None, steps=None, reset_state=True):
     if not reset_state:
       self._adapt_accumulator = self._combiner.restore(self._restore_updates())
-    super(CombinerPreprocessingLayer, self).adapt(
-        data, batch_size=batch_size, steps=steps, reset_state=reset_state)
+    if self._adapt_num_workers > 1:
+      self._adapt_workers = _CombinerWorkers(self._combiner,
+                                             self._adapt_num_workers)
+    try:
+      super(CombinerPreprocessingLayer, self).adapt(
+          data, batch_size=batch_size, steps=steps, reset_state=reset_state)
+    finally:
+      if self._adapt_workers is not None:
+        self._adapt_workers.close()
+        self._adapt_workers = None
 
   def _add_state_variable(self,
                           name,
@@ -427,6 +472,169 @@ def convert_to_list(values, sparse_default_value=None):
   return values
 
 
+def _to_host(data):
+  """Copies a batch of tensors to picklable NumPy values."""
+
+  def to_host(value):
+    if isinstance(value, tf.RaggedTensor):
+      return tf.compat.v1.ragged.RaggedTensorValue(
+          to_host(value.values), value.row_splits.numpy())
+    if isinstance(value, tf.SparseTensor):
+      return tf.compat.v1.SparseTensorValue(
+          value.indices.numpy(), value.values.numpy(),
+          value.dense_shape.numpy())
+    if isinstance(value, tf.Tensor):
+      return value.numpy()
+    return value
+
+  return tf.nest.map_structure(to_host, data)
+
+
+def _combiner_worker(worker_id, combiner, inboxes, results):
+  """Computes a partial accumulator over the batches sent to `worker_id`.
+
+  Workers merge their accumulators as a binary tree: worker `i` receives the
+  serialized accumulators of workers `i + 1`, `i + 2`, `i + 4`... while these
+  are less than `i`'s lowest set bit, then sends its own to the worker with
+  that bit cleared. Worker 0, the root, sends the result to `results`.
+
+  Args:
+    worker_id: Index of this worker.
+    combiner: The `Combiner` of the layer.
+    inboxes: Queues of `(kind, payload)` messages to each worker. Kinds are
+      'batch', 'finish' (no more batches) and 'merge'.
+    results: Queue of `(kind, payload)` messages to the layer, either
+      `('result', serialized_accumulator)` or `('error', traceback)`.
+  """
+  try:
+    num_workers = len(inboxes)
+    num_children = 0
+    parent = None
+    stride = 1
+    while stride < num_workers:
+      if worker_id % (2 * stride):
+        parent = worker_id - stride
+        break
+      if worker_id + stride < num_workers:
+        num_children += 1
+      stride *= 2
+
+    accumulator = None
+
+    def merge(other):
+      if accumulator is None:
+        return other
+      if other is None:
+        return accumulator
+      return combiner.merge([accumulator, other])
+
+    finished = False
+    num_merged = 0
+    while not finished or num_merged < num_children:
+      kind, payload = inboxes[worker_id].get()
+      if kind == 'batch':
+        accumulator = combiner.compute(payload, accumulator)
+      elif kind == 'finish':
+        finished = True
+      else:
+        if payload is not None:
+          accumulator = merge(combiner.deserialize(payload))
+        num_merged += 1
+
+    if accumulator is not None:
+      accumulator = combiner.serialize(accumulator)
+    if parent is None:
+      results.put(('result', accumulator))
+    else:
+      inboxes[parent].put(('merge', accumulator))
+  except Exception:  # pylint: disable=broad-except
+    results.put(('error', traceback.format_exc()))
+
+
+class _CombinerWorkers(object):
+  """Local worker processes computing accumulators for `adapt`.
+
+  Batches are sent to the workers in turns, through queues of bounded size so
+  that the data does not outrun the workers. The workers are spawned rather
+  than forked, as forking a process running TensorFlow is unsafe.
+
+  Args:
+    combiner: The `Combiner` to run in the workers.
+    num_workers: Number of worker processes.
+    max_pending_batches: Maximum number of batches queued for each worker.
+  """
+
+  def __init__(self, combiner, num_workers, max_pending_batches=4):
+    self._combiner = combiner
+    context = multiprocessing.get_context('spawn')
+    self._inboxes = [
+        context.Queue(max_pending_batches) for _ in range(num_workers)
+    ]
+    self._results = context.Queue()
+    self._processes = [
+        context.Process(
+            target=_combiner_worker,
+            args=(i, combiner, self._inboxes, self._results),
+            daemon=True) for i in range(num_workers)
+    ]
+    for process in self._processes:
+      process.start()
+    self._next_worker = 0
+
+  def compute(self, data):
+    """Sends a batch of data to the next worker."""
+    self._put(self._inboxes[self._next_worker], ('batch', _to_host(data)))
+    self._next_worker = (self._next_worker + 1) % len(self._inboxes)
+
+  def result(self):
+    """Returns the accumulator merged over all the batches, or None."""
+    for inbox in self._inboxes:
+      self._put(inbox, ('finish', None))
+    while True:
+      try:
+        kind, payload = self._results.get(timeout=1)
+      except queue.Empty:
+        self._check_workers()
+        continue
+      self._raise_if_error(kind, payload)
+      return None if payload is None else self._combiner.deserialize(payload)
+
+  def close(self):
+    for process in self._processes:
+      if process.is_alive():
+        process.terminate()
+      process.join()
+    for q in self._inboxes + [self._results]:
+      q.cancel_join_thread()
+      q.close()
+
+  def _put(self, inbox, message):
+    while True:
+      try:
+        inbox.put(message, timeout=1)
+        return
+      except queue.Full:
+        # No result is sent before all the batches are, so only errors can be
+        # queued yet.
+        try:
+          self._raise_if_error(*self._results.get_nowait())
+        except queue.Empty:
+          pass
+        self._check_workers()
+
+  def _check_workers(self):
+    for process in self._processes:
+      if process.exitcode is not None and process.exitcode != 0:
+        raise RuntimeError(
+            'An `adapt` worker process exited unexpectedly with exit code '
+            '{}.'.format(process.exitcode))
+
+  def _raise_if_error(self, kind, payload):
+    if kind == 'error':
+      raise RuntimeError(
+          'An `adapt` worker process failed:\n{}'.format(payload))
+
+
 # TODO(omalleyt): This class will be gradually replaced.
 class Combiner(object):
   """Functional object that defines a shardable computation.
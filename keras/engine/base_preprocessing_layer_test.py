@@ -103,7 +103,7 @@ class AddingPreprocessingLayer(
 
     def serialize(self, accumulator):
       """Serialize an accumulator for a remote call."""
-      return tf.compat.as_bytes(json.dumps(accumulator))
+      return tf.compat.as_bytes(json.dumps(float(accumulator)))
 
     def deserialize(self, encoded_accumulator):
       """Deserialize an accumulator received from 'serialize()'."""
@@ -402,6 +402,51 @@ class PreprocessingLayerTest(keras_parameterized.TestCase):
     self.assertEqual(model.input_shape, (None, 1, 2))
 
 
+@keras_parameterized.run_all_keras_modes(always_skip_v1=True)
+class ParallelAdaptTest(keras_parameterized.TestCase):
+
+  def _get_model(self, layer):
+    input_data = keras.Input(shape=(1,))
+    output = layer(input_data)
+    model = keras.Model(input_data, output)
+    model._run_eagerly = testing_utils.should_run_eagerly()
+    return model
+
+  @parameterized.named_parameters(("2_workers", 2), ("3_workers", 3))
+  def test_adapt_with_workers(self, num_workers):
+    input_dataset = tf.data.Dataset.from_tensor_slices(
+        np.array([[1], [2], [3], [4], [5], [0]])).batch(1)
+
+    layer = get_layer()
+    layer.compile(num_workers=num_workers)
+    layer.adapt(input_dataset)
+    model = self._get_model(layer)
+
+    self.assertAllEqual([[16], [17], [18]], model.predict([1., 2., 3.]))
+
+  def test_further_tuning_with_workers(self):
+    layer = get_layer()
+    layer.adapt(np.array([1, 2, 3, 4, 5]))
+    model = self._get_model(layer)
+
+    layer.compile(num_workers=2)
+    layer.adapt(np.array([1, 2]), batch_size=1, reset_state=False)
+    self.assertAllEqual([[19], [20], [21]], model.predict([1., 2., 3.]))
+
+  def test_worker_error_is_raised(self):
+    layer = get_layer()
+    layer.compile(num_workers=2)
+    with self.assertRaisesRegex(RuntimeError, "worker process failed"):
+      layer.adapt(np.array([["a"], ["b"]]), batch_size=1)
+
+  def test_invalid_num_workers_fails(self):
+    layer = get_layer()
+    with self.assertRaisesRegex(ValueError, "at least 1"):
+      layer.compile(num_workers=0)
+    with self.assertRaisesRegex(ValueError, "run_eagerly"):
+      layer.compile(run_eagerly=False, num_workers=2)
+
+
 @keras_parameterized.run_all_keras_modes
 class ConvertToListTest(keras_parameterized.TestCase):
 
@@ -19,13 +19,16 @@ from __future__ import print_function
 
 import tensorflow.compat.v2 as tf
 
+import collections
 import copy
 
+import numpy as np
 import six
 from keras import losses as losses_mod
 from keras import metrics as metrics_mod
 from keras.utils import generic_utils
 from keras.utils import losses_utils
+from keras.utils import metrics_utils
 from keras.utils import tf_utils
 
 
@@ -430,15 +433,48 @@ class MetricsContainer(Container):
       mask = get_mask(y_p)
       sw = apply_mask(y_p, sw, mask)
 
-      for metric_obj in metric_objs:
-        if metric_obj is None:
-          continue
-        metric_obj.update_state(y_t, y_p, sample_weight=mask)
+      self._update_metric_objs(metric_objs, y_t, y_p, mask)
+      self._update_metric_objs(weighted_metric_objs, y_t, y_p, sw)
 
-      for weighted_metric_obj in weighted_metric_objs:
-        if weighted_metric_obj is None:
-          continue
-        weighted_metric_obj.update_state(y_t, y_p, sample_weight=sw)
+  def _update_metric_objs(self, metric_objs, y_t, y_p, sample_weight):
+    """Updates the metrics of an output, fusing confusion matrix updates.
+
+    Metrics counting the confusion matrix at the same thresholds, e.g.
+    `Precision`, `Recall`, `TruePositives` and `FalsePositives` with their
+    default threshold of 0.5, share the casts, thresholding and reductions of
+    a single `update_confusion_matrix_variables` call, which then adds the
+    same counts to the variables of each metric.
+
+    Args:
+      metric_objs: List of `Metric` objects, or `None`s.
+      y_t: Labels of the output.
+      y_p: Predictions of the output.
+      sample_weight: Sample weights passed to every metric.
+    """
+    fused_updates = collections.OrderedDict()
+    for metric_obj in metric_objs:
+      if metric_obj is None:
+        continue
+      update_args = metric_obj._confusion_matrix_update_args()  # pylint: disable=protected-access
+      if update_args is None:
+        metric_obj.update_state(y_t, y_p, sample_weight=sample_weight)
+        continue
+      key = _confusion_matrix_update_key(metric_obj.dtype, update_args[1])
+      fused_updates.setdefault(key, []).append((metric_obj, update_args))
+
+    for group in fused_updates.values():
+      if len(group) == 1:
+        metric_obj, _ = group[0]
+        metric_obj.update_state(y_t, y_p, sample_weight=sample_weight)
+        continue
+      variables_to_update = collections.OrderedDict()
+      for _, (metric_variables, _) in group:
+        for matrix_cond, var in metric_variables.items():
+          variables_to_update.setdefault(matrix_cond, []).append(var)
+      _, (_, kwargs) = group[0]
+      metrics_utils.update_confusion_matrix_variables(
+          variables_to_update, y_t, y_p, sample_weight=sample_weight,
+          **kwargs)
 
   def reset_states(self):
     """Resets the state of all `Metric`s in this container."""
@@ -533,6 +569,26 @@ class MetricsContainer(Container):
     return obj  # Can be a function or `None`.
 
 
+# Defaults of the keyword arguments of `update_confusion_matrix_variables`.
+_CONFUSION_MATRIX_UPDATE_DEFAULTS = {
+    'top_k': None,
+    'class_id': None,
+    'thresholds_distributed_evenly': False,
+    'thresholds_with_epsilon': False,
+}
+
+
+def _confusion_matrix_update_key(dtype, kwargs):
+  """Returns a hashable key of the arguments of a confusion matrix update."""
+  kwargs = dict(_CONFUSION_MATRIX_UPDATE_DEFAULTS, **kwargs)
+  key = [dtype]
+  for name, value in sorted(kwargs.items()):
+    if name == 'thresholds':
+      value = tuple(np.asarray(value, dtype='float64').ravel().tolist())
+    key.append((name, value))
+  return tuple(key)
+
+
 def create_pseudo_output_names(outputs):
   """Create pseudo output names for a subclassed Model."""
   return _create_pseudo_names(outputs, prefix='output_')
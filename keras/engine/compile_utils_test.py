@@ -24,6 +24,7 @@ from keras import keras_parameterized
 from keras import losses as losses_mod
 from keras import metrics as metrics_mod
 from keras.engine import compile_utils
+from keras.utils import metrics_utils
 
 
 class LossesContainerTest(keras_parameterized.TestCase):
@@ -764,6 +765,77 @@ class MetricsContainerTest(keras_parameterized.TestCase):
       self.assertEqual(metric.name, 'mean_squared_error')
       self.assertEqual(metric.result().numpy(), 1.)
 
+  def test_fused_confusion_matrix_metrics(self):
+    metric_objs = [
+        metrics_mod.Precision(),
+        metrics_mod.Recall(),
+        metrics_mod.TruePositives(),
+        metrics_mod.FalsePositives(),
+        metrics_mod.AUC(),
+        metrics_mod.AUC(num_thresholds=200, name='auc_1'),
+        metrics_mod.Precision(thresholds=0.3, name='precision_1'),
+        'mae',
+    ]
+    metrics_container = compile_utils.MetricsContainer(
+        metrics=metric_objs, weighted_metrics=[metrics_mod.Recall()])
+    y_t = tf.constant([[1], [0], [1], [0], [1]], dtype=tf.float32)
+    y_p = tf.constant([[.9], [.6], [.4], [.1], [.35]], dtype=tf.float32)
+    sw = tf.constant([1., 2., 3., 4., 0.])
+
+    update_confusion_matrix_variables = (
+        metrics_utils.update_confusion_matrix_variables)
+    with tf.compat.v1.test.mock.patch.object(
+        metrics_utils, 'update_confusion_matrix_variables',
+        wraps=update_confusion_matrix_variables) as update_fn:
+      metrics_container.update_state(y_t, y_p, sample_weight=sw)
+    # The metrics at 0.5 and the two AUCs are updated together, the other
+    # precision and the weighted recall separately.
+    self.assertEqual(update_fn.call_count, 4)
+
+    expected_metrics = [
+        metrics_mod.Precision(),
+        metrics_mod.Recall(),
+        metrics_mod.TruePositives(),
+        metrics_mod.FalsePositives(),
+        metrics_mod.AUC(),
+        metrics_mod.AUC(num_thresholds=200),
+        metrics_mod.Precision(thresholds=0.3),
+    ]
+    self.assertLen(metrics_container.metrics, 9)
+    for metric, expected in zip(metrics_container.metrics, expected_metrics):
+      expected.update_state(y_t, y_p)
+      self.assertAllClose(metric.result(), expected.result())
+
+    weighted_recall = metrics_container.metrics[-1]
+    self.assertEqual(weighted_recall.name, 'weighted_recall')
+    self.assertAllClose(weighted_recall.result(), 1. / 4)
+
+  def test_confusion_matrix_metrics_overriding_update_state_not_fused(self):
+
+    class NegativePrecision(metrics_mod.Precision):
+
+      def update_state(self, y_true, y_pred, sample_weight=None):
+        return super(NegativePrecision, self).update_state(
+            y_true, 1. - y_pred, sample_weight=sample_weight)
+
+    metrics_container = compile_utils.MetricsContainer(
+        metrics=[NegativePrecision(), metrics_mod.Recall()])
+    y_t = tf.constant([[1], [0], [0], [0]], dtype=tf.float32)
+    y_p = tf.constant([[.2], [.9], [.7], [.4]])
+
+    update_confusion_matrix_variables = (
+        metrics_utils.update_confusion_matrix_variables)
+    with tf.compat.v1.test.mock.patch.object(
+        metrics_utils, 'update_confusion_matrix_variables',
+        wraps=update_confusion_matrix_variables) as update_fn:
+      metrics_container.update_state(y_t, y_p)
+    self.assertEqual(update_fn.call_count, 2)
+
+    precision, recall = metrics_container.metrics
+    self.assertIsNone(precision._confusion_matrix_update_args())  # pylint: disable=protected-access
+    self.assertAllClose(precision.result(), 1. / 2)
+    self.assertAllClose(recall.result(), 0.)
+
   def test_custom_metric_callables(self):
 
     def custom_metric_fn(y_true, y_pred):
@@ -21,6 +21,7 @@ from __future__ import print_function
 import tensorflow.compat.v2 as tf
 
 import abc
+import collections
 import contextlib
 import functools
 import itertools
@@ -35,6 +36,7 @@ from keras import backend
 from keras.engine import training_utils
 from keras.utils import data_utils
 from keras.utils import dataset_creator
+from keras.utils import memmap_utils
 from keras.utils import tf_utils
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util.tf_export import keras_export
@@ -198,6 +200,14 @@ class DataAdapter(object):
     """Returns whether a new iterator should be created every epoch."""
     raise NotImplementedError
 
+  def applies_class_weight(self):
+    """Whether the dataset already has the `class_weight` argument applied.
+
+    Adapters which return `False` get `class_weight` applied by the
+    `DataHandler` with a `Dataset.map` over each batch.
+    """
+    return False
+
   def get_samples(self):
     """Returns number of samples in the data, or `None`."""
     if not self.get_size() or not self.batch_size():
@@ -215,6 +225,9 @@ class DataAdapter(object):
 class TensorLikeDataAdapter(DataAdapter):
   """Adapter that handles Tensor-like objects, e.g. EagerTensor and NumPy."""
 
+  # Whether `class_weight` is applied to the whole data at construction.
+  _fuse_class_weight = True
+
   @staticmethod
   def can_handle(x, y=None):
     # TODO(kaftan): Check performance implications of using a flatten
@@ -223,15 +236,20 @@ class TensorLikeDataAdapter(DataAdapter):
     if y is not None:
       flat_inputs += tf.nest.flatten(y)
 
-    tensor_types = (tf.Tensor, np.ndarray)
+    tensor_types = (tf.Tensor, np.ndarray, _SplitArray)
     if pd:
-      tensor_types = (tf.Tensor, np.ndarray, pd.Series, pd.DataFrame)
+      tensor_types = (tf.Tensor, np.ndarray, _SplitArray, pd.Series,
+                      pd.DataFrame)
 
     def _is_tensor(v):
       if isinstance(v, tensor_types):
         return True
       return False
 
+    # Memory-mapped arrays are streamed by `MemmapDataAdapter` instead.
+    if any(memmap_utils.is_memmap(v) for v in flat_inputs):
+      return False
+
     return all(_is_tensor(v) for v in flat_inputs)
 
   def __init__(self,
@@ -243,8 +261,13 @@ class TensorLikeDataAdapter(DataAdapter):
                epochs=1,
                steps=None,
                shuffle=False,
+               class_weight=None,
                **kwargs):
     super(TensorLikeDataAdapter, self).__init__(x, y, **kwargs)
+    # Subsets from `train_validation_split(..., lazy=True)` are read from
+    # their source arrays, offset by the start of their row range.
+    (x, y, sample_weights), row_range = _unpack_split_arrays(
+        (x, y, sample_weights))
     x, y, sample_weights = _process_tensorlike((x, y, sample_weights))
     sample_weight_modes = broadcast_sample_weight_modes(
         sample_weights, sample_weight_modes)
@@ -257,6 +280,18 @@ class TensorLikeDataAdapter(DataAdapter):
 
     num_samples = set(int(i.shape[0]) for i in tf.nest.flatten(inputs)).pop()
     _check_data_cardinality(inputs)
+    first_sample = 0
+    if row_range is not None:
+      first_sample, end_sample = row_range
+      num_samples = end_sample - first_sample
+
+    # Computing the sample weights of the whole data once lets `slice_inputs`
+    # gather them with the rest of each batch, instead of running a separate
+    # `Dataset.map` over every batch.
+    self._class_weight_applied = False
+    if class_weight and self._fuse_class_weight:
+      inputs = _make_class_weight_map_fn(class_weight)(*inputs)
+      self._class_weight_applied = True
 
     # If batch_size is not passed but steps is, calculate from the input data.
     # Default to 32 for backwards compat.
@@ -292,7 +327,8 @@ class TensorLikeDataAdapter(DataAdapter):
       # It turns out to be more performant to make a new set of indices rather
       # than reusing the same range Tensor. (presumably because of buffer
       # forwarding.)
-      indices = tf.range(num_samples, dtype=tf.int64)
+      indices = tf.range(
+          first_sample, first_sample + num_samples, dtype=tf.int64)
       if shuffle and shuffle != "batch":
         indices = tf.random.shuffle(indices)
       return indices
@@ -398,6 +434,9 @@ class TensorLikeDataAdapter(DataAdapter):
   def partial_batch_size(self):
     return self._partial_batch_size or None
 
+  def applies_class_weight(self):
+    return self._class_weight_applied
+
   def should_recreate_iterator(self):
     # An infinite dataset is always created here.
     return False
@@ -421,6 +460,9 @@ class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
   by the ListsOfScalarsDataAdapter.
   """
 
+  # Weighting the whole data would force the targets into memory.
+  _fuse_class_weight = False
+
   @staticmethod
   def can_handle(x, y=None):
     flat_inputs = tf.nest.flatten(x)
@@ -437,7 +479,8 @@ class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
       )
 
     if (not TensorLikeDataAdapter.can_handle(x, y) and
-        not CompositeTensorDataAdapter.can_handle(x, y)):
+        not CompositeTensorDataAdapter.can_handle(x, y) and
+        not MemmapDataAdapter.can_handle(x, y)):
       return all(_is_array_like(v) for v in flat_inputs)
     else:
       return False
@@ -499,6 +542,154 @@ class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
     return dataset
 
 
+# Target size in bytes of the contiguous reads of `MemmapDataAdapter`.
+_MEMMAP_BLOCK_BYTES = 64 * 2**20
+
+
+class MemmapDataAdapter(DataAdapter):
+  """Adapter that streams `np.memmap` and `NpyDirectory` inputs from disk.
+
+  Unlike `TensorLikeDataAdapter`, the inputs are never loaded in memory as a
+  whole, and unlike `GenericArrayLikeDataAdapter` they are not gathered one
+  index at a time. Each epoch, the samples are split in blocks of consecutive
+  rows, read with one contiguous read per input. When shuffling, the blocks
+  are read in a random order and the samples are shuffled within each block,
+  the last block (which holds the partial batch) always coming last.
+
+  A pool of `workers` threads reads up to `max_queue_size` blocks ahead of
+  the one being consumed. In-memory NumPy inputs, like labels, may be mixed
+  with memory-mapped ones.
+  """
+
+  @staticmethod
+  def can_handle(x, y=None):
+    flat_inputs = tf.nest.flatten(x)
+    if y is not None:
+      flat_inputs += tf.nest.flatten(y)
+    return (any(memmap_utils.is_memmap(v) for v in flat_inputs) and
+            all(memmap_utils.is_memmap(v) or isinstance(v, np.ndarray)
+                for v in flat_inputs))
+
+  def __init__(self,
+               x,
+               y=None,
+               sample_weights=None,
+               sample_weight_modes=None,
+               batch_size=None,
+               steps=None,
+               shuffle=False,
+               workers=1,
+               max_queue_size=10,
+               block_size=None,
+               **kwargs):
+    super(MemmapDataAdapter, self).__init__(x, y, **kwargs)
+    x, y, sample_weights = tf.__internal__.nest.list_to_tuple(
+        (x, y, sample_weights))
+    sample_weight_modes = broadcast_sample_weight_modes(
+        sample_weights, sample_weight_modes)
+    (sample_weights, _, _) = training_utils.handle_partial_sample_weights(
+        y, sample_weights, sample_weight_modes, check_all_flat=True)
+
+    inputs = pack_x_y_sample_weight(x, y, sample_weights)
+    flat_inputs = tf.nest.flatten(inputs)
+    _check_data_cardinality(inputs)
+    num_samples = int(flat_inputs[0].shape[0])
+
+    if not batch_size:
+      batch_size = int(math.ceil(num_samples / steps)) if steps else 32
+    if not block_size:
+      row_bytes = sum(
+          inp.dtype.itemsize * int(np.prod(inp.shape[1:]))
+          for inp in flat_inputs)
+      block_size = max(_MEMMAP_BLOCK_BYTES // max(row_bytes, 1), batch_size)
+    # Blocks hold whole batches, so only the last batch may be partial.
+    block_size = max(block_size // batch_size, 1) * batch_size
+
+    self._size = int(math.ceil(num_samples / batch_size))
+    self._batch_size = batch_size
+    self._partial_batch_size = num_samples % batch_size
+    self._shuffle = shuffle
+
+    num_blocks = int(math.ceil(num_samples / block_size))
+    if isinstance(workers, (tuple, list)):
+      # No autoscaling for disk reads, use the upper bound.
+      workers = workers[-1]
+    workers = max(workers, 1)
+    read_ahead = max(max_queue_size, 1)
+
+    def _output_dtype(inp):
+      if issubclass(inp.dtype.type, np.floating):
+        return np.dtype(backend.floatx())
+      return inp.dtype
+
+    out_dtypes = [_output_dtype(inp) for inp in flat_inputs]
+
+    def read_block(block):
+      start = block * block_size
+      stop = min(start + block_size, num_samples)
+      flat_block = []
+      for inp, dtype in zip(flat_inputs, out_dtypes):
+        if memmap_utils.is_memmap(inp) and inp.dtype == dtype:
+          out = np.empty((stop - start,) + inp.shape[1:], dtype=dtype)
+          memmap_utils.read_rows(inp, start, stop, out)
+        else:
+          out = np.asarray(inp[start:stop], dtype=dtype)
+        flat_block.append(out)
+      if shuffle:
+        permutation = np.random.permutation(stop - start)
+        flat_block = [b[permutation] for b in flat_block]
+      return flat_block
+
+    def generator():
+      order = np.arange(num_blocks)
+      if shuffle and num_blocks > 1:
+        # The last block is the one holding the partial batch.
+        np.random.shuffle(order[:-1])
+      pool = data_utils.get_pool_class(False)(workers)
+      try:
+        pending = collections.deque()
+        blocks = iter(order)
+        for block in itertools.islice(blocks, read_ahead):
+          pending.append(pool.apply_async(read_block, (block,)))
+        while pending:
+          flat_block = pending.popleft().get()
+          for block in itertools.islice(blocks, 1):
+            pending.append(pool.apply_async(read_block, (block,)))
+          num_rows = len(flat_block[0])
+          for i in range(0, num_rows, batch_size):
+            yield tf.nest.pack_sequence_as(
+                inputs, [b[i:i + batch_size] for b in flat_block])
+      finally:
+        pool.terminate()
+
+    output_types = tf.nest.pack_sequence_as(
+        inputs, [tf.as_dtype(dtype) for dtype in out_dtypes])
+    output_shapes = tf.nest.pack_sequence_as(
+        inputs,
+        [tf.TensorShape((None,) + tuple(inp.shape[1:])) for inp in flat_inputs])
+    self._dataset = tf.data.Dataset.from_generator(
+        generator, output_types, output_shapes=output_shapes)
+
+  def get_dataset(self):
+    return self._dataset
+
+  def get_size(self):
+    return self._size
+
+  def batch_size(self):
+    return self._batch_size
+
+  def has_partial_batch(self):
+    return self._partial_batch_size > 0
+
+  def partial_batch_size(self):
+    return self._partial_batch_size or None
+
+  def should_recreate_iterator(self):
+    # Every iterator reads the data once, in a new order if shuffling.
+    return True
+
+
 class DatasetCreatorAdapter(DataAdapter):
   """Adapter that handles dataset functions."""
 
@@ -683,6 +874,9 @@ class ListsOfScalarsDataAdapter(DataAdapter):
   def partial_batch_size(self):
     return self._internal_adapter.partial_batch_size()
 
+  def applies_class_weight(self):
+    return self._internal_adapter.applies_class_weight()
+
   def should_recreate_iterator(self):
     return True
 
@@ -858,7 +1052,7 @@ class GeneratorDataAdapter(DataAdapter):
   def _handle_multiprocessing(self, x, workers, use_multiprocessing,
                               max_queue_size):
     """Create a callable, possibly including an Enqueuer."""
-    if workers > 1 or (workers > 0 and use_multiprocessing):
+    if _use_enqueuer(workers, use_multiprocessing):
       def generator_fn():
         enqueuer = data_utils.GeneratorEnqueuer(
             x, use_multiprocessing=use_multiprocessing)
@@ -918,6 +1112,7 @@ class KerasSequenceAdapter(GeneratorDataAdapter):
     self._shuffle_sequence = shuffle
     self._keras_sequence = x
     self._enqueuer = None
+    self._autoscaler = None
     super(KerasSequenceAdapter, self).__init__(
         x,
         shuffle=False,  # Shuffle is handed in the _make_callable override.
@@ -933,12 +1128,15 @@ class KerasSequenceAdapter(GeneratorDataAdapter):
 
   def _handle_multiprocessing(self, x, workers, use_multiprocessing,
                               max_queue_size):
-    if workers > 1 or (workers > 0 and use_multiprocessing):
+    if _use_enqueuer(workers, use_multiprocessing):
       def generator_fn():
         self._enqueuer = data_utils.OrderedEnqueuer(
             x, use_multiprocessing=use_multiprocessing,
             shuffle=self._shuffle_sequence)
+        # Keep the number of workers picked during the previous epochs.
+        self._enqueuer.autoscaler = self._autoscaler
         self._enqueuer.start(workers=workers, max_queue_size=max_queue_size)
+        self._autoscaler = self._enqueuer.autoscaler
         return self._enqueuer.get()
     else:
       def generator_fn():
@@ -956,6 +1154,19 @@ class KerasSequenceAdapter(GeneratorDataAdapter):
   def get_size(self):
     return self._size
 
+  def enqueuer_stats(self):
+    """Returns the worker autoscaling stats, see `OrderedEnqueuer.start`.
+
+    Returns:
+      A dict with the current, minimum and maximum number of workers, the
+      time spent by the consumer waiting for batches and by the workers
+      blocked on a full queue, and the list of scaling decisions, accumulated
+      over all epochs. `None` if `workers` is not a `(min, max)` tuple.
+    """
+    if self._autoscaler is None:
+      return None
+    return self._autoscaler.get_stats()
+
   def should_recreate_iterator(self):
     return True
 
@@ -965,10 +1176,19 @@ class KerasSequenceAdapter(GeneratorDataAdapter):
     self._keras_sequence.on_epoch_end()
 
 
+def _use_enqueuer(workers, use_multiprocessing):
+  """Whether generator-like inputs should be read through an Enqueuer."""
+  if isinstance(workers, (tuple, list)):
+    # Autoscaling between `(min_workers, max_workers)`.
+    return True
+  return workers > 1 or (workers > 0 and use_multiprocessing)
+
+
 ALL_ADAPTER_CLS = [
     ListsOfScalarsDataAdapter, TensorLikeDataAdapter,
-    GenericArrayLikeDataAdapter, DatasetAdapter, GeneratorDataAdapter,
-    KerasSequenceAdapter, CompositeTensorDataAdapter, DatasetCreatorAdapter
+    GenericArrayLikeDataAdapter, MemmapDataAdapter, DatasetAdapter,
+    GeneratorDataAdapter, KerasSequenceAdapter, CompositeTensorDataAdapter,
+    DatasetCreatorAdapter
 ]
 
 
@@ -1148,6 +1368,7 @@ class DataHandler(object):
         epochs=epochs - initial_epoch,
         sample_weights=sample_weight,
         shuffle=shuffle,
+        class_weight=class_weight,
         max_queue_size=max_queue_size,
         workers=workers,
         use_multiprocessing=use_multiprocessing,
@@ -1173,7 +1394,7 @@ class DataHandler(object):
     """Configure the `_dataset` and `_inferred_steps` attributes."""
     del x
     dataset = self._adapter.get_dataset()
-    if class_weight:
+    if class_weight and not self._adapter.applies_class_weight():
       dataset = dataset.map(_make_class_weight_map_fn(class_weight))
     self._inferred_steps = self._infer_steps(steps_per_epoch, dataset)
 
@@ -1430,7 +1651,91 @@ def expand_1d(data):
   return tf.nest.map_structure(_expand_single_1d_tensor, data)
 
 
-def train_validation_split(arrays, validation_split):
+class _SplitSource(object):
+  """An array shared by the subsets of `train_validation_split`."""
+
+  def __init__(self, array):
+    self.array = array
+    self._tensor = None
+
+  def as_tensor(self):
+    """Converts the array once, for all the subsets which read from it."""
+    if self._tensor is None:
+      self._tensor = _process_tensorlike(self.array)
+    return self._tensor
+
+
+class _SplitArray(object):
+  """The rows `[start, stop)` of an array, without copying them.
+
+  `TensorLikeDataAdapter` reads these rows from the tensor of the whole array,
+  so splitting off validation data doesn't copy the training data. Anything
+  else gets the rows as a regular array.
+  """
+
+  def __init__(self, source, start, stop):
+    self.source = source
+    self.start = start
+    self.stop = stop
+
+  @property
+  def shape(self):
+    return (self.stop - self.start,) + tuple(self.source.array.shape[1:])
+
+  @property
+  def dtype(self):
+    return self.source.array.dtype
+
+  def __len__(self):
+    return self.stop - self.start
+
+  def __getitem__(self, key):
+    return self.materialize()[key]
+
+  def materialize(self):
+    return self.source.array[self.start:self.stop]
+
+
+def _split_array_to_tensor(value, dtype=None, name=None, as_ref=False):
+  del as_ref  # Unused.
+  return tf.convert_to_tensor(value.materialize(), dtype=dtype, name=name)
+
+
+tf.register_tensor_conversion_function(_SplitArray, _split_array_to_tensor)
+
+
+def _unpack_split_arrays(inputs):
+  """Replaces the `_SplitArray`s of `inputs` with the tensors they split.
+
+  Args:
+    inputs: Structure of tensor-like values, possibly `_SplitArray`s.
+
+  Returns:
+    A tuple `(inputs, row_range)`. If all the non-`None` values of `inputs` are
+    `_SplitArray`s of the same rows, `row_range` is the `(start, stop)` of those
+    rows and the values are replaced by the tensors of their whole arrays.
+    Otherwise `row_range` is `None` and the `_SplitArray`s are materialized.
+  """
+  flat_inputs = [t for t in tf.nest.flatten(inputs) if t is not None]
+  split_arrays = [t for t in flat_inputs if isinstance(t, _SplitArray)]
+  if not split_arrays:
+    return inputs, None
+
+  row_ranges = set((t.start, t.stop) for t in split_arrays)
+  if len(split_arrays) == len(flat_inputs) and len(row_ranges) == 1:
+    return tf.nest.map_structure(
+        lambda t: t.source.as_tensor() if t is not None else t,
+        inputs), row_ranges.pop()
+
+  def _materialize(t):
+    if isinstance(t, _SplitArray):
+      return t.materialize()
+    return t
+
+  return tf.nest.map_structure(_materialize, inputs), None
+
+
+def train_validation_split(arrays, validation_split, lazy=False):
   """Split arrays into train and validation subsets in deterministic order.
 
   The last part of data will become validation data.
@@ -1441,6 +1746,9 @@ def train_validation_split(arrays, validation_split):
     validation_split: Float between 0 and 1. The proportion of the dataset to
       include in the validation split. The rest of the dataset will be included
       in the training split.
+    lazy: Whether to return views of the dense Tensors and NumPy arrays
+      instead of copies of their rows. The views are only meant to be passed to
+      `DataHandler`, which reads both subsets from a single copy of the data.
   Returns:
     `(train_arrays, validation_arrays)`
   """
@@ -1479,10 +1787,26 @@ def train_validation_split(arrays, validation_split):
         "different value for the `validation_split` argument." .format(
             batch_dim=batch_dim, validation_split=validation_split))
 
-  def _split(t, start, end):
-    if t is None:
-      return t
-    return t[start:end]
+  def _can_split_lazily(t):
+    return (t is None or isinstance(t, tf.Tensor) or
+            (isinstance(t, np.ndarray) and not memmap_utils.is_memmap(t)))
+
+  if lazy and all(_can_split_lazily(t) for t in flat_arrays):
+    sources = tf.nest.map_structure(
+        lambda t: _SplitSource(t) if t is not None else t, arrays)
+
+    def _split(t, start, end):
+      if t is None:
+        return t
+      return _SplitArray(t, start, end)
+
+    arrays = sources
+  else:
+
+    def _split(t, start, end):
+      if t is None:
+        return t
+      return t[start:end]
 
   train_arrays = tf.nest.map_structure(
       functools.partial(_split, start=0, end=split_at), arrays)
@@ -1611,9 +1935,9 @@ def single_batch_iterator(strategy,
     data = (x, y, sample_weight)
 
   _check_data_cardinality(data)
-  dataset = tf.data.Dataset.from_tensors(data)
   if class_weight:
-    dataset = dataset.map(_make_class_weight_map_fn(class_weight))
+    data = _make_class_weight_map_fn(class_weight)(*data)
+  dataset = tf.data.Dataset.from_tensors(data)
   dataset = strategy.experimental_distribute_dataset(dataset)
   return iter(dataset)
 
@@ -21,6 +21,7 @@ from __future__ import print_function
 import tensorflow.compat.v2 as tf
 
 import math
+import os
 
 from absl.testing import parameterized
 import numpy as np
@@ -30,6 +31,7 @@ from keras import keras_parameterized
 from keras import testing_utils
 from keras.engine import data_adapter
 from keras.utils import data_utils
+from keras.utils import memmap_utils
 
 
 class DummyArrayLike(object):
@@ -612,6 +614,122 @@ class GenericArrayLikeDataAdapterTest(DataAdapterTestBase):
     self.assertEqual(adapter.partial_batch_size(), partial_batch_size or None)
 
 
+class MemmapDataAdapterTest(DataAdapterTestBase):
+
+  def setUp(self):
+    super(MemmapDataAdapterTest, self).setUp()
+    self.adapter_cls = data_adapter.MemmapDataAdapter
+    self.memmap_input = self._make_memmap('x.npy', self.numpy_input)
+    self.memmap_target = self._make_memmap('y.npy', self.numpy_target)
+
+  def _make_memmap(self, name, array):
+    path = os.path.join(self.get_temp_dir(), name)
+    np.save(path, array)
+    return np.load(path, mmap_mode='r')
+
+  def _make_npy_directory(self, array, num_shards):
+    directory = os.path.join(self.get_temp_dir(), 'shards')
+    os.mkdir(directory)
+    for i, shard in enumerate(np.array_split(array, num_shards)):
+      np.save(os.path.join(directory, 'part-%02d.npy' % i), shard)
+    return memmap_utils.NpyDirectory(directory)
+
+  def test_can_handle(self):
+    self.assertTrue(self.adapter_cls.can_handle(self.memmap_input))
+    self.assertTrue(
+        self.adapter_cls.can_handle(self.memmap_input, self.memmap_target))
+    self.assertTrue(
+        self.adapter_cls.can_handle(self.memmap_input, self.numpy_target))
+    self.assertTrue(self.adapter_cls.can_handle(
+        self._make_npy_directory(self.numpy_input, 3), self.numpy_target))
+
+    self.assertFalse(self.adapter_cls.can_handle(self.numpy_input))
+    self.assertFalse(
+        self.adapter_cls.can_handle(self.memmap_input, self.tensor_target))
+    self.assertFalse(self.adapter_cls.can_handle(self.arraylike_input))
+    self.assertFalse(self.adapter_cls.can_handle(self.dataset_input))
+    self.assertFalse(self.adapter_cls.can_handle(self.generator_input))
+    self.assertFalse(self.adapter_cls.can_handle(self.sequence_input))
+
+  def test_not_handled_by_other_adapters(self):
+    self.assertIs(
+        data_adapter.select_data_adapter(
+            self.memmap_input, self.numpy_target),
+        data_adapter.MemmapDataAdapter)
+    self.assertIs(
+        data_adapter.select_data_adapter(
+            self._make_npy_directory(self.numpy_input, 3), self.numpy_target),
+        data_adapter.MemmapDataAdapter)
+
+  @parameterized.named_parameters(
+      ('batch_size_5', 5, None, 10, 0),
+      ('batch_size_4', 4, None, 13, 2),
+      ('steps_4', None, 4, 4, 11),
+  )
+  def test_partial_batch(
+      self, batch_size_in, steps, size, partial_batch_size):
+    adapter = self.adapter_cls(
+        self.memmap_input, self.memmap_target,
+        batch_size=batch_size_in,
+        steps=steps)
+    self.assertEqual(adapter.get_size(), size)
+    self.assertEqual(adapter.has_partial_batch(), bool(partial_batch_size))
+    self.assertEqual(adapter.partial_batch_size(), partial_batch_size or None)
+
+  @parameterized.named_parameters(('memmap', False), ('npy_directory', True))
+  def test_unshuffled_order(self, use_npy_directory):
+    num_samples = 100
+    x = np.arange(num_samples * 2).reshape((num_samples, 2))
+    if use_npy_directory:
+      x_input = self._make_npy_directory(x, 7)
+    else:
+      x_input = self._make_memmap('x_range.npy', x)
+    adapter = self.adapter_cls(
+        x_input, np.arange(num_samples), batch_size=8, block_size=24,
+        workers=3, max_queue_size=2)
+    batches = list(adapter.get_dataset())
+    self.assertLen(batches, 13)
+    self.assertEqual(batches[-1][0].shape, (4, 2))
+    self.assertAllEqual(np.concatenate([b[0] for b in batches]), x)
+    self.assertAllEqual(
+        np.concatenate([b[1] for b in batches]), np.arange(num_samples))
+
+  def test_shuffle_correctness(self):
+    num_samples = 100
+    x = self._make_memmap('x_range.npy', np.arange(num_samples))
+    np.random.seed(99)
+    adapter = self.adapter_cls(
+        x, np.arange(num_samples), batch_size=8, block_size=16, shuffle=True)
+
+    def _get_epoch():
+      batches = list(adapter.get_dataset())
+      self.assertEqual(batches[-1][0].shape, (4,))
+      epoch_x = np.concatenate([b[0].numpy() for b in batches])
+      epoch_y = np.concatenate([b[1].numpy() for b in batches])
+      # Inputs and targets are shuffled together.
+      self.assertAllEqual(epoch_x, epoch_y)
+      return epoch_x
+
+    epoch_data = _get_epoch()
+    self.assertNotAllClose(x, epoch_data)
+    self.assertAllClose(x, np.sort(epoch_data))
+    second_epoch_data = _get_epoch()
+    self.assertNotAllClose(epoch_data, second_epoch_data)
+    self.assertAllClose(x, np.sort(second_epoch_data))
+
+  @keras_parameterized.run_all_keras_modes(always_skip_v1=True)
+  def test_training(self):
+    self.model.compile(loss='sparse_categorical_crossentropy', optimizer='sgd',
+                       run_eagerly=testing_utils.should_run_eagerly())
+    self.model.fit(self.memmap_input, self.memmap_target, batch_size=5,
+                   epochs=2)
+    self.model.fit(self.memmap_input, self.numpy_target, shuffle=True,
+                   batch_size=4, workers=2)
+    self.model.evaluate(self.memmap_input, self.memmap_target, batch_size=5)
+    self.model.predict(
+        self._make_npy_directory(self.numpy_input, 4), batch_size=5)
+
+
 class DatasetAdapterTest(DataAdapterTestBase):
 
   def setUp(self):
@@ -758,6 +876,26 @@ class KerasSequenceAdapterTest(DataAdapterTestBase):
     self.model.fit(self.sequence_input, workers=1, use_multiprocessing=True,
                    max_queue_size=10, steps_per_epoch=10)
 
+  @keras_parameterized.run_all_keras_modes(always_skip_v1=True)
+  @testing_utils.run_v2_only
+  def test_autoscaling_workers_training(self):
+    self.model.compile(loss='sparse_categorical_crossentropy', optimizer='sgd',
+                       run_eagerly=testing_utils.should_run_eagerly())
+    data_handler = data_adapter.DataHandler(
+        self.sequence_input, workers=(1, 3), epochs=2)
+    for _, iterator in data_handler.enumerate_epochs():
+      for _ in data_handler.steps():
+        next(iterator)
+    stats = data_handler._adapter.enqueuer_stats()
+    self.assertEqual(stats['min_workers'], 1)
+    self.assertEqual(stats['max_workers'], 3)
+    self.assertBetween(stats['workers'], 1, 3)
+    self.model.fit(self.sequence_input, workers=(1, 3), steps_per_epoch=10)
+
+  def test_enqueuer_stats_without_autoscaling(self):
+    adapter = self.adapter_cls(self.sequence_input, workers=2)
+    self.assertIsNone(adapter.enqueuer_stats())
+
   def test_size(self):
     adapter = self.adapter_cls(self.sequence_input)
     self.assertEqual(adapter.get_size(), 10)
@@ -1003,6 +1141,29 @@ class DataHandlerTest(keras_parameterized.TestCase):
               2: 1.5
           })
 
+  @parameterized.named_parameters(('numpy', True), ('dataset', False))
+  def test_class_weight(self, use_numpy):
+    x = np.arange(6).reshape((6, 1))
+    y = np.array([0, 1, 2, 2, 1, 0])
+    sw = np.array([1., 2., 1., 2., 1., 2.])
+    if use_numpy:
+      inputs = {'x': x, 'y': y, 'sample_weight': sw, 'batch_size': 2}
+    else:
+      inputs = {
+          'x': tf.data.Dataset.from_tensor_slices((x, y, sw)).batch(2)
+      }
+    data_handler = data_adapter.DataHandler(
+        class_weight={0: 0.5, 1: 1., 2: 2.}, **inputs)
+    # NumPy inputs are weighted once by the adapter, instead of by a `map`.
+    self.assertEqual(data_handler._adapter.applies_class_weight(), use_numpy)
+    returned_data = []
+    for _, iterator in data_handler.enumerate_epochs():
+      for _ in data_handler.steps():
+        returned_data.append(next(iterator))
+    returned_data = self.evaluate(returned_data)
+    returned_sw = np.concatenate([batch[2] for batch in returned_data])
+    self.assertAllClose(returned_sw, [0.5, 2., 2., 4., 1., 1.])
+
   @parameterized.named_parameters(('numpy', True), ('dataset', False))
   def test_single_x_input_no_tuple_wrapping(self, use_numpy):
     x = np.ones((10, 1))
@@ -1052,6 +1213,51 @@ class TestValidationSplit(keras_parameterized.TestCase):
     self.assertEqual(val_y.numpy().tolist(), [8])
     self.assertEqual(val_sw.numpy().tolist(), [16])
 
+  @parameterized.named_parameters(('numpy_arrays', True), ('tensors', False))
+  def test_validation_split_lazy(self, use_numpy):
+    x = np.arange(10).reshape((10, 1))
+    y = np.arange(10) * 2
+    if not use_numpy:
+      x, y = tf.convert_to_tensor(x), tf.convert_to_tensor(y)
+
+    (train_x, train_y, train_sw), (val_x, val_y, val_sw) = (
+        data_adapter.train_validation_split((x, y, None),
+                                            validation_split=0.3,
+                                            lazy=True))
+    self.assertIsNone(train_sw)
+    self.assertIsNone(val_sw)
+    self.assertEqual(train_x.shape, (7, 1))
+    self.assertLen(val_y, 3)
+    # Both subsets are read from a single copy of the data.
+    self.assertIs(train_x.source, val_x.source)
+    self.assertAllEqual(tf.convert_to_tensor(val_y), [14, 16, 18])
+
+    adapter = data_adapter.TensorLikeDataAdapter(
+        train_x, train_y, batch_size=4, shuffle=True)
+    self.assertEqual(adapter.get_size(), 2)
+    self.assertEqual(adapter.partial_batch_size(), 3)
+    returned_data = self.evaluate(list(adapter.get_dataset()))
+    returned_x = np.concatenate([batch[0] for batch in returned_data])
+    returned_y = np.concatenate([batch[1] for batch in returned_data])
+    self.assertAllEqual(np.sort(returned_x[:, 0]), range(7))
+    self.assertAllEqual(returned_y, returned_x[:, 0] * 2)
+
+    adapter = data_adapter.TensorLikeDataAdapter(val_x, val_y, batch_size=4)
+    returned_data = self.evaluate(list(adapter.get_dataset()))
+    self.assertLen(returned_data, 1)
+    self.assertAllEqual(returned_data[0][0], [[7], [8], [9]])
+    self.assertAllEqual(returned_data[0][1], [14, 16, 18])
+
+  def test_validation_split_lazy_mixed_with_arrays(self):
+    (train_x, _), _ = data_adapter.train_validation_split(
+        (np.arange(10), None), validation_split=0.5, lazy=True)
+    # Subsets mixed with other arrays are read as regular arrays.
+    adapter = data_adapter.TensorLikeDataAdapter(
+        train_x, np.arange(5) * 2, batch_size=5)
+    returned_data = self.evaluate(list(adapter.get_dataset()))
+    self.assertAllEqual(returned_data[0][0], range(5))
+    self.assertAllEqual(returned_data[0][1], np.arange(5) * 2)
+
   def test_validation_split_user_error(self):
     with self.assertRaisesRegex(ValueError, 'is only supported for Tensors'):
       data_adapter.train_validation_split(
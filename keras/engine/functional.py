@@ -225,6 +225,7 @@ class Functional(training_lib.Model):
         self._feed_inputs.append(layer.input)
 
     self._compute_tensor_usage_count()
+    self._execution_plan = None
     self._set_save_spec(self._nested_inputs)
     tf_utils.assert_no_legacy_layers(self.layers)
 
@@ -533,39 +534,30 @@ class Functional(training_lib.Model):
     for input_t, mask in zip(inputs, masks):
       input_t._keras_mask = mask
 
-    # Dictionary mapping reference tensors to computed tensors.
-    tensor_dict = {}
-    tensor_usage_count = self._tensor_usage_count
-    for x, y in zip(self.inputs, inputs):
-      y = self._conform_to_reference_input(y, ref_input=x)
-      x_id = str(id(x))
-      tensor_dict[x_id] = [y] * tensor_usage_count[x_id]
-
-    nodes_by_depth = self._nodes_by_depth
-    depth_keys = list(nodes_by_depth.keys())
-    depth_keys.sort(reverse=True)
-
-    for depth in depth_keys:
-      nodes = nodes_by_depth[depth]
-      for node in nodes:
-        if node.is_input:
-          continue  # Input tensors already exist.
-
-        if any(t_id not in tensor_dict for t_id in node.flat_input_ids):
-          continue  # Node is not computable, try skipping.
-
-        args, kwargs = node.map_arguments(tensor_dict)
-        outputs = node.layer(*args, **kwargs)
-
-        # Update tensor_dict.
-        for x_id, y in zip(node.flat_output_ids, tf.nest.flatten(outputs)):
-          tensor_dict[x_id] = [y] * tensor_usage_count[x_id]
+    plan = getattr(self, '_execution_plan', None)
+    if plan is None:
+      # Built once, and reset when the graph of the model changes.
+      plan = self._execution_plan = _ExecutionPlan(self)
+
+    # Computed tensors, indexed by the slots of the plan.
+    values = [None] * plan.num_slots
+    for slot, x, y in zip(plan.input_slots, self.inputs, inputs):
+      values[slot] = self._conform_to_reference_input(y, ref_input=x)
+
+    for (layer, input_slots, unpack_arguments, output_slots,
+         released_slots) in plan.steps:
+      args, kwargs = unpack_arguments([values[slot] for slot in input_slots])
+      outputs = layer(*args, **kwargs)
+      for slot, y in zip(output_slots, tf.nest.flatten(outputs)):
+        values[slot] = y
+      # Release tensors which are no longer needed as early as possible.
+      for slot in released_slots:
+        values[slot] = None
 
     output_tensors = []
-    for x in self.outputs:
-      x_id = str(id(x))
-      assert x_id in tensor_dict, 'Could not compute output ' + str(x)
-      output_tensors.append(tensor_dict[x_id].pop())
+    for x, slot in zip(self.outputs, plan.output_slots):
+      assert slot is not None, 'Could not compute output ' + str(x)
+      output_tensors.append(values[slot])
 
     return tf.nest.pack_sequence_as(self._nested_outputs, output_tensors)
 
@@ -810,6 +802,7 @@ class Functional(training_lib.Model):
     self._handle_deferred_layer_dependencies(deferred_layers)
 
     self._compute_tensor_usage_count()
+    self._execution_plan = None
 
   def _compute_tensor_usage_count(self):
     """Compute the #. of tensor usages for all the output tensors of layers.
@@ -879,6 +872,67 @@ class Functional(training_lib.Model):
     return super(Functional, self)._get_save_spec(dynamic_batch)
 
 
+class _ExecutionPlan(object):
+  """The layer calls of a Functional model, in the order to run them.
+
+  Computed tensors are kept in a list indexed by integer slots instead of a
+  dictionary keyed by the ids of Keras Tensors, and each step comes with a
+  prebuilt function mapping its input tensors to call arguments, so running the
+  model doesn't walk `_nodes_by_depth` or `nest` structures.
+
+  Attributes:
+    num_slots: Number of tensor slots.
+    input_slots: Slots of the tensors of `model.inputs`.
+    steps: List of `(layer, input_slots, unpack_arguments, output_slots,
+      released_slots)` tuples, where `released_slots` are the slots which are
+      no longer needed after the step.
+    output_slots: Slots of the tensors of `model.outputs`, or `None` for outputs
+      which can't be computed.
+  """
+
+  def __init__(self, model):
+    slots = {}
+    self.input_slots = []
+    for x in model.inputs:
+      slots[str(id(x))] = len(self.input_slots)
+      self.input_slots.append(len(self.input_slots))
+    num_slots = len(self.input_slots)
+
+    nodes = []
+    for depth in sorted(model._nodes_by_depth.keys(), reverse=True):
+      for node in model._nodes_by_depth[depth]:
+        if node.is_input:
+          continue  # Input tensors already exist.
+        if any(t_id not in slots for t_id in node.flat_input_ids):
+          continue  # Node is not computable, try skipping.
+        input_slots = [slots[t_id] for t_id in node.flat_input_ids]
+        output_slots = []
+        for x_id in node.flat_output_ids:
+          slots[x_id] = num_slots
+          output_slots.append(num_slots)
+          num_slots += 1
+        nodes.append((node, input_slots, output_slots))
+    self.num_slots = num_slots
+    self.output_slots = [slots.get(str(id(x))) for x in model.outputs]
+
+    last_uses = {}
+    for i, (_, input_slots, _) in enumerate(nodes):
+      for slot in input_slots:
+        last_uses[slot] = i
+    for slot in self.output_slots:
+      last_uses.pop(slot, None)
+    released_slots = [[] for _ in nodes]
+    for slot, i in last_uses.items():
+      released_slots[i].append(slot)
+
+    self.steps = [
+        (node.layer, input_slots, node.make_argument_unpacker(), output_slots,
+         released)
+        for (node, input_slots, output_slots), released in zip(
+            nodes, released_slots)
+    ]
+
+
 def _make_node_key(layer_name, node_index):
   return layer_name + '_ib-' + str(node_index)
 
@@ -1138,18 +1192,11 @@ def reconstruct_from_config(config, custom_objects=None, created_layers=None):
   node_index_map = {}
   node_count_by_layer = {}
 
-  # Dictionary mapping layer instances to
-  # node data that specifies a layer call.
-  # It acts as a queue that maintains any unprocessed
-  # layer call until it becomes possible to process it
-  # (i.e. until the input tensors to the call all exist).
-  unprocessed_nodes = {}
-
-  def add_unprocessed_node(layer, node_data):
-    if layer not in unprocessed_nodes:
-      unprocessed_nodes[layer] = [node_data]
-    else:
-      unprocessed_nodes[layer].append(node_data)
+  # Layer calls in the order of the config, as tuples of
+  # `(layer name, node data, dependencies)`. The dependencies are the
+  # `(layer name, config node index)` of the nodes which must be processed
+  # before the call: its inbound nodes and the previous node of the layer.
+  scheduled_nodes = collections.deque()
 
   def get_node_index(layer, config_node_index):
     """Returns node index in layer (might differ from config_node_index)."""
@@ -1157,45 +1204,49 @@ def reconstruct_from_config(config, custom_objects=None, created_layers=None):
       return 0
     return node_index_map.get((layer.name, config_node_index), None)
 
-  def _deserialize_keras_tensors(kwargs, layer_map):
+  def is_processed(dependency):
+    layer_name, config_node_index = dependency
+    return get_node_index(created_layers[layer_name],
+                          config_node_index) is not None
+
+  def get_keras_tensor(layer_name, node_index, tensor_index):
+    layer = created_layers[layer_name]
+    node = layer._inbound_nodes[get_node_index(layer, node_index)]
+    return tf.nest.flatten(node.outputs)[tensor_index]
+
+  def _deserialize_keras_tensors(kwargs):
     """Deserializes Keras Tensors passed to `call`.."""
 
     def _deserialize_keras_tensor(t):
       """Deserializes a single Keras Tensor passed to `call`."""
       if isinstance(t, tf_utils.ListWrapper):
-        t = t.as_list()
-        layer_name = t[0]
-        node_index = t[1]
-        tensor_index = t[2]
-
-        layer = layer_map[layer_name]
-        new_node_index = get_node_index(layer, node_index)
-        if new_node_index is None:
-          # The inbound node may not have been processed yet,
-          # (This can happen e.g. if it depends on a different set
-          # of inputs than those that have been processed already).
-          # raise an IndexError so that the current node puts itself
-          # back on the unprocessed queue.
-          # Caution: This may lead to infinite loops for malformed
-          # network configurations! (or when there is a bug in
-          # the network config loading code).
-          raise IndexError
-        node = layer._inbound_nodes[new_node_index]
-        return tf.nest.flatten(node.outputs)[tensor_index]
+        return get_keras_tensor(*t.as_list()[:3])
       return t
 
-    kwargs = tf_utils.convert_inner_node_data(kwargs, wrap=True)
     return tf.nest.map_structure(_deserialize_keras_tensor, kwargs)
 
+  def get_node_dependencies(node_data):
+    """Returns the inbound nodes of `node_data`, including in its kwargs."""
+    dependencies = []
+    for input_data in tf.nest.flatten(node_data):
+      input_data = input_data.as_list()
+      if len(input_data) not in (3, 4):
+        raise ValueError('Improperly formatted model config.')
+      if input_data[0] != node_module._CONSTANT_VALUE:
+        dependencies.append((input_data[0], input_data[1]))
+      if len(input_data) == 4:
+        kwargs = tf_utils.convert_inner_node_data(input_data[3], wrap=True)
+        for t in tf.nest.flatten(kwargs):
+          if isinstance(t, tf_utils.ListWrapper):
+            dependencies.append(tuple(t.as_list()[:2]))
+    return dependencies
+
   def process_node(layer, node_data):
-    """Deserialize a node.
+    """Deserialize a node, once the nodes it depends on are processed.
 
     Args:
         layer: layer instance.
         node_data: Nested structure of `ListWrapper`.
-
-    Raises:
-        ValueError: In case of improperly formatted `node_data`.
     """
     input_tensors = []
     for input_data in tf.nest.flatten(node_data):
@@ -1205,27 +1256,13 @@ def reconstruct_from_config(config, custom_objects=None, created_layers=None):
       inbound_tensor_index = input_data[2]
       if len(input_data) == 3:
         kwargs = {}
-      elif len(input_data) == 4:
-        kwargs = input_data[3]
-        try:
-          kwargs = _deserialize_keras_tensors(kwargs, created_layers)
-        except IndexError:
-          # Happens if keras tensors in kwargs are still unprocessed
-          add_unprocessed_node(layer, node_data)
-          return
       else:
-        raise ValueError('Improperly formatted model config.')
+        kwargs = _deserialize_keras_tensors(
+            tf_utils.convert_inner_node_data(input_data[3], wrap=True))
 
       if inbound_layer_name != node_module._CONSTANT_VALUE:
-        inbound_layer = created_layers[inbound_layer_name]
-        inbound_node_index = get_node_index(inbound_layer, inbound_node_index)
-
-        if inbound_node_index is None:
-          add_unprocessed_node(layer, node_data)
-          return
-        inbound_node = inbound_layer._inbound_nodes[inbound_node_index]
-        input_tensors.append(
-            tf.nest.flatten(inbound_node.outputs)[inbound_tensor_index])
+        input_tensors.append(get_keras_tensor(
+            inbound_layer_name, inbound_node_index, inbound_tensor_index))
       else:
         # We received a constant w/ no Keras history attached
         input_tensors.append(inbound_tensor_index)
@@ -1244,7 +1281,7 @@ def reconstruct_from_config(config, custom_objects=None, created_layers=None):
       node_count_by_layer[layer] += 1
 
   def process_layer(layer_data):
-    """Deserializes a layer, then call it on appropriate inputs.
+    """Deserializes a layer, then schedules its calls.
 
     Args:
         layer_data: layer config dict.
@@ -1263,32 +1300,44 @@ def reconstruct_from_config(config, custom_objects=None, created_layers=None):
       layer = deserialize_layer(layer_data, custom_objects=custom_objects)
       created_layers[layer_name] = layer
 
-    node_count_by_layer[layer] = int(_should_skip_first_node(layer))
+    first_node_index = int(_should_skip_first_node(layer))
+    node_count_by_layer[layer] = first_node_index
 
     # Gather layer inputs and convert to `ListWrapper` objects.
     inbound_nodes_data = layer_data['inbound_nodes']
     inbound_nodes_data = tf_utils.convert_inner_node_data(
         inbound_nodes_data, wrap=True)
-    for node_data in inbound_nodes_data:
+    for i, node_data in enumerate(inbound_nodes_data):
       # We don't process nodes (i.e. make layer calls)
       # on the fly because the inbound node may not yet exist,
       # in case of layer shared at different topological depths
       # (e.g. a model such as A(B(A(B(x)))))
-      add_unprocessed_node(layer, node_data)
+      dependencies = get_node_dependencies(node_data)
+      if i:
+        dependencies.append((layer_name, first_node_index + i - 1))
+      scheduled_nodes.append((layer_name, node_data, dependencies))
 
-  # First, we create all layers and enqueue nodes to be processed
+  # First, we create all layers and schedule their calls.
   for layer_data in config['layers']:
     process_layer(layer_data)
-  # Then we process nodes in order of layer depth.
-  # Nodes that cannot yet be processed (if the inbound node
-  # does not yet exist) are re-enqueued, and the process
-  # is repeated until all nodes are processed.
-  while unprocessed_nodes:
-    for layer_data in config['layers']:
-      layer = created_layers[layer_data['name']]
-      if layer in unprocessed_nodes:
-        for node_data in unprocessed_nodes.pop(layer):
-          process_node(layer, node_data)
+  # Then we process the calls in the order of the config. A call whose inbound
+  # nodes don't exist yet waits for the first missing one to be processed, so
+  # each call is checked at most once per dependency.
+  waiting_nodes = collections.defaultdict(list)
+  while scheduled_nodes:
+    layer_name, node_data, dependencies = scheduled_nodes.popleft()
+    missing = [d for d in dependencies if not is_processed(d)]
+    if missing:
+      waiting_nodes[missing[0]].append((layer_name, node_data, dependencies))
+      continue
+    layer = created_layers[layer_name]
+    process_node(layer, node_data)
+    processed = (layer_name, node_count_by_layer[layer] - 1)
+    scheduled_nodes.extend(waiting_nodes.pop(processed, []))
+  if waiting_nodes:
+    raise ValueError(
+        'Improperly formatted model config: the inbound nodes {} of some '
+        'layers are never created.'.format(sorted(waiting_nodes)))
 
   input_tensors = []
   output_tensors = []
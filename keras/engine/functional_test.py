@@ -801,6 +801,38 @@ class NetworkConstructionTest(keras_parameterized.TestCase):
     output_val_2 = m2.predict(x_val)
     self.assertAllClose(output_val, output_val_2, atol=1e-6)
 
+  @combinations.generate(combinations.keras_mode_combinations())
+  def test_from_config_with_layers_out_of_order(self):
+    x_val = np.random.random((10, 5))
+
+    x = input_layer_lib.Input(shape=(5,))
+    a = layers.Dense(5, name='A')
+    b = layers.Dense(5, name='B')
+    c = layers.Dense(5, name='C')
+    output = layers.add([c(a(b(x))), a(x)])
+    m = training_lib.Model(x, output)
+    m.run_eagerly = testing_utils.should_run_eagerly()
+    output_val = m.predict(x_val)
+
+    # Calls whose inbound nodes come later in the config are deferred.
+    config = m.get_config()
+    config['layers'] = config['layers'][:1] + config['layers'][:0:-1]
+    m2 = models.Model.from_config(config)
+    for layer in m.layers:
+      m2.get_layer(layer.name).set_weights(layer.get_weights())
+    self.assertAllClose(output_val, m2.predict(x_val), atol=1e-6)
+
+  def test_from_config_with_missing_inbound_node(self):
+    x = input_layer_lib.Input(shape=(5,))
+    a = layers.Dense(5, name='A')
+    m = training_lib.Model(x, a(a(x)))
+
+    config = m.get_config()
+    # Make the second call of `A` depend on a node that is never created.
+    config['layers'][1]['inbound_nodes'][1][0][1] = 2
+    with self.assertRaisesRegex(ValueError, 'never created'):
+      models.Model.from_config(config)
+
   @combinations.generate(combinations.keras_mode_combinations())
   def test_layer_sharing_at_heterogenous_depth_with_concat(self):
     input_shape = (16, 9, 3)
@@ -2365,6 +2397,57 @@ class CacheCorrectnessTest(keras_parameterized.TestCase):
       # if training is not passed at runtime
       self.assertAllEqual(network(x), _call(x, None))
 
+  @combinations.generate(combinations.combine(mode=['eager']))
+  def test_execution_plan_cache(self):
+    inputs = input_layer_lib.Input(shape=(3,))
+    dense = layers.Dense(3, kernel_initializer='ones', bias_initializer='ones')
+    residual = layers.add([dense(inputs), inputs])
+    outputs = [dense(residual), residual]
+    network = functional.Functional(inputs, outputs)
+
+    x = np.ones((2, 3), dtype=np.float32)
+    out_1, out_2 = network(x)
+    self.assertAllClose(out_1, np.full((2, 3), 16.))
+    self.assertAllClose(out_2, np.full((2, 3), 5.))
+    plan = network._execution_plan
+    # One step for each of the layer calls: `dense`, `add` and `dense`.
+    self.assertLen(plan.steps, 3)
+
+    # The second pass should reuse the plan.
+    out_1, out_2 = network(x * 2)
+    self.assertIs(network._execution_plan, plan)
+    self.assertAllClose(out_1, np.full((2, 3), 28.))
+    self.assertAllClose(out_2, np.full((2, 3), 9.))
+
+    # Adding to the topology should invalidate the plan.
+    network.add_loss(tf.reduce_sum(residual))
+    self.assertIsNone(network._execution_plan)
+    network(x)
+    self.assertIsNot(network._execution_plan, plan)
+    self.assertAllClose(network.losses, [30.])
+
+  @combinations.generate(combinations.combine(mode=['eager']))
+  def test_execution_plan_nested_list_argument(self):
+
+    class NestedSum(layers.Layer):
+
+      def call(self, inputs):
+        first, rest = inputs
+        if isinstance(rest, dict):
+          return first + 2 * rest['k']
+        return first + rest[0] * rest[1]
+
+    a = input_layer_lib.Input(shape=(2,))
+    b = input_layer_lib.Input(shape=(2,))
+    c = input_layer_lib.Input(shape=(2,))
+    outputs = [NestedSum()([a, [b, c]]), NestedSum()([a, {'k': b}])]
+    network = functional.Functional([a, b, c], outputs)
+
+    x = np.ones((1, 2), dtype=np.float32)
+    out_1, out_2 = network([x, 2 * x, 3 * x])
+    self.assertAllClose(out_1, np.full((1, 2), 7.))
+    self.assertAllClose(out_2, np.full((1, 2), 5.))
+
 
 class InputsOutputsErrorTest(keras_parameterized.TestCase):
 
@@ -156,6 +156,34 @@ class Node(object):
                                            flat_arguments)
       return args, kwargs
 
+  def make_argument_unpacker(self):
+    """Returns a function mapping computed Tensors to call arguments.
+
+    The returned function takes a list of the computed Tensors for the Keras
+    Tensors of `flat_input_ids`, and returns the `(args, kwargs)` to call the
+    layer with. It does the work of `map_arguments` without a `tensor_dict`.
+    """
+    if self._single_positional_tensor_passed:
+      return lambda values: ((values[0],), {})
+    if (not self.call_kwargs and len(self.call_args) == 1 and
+        isinstance(self.call_args[0], list) and
+        len(self._keras_inputs) == len(self._flat_arguments) and
+        not any(tf.nest.is_nested(arg) for arg in self.call_args[0])):
+      # A flat list of Keras Tensors, as passed to the merge layers.
+      return lambda values: ((list(values),), {})
+
+    flat_arguments = self._flat_arguments
+    kt_indices = [kt_index for _, kt_index in self._keras_inputs_ids_and_indices]
+    structure = (self.call_args, self.call_kwargs)
+
+    def unpack_arguments(values):
+      arguments = copy.copy(flat_arguments)
+      for kt_index, value in zip(kt_indices, values):
+        arguments[kt_index] = value
+      return tf.nest.pack_sequence_as(structure, arguments)
+
+    return unpack_arguments
+
   def serialize(self, make_node_key, node_conversion_map):
     """Serializes `Node` for Functional API's `get_config`."""
     # Serialization still special-cases first argument.
@@ -1005,7 +1005,9 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
             only. Maximum number of processes to spin up
             when using process-based threading. If unspecified, `workers`
             will default to 1. If 0, will execute the generator on the main
-            thread.
+            thread. A `(min_workers, max_workers)` tuple lets the number of
+            active workers adapt to how often the model waits for input, see
+            `tf.keras.utils.SequenceEnqueuer.start`.
         use_multiprocessing: Boolean. Used for generator or
             `keras.utils.Sequence` input only. If `True`, use process-based
             threading. If unspecified, `use_multiprocessing` will default to
@@ -1062,7 +1064,8 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
       # `Tensor` and `NumPy` input.
       (x, y, sample_weight), validation_data = (
           data_adapter.train_validation_split(
-              (x, y, sample_weight), validation_split=validation_split))
+              (x, y, sample_weight), validation_split=validation_split,
+              lazy=True))
 
     if validation_data:
       val_x, val_y, val_sample_weight = (
@@ -33,6 +33,7 @@ from keras.engine.base_preprocessing_layer import PreprocessingLayer
 
 # Image preprocessing layers.
 from keras.layers.preprocessing.image_preprocessing import CenterCrop
+from keras.layers.preprocessing.image_preprocessing import ComposedTransform
 from keras.layers.preprocessing.image_preprocessing import RandomCrop
 from keras.layers.preprocessing.image_preprocessing import RandomFlip
 from keras.layers.preprocessing.image_preprocessing import RandomContrast
@@ -0,0 +1,208 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""A compact binary format for serialized combiner accumulators.
+
+An encoded accumulator is a header followed by named fields:
+
+  header: magic (4 bytes), format version (uint16), number of fields (uint32)
+  field:  name length (uint16), UTF-8 name, kind (uint8), then
+    arrays:  dtype length (uint8), dtype string, rank (uint8), shape (int64
+             each), padding to 8 bytes, then the packed array data.
+    strings: number of strings (int64), padding to 8 bytes, offsets of the
+             strings in the blob (int64 each, plus the end offset), then the
+             blob of the concatenated strings.
+
+All integers are little-endian. Arrays, and the offsets of strings, are read
+back with `np.frombuffer`, without copying them out of the encoded bytes.
+The magic starts with a NUL byte, so an encoded accumulator is never valid
+JSON, which combiners use as a fallback format.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import struct
+
+import numpy as np
+
+_MAGIC = b"\x00KPA"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHI")
+_NAME_LENGTH = struct.Struct("<H")
+_UINT8 = struct.Struct("<B")
+_INT64 = struct.Struct("<q")
+
+# Kinds of fields.
+_ARRAY = 0
+_TEXT = 1
+_BYTES = 2
+
+_ALIGNMENT = 8
+
+
+def is_binary(encoded):
+  """Returns whether `encoded` was encoded by `dumps`."""
+  return bytes(encoded[:len(_MAGIC)]) == _MAGIC
+
+
+def dumps(fields):
+  """Encodes a dict of arrays and string lists to bytes.
+
+  Args:
+    fields: A dict mapping names to values. Values are numeric or boolean
+      arrays or scalars, or sequences (lists or arrays) of either `str` or
+      `bytes` strings.
+
+  Returns:
+    The encoded bytes.
+
+  Raises:
+    TypeError: If a value cannot be encoded.
+  """
+  chunks = [_HEADER.pack(_MAGIC, FORMAT_VERSION, len(fields))]
+  size = _HEADER.size
+  for name, value in fields.items():
+    kind, value = _classify(name, value)
+    encoded_name = name.encode("utf-8")
+    header = [_NAME_LENGTH.pack(len(encoded_name)), encoded_name,
+              _UINT8.pack(kind)]
+    if kind == _ARRAY:
+      dtype = value.dtype.str.encode("ascii")
+      header.extend([_UINT8.pack(len(dtype)), dtype, _UINT8.pack(value.ndim)])
+      header.extend(_INT64.pack(dim) for dim in value.shape)
+      data = [value.tobytes()]
+    else:
+      blob = "".join(value) if kind == _TEXT else b"".join(value)
+      if kind == _TEXT and blob.isascii():
+        blob = blob.encode("ascii")
+      elif kind == _TEXT:
+        value = [v.encode("utf-8") for v in value]
+        blob = b"".join(value)
+      offsets = np.zeros((len(value) + 1,), dtype="<i8")
+      offsets[1:] = np.cumsum(np.fromiter(map(len, value), dtype=np.int64,
+                                          count=len(value)))
+      header.append(_INT64.pack(len(value)))
+      data = [offsets.tobytes(), blob]
+    header = b"".join(header)
+    size += len(header)
+    # The data starts on an aligned offset, for `np.frombuffer`.
+    padding = _padding(size)
+    chunks.extend([header, padding] + data)
+    size += len(padding) + sum(len(d) for d in data)
+
+  return b"".join(chunks)
+
+
+def loads(encoded):
+  """Decodes bytes encoded by `dumps`.
+
+  Args:
+    encoded: A bytes-like object returned by `dumps`.
+
+  Returns:
+    A dict mapping names to values. Arrays are read-only views of `encoded`.
+    Strings are returned as NumPy arrays of `str` or `bytes` objects.
+
+  Raises:
+    ValueError: If `encoded` is not an encoded accumulator, or has a format
+      version more recent than this one.
+  """
+  view = memoryview(encoded)
+  if len(view) < _HEADER.size:
+    raise ValueError("Not a binary accumulator: too short.")
+  magic, version, num_fields = _HEADER.unpack_from(view)
+  if magic != _MAGIC:
+    raise ValueError("Not a binary accumulator.")
+  if version > FORMAT_VERSION:
+    raise ValueError(
+        "The binary accumulator has format version {}, but only versions up to "
+        "{} are supported.".format(version, FORMAT_VERSION))
+
+  offset = _HEADER.size
+  fields = {}
+  for _ in range(num_fields):
+    (name_length,) = _NAME_LENGTH.unpack_from(view, offset)
+    offset += _NAME_LENGTH.size
+    name = view[offset:offset + name_length].tobytes().decode("utf-8")
+    offset += name_length
+    (kind,) = _UINT8.unpack_from(view, offset)
+    offset += _UINT8.size
+
+    if kind == _ARRAY:
+      (dtype_length,) = _UINT8.unpack_from(view, offset)
+      offset += _UINT8.size
+      dtype = np.dtype(view[offset:offset + dtype_length].tobytes().decode())
+      offset += dtype_length
+      (ndim,) = _UINT8.unpack_from(view, offset)
+      offset += _UINT8.size
+      shape = struct.unpack_from("<%dq" % ndim, view, offset)
+      offset += ndim * _INT64.size
+      offset += len(_padding(offset))
+      count = int(np.prod(shape))
+      value = np.frombuffer(view, dtype=dtype, count=count, offset=offset)
+      fields[name] = value.reshape(shape)
+      offset += count * dtype.itemsize
+    elif kind in (_TEXT, _BYTES):
+      (count,) = _INT64.unpack_from(view, offset)
+      offset += _INT64.size
+      offset += len(_padding(offset))
+      offsets = np.frombuffer(view, dtype="<i8", count=count + 1, offset=offset)
+      offset += (count + 1) * _INT64.size
+      blob = view[offset:offset + int(offsets[-1])].tobytes()
+      offset += int(offsets[-1])
+      bounds = zip(offsets[:-1].tolist(), offsets[1:].tolist())
+      if kind == _TEXT and blob.isascii():
+        # Offsets in bytes are offsets in characters, so decode the blob once.
+        blob = blob.decode("ascii")
+        strings = [blob[start:end] for start, end in bounds]
+      elif kind == _TEXT:
+        strings = [blob[start:end].decode("utf-8") for start, end in bounds]
+      else:
+        strings = [blob[start:end] for start, end in bounds]
+      value = np.empty((count,), dtype=object)
+      value[:] = strings
+      fields[name] = value
+    else:
+      raise ValueError("Unknown kind {} for field {}.".format(kind, name))
+  return fields
+
+
+def _classify(name, value):
+  """Returns the kind of a field and its value to encode."""
+  if isinstance(value, np.ndarray) and value.dtype.kind in "US":
+    value = value.tolist()
+  elif isinstance(value, np.ndarray) and value.dtype.kind == "O":
+    value = value.tolist()
+  elif not isinstance(value, (list, tuple)):
+    value = np.asarray(value)
+    if value.dtype.kind not in "biuf":
+      raise TypeError("Cannot encode field {} of dtype {}.".format(
+          name, value.dtype))
+    return _ARRAY, value
+
+  if all(isinstance(v, str) for v in value):
+    return _TEXT, value
+  if all(isinstance(v, bytes) for v in value):
+    return _BYTES, value
+  if all(isinstance(v, (int, float, np.integer, np.floating)) for v in value):
+    return _classify(name, np.array(value))
+  raise TypeError(
+      "Cannot encode field {}: strings must all be str or all be bytes.".format(
+          name))
+
+
+def _padding(size):
+  return b"\x00" * (-size % _ALIGNMENT)
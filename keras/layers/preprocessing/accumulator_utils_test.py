@@ -0,0 +1,86 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the binary accumulator format."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow.compat.v2 as tf
+
+import json
+
+import numpy as np
+from keras.layers.preprocessing import accumulator_utils
+
+
+class AccumulatorUtilsTest(tf.test.TestCase):
+
+  def test_round_trip(self):
+    fields = {
+        "counts": np.array([3, 1, 2], dtype=np.int64),
+        "summary": np.random.random((4, 2)),
+        "num_documents": 7,
+        "flags": np.array([True, False]),
+        "text": np.array([u"hello", u"", u"wörld"]),
+        "bytes": [b"a\x00", b"", b"\xff"],
+        "empty": [],
+    }
+    decoded = accumulator_utils.loads(accumulator_utils.dumps(fields))
+
+    self.assertEqual(list(fields.keys()), list(decoded.keys()))
+    self.assertAllEqual(fields["counts"], decoded["counts"])
+    self.assertEqual(np.int64, decoded["counts"].dtype)
+    self.assertAllEqual(fields["summary"], decoded["summary"])
+    self.assertEqual((), decoded["num_documents"].shape)
+    self.assertEqual(7, int(decoded["num_documents"]))
+    self.assertAllEqual(fields["flags"], decoded["flags"])
+    self.assertEqual([u"hello", u"", u"wörld"], decoded["text"].tolist())
+    self.assertEqual([b"a\x00", b"", b"\xff"], decoded["bytes"].tolist())
+    self.assertEqual([], decoded["empty"].tolist())
+
+  def test_arrays_are_not_copied(self):
+    encoded = accumulator_utils.dumps({
+        "name": ["a", "bc"],
+        "counts": np.arange(10, dtype=np.int64),
+    })
+    counts = accumulator_utils.loads(encoded)["counts"]
+    self.assertFalse(counts.flags.owndata)
+    self.assertFalse(counts.flags.writeable)
+    self.assertEqual(0, counts.ctypes.data % 8)
+
+  def test_is_binary(self):
+    self.assertTrue(
+        accumulator_utils.is_binary(accumulator_utils.dumps({"a": 1})))
+    self.assertFalse(
+        accumulator_utils.is_binary(tf.compat.as_bytes(json.dumps({"a": 1}))))
+
+  def test_mixed_strings_fail(self):
+    with self.assertRaisesRegex(TypeError, "all be str or all be bytes"):
+      accumulator_utils.dumps({"vocab": ["a", b"b"]})
+
+  def test_newer_version_fails(self):
+    encoded = bytearray(accumulator_utils.dumps({"a": 1}))
+    encoded[4] = accumulator_utils.FORMAT_VERSION + 1
+    with self.assertRaisesRegex(ValueError, "format version"):
+      accumulator_utils.loads(bytes(encoded))
+
+  def test_not_binary_fails(self):
+    with self.assertRaisesRegex(ValueError, "Not a binary accumulator"):
+      accumulator_utils.loads(b'{"vocab": []}')
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -26,6 +26,7 @@ import numpy as np
 
 import keras
 from keras.layers.preprocessing import category_crossing
+from keras.layers.preprocessing import hashing
 
 tf.compat.v1.enable_v2_behavior()
 
@@ -99,6 +100,55 @@ class BenchmarkLayer(tf.test.Benchmark):
     self.report_benchmark(
         iters=num_repeats, wall_time=avg_time, extras=extras, name=name)
 
+  def _run_crossing(self, fn, inputs, num_repeats):
+    fn = tf.function(fn)
+    _ = fn(inputs)
+    starts = []
+    ends = []
+    for _ in range(num_repeats):
+      starts.append(time.time())
+      _ = fn(inputs)
+      ends.append(time.time())
+    return np.mean(np.array(ends) - np.array(starts))
+
+  def bm_hashed_crossing(self, batch_size, num_inputs, ragged):
+    """Compares hashed crossing with hashing the crossed strings."""
+    num_repeats = 10
+    num_bins = 2**20
+    inputs = []
+    for _ in range(num_inputs):
+      # High-cardinality string features, with 1 to 4 values per example.
+      values = tf.strings.as_string(
+          np.random.randint(0, 10**9, (batch_size * 4,)))
+      row_lengths = np.random.randint(1, 5, (batch_size,))
+      values = values[:int(np.sum(row_lengths))]
+      inp = tf.RaggedTensor.from_row_lengths(values, row_lengths)
+      inputs.append(inp if ragged else inp.to_sparse())
+
+    hashed_layer = category_crossing.CategoryCrossing(num_bins=num_bins)
+    avg_time = self._run_crossing(hashed_layer, inputs, num_repeats)
+
+    crossing_layer = category_crossing.CategoryCrossing()
+    hashing_layer = hashing.Hashing(num_bins=num_bins)
+    baseline = self._run_crossing(
+        lambda x: hashing_layer(crossing_layer(x)), inputs, num_repeats)
+
+    name = "hashed_category_crossing|batch_%s|%s_inputs|%s" % (
+        batch_size, num_inputs, "ragged" if ragged else "sparse")
+    extras = {
+        "crossing and hashing baseline": baseline,
+        "delta seconds": (baseline - avg_time),
+        "delta percent": ((baseline - avg_time) / baseline) * 100
+    }
+    self.report_benchmark(
+        iters=num_repeats, wall_time=avg_time, extras=extras, name=name)
+
+  def benchmark_hashed_crossing(self):
+    for ragged in [False, True]:
+      for num_inputs in [2, 3]:
+        for batch in [256, 4096]:
+          self.bm_hashed_crossing(batch, num_inputs, ragged)
+
   def benchmark_vocab_size_by_batch(self):
     for batch in [32, 64, 256]:
       self.bm_layer_implementation(batch_size=batch)
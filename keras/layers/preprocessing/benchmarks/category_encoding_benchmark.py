@@ -65,6 +65,67 @@ class BenchmarkLayer(tf.test.Benchmark):
         batch_size, sequence_length, max_tokens)
     self.report_benchmark(iters=num_repeats, wall_time=avg_time, name=name)
 
+  def _output_bytes(self, output):
+    if isinstance(output, tf.SparseTensor):
+      return (output.indices.numpy().nbytes + output.values.numpy().nbytes +
+              output.dense_shape.numpy().nbytes)
+    return output.numpy().nbytes
+
+  def bm_sparse_output(self, output_mode, batch_size, num_tokens, sparse):
+    """Measures a weighted encoding consumed by a `Dense` layer."""
+    sequence_length = 10
+    num_repeats = 5
+    inputs = tf.random.uniform([batch_size, sequence_length],
+                               minval=0,
+                               maxval=num_tokens - 1,
+                               dtype=tf.int32)
+    layer = category_encoding.CategoryEncoding(
+        num_tokens=num_tokens, output_mode="count", sparse=sparse)
+    idf_weights = tf.random.uniform([num_tokens])
+    dense_layer = keras.layers.Dense(4)
+
+    def encode(x):
+      output = layer(x)
+      if output_mode == "tf-idf" and sparse:
+        output = category_encoding.sparse_tf_idf(output, idf_weights)
+      elif output_mode == "tf-idf":
+        output = tf.multiply(output, idf_weights)
+      return output
+
+    output_bytes = self._output_bytes(encode(inputs))
+    fn = tf.function(lambda x: dense_layer(encode(x)))
+    _ = fn(inputs)
+
+    has_gpu = bool(tf.config.list_logical_devices("GPU"))
+    if has_gpu:
+      tf.config.experimental.reset_memory_stats("GPU:0")
+    starts = []
+    ends = []
+    for _ in range(num_repeats):
+      starts.append(time.time())
+      _ = fn(inputs).numpy()
+      ends.append(time.time())
+    avg_time = np.mean(np.array(ends) - np.array(starts))
+
+    extras = {"encoded bytes": output_bytes}
+    if has_gpu:
+      extras["peak gpu bytes"] = tf.config.experimental.get_memory_info(
+          "GPU:0")["peak"]
+    name = "category_encoding_memory|%s|batch_%s|%s_tokens|%s" % (
+        output_mode, batch_size, num_tokens, "sparse" if sparse else "dense")
+    self.report_benchmark(
+        iters=num_repeats, wall_time=avg_time, extras=extras, name=name)
+
+  def benchmark_sparse_output_memory(self):
+    for output_mode in ["count", "tf-idf"]:
+      for num_tokens in [10**4, 10**6]:
+        for sparse in [True, False]:
+          self.bm_sparse_output(
+              output_mode, batch_size=64, num_tokens=num_tokens, sparse=sparse)
+    # The dense output would not fit in memory here.
+    self.bm_sparse_output("tf-idf", batch_size=1024, num_tokens=10**7,
+                          sparse=True)
+
   def benchmark_vocab_size_by_batch(self):
     for batch in [32, 256, 2048]:
       for sequence_length in [10, 1000]:
@@ -46,7 +46,7 @@ class BenchmarkAdapt(tf.test.Benchmark):
 
   def run_dataset_implementation(self, num_elements, batch_size):
     input_t = keras.Input(shape=(1,))
-    layer = discretization.Discretization()
+    layer = discretization.Discretization(bins=100, epsilon=EPSILON)
     _ = layer(input_t)
 
     num_repeats = 5
@@ -73,7 +73,7 @@ class BenchmarkAdapt(tf.test.Benchmark):
   def bm_adapt_implementation(self, num_elements, batch_size):
     """Test the KPL adapt implementation."""
     input_t = keras.Input(shape=(1,), dtype=tf.float32)
-    layer = discretization.Discretization()
+    layer = discretization.Discretization(bins=100, epsilon=EPSILON)
     _ = layer(input_t)
 
     num_repeats = 5
@@ -103,6 +103,46 @@ class BenchmarkAdapt(tf.test.Benchmark):
     self.report_benchmark(
         iters=num_repeats, wall_time=avg_time, extras=extras, name=name)
 
+  def bm_sketch(self, num_elements, num_features, batch_size):
+    """Test the quantile sketch against merging the summaries of batches."""
+    data = np.random.standard_normal((num_elements, num_features))
+    batches = np.array_split(data, num_elements // batch_size)
+
+    start = time.time()
+    for feature in range(num_features):
+      state = (np.zeros((1, 2)),)
+      for batch in batches:
+        state = reduce_fn(state, batch[:, feature])
+    baseline = time.time() - start
+
+    start = time.time()
+    sketch = discretization.QuantileSketch(
+        k=int(np.ceil(4 / EPSILON)), num_features=num_features)
+    for batch in batches:
+      sketch.update(batch)
+    summary = sketch.summaries()[0]
+    sketch_time = time.time() - start
+
+    quantiles = np.linspace(0.01, 0.99, 99)
+    estimates = np.interp(quantiles, summary[:, 1].cumsum() / num_elements,
+                          summary[:, 0])
+    ranks = np.searchsorted(np.sort(data[:, 0]), estimates) / num_elements
+    name = "discretization_sketch|%s_elements|%s_features|batch_%s" % (
+        num_elements, num_features, batch_size)
+    extras = {
+        "summaries baseline": baseline,
+        "speedup": baseline / sketch_time,
+        "sketch values per feature": summary.shape[0],
+        "max rank error": float(np.max(np.abs(ranks - quantiles))),
+    }
+    self.report_benchmark(
+        iters=1, wall_time=sketch_time, extras=extras, name=name)
+
+  def benchmark_sketch_by_num_features(self):
+    for num_features in [1, 16, 128]:
+      for batch in [1024, 16 * 1024]:
+        self.bm_sketch(100000, num_features, batch)
+
   def benchmark_vocab_size_by_batch(self):
     for vocab_size in [100, 1000, 10000, 100000, 1000000]:
       for batch in [64 * 2048]:
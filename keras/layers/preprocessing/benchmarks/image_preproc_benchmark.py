@@ -143,6 +143,49 @@ class BenchmarkLayer(tf.test.Benchmark):
     self.report_benchmark(
         iters=num_repeats, wall_time=avg_time, extras=extras, name=name)
 
+  def _run_augmentation(self, augmentation, images, num_repeats):
+    fn = tf.function(lambda x: augmentation(x, training=True))
+    _ = fn(images)
+    starts = []
+    ends = []
+    for _ in range(num_repeats):
+      starts.append(time.time())
+      _ = fn(images).numpy()
+      ends.append(time.time())
+    return np.mean(np.array(ends) - np.array(starts))
+
+  def bm_composed_transform(self, batch_size):
+    """Compares the geometric augmentation stack with a single resampling."""
+    num_repeats = 10
+    images = tf.constant(
+        np.random.random((batch_size, 224, 224, 3)), dtype=tf.float32)
+
+    def augmentation_layers():
+      return [
+          image_preprocessing.RandomRotation(factor=(.2, .4)),
+          image_preprocessing.RandomFlip(mode="horizontal"),
+          image_preprocessing.RandomTranslation(.1, .1),
+          image_preprocessing.RandomZoom(.2, .2)
+      ]
+
+    composed = image_preprocessing.ComposedTransform(augmentation_layers())
+    avg_time = self._run_augmentation(composed, images, num_repeats)
+    stacked = keras.Sequential(augmentation_layers())
+    baseline = self._run_augmentation(stacked, images, num_repeats)
+
+    name = "composed_transform|batch_%s" % batch_size
+    extras = {
+        "sequential layers baseline": baseline,
+        "delta seconds": (baseline - avg_time),
+        "delta percent": ((baseline - avg_time) / baseline) * 100
+    }
+    self.report_benchmark(
+        iters=num_repeats, wall_time=avg_time, extras=extras, name=name)
+
+  def benchmark_composed_transform_by_batch(self):
+    for batch in [32, 64, 256]:
+      self.bm_composed_transform(batch_size=batch)
+
   def benchmark_vocab_size_by_batch(self):
     for batch in [32, 64, 256]:
       self.bm_layer_implementation(batch_size=batch)
@@ -21,6 +21,7 @@ import tensorflow.compat.v2 as tf
 
 import collections
 import itertools
+import operator
 import random
 import string
 import time
@@ -56,6 +57,24 @@ def get_top_k(dataset, k):
   return sorted_vocab
 
 
+def get_top_k_per_token(dataset, k):
+  """Counts tokens one at a time, as `IndexLookup.adapt` used to."""
+  counts = collections.defaultdict(int)
+  for tensor in dataset:
+    for document in tensor.numpy().tolist():
+      for token in document:
+        counts[token] += 1
+  sorted_counts = sorted(
+      counts.items(), key=operator.itemgetter(1, 0), reverse=True)
+  return [token for token, _ in sorted_counts[:k]]
+
+
+def zipf_documents(num_documents, document_length, num_unique):
+  """Returns documents of words with a Zipfian distribution, as in text."""
+  ids = np.random.zipf(1.1, size=(num_documents, document_length)) % num_unique
+  return np.char.add("word_", ids.astype(str))
+
+
 class BenchmarkAdapt(tf.test.Benchmark):
   """Benchmark adapt."""
 
@@ -115,6 +134,84 @@ class BenchmarkAdapt(tf.test.Benchmark):
     self.report_benchmark(
         iters=num_repeats, wall_time=avg_time, extras=extras, name=name)
 
+  def bm_adapt_documents(self, num_documents, k, approximate_adapt,
+                         num_workers=1):
+    """Test adapt on a batched dataset of Zipfian documents."""
+    data = zipf_documents(num_documents, 64, 10 * k)
+    batched_ds = tf.data.Dataset.from_tensor_slices(data).batch(1024)
+    layer = index_lookup.IndexLookup(
+        max_tokens=k,
+        num_oov_indices=0,
+        mask_token=None,
+        oov_token="OOV",
+        approximate_adapt=approximate_adapt,
+        dtype=tf.string)
+    layer.compile(num_workers=num_workers)
+
+    start = time.time()
+    get_top_k_per_token(batched_ds, k)
+    baseline = time.time() - start
+    start = time.time()
+    layer.adapt(batched_ds)
+    avg_time = time.time() - start
+
+    num_tokens = data.size
+    name = "index_lookup_adapt_documents|%s_tokens|vocab_size_%s|%s|%s" % (
+        num_tokens, k, "approximate" if approximate_adapt else "exact",
+        "%s_workers" % num_workers)
+    extras = {
+        "per-token baseline": baseline,
+        "speedup": baseline / avg_time,
+        "tokens per second": num_tokens / avg_time,
+    }
+    self.report_benchmark(iters=1, wall_time=avg_time, extras=extras, name=name)
+
+  def bm_incremental_adapt(self, num_days, documents_per_day, k):
+    """Test a daily delta adapt against a full adapt over all the days."""
+    days = [
+        zipf_documents(documents_per_day, 64, 10 * k) for _ in range(num_days)
+    ]
+    history = tf.data.Dataset.from_tensor_slices(
+        np.concatenate(days[:-1])).batch(1024)
+    delta = tf.data.Dataset.from_tensor_slices(days[-1]).batch(1024)
+    layer = index_lookup.IndexLookup(
+        max_tokens=k,
+        num_oov_indices=1,
+        mask_token=None,
+        oov_token="OOV",
+        dtype=tf.string)
+    layer.adapt(history)
+
+    start = time.time()
+    layer.adapt(history.concatenate(delta))
+    full_time = time.time() - start
+    layer.adapt(history)
+    start = time.time()
+    layer.adapt(delta, reset_state=False)
+    delta_time = time.time() - start
+
+    name = "index_lookup_incremental_adapt|%s_days|%s_tokens_per_day|%s" % (
+        num_days, days[-1].size, "vocab_size_%s" % k)
+    extras = {
+        "full adapt baseline": full_time,
+        "speedup": full_time / delta_time,
+    }
+    self.report_benchmark(
+        iters=1, wall_time=delta_time, extras=extras, name=name)
+
+  def benchmark_daily_delta_by_num_days(self):
+    for num_days in [7, 30]:
+      self.bm_incremental_adapt(num_days, 10000, 100000)
+
+  def benchmark_documents_by_vocab_size(self):
+    for k in [1000, 100000]:
+      for approximate_adapt in [False, True]:
+        self.bm_adapt_documents(100000, k, approximate_adapt)
+
+  def benchmark_documents_by_num_workers(self):
+    for num_workers in [1, 2, 4, 8]:
+      self.bm_adapt_documents(400000, 100000, False, num_workers=num_workers)
+
   def benchmark_vocab_size_by_batch(self):
     for vocab_size in [100, 1000, 10000, 100000, 1000000]:
       for batch in [1, 16, 2048]:
@@ -0,0 +1,75 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark for creating a StringLookup layer from a vocabulary file."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow.compat.v2 as tf
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+from keras.layers.preprocessing import string_lookup
+
+tf.compat.v1.enable_v2_behavior()
+
+
+class BenchmarkColdStart(tf.test.Benchmark):
+  """Benchmark the creation of a layer and its first lookups."""
+
+  def _write_vocabulary(self, vocab_size):
+    vocab_path = os.path.join(tempfile.mkdtemp(), "vocab_%s.txt" % vocab_size)
+    with tf.io.gfile.GFile(vocab_path, "w") as writer:
+      for i in range(vocab_size):
+        writer.write("token_%d\n" % i)
+    return vocab_path
+
+  def bm_cold_start(self, vocab_size, lazy_vocabulary_file):
+    vocab_path = self._write_vocabulary(vocab_size)
+
+    # Only the memory allocated by Python is traced, not that of the table.
+    tracemalloc.start()
+    start = time.time()
+    layer = string_lookup.StringLookup(
+        vocabulary=vocab_path, lazy_vocabulary_file=lazy_vocabulary_file)
+    layer(tf.constant(["token_0", "unknown"]))
+    init_time = time.time() - start
+    start = time.time()
+    vocab = layer.get_vocabulary()
+    _ = vocab[len(vocab) // 2]
+    vocabulary_time = time.time() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    name = "string_lookup_cold_start|vocab_size_%s|%s" % (
+        vocab_size, "lazy" if lazy_vocabulary_file else "eager")
+    extras = {
+        "get_vocabulary seconds": vocabulary_time,
+        "peak python memory MB": peak_memory / 2**20,
+    }
+    self.report_benchmark(
+        iters=1, wall_time=init_time, extras=extras, name=name)
+
+  def benchmark_vocab_size(self):
+    for vocab_size in [10000, 1000000, 20000000]:
+      for lazy_vocabulary_file in [False, True]:
+        self.bm_cold_start(vocab_size, lazy_vocabulary_file)
+
+
+if __name__ == "__main__":
+  tf.test.main()
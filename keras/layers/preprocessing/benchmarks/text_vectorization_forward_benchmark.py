@@ -0,0 +1,108 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark for the forward pass of the TextVectorization layer."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow.compat.v2 as tf
+
+import random
+import string
+import time
+
+import numpy as np
+
+from keras.layers.preprocessing import text_vectorization
+
+tf.compat.v1.enable_v2_behavior()
+
+_VOCAB_SIZE = 10000
+_OUTPUT_SEQUENCE_LENGTH = 64
+
+
+def get_vocab():
+  return ["token%d" % i for i in range(_VOCAB_SIZE)]
+
+
+# text_gen creates texts of random vocabulary and OOV tokens, in mixed case
+# and with punctuation to strip.
+def text_gen(batch, num_tokens):
+  texts = []
+  for _ in range(batch):
+    tokens = []
+    for _ in range(num_tokens):
+      token = "Token%d" % random.randint(0, 2 * _VOCAB_SIZE)
+      tokens.append(token + random.choice(string.punctuation + "  "))
+    texts.append(" ".join(tokens))
+  return tf.constant(texts)
+
+
+def standardize(inputs):
+  """The default standardization, as a callable that disables fusing."""
+  return tf.strings.regex_replace(
+      tf.strings.lower(inputs), text_vectorization.DEFAULT_STRIP_REGEX, "")
+
+
+class BenchmarkTextVectorization(tf.test.Benchmark):
+  """Benchmark the fused default configuration against the op chain."""
+
+  def _run_layer(self, layer, data, num_repeats):
+    fn = tf.function(layer)
+    _ = fn(data)
+    starts = []
+    ends = []
+    for _ in range(num_repeats):
+      starts.append(time.time())
+      out = fn(data)
+      ends.append(time.time())
+    return np.mean(np.array(ends) - np.array(starts)), out
+
+  def bm_forward(self, num_tokens, batch_size):
+    num_repeats = 10
+    data = text_gen(batch_size, num_tokens)
+    fused_layer = text_vectorization.TextVectorization(
+        output_sequence_length=_OUTPUT_SEQUENCE_LENGTH,
+        vocabulary=get_vocab())
+    avg_time, fused_out = self._run_layer(fused_layer, data, num_repeats)
+
+    unfused_layer = text_vectorization.TextVectorization(
+        standardize=standardize,
+        output_sequence_length=_OUTPUT_SEQUENCE_LENGTH,
+        vocabulary=get_vocab())
+    baseline, unfused_out = self._run_layer(unfused_layer, data, num_repeats)
+    assert np.array_equal(fused_out.numpy(), unfused_out.numpy())
+
+    extras = {
+        "unfused baseline": baseline,
+        "delta seconds": (baseline - avg_time),
+        "delta percent": ((baseline - avg_time) / baseline) * 100
+    }
+    name = "text_vectorization_forward|%s_tokens|batch_%s" % (num_tokens,
+                                                               batch_size)
+    self.report_benchmark(
+        iters=num_repeats, wall_time=avg_time, extras=extras, name=name)
+
+  def benchmark_short_texts(self):
+    for batch in [1, 256, 4096]:
+      self.bm_forward(8, batch)
+
+  def benchmark_long_texts(self):
+    for batch in [1, 256, 1024]:
+      self.bm_forward(1000, batch)
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -55,6 +55,18 @@ class CategoryCrossing(base_preprocessing_layer.PreprocessingLayer):
            [b'b-e'],
            [b'c-f']], dtype=object)>
 
+  Hashed crossing: if `num_bins` is set, the layer hashes each input value and
+  combines the hashes of the values in a cross, without building the crossed
+  strings. This is equivalent, up to the hash function, to a `Hashing` layer
+  applied to the string output, and much faster for high-cardinality crosses.
+
+  >>> inp_1 = ['a', 'b', 'c']
+  >>> inp_2 = ['d', 'e', 'f']
+  >>> layer = tf.keras.layers.experimental.preprocessing.CategoryCrossing(
+  ...    num_bins=5)
+  >>> layer([inp_1, inp_2]).dtype
+  tf.int64
+
   Args:
     depth: depth of input crossing. By default None, all inputs are crossed into
       one output. It can also be an int or tuple/list of ints. Passing an
@@ -66,15 +78,20 @@ class CategoryCrossing(base_preprocessing_layer.PreprocessingLayer):
       inputs. For example, with inputs `a`, `b` and `c`, `depth=2` means the
       output will be [a;b;c;cross(a, b);cross(bc);cross(ca)].
     separator: A string added between each input being joined. Defaults to
-      '_X_'.
+      '_X_'. Unused if `num_bins` is set.
+    num_bins: Number of hash bins of hashed crossing. Defaults to None, meaning
+      the crossed features are output as strings.
+    hash_key: An integer, the key of the hash function that combines the
+      hashes of the inputs of hashed crossing. Defaults to None, meaning a
+      fixed default key. Only used if `num_bins` is set.
     name: Name to give to the layer.
     **kwargs: Keyword arguments to construct a layer.
 
   Input shape: a list of string or int tensors or sparse tensors of shape
     `[batch_size, d1, ..., dm]`
 
-  Output shape: a single string or int tensor or sparse tensor of shape
-    `[batch_size, d1, ..., dm]`
+  Output shape: a single string tensor or sparse tensor of shape
+    `[batch_size, d1, ..., dm]`, or an int64 one if `num_bins` is set.
 
   Returns:
     If any input is `RaggedTensor`, the output is `RaggedTensor`.
@@ -106,12 +123,23 @@ class CategoryCrossing(base_preprocessing_layer.PreprocessingLayer):
     `[[b'1_X_2_X_3'], [b'4_X_5_X_6']]`
   """
 
-  def __init__(self, depth=None, name=None, separator='_X_', **kwargs):
+  def __init__(self,
+               depth=None,
+               name=None,
+               separator='_X_',
+               num_bins=None,
+               hash_key=None,
+               **kwargs):
+    if num_bins is not None and num_bins <= 0:
+      raise ValueError('`num_bins` must be None or positive, got {}'.format(
+          num_bins))
     super(CategoryCrossing, self).__init__(name=name, **kwargs)
     base_preprocessing_layer.keras_kpl_gauge.get_cell(
         'CategoryCrossing').set(True)
     self.depth = depth
     self.separator = separator
+    self.num_bins = num_bins
+    self.hash_key = hash_key
     if isinstance(depth, (tuple, list)):
       self._depth_tuple = depth
     elif depth is not None:
@@ -119,6 +147,9 @@ class CategoryCrossing(base_preprocessing_layer.PreprocessingLayer):
 
   def partial_crossing(self, partial_inputs, ragged_out, sparse_out):
     """Gets the crossed output from a partial list/tuple of inputs."""
+    if self.num_bins is not None:
+      return self._partial_hashed_crossing(partial_inputs, ragged_out,
+                                           sparse_out)
     # If ragged_out=True, convert output from sparse to ragged.
     if ragged_out:
       # TODO(momernick): Support separator with ragged_cross.
@@ -132,6 +163,17 @@ class CategoryCrossing(base_preprocessing_layer.PreprocessingLayer):
       return tf.sparse.to_dense(
           tf.sparse.cross(partial_inputs, separator=self.separator))
 
+  def _partial_hashed_crossing(self, partial_inputs, ragged_out, sparse_out):
+    """Gets the hashed crossed output from a partial list/tuple of inputs."""
+    if ragged_out:
+      return tf.ragged.cross_hashed(
+          partial_inputs, num_buckets=self.num_bins, hash_key=self.hash_key)
+    output = tf.sparse.cross_hashed(
+        partial_inputs, num_buckets=self.num_bins, hash_key=self.hash_key)
+    if sparse_out:
+      return output
+    return tf.sparse.to_dense(output)
+
   def _preprocess_input(self, inp):
     if isinstance(inp, (list, tuple, np.ndarray)):
       inp = tf.convert_to_tensor(inp)
@@ -181,21 +223,24 @@ class CategoryCrossing(base_preprocessing_layer.PreprocessingLayer):
   def compute_output_signature(self, input_spec):
     input_shapes = [x.shape for x in input_spec]
     output_shape = self.compute_output_shape(input_shapes)
+    output_dtype = tf.string if self.num_bins is None else tf.int64
     if any(
         isinstance(inp_spec, tf.RaggedTensorSpec)
         for inp_spec in input_spec):
-      return tf.TensorSpec(shape=output_shape, dtype=tf.string)
+      return tf.TensorSpec(shape=output_shape, dtype=output_dtype)
     elif any(
         isinstance(inp_spec, tf.SparseTensorSpec)
         for inp_spec in input_spec):
       return tf.SparseTensorSpec(
-          shape=output_shape, dtype=tf.string)
-    return tf.TensorSpec(shape=output_shape, dtype=tf.string)
+          shape=output_shape, dtype=output_dtype)
+    return tf.TensorSpec(shape=output_shape, dtype=output_dtype)
 
   def get_config(self):
     config = {
         'depth': self.depth,
         'separator': self.separator,
+        'num_bins': self.num_bins,
+        'hash_key': self.hash_key,
     }
     base_config = super(CategoryCrossing, self).get_config()
     return dict(list(base_config.items()) + list(config.items()))
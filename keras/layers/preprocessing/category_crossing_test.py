@@ -237,6 +237,69 @@ class CategoryCrossingTest(keras_parameterized.TestCase):
     self.assertEqual(output_spec.shape.dims[0], input_shapes[0].dims[0])
     self.assertEqual(output_spec.dtype, tf.string)
 
+  def test_hashed_crossing_sparse_inputs(self):
+    layer = category_crossing.CategoryCrossing(num_bins=10)
+    inputs_0 = tf.SparseTensor(
+        indices=[[0, 0], [1, 0], [1, 1]],
+        values=['a', 'b', 'c'],
+        dense_shape=[2, 2])
+    inputs_1 = tf.SparseTensor(
+        indices=[[0, 1], [1, 2]], values=['d', 'e'], dense_shape=[2, 3])
+    output = layer([inputs_0, inputs_1])
+    expected_output = tf.sparse.cross_hashed([inputs_0, inputs_1],
+                                             num_buckets=10)
+    self.assertEqual(tf.int64, output.dtype)
+    self.assertAllClose(np.asarray([[0, 0], [1, 0], [1, 1]]), output.indices)
+    self.assertAllEqual(expected_output.values, output.values)
+
+  def test_hashed_crossing_matches_across_input_types(self):
+    dense_inputs = [
+        tf.constant([['a'], ['b'], ['c']]),
+        tf.constant([['d'], ['e'], ['f']]),
+        tf.constant([['g'], ['h'], ['i']]),
+    ]
+    layer = category_crossing.CategoryCrossing(
+        depth=(2, 3), num_bins=1000, hash_key=7)
+    dense_output = layer(dense_inputs)
+    sparse_output = layer([tf.sparse.from_dense(inp) for inp in dense_inputs])
+    ragged_output = layer(
+        [tf.RaggedTensor.from_tensor(inp) for inp in dense_inputs])
+    self.assertAllEqual([3, 4], dense_output.shape)
+    self.assertAllEqual(dense_output, tf.sparse.to_dense(sparse_output))
+    self.assertAllEqual(dense_output, ragged_output.to_tensor())
+    self.assertAllInRange(dense_output, 0, 999)
+
+  def test_hashed_crossing_ragged_inputs(self):
+    inputs_0 = tf.ragged.constant(
+        [['omar', 'skywalker'], ['marlo']],
+        dtype=tf.string)
+    inputs_1 = tf.ragged.constant(
+        [['a'], ['b']],
+        dtype=tf.string)
+    inp_0_t = input_layer.Input(shape=(None,), ragged=True, dtype=tf.string)
+    inp_1_t = input_layer.Input(shape=(None,), ragged=True, dtype=tf.string)
+
+    hashed_layer = category_crossing.CategoryCrossing(num_bins=100)
+    out_t = hashed_layer([inp_0_t, inp_1_t])
+    model = training.Model(inputs=[inp_0_t, inp_1_t], outputs=out_t)
+    expected_output = tf.ragged.cross_hashed([inputs_0, inputs_1],
+                                             num_buckets=100)
+    self.assertAllEqual(expected_output, model.predict([inputs_0, inputs_1]))
+
+  def test_hashed_crossing_compute_output_signature(self):
+    input_specs = [
+        tf.SparseTensorSpec(tf.TensorShape([2, 2]), tf.string),
+        tf.TensorSpec(tf.TensorShape([2, 3]), tf.string),
+    ]
+    layer = category_crossing.CategoryCrossing(num_bins=10)
+    output_spec = layer.compute_output_signature(input_specs)
+    self.assertIsInstance(output_spec, tf.SparseTensorSpec)
+    self.assertEqual(output_spec.dtype, tf.int64)
+
+  def test_non_positive_num_bins_fails(self):
+    with self.assertRaisesRegex(ValueError, '`num_bins` must be None or'):
+      category_crossing.CategoryCrossing(num_bins=0)
+
   @testing_utils.run_v2_only
   def test_config_with_custom_name(self):
     layer = category_crossing.CategoryCrossing(depth=2, name='hashing')
@@ -249,6 +312,12 @@ class CategoryCrossingTest(keras_parameterized.TestCase):
     layer_1 = category_crossing.CategoryCrossing.from_config(config)
     self.assertEqual(layer_1.name, layer.name)
 
+    layer = category_crossing.CategoryCrossing(num_bins=10, hash_key=7)
+    config = layer.get_config()
+    layer_1 = category_crossing.CategoryCrossing.from_config(config)
+    self.assertEqual(10, layer_1.num_bins)
+    self.assertEqual(7, layer_1.hash_key)
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -199,6 +199,26 @@ def sparse_bincount(inputs, out_depth, binary_output, count_weights=None):
   return result
 
 
+def sparse_tf_idf(bincounts, idf_weights):
+  """Weights the counts of a sparse tensor from `sparse_bincount` by idf.
+
+  Only the nonzero counts are weighted, so the output is never densified.
+
+  Args:
+    bincounts: A `SparseTensor` of token counts, of shape `[batch, depth]`.
+    idf_weights: A 1D tensor of inverse document frequencies, of at least
+      `depth` elements.
+
+  Returns:
+    A `SparseTensor` with the same indices as `bincounts`.
+  """
+  weights = tf.gather(idf_weights, bincounts.indices[:, -1])
+  return tf.SparseTensor(
+      indices=bincounts.indices,
+      values=bincounts.values * tf.cast(weights, bincounts.values.dtype),
+      dense_shape=bincounts.dense_shape)
+
+
 def dense_bincount(inputs, out_depth, binary_output, count_weights=None):
   """Apply binary or count encoding to an input."""
   result = tf.math.bincount(
@@ -255,6 +255,23 @@ class CategoryEncodingInputTest(keras_parameterized.TestCase,
     model = keras.Model(inputs=input_data, outputs=output_data)
     _ = model.predict(input_array, steps=1)
 
+  def test_sparse_tf_idf(self):
+    input_array = tf.constant([[1, 2, 2], [3, 3, 0]])
+    # The output is never densified, so a large depth is cheap.
+    num_tokens = 10**8
+    idf_weights = tf.constant([.5, .25, .75, .6])
+    # pyformat: disable
+    expected_indices = [[0, 1], [0, 2], [1, 0], [1, 3]]
+    expected_values = [.25, 1.5, .5, 1.2]
+    # pyformat: enable
+
+    bincounts = category_encoding.sparse_bincount(
+        input_array, num_tokens, binary_output=False)
+    output = category_encoding.sparse_tf_idf(bincounts, idf_weights)
+    self.assertAllEqual(expected_indices, output.indices)
+    self.assertAllClose(expected_values, output.values)
+    self.assertAllEqual([2, num_tokens], output.dense_shape)
+
   def test_dense_oov_input(self):
     input_array = tf.constant([[0, 1, 2], [2, 3, 1]])
     num_tokens = 3
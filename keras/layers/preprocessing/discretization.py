@@ -20,18 +20,21 @@ from __future__ import print_function
 
 import tensorflow.compat.v2 as tf
 
-import collections
-import json
-
 import numpy as np
 from keras import backend as K
 from keras.engine import base_preprocessing_layer
 from keras.engine.base_preprocessing_layer import Combiner
+from keras.layers.preprocessing import accumulator_utils
 from keras.utils import tf_utils
 from tensorflow.python.util.tf_export import keras_export
 
 
 _BINS_NAME = "bins"
+# The rank error of a sketch of size `k` is about 1.7 / k, so this keeps it
+# below `epsilon / 2`.
+_SKETCH_K_PER_EPSILON = 4
+# Seeds the sketches, so that adapting on the same data gives the same bins.
+_SKETCH_SEED = 0
 
 
 def summarize(values, epsilon):
@@ -125,6 +128,105 @@ def get_bucket_boundaries(summary, num_bins):
   return compress(summary, 1.0 / num_bins)[:-1, 0]
 
 
+class QuantileSketch(object):
+  """A mergeable sketch of the quantiles of one or more features.
+
+  This is a KLL sketch (Karnin, Lang and Liberty, "Optimal Quantile
+  Approximation in Streams", 2016). Values are buffered in compactors of
+  increasing weight: when the compactors are full, the lowest full compactor
+  is sorted, and every other value, starting at a random offset, is promoted to
+  the next compactor with twice the weight. The sketch holds at most about
+  `3 * k` values per feature, whatever the number of values added to it, and
+  estimates ranks with an error of about `1.7 / k` of the number of values,
+  with a probability of 99%. Sketches of distinct data merge into a sketch of
+  their union with the same guarantee.
+
+  All the features of a sketch are updated with the same number of values, so
+  the compactors of all the features have the same sizes and are updated
+  together, as the rows of 2-D arrays.
+
+  Args:
+    k: Size of the largest compactor, which sets the accuracy of the sketch.
+    num_features: Number of features to sketch.
+    seed: Seed of the random choices of the compactions, so that sketching the
+      same values in the same order gives the same sketch.
+  """
+
+  def __init__(self, k, num_features=1, seed=None):
+    self.k = k
+    self.num_features = num_features
+    self.num_values = 0
+    # `compactors[h]` holds the values of weight 2**h of each feature.
+    self.compactors = [np.zeros((num_features, 0))]
+    self._random = np.random.RandomState(seed)
+
+  def update(self, values):
+    """Adds a 2-D array of values, with one column per feature."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 2 or values.shape[1] != self.num_features:
+      raise ValueError("Expected values of shape (None, {}), got {}.".format(
+          self.num_features, values.shape))
+    self.num_values += values.shape[0]
+    self.compactors[0] = np.concatenate((self.compactors[0], values.T), axis=1)
+    self._compress()
+
+  def merge(self, other):
+    """Adds the values of sketch `other` to this sketch."""
+    if other.num_features != self.num_features:
+      raise ValueError("Cannot merge sketches of {} and {} features.".format(
+          self.num_features, other.num_features))
+    self.num_values += other.num_values
+    for height, compactor in enumerate(other.compactors):
+      if height == len(self.compactors):
+        self.compactors.append(compactor)
+      else:
+        self.compactors[height] = np.concatenate(
+            (self.compactors[height], compactor), axis=1)
+    self._compress()
+
+  def summaries(self):
+    """Returns a summary of each feature, as `summarize` does.
+
+    Returns:
+      A list of 2-D `np.ndarray` summaries, one per feature. The first column
+      is the sorted values, the second their weights.
+    """
+    values = np.concatenate(self.compactors, axis=1)
+    weights = np.concatenate([
+        np.full((compactor.shape[1],), 2.0**height)
+        for height, compactor in enumerate(self.compactors)
+    ])
+    order = np.argsort(values, axis=1, kind="stable")
+    values = np.take_along_axis(values, order, axis=1)
+    return [np.stack((v, weights[o]), axis=1) for v, o in zip(values, order)]
+
+  def _capacity(self, height):
+    depth = len(self.compactors) - height - 1
+    return max(int(np.ceil(self.k * (2. / 3.)**depth)), 2)
+
+  def _size(self):
+    return sum(compactor.shape[1] for compactor in self.compactors)
+
+  def _compress(self):
+    """Compacts full compactors until all the values fit in the sketch."""
+    while self._size() > sum(
+        self._capacity(h) for h in range(len(self.compactors))):
+      height = next(h for h in range(len(self.compactors))
+                    if self.compactors[h].shape[1] >= self._capacity(h))
+      if height + 1 == len(self.compactors):
+        self.compactors.append(np.zeros((self.num_features, 0)))
+      compactor = np.sort(self.compactors[height], axis=1)
+      # An odd value out stays in the compactor. Which half of the values is
+      # promoted is random, so the rank errors of the compactions cancel out
+      # on average.
+      num_promoted = compactor.shape[1] // 2
+      kept = compactor[:, 2 * num_promoted:]
+      promoted = compactor[:, self._random.randint(2):2 * num_promoted:2]
+      self.compactors[height] = kept
+      self.compactors[height + 1] = np.concatenate(
+          (self.compactors[height + 1], promoted), axis=1)
+
+
 @keras_export("keras.layers.experimental.preprocessing.Discretization")
 class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
   """Buckets data into discrete ranges.
@@ -263,8 +365,8 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
 
     This class encapsulates the computations for finding the quantile boundaries
     of a set of data in a stable and numerically correct way. Its associated
-    accumulator is a namedtuple('summaries'), representing summarizations of
-    the data used to generate boundaries.
+    accumulator is a `QuantileSketch` of the data, from which the boundaries are
+    generated.
 
     Attributes:
       epsilon: Error tolerance.
@@ -280,38 +382,33 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
     def compute(self, values, accumulator=None):
       """Compute a step in this computation, returning a new accumulator."""
 
-      if isinstance(values, tf.SparseTensor):
+      if isinstance(values,
+                    (tf.SparseTensor, tf.compat.v1.SparseTensorValue)):
         values = values.values
       if tf_utils.is_ragged(values):
         values = values.flat_values
       flattened_input = np.reshape(values, newshape=(-1, 1))
 
-      summaries = [summarize(v, self.epsilon) for v in flattened_input.T]
-
       if accumulator is None:
-        return self._create_accumulator(summaries)
-      else:
-        return self._create_accumulator(
-            [merge_summaries(prev_summ, summ, self.epsilon)
-             for prev_summ, summ in zip(accumulator.summaries, summaries)])
+        accumulator = self._create_accumulator()
+      accumulator.update(flattened_input)
+      return accumulator
 
     def merge(self, accumulators):
       """Merge several accumulators to a single accumulator."""
       # Combine accumulators and return the result.
 
-      merged = accumulators[0].summaries
+      merged = accumulators[0]
       for accumulator in accumulators[1:]:
-        merged = [merge_summaries(prev, summary, self.epsilon)
-                  for prev, summary in zip(merged, accumulator.summaries)]
-
-      return self._create_accumulator(merged)
+        merged.merge(accumulator)
+      return merged
 
     def extract(self, accumulator):
       """Convert an accumulator into a dict of output values."""
 
       boundaries = [np.append(get_bucket_boundaries(summary, self.num_bins),
                               [np.Inf])
-                    for summary in accumulator.summaries]
+                    for summary in accumulator.summaries()]
       return {
           _BINS_NAME: np.squeeze(np.vstack(boundaries))
       }
@@ -323,16 +420,28 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
 
     def serialize(self, accumulator):
       """Serialize an accumulator for a remote call."""
-      output_dict = {
-          _BINS_NAME: [summary.tolist() for summary in accumulator.summaries]
+      fields = {
+          "num_values": np.int64(accumulator.num_values),
+          "num_compactors": len(accumulator.compactors),
       }
-      return tf.compat.as_bytes(json.dumps(output_dict))
+      for height, compactor in enumerate(accumulator.compactors):
+        fields["compactors/%d" % height] = compactor
+      return accumulator_utils.dumps(fields)
 
     def deserialize(self, encoded_accumulator):
       """Deserialize an accumulator received from 'serialize()'."""
-      value_dict = json.loads(tf.compat.as_text(encoded_accumulator))
-      return self._create_accumulator(np.array(value_dict[_BINS_NAME]))
-
-    def _create_accumulator(self, summaries):
-      """Represent the accumulator as one or more summaries of the dataset."""
-      return collections.namedtuple("Accumulator", ["summaries"])(summaries)
+      fields = accumulator_utils.loads(encoded_accumulator)
+      compactors = [
+          fields["compactors/%d" % height]
+          for height in range(int(fields["num_compactors"]))
+      ]
+      accumulator = self._create_accumulator(
+          num_features=compactors[0].shape[0])
+      accumulator.num_values = int(fields["num_values"])
+      accumulator.compactors = compactors
+      return accumulator
+
+    def _create_accumulator(self, num_features=1):
+      """Represent the accumulator as a sketch of the dataset."""
+      k = int(np.ceil(_SKETCH_K_PER_EPSILON / self.epsilon))
+      return QuantileSketch(k, num_features=num_features, seed=_SKETCH_SEED)
@@ -164,7 +164,7 @@ class DiscretizationTest(keras_parameterized.TestCase,
           "test_data": np.arange(300),
           "use_dataset": True,
           "expected":
-              np.concatenate([np.zeros(101), np.ones(99), 2 * np.ones(100)]),
+              np.concatenate([np.zeros(100), np.ones(100), 2 * np.ones(100)]),
           "num_bins": 3,
           "epsilon": 0.01
       }, {
@@ -173,17 +173,9 @@ class DiscretizationTest(keras_parameterized.TestCase,
           "test_data": np.arange(300) ** 2,
           "use_dataset": True,
           "expected":
-              np.concatenate([np.zeros(101), np.ones(99), 2 * np.ones(100)]),
+              np.concatenate([np.zeros(100), np.ones(100), 2 * np.ones(100)]),
           "num_bins": 3,
           "epsilon": 0.01
-      }, {
-          "testcase_name": "300_batch_1d_single_element_large_epsilon",
-          "adapt_data": np.arange(300),
-          "test_data": np.arange(300),
-          "use_dataset": True,
-          "expected": np.concatenate([np.zeros(137), np.ones(163)]),
-          "num_bins": 2,
-          "epsilon": 0.1
       }])
   def test_layer_computation(self, adapt_data, test_data, use_dataset,
                              expected, num_bins=5, epsilon=0.01):
@@ -208,6 +200,30 @@ class DiscretizationTest(keras_parameterized.TestCase,
     output_data = model.predict(test_data)
     self.assertAllClose(expected, output_data)
 
+  def test_layer_computation_large_epsilon(self):
+    # 300 values do not fit in the sketch for this epsilon, so the boundary
+    # is only within epsilon of the median.
+    epsilon = 0.1
+    adapt_data = np.arange(300)
+    np.random.RandomState(1337).shuffle(adapt_data)
+    adapt_data = tf.data.Dataset.from_tensor_slices(adapt_data).batch(150)
+    test_data = tf.data.Dataset.from_tensor_slices(np.arange(300)).batch(150)
+
+    cls = get_layer_class()
+    layer = cls(epsilon=epsilon, bins=2)
+    layer.adapt(adapt_data)
+
+    input_data = keras.Input(shape=())
+    output = layer(input_data)
+    model = keras.Model(input_data, output)
+    model._run_eagerly = testing_utils.should_run_eagerly()
+    output_data = model.predict(test_data)
+    num_zeros = np.sum(output_data == 0)
+    self.assertAllEqual(
+        np.concatenate([np.zeros(num_zeros), np.ones(300 - num_zeros)]),
+        output_data)
+    self.assertAllClose(0.5, num_zeros / 300., atol=epsilon)
+
   @parameterized.named_parameters(
       {
           "num_bins": 5,
@@ -237,5 +253,55 @@ class DiscretizationTest(keras_parameterized.TestCase,
                                                                   num_bins)
     self.validate_accumulator_extract(combiner, data, expected)
 
+  @parameterized.named_parameters(
+      ("epsilon_0.01", 0.01),
+      ("epsilon_0.05", 0.05))
+  def test_combiner_rank_error(self, epsilon):
+    data = np.random.RandomState(1337).standard_normal((100000, 1))
+    combiner = discretization.Discretization.DiscretizingCombiner(epsilon, 10)
+    accumulators = [
+        combiner.compute(batch) for batch in np.split(data[:80000], 16)
+    ]
+    last_accumulator = combiner.compute(data[80000:90000])
+    last_accumulator = combiner.compute(data[90000:], last_accumulator)
+    accumulators.append(
+        combiner.deserialize(combiner.serialize(last_accumulator)))
+    accumulator = combiner.merge(accumulators)
+
+    # The sketch holds a bounded number of values, of total weight the number
+    # of values added to it.
+    summary = accumulator.summaries()[0]
+    self.assertLess(summary.shape[0], 4 * accumulator.k)
+    self.assertEqual(data.shape[0], summary[:, 1].sum())
+
+    quantiles = np.linspace(0.01, 0.99, 99)
+    cum_weights = summary[:, 1].cumsum() / data.shape[0]
+    estimates = np.interp(quantiles, cum_weights, summary[:, 0])
+    ranks = np.searchsorted(np.sort(data[:, 0]), estimates) / data.shape[0]
+    self.assertLess(np.max(np.abs(ranks - quantiles)), epsilon)
+
+  def test_sketch_multiple_features(self):
+    sketch = discretization.QuantileSketch(k=100, num_features=3, seed=0)
+    data = np.random.RandomState(1337).random_sample((10000, 3)) * [
+        1., 10., 100.]
+    for batch in np.split(data, 10):
+      sketch.update(batch)
+
+    summaries = sketch.summaries()
+    self.assertLen(summaries, 3)
+    for scale, summary in zip([1., 10., 100.], summaries):
+      median = np.interp(0.5, summary[:, 1].cumsum() / 10000, summary[:, 0])
+      self.assertAllClose(0.5 * scale, median, atol=0.05 * scale)
+
+    # With the same seed, the same values give the same sketch.
+    other_sketch = discretization.QuantileSketch(k=100, num_features=3, seed=0)
+    for batch in np.split(data, 10):
+      other_sketch.update(batch)
+    for summary, other_summary in zip(summaries, other_sketch.summaries()):
+      self.assertAllEqual(summary, other_summary)
+
+    with self.assertRaisesRegex(ValueError, "Cannot merge"):
+      sketch.merge(discretization.QuantileSketch(k=100))
+
 if __name__ == "__main__":
   tf.test.main()
@@ -26,6 +26,7 @@ from keras.engine import base_preprocessing_layer
 from keras.engine.base_preprocessing_layer import PreprocessingLayer
 from keras.engine.input_spec import InputSpec
 from keras.utils import control_flow_util
+from keras.utils import generic_utils
 from tensorflow.python.ops import stateless_random_ops
 from tensorflow.python.util.tf_export import keras_export
 
@@ -407,6 +408,24 @@ class RandomFlip(PreprocessingLayer):
     output.set_shape(inputs.shape)
     return output
 
+  def _get_random_transforms(self, batch_size, image_height, image_width):
+    """Returns random flips as projective transforms, for `ComposedTransform`.
+
+    A flip is a zoom by a factor of -1 about the center of the image.
+    """
+    flips = []
+    for flipped in (self.horizontal, self.vertical):
+      if flipped:
+        flips.append(
+            tf.compat.v1.where(
+                self._rng.uniform(shape=[batch_size, 1]) < 0.5,
+                -tf.ones((batch_size, 1), tf.float32),
+                tf.ones((batch_size, 1), tf.float32)))
+      else:
+        flips.append(tf.ones((batch_size, 1), tf.float32))
+    return get_zoom_matrix(
+        tf.concat(flips, axis=1), image_height, image_width)
+
   def compute_output_shape(self, input_shape):
     return input_shape
 
@@ -524,27 +543,11 @@ class RandomTranslation(PreprocessingLayer):
       """Translated inputs with random ops."""
       inputs_shape = tf.compat.v1.shape(inputs)
       batch_size = inputs_shape[0]
-      h_axis, w_axis = H_AXIS, W_AXIS
-      img_hd = tf.cast(inputs_shape[h_axis], tf.float32)
-      img_wd = tf.cast(inputs_shape[w_axis], tf.float32)
-      height_translate = self._rng.uniform(
-          shape=[batch_size, 1],
-          minval=self.height_lower,
-          maxval=self.height_upper,
-          dtype=tf.float32)
-      height_translate = height_translate * img_hd
-      width_translate = self._rng.uniform(
-          shape=[batch_size, 1],
-          minval=self.width_lower,
-          maxval=self.width_upper,
-          dtype=tf.float32)
-      width_translate = width_translate * img_wd
-      translations = tf.cast(
-          tf.concat([width_translate, height_translate], axis=1),
-          dtype=tf.float32)
+      img_hd = tf.cast(inputs_shape[H_AXIS], tf.float32)
+      img_wd = tf.cast(inputs_shape[W_AXIS], tf.float32)
       return transform(
           inputs,
-          get_translation_matrix(translations),
+          self._get_random_transforms(batch_size, img_hd, img_wd),
           interpolation=self.interpolation,
           fill_mode=self.fill_mode,
           fill_value=self.fill_value)
@@ -554,6 +557,25 @@ class RandomTranslation(PreprocessingLayer):
     output.set_shape(inputs.shape)
     return output
 
+  def _get_random_transforms(self, batch_size, image_height, image_width):
+    """Returns random translations as projective transforms."""
+    height_translate = self._rng.uniform(
+        shape=[batch_size, 1],
+        minval=self.height_lower,
+        maxval=self.height_upper,
+        dtype=tf.float32)
+    height_translate = height_translate * image_height
+    width_translate = self._rng.uniform(
+        shape=[batch_size, 1],
+        minval=self.width_lower,
+        maxval=self.width_upper,
+        dtype=tf.float32)
+    width_translate = width_translate * image_width
+    translations = tf.cast(
+        tf.concat([width_translate, height_translate], axis=1),
+        dtype=tf.float32)
+    return get_translation_matrix(translations)
+
   def compute_output_shape(self, input_shape):
     return input_shape
 
@@ -815,13 +837,9 @@ class RandomRotation(PreprocessingLayer):
       batch_size = inputs_shape[0]
       img_hd = tf.cast(inputs_shape[H_AXIS], tf.float32)
       img_wd = tf.cast(inputs_shape[W_AXIS], tf.float32)
-      min_angle = self.lower * 2. * np.pi
-      max_angle = self.upper * 2. * np.pi
-      angles = self._rng.uniform(
-          shape=[batch_size], minval=min_angle, maxval=max_angle)
       return transform(
           inputs,
-          get_rotation_matrix(angles, img_hd, img_wd),
+          self._get_random_transforms(batch_size, img_hd, img_wd),
           fill_mode=self.fill_mode,
           fill_value=self.fill_value,
           interpolation=self.interpolation)
@@ -831,6 +849,14 @@ class RandomRotation(PreprocessingLayer):
     output.set_shape(inputs.shape)
     return output
 
+  def _get_random_transforms(self, batch_size, image_height, image_width):
+    """Returns random rotations as projective transforms."""
+    min_angle = self.lower * 2. * np.pi
+    max_angle = self.upper * 2. * np.pi
+    angles = self._rng.uniform(
+        shape=[batch_size], minval=min_angle, maxval=max_angle)
+    return get_rotation_matrix(angles, image_height, image_width)
+
   def compute_output_shape(self, input_shape):
     return input_shape
 
@@ -950,23 +976,9 @@ class RandomZoom(PreprocessingLayer):
       batch_size = inputs_shape[0]
       img_hd = tf.cast(inputs_shape[H_AXIS], tf.float32)
       img_wd = tf.cast(inputs_shape[W_AXIS], tf.float32)
-      height_zoom = self._rng.uniform(
-          shape=[batch_size, 1],
-          minval=1. + self.height_lower,
-          maxval=1. + self.height_upper)
-      if self.width_factor is not None:
-        width_zoom = self._rng.uniform(
-            shape=[batch_size, 1],
-            minval=1. + self.width_lower,
-            maxval=1. + self.width_upper)
-      else:
-        width_zoom = height_zoom
-      zooms = tf.cast(
-          tf.concat([width_zoom, height_zoom], axis=1),
-          dtype=tf.float32)
       return transform(
           inputs,
-          get_zoom_matrix(zooms, img_hd, img_wd),
+          self._get_random_transforms(batch_size, img_hd, img_wd),
           fill_mode=self.fill_mode,
           fill_value=self.fill_value,
           interpolation=self.interpolation)
@@ -976,6 +988,24 @@ class RandomZoom(PreprocessingLayer):
     output.set_shape(inputs.shape)
     return output
 
+  def _get_random_transforms(self, batch_size, image_height, image_width):
+    """Returns random zooms as projective transforms."""
+    height_zoom = self._rng.uniform(
+        shape=[batch_size, 1],
+        minval=1. + self.height_lower,
+        maxval=1. + self.height_upper)
+    if self.width_factor is not None:
+      width_zoom = self._rng.uniform(
+          shape=[batch_size, 1],
+          minval=1. + self.width_lower,
+          maxval=1. + self.width_upper)
+    else:
+      width_zoom = height_zoom
+    zooms = tf.cast(
+        tf.concat([width_zoom, height_zoom], axis=1),
+        dtype=tf.float32)
+    return get_zoom_matrix(zooms, image_height, image_width)
+
   def compute_output_shape(self, input_shape):
     return input_shape
 
@@ -1033,6 +1063,149 @@ def get_zoom_matrix(zooms, image_height, image_width, name=None):
         axis=1)
 
 
+def compose_transforms(transforms, name=None):
+  """Returns the projective transform(s) of applying transforms in sequence.
+
+  Transforms map *output* points to *input* points, so transforming an image
+  by `transforms[0]`, then by `transforms[1]`, is equivalent to transforming it
+  once by the product of their matrices, `transforms[0] @ transforms[1]`.
+
+  Args:
+    transforms: A list of tensors of shape (num_images, 8), projective
+      transforms as given to `transform`, in the order they are applied.
+    name: The name of the op.
+
+  Returns:
+    A tensor of shape (num_images, 8), the composed projective transform(s).
+  """
+  with K.name_scope(name or 'compose_transforms'):
+    matrices = None
+    for transforms_i in transforms:
+      # The last entry of each 3x3 matrix is implicitly 1.
+      matrices_i = tf.reshape(
+          tf.concat([transforms_i, tf.ones_like(transforms_i[:, :1])], axis=1),
+          [-1, 3, 3])
+      if matrices is None:
+        matrices = matrices_i
+      else:
+        matrices = tf.matmul(matrices, matrices_i)
+    matrices = matrices / matrices[:, 2:, 2:]
+    return tf.reshape(matrices, [-1, 9])[:, :8]
+
+
+@keras_export('keras.layers.experimental.preprocessing.ComposedTransform')
+class ComposedTransform(PreprocessingLayer):
+  """Apply a stack of random geometric transforms with a single resampling.
+
+  Each of `RandomFlip`, `RandomRotation`, `RandomTranslation` and `RandomZoom`
+  resamples its inputs, so a stack of them interpolates every image several
+  times, which is slow and blurs the images. This layer draws the random
+  transform of each layer in `layers`, multiplies their matrices, and
+  transforms each image once.
+
+  The output differs from that of the layers applied in sequence only in the
+  points which an intermediate layer would fill from outside of its input,
+  and in interpolation error.
+
+  By default, the random transforms are only applied during training. At
+  inference time, the layer does nothing.
+
+  Args:
+    layers: List of `RandomFlip`, `RandomRotation`, `RandomTranslation` and
+      `RandomZoom` layers, in the order to apply them. Their own random
+      generators are used. All of them other than `RandomFlip` must have the
+      same `fill_mode`, `fill_value` and `interpolation`, which are used for
+      the single transform.
+    name: A string, the name of the layer.
+  Input shape:
+    4D tensor with shape: `(samples, height, width, channels)`,
+      data_format='channels_last'.
+  Output shape:
+    4D tensor with shape: `(samples, height, width, channels)`,
+      data_format='channels_last'.
+  Raise:
+    ValueError: if `layers` is empty, contains other layers, or layers with
+      different fill or interpolation settings.
+  """
+
+  def __init__(self, layers, name=None, **kwargs):
+    if not layers:
+      raise ValueError('`layers` must not be empty.')
+    settings = set()
+    for layer in layers:
+      if isinstance(layer, RandomFlip):
+        continue
+      if not isinstance(layer, (RandomRotation, RandomTranslation, RandomZoom)):
+        raise ValueError(
+            'ComposedTransform only supports RandomFlip, RandomRotation, '
+            'RandomTranslation and RandomZoom layers, got {}'.format(layer))
+      settings.add((layer.fill_mode, layer.fill_value, layer.interpolation))
+    if len(settings) > 1:
+      raise ValueError(
+          'The layers of a ComposedTransform must have the same `fill_mode`, '
+          '`fill_value` and `interpolation`, got (fill_mode, fill_value, '
+          'interpolation) values {}'.format(sorted(settings)))
+    if settings:
+      self.fill_mode, self.fill_value, self.interpolation = settings.pop()
+    else:
+      self.fill_mode, self.fill_value, self.interpolation = (
+          'reflect', 0.0, 'bilinear')
+    self.input_spec = InputSpec(ndim=4)
+    super(ComposedTransform, self).__init__(name=name, **kwargs)
+    self._transform_layers = list(layers)
+    base_preprocessing_layer.keras_kpl_gauge.get_cell('ComposedTransform').set(
+        True)
+
+  def call(self, inputs, training=True):
+    if training is None:
+      training = K.learning_phase()
+
+    def random_transformed_inputs():
+      """Transformed inputs with random ops."""
+      inputs_shape = tf.compat.v1.shape(inputs)
+      batch_size = inputs_shape[0]
+      img_hd = tf.cast(inputs_shape[H_AXIS], tf.float32)
+      img_wd = tf.cast(inputs_shape[W_AXIS], tf.float32)
+      transforms = [
+          layer._get_random_transforms(batch_size, img_hd, img_wd)  # pylint: disable=protected-access
+          for layer in self._transform_layers
+      ]
+      return transform(
+          inputs,
+          compose_transforms(transforms),
+          fill_mode=self.fill_mode,
+          fill_value=self.fill_value,
+          interpolation=self.interpolation)
+
+    output = control_flow_util.smart_cond(training, random_transformed_inputs,
+                                          lambda: inputs)
+    output.set_shape(inputs.shape)
+    return output
+
+  def compute_output_shape(self, input_shape):
+    return input_shape
+
+  def get_config(self):
+    config = {
+        'layers': [
+            generic_utils.serialize_keras_object(layer)
+            for layer in self._transform_layers
+        ],
+    }
+    base_config = super(ComposedTransform, self).get_config()
+    return dict(list(base_config.items()) + list(config.items()))
+
+  @classmethod
+  def from_config(cls, config, custom_objects=None):
+    from keras.layers import deserialize as deserialize_layer  # pylint: disable=g-import-not-at-top
+    config = config.copy()
+    config['layers'] = [
+        deserialize_layer(layer_config, custom_objects=custom_objects)
+        for layer_config in config['layers']
+    ]
+    return cls(**config)
+
+
 @keras_export('keras.layers.experimental.preprocessing.RandomContrast')
 class RandomContrast(PreprocessingLayer):
   """Adjust the contrast of an image or images by a random factor.
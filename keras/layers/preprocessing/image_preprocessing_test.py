@@ -1206,6 +1206,108 @@ class RandomZoomTest(keras_parameterized.TestCase):
     self.assertEqual(layer_1.name, layer.name)
 
 
+@keras_parameterized.run_all_keras_modes(always_skip_v1=True)
+class ComposedTransformTest(keras_parameterized.TestCase):
+
+  def test_compose_transforms(self):
+    translation = np.asarray([[1., 0., -2., 0., 1., 1., 0., 0.]])
+    rotation = np.asarray([[0., -1., 4., 1., 0., 0., 0., 0.]])
+    zoom = np.asarray([[.5, 0., 1., 0., 2., -2., 0., 0.]])
+    expected_matrix = np.eye(3)
+    for transform_matrix in (translation, rotation, zoom):
+      expected_matrix = np.matmul(
+          expected_matrix, np.append(transform_matrix, 1.).reshape((3, 3)))
+    output = image_preprocessing.compose_transforms(
+        [tf.constant(translation, tf.float32),
+         tf.constant(rotation, tf.float32),
+         tf.constant(zoom, tf.float32)])
+    self.assertAllClose(expected_matrix.reshape((1, 9))[:, :8], output)
+
+  def test_single_layer_numeric(self):
+    for dtype in (np.int64, np.float32):
+      with testing_utils.use_gpu():
+        input_image = np.reshape(np.arange(0, 25), (5, 5, 1)).astype(dtype)
+        layer = image_preprocessing.ComposedTransform([
+            image_preprocessing.RandomZoom((-.5, -.5), (-.5, -.5),
+                                           interpolation='nearest')
+        ])
+        output_image = layer(np.expand_dims(input_image, axis=0))
+        # pyformat: disable
+        expected_output = np.asarray([
+            [6, 7, 7, 8, 8],
+            [11, 12, 12, 13, 13],
+            [11, 12, 12, 13, 13],
+            [16, 17, 17, 18, 18],
+            [16, 17, 17, 18, 18]
+        ]).astype(dtype)
+        # pyformat: enable
+        expected_output = np.reshape(expected_output, (1, 5, 5, 1))
+        self.assertAllEqual(expected_output, output_image)
+
+  def test_flip_and_zoom_resample_once(self):
+    with testing_utils.use_gpu():
+      input_image = np.reshape(np.arange(0, 25), (1, 5, 5, 1)).astype(
+          np.float32)
+      layer = image_preprocessing.ComposedTransform([
+          image_preprocessing.RandomFlip(mode='horizontal_and_vertical'),
+          image_preprocessing.RandomZoom((0., 0.), (0., 0.),
+                                         interpolation='nearest'),
+      ])
+      output_image = self.evaluate(layer(input_image))
+      # Each flip is exact, so the output is one of the flips of the input.
+      candidates = [input_image, input_image[:, ::-1], input_image[:, :, ::-1],
+                    input_image[:, ::-1, ::-1]]
+      self.assertTrue(
+          any(np.array_equal(candidate, output_image)
+              for candidate in candidates))
+
+  def test_composed_transform_inference(self):
+    input_images = np.random.random((2, 5, 8, 3)).astype(np.float32)
+    with testing_utils.use_gpu():
+      layer = image_preprocessing.ComposedTransform([
+          image_preprocessing.RandomRotation(.5),
+          image_preprocessing.RandomZoom(.5, .5),
+      ])
+      actual_output = layer(input_images, training=0)
+      self.assertAllClose(input_images, actual_output)
+
+  def test_composed_transform_output_shape(self):
+    input_images = np.random.random((2, 5, 8, 3)).astype(np.float32)
+    with testing_utils.use_gpu():
+      layer = image_preprocessing.ComposedTransform([
+          image_preprocessing.RandomRotation(.2),
+          image_preprocessing.RandomFlip(),
+          image_preprocessing.RandomTranslation(.1, .2),
+          image_preprocessing.RandomZoom(.2),
+      ])
+      output = layer(input_images, training=True)
+      self.assertAllEqual((2, 5, 8, 3), output.shape)
+
+  def test_different_fill_modes_fail(self):
+    with self.assertRaisesRegex(ValueError, 'same `fill_mode`'):
+      image_preprocessing.ComposedTransform([
+          image_preprocessing.RandomRotation(.2, fill_mode='constant'),
+          image_preprocessing.RandomZoom(.2, fill_mode='reflect'),
+      ])
+
+  def test_unsupported_layer_fails(self):
+    with self.assertRaisesRegex(ValueError, 'only supports'):
+      image_preprocessing.ComposedTransform(
+          [image_preprocessing.RandomContrast(.2)])
+
+  @testing_utils.run_v2_only
+  def test_config_with_custom_name(self):
+    layer = image_preprocessing.ComposedTransform([
+        image_preprocessing.RandomRotation(.2, fill_mode='constant'),
+        image_preprocessing.RandomFlip(mode='vertical'),
+    ], name='image_preproc')
+    config = layer.get_config()
+    layer_1 = image_preprocessing.ComposedTransform.from_config(config)
+    self.assertEqual(layer_1.name, layer.name)
+    self.assertEqual('constant', layer_1.fill_mode)
+    self.assertEqual(config, layer_1.get_config())
+
+
 @keras_parameterized.run_all_keras_modes(always_skip_v1=True)
 class RandomHeightTest(keras_parameterized.TestCase):
 
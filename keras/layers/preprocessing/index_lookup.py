@@ -20,16 +20,17 @@ from __future__ import print_function
 
 import tensorflow.compat.v2 as tf
 
-import collections
+import itertools
 import json
-import operator
 
 import numpy as np
 from keras import backend as K
 from keras.engine import base_preprocessing_layer
+from keras.layers.preprocessing import accumulator_utils
 from keras.layers.preprocessing import category_encoding
 from keras.layers.preprocessing import table_utils
 from keras.utils import layer_utils
+from keras.utils import tf_utils
 from tensorflow.python.ops import lookup_ops
 
 INT = "int"
@@ -39,6 +40,19 @@ TFIDF = "tf-idf"
 
 _VOCAB_NAME = "vocab"
 _IDF_WEIGHTS_NAME = "idf_weights"
+_ACCUMULATOR_NAME = "accumulator"
+
+# Counts of new batches are buffered until they hold at least this many tokens.
+_MIN_PENDING_TOKENS = 2**16
+
+# Shape of the count-min sketch of approximate adapts, for a vocab of `k`
+# tokens: _SKETCH_DEPTH rows of max(_MIN_SKETCH_WIDTH, _SKETCH_WIDTH_PER_TOKEN *
+# k) buckets, of which the tokens of highest counts are candidates for the
+# vocab.
+_SKETCH_DEPTH = 4
+_MIN_SKETCH_WIDTH = 2**16
+_SKETCH_WIDTH_PER_TOKEN = 8
+_SKETCH_CANDIDATES_PER_TOKEN = 2
 
 
 class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
@@ -55,7 +69,11 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
   unlimited size or be capped, depending on the configuration options for this
   layer; if there are more unique values in the input than the maximum
   vocabulary size, the most frequent terms will be used to create the
-  vocabulary.
+  vocabulary. Calling `adapt(data, reset_state=False)` later on updates the
+  vocabulary from the new data only: the tokens already in the vocabulary keep
+  their indices, and new tokens are appended. With `keep_adapt_counts=True`,
+  the counts of the previous calls are kept by the layer and added to the
+  counts of the new data.
 
   Args:
     max_tokens: The maximum size of the vocabulary for this layer. If None,
@@ -95,8 +113,22 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
       the number of unique tokens in the vocabulary is less than max_tokens,
       resulting in a tensor of shape [batch_size, max_tokens] regardless of
       vocabulary size. Defaults to False.
-    sparse: Boolean. Only applicable to "binary" and "count" output modes.
-      If true, returns a `SparseTensor` instead of a dense `Tensor`.
+    sparse: Boolean. Only applicable to "binary", "count" and "tf-idf" output
+      modes. If true, returns a `SparseTensor` instead of a dense `Tensor`,
+      without allocating a dense `[batch_size, max_tokens]` buffer.
+      Defaults to `False`.
+    approximate_adapt: Boolean. Only applicable if `max_tokens` is set. If
+      true, `adapt()` estimates the frequency of the tokens with a count-min
+      sketch, in memory bounded by `max_tokens` instead of by the number of
+      distinct tokens in the data set. The most frequent tokens may then be
+      missed if many tokens have close frequencies. Defaults to `False`.
+    keep_adapt_counts: Boolean. If true, the layer keeps the counts of every
+      distinct token seen by `adapt()`, so that `adapt(reset_state=False)`
+      ranks new tokens by their counts in all the data adapted on, and TF-IDF
+      weights can be updated. Otherwise, new tokens are ranked by their counts
+      in the new data only, and the memory used by the counts is released
+      after each `adapt()`. The counts are not saved with the layer, so after
+      it is reloaded, `adapt(reset_state=False)` only counts the new data.
       Defaults to `False`.
   """
 
@@ -110,6 +142,8 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
                output_mode=INT,
                sparse=False,
                pad_to_max_tokens=False,
+               approximate_adapt=False,
+               keep_adapt_counts=False,
                **kwargs):
 
     # If max_tokens is set, the value must be greater than 1 - otherwise we
@@ -141,6 +175,8 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
     self.output_mode = output_mode
     self.sparse = sparse
     self.pad_to_max_tokens = pad_to_max_tokens
+    self.approximate_adapt = approximate_adapt
+    self.keep_adapt_counts = keep_adapt_counts
     self._called = False
 
     # If there is only one OOV bucket, we can determine the OOV value (either 0
@@ -165,9 +201,17 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
             vocab_size=vocab_size,
             mask_value=mask_token,
             oov_value=oov_token,
-            compute_idf=(output_mode == TFIDF)),
+            compute_idf=(output_mode == TFIDF),
+            approximate=approximate_adapt),
         **kwargs)
 
+    # The accumulator of the last `adapt` if `keep_adapt_counts` is set, which
+    # `adapt(reset_state=False)` adds the counts of new data to.
+    self._vocab_accumulator = None
+    # A `table_utils.VocabularyFile`, if subclasses initialize the table from a
+    # vocabulary file directly.
+    self._vocabulary_file = None
+
     # We need to save the key dtype so that we know if we're expecting int64
     # keys. If we are, we will cast int32 inputs to int64 as well.
     if invert:
@@ -248,6 +292,8 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
   def compute_output_signature(self, input_spec):
     output_shape = self.compute_output_shape(input_spec.shape.as_list())
     output_dtype = self._value_dtype if self.output_mode == INT else K.floatx()
+    if self.sparse and self.output_mode != INT:
+      return tf.SparseTensorSpec(shape=output_shape, dtype=output_dtype)
     return tf.TensorSpec(shape=output_shape, dtype=output_dtype)
 
   def adapt(self, data, reset_state=True):
@@ -260,14 +306,17 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
       data: The data to train on. It can be passed either as a tf.data Dataset,
         or as a numpy array.
       reset_state: Optional argument specifying whether to clear the state of
-        the layer at the start of the call to `adapt`. This must be True for
-        this layer, which does not support repeated calls to `adapt`.
+        the layer at the start of the call to `adapt`. If False, only `data` is
+        counted, and added to the counts of the previous calls to `adapt` if
+        `keep_adapt_counts` is set. Tokens already in the vocabulary keep their
+        indices, and new tokens are appended by decreasing frequency while
+        there is room for them.
     """
-    if not reset_state:
-      raise ValueError("IndexLookup does not support streaming adapts.")
-    super(IndexLookup, self).adapt(data, reset_state)
+    super(IndexLookup, self).adapt(data, reset_state=reset_state)
 
   def get_vocabulary(self):
+    if self._vocabulary_file is not None:
+      return self._vocabulary_file
     if self._table_handler.vocab_size() == 0:
       return []
 
@@ -292,6 +341,8 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
         "mask_token": self.mask_token,
         "output_mode": self.output_mode,
         "pad_to_max_tokens": self.pad_to_max_tokens,
+        "approximate_adapt": self.approximate_adapt,
+        "keep_adapt_counts": self.keep_adapt_counts,
     }
     base_config = super(IndexLookup, self).get_config()
     return dict(list(base_config.items()) + list(config.items()))
@@ -499,6 +550,8 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
       vocab_size = self._set_inverse_vocabulary(vocab)
     else:
       vocab_size = self._set_forward_vocabulary(vocab, idf_weights=idf_weights)
+    # The counts of a previous `adapt` do not match this vocabulary anymore.
+    self._vocab_accumulator = None
     # TODO(mattdangerw): we should not overwrite the init arg here. We currently
     # need to persist our vocab size in the config, and not our weights, to
     # force a static shape for our output. This could be avoided if the
@@ -509,8 +562,33 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
   def _set_state_variables(self, updates):
     if not self.built:
       raise RuntimeError("_set_state_variables() must be called after build().")
-    self.set_vocabulary(
-        updates[_VOCAB_NAME], idf_weights=updates[_IDF_WEIGHTS_NAME])
+    max_tokens = self.max_tokens
+    if not self.pad_to_max_tokens:
+      # `set_vocabulary` overwrites `max_tokens` with the size of the last
+      # vocabulary, which an incremental `adapt` may grow up to the
+      # `max_tokens` enforced by the combiner.
+      self.max_tokens = None
+    try:
+      self.set_vocabulary(
+          updates[_VOCAB_NAME], idf_weights=updates[_IDF_WEIGHTS_NAME])
+    except Exception:
+      self.max_tokens = max_tokens
+      raise
+
+  def _restore_updates(self):
+    """Returns the vocabulary and counts `adapt(reset_state=False)` adds to."""
+    num_special_tokens = 0 if self.mask_token is None else 1
+    if not self.invert:
+      num_special_tokens += self.num_oov_indices
+    # Subclasses may decode the vocabulary, but the combiner counts the tokens
+    # as they are stored in the table.
+    vocab = IndexLookup.get_vocabulary(self)[num_special_tokens:]
+    return {_VOCAB_NAME: vocab, _ACCUMULATOR_NAME: self._vocab_accumulator}
+
+  def _set_accumulator(self, accumulator):
+    super(IndexLookup, self)._set_accumulator(accumulator)
+    if self.keep_adapt_counts:
+      self._vocab_accumulator = accumulator
 
   def call(self, inputs):
     if not self.max_tokens:
@@ -535,6 +613,8 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
                                                    binary_output)
 
     if self.output_mode == TFIDF:
+      if self.sparse:
+        return category_encoding.sparse_tf_idf(bincounts, self.tf_idf_weights)
       return tf.multiply(bincounts, self.tf_idf_weights)
 
     return bincounts
@@ -549,10 +629,162 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
     return tf.lookup.StaticHashTable
 
 
-class _IndexLookupAccumulator(
-    collections.namedtuple("Accumulator",
-                           ["data", "count_dict", "per_doc_count_dict"])):
-  pass
+class _CountMinSketch(object):
+  """Approximate token counts in a fixed amount of memory.
+
+  Each token is counted in one bucket of each of the `depth` rows of the
+  sketch. The estimated count of a token is its smallest bucket count, which is
+  never less than its true count. Buckets are only raised as much as needed
+  to keep it so ("conservative update"), which makes the estimates of rare
+  tokens much tighter than plain increments would.
+  """
+
+  def __init__(self, width, depth=_SKETCH_DEPTH, compute_idf=False):
+    self.counts = np.zeros((depth, width), dtype=np.int64)
+    self.doc_counts = (
+        np.zeros((depth, width), dtype=np.int64) if compute_idf else None)
+
+  def add(self, tokens, counts, doc_counts=None):
+    """Adds the counts of unique `tokens`."""
+    buckets = self._buckets(tokens)
+    _conservative_update(self.counts, buckets, counts)
+    if doc_counts is not None:
+      _conservative_update(self.doc_counts, buckets, doc_counts)
+
+  def estimate(self, tokens):
+    """Returns the estimated counts and document counts of `tokens`."""
+    buckets = self._buckets(tokens)
+    counts = np.min(
+        [self.counts[row][b] for row, b in enumerate(buckets)], axis=0)
+    if self.doc_counts is None:
+      return counts, None
+    doc_counts = np.min(
+        [self.doc_counts[row][b] for row, b in enumerate(buckets)], axis=0)
+    return counts, doc_counts
+
+  def merge(self, other):
+    self.counts += other.counts
+    if self.doc_counts is not None:
+      self.doc_counts += other.doc_counts
+
+  def _buckets(self, tokens):
+    depth, width = self.counts.shape
+    fingerprints = _fingerprint(tokens)
+    return [_hash_to_bucket(fingerprints, row, width) for row in range(depth)]
+
+
+class _IndexLookupAccumulator(object):
+  """Counts of the tokens seen by `adapt`, as arrays sorted by token.
+
+  The counts of new batches are buffered, and joined into the sorted arrays
+  once the buffer holds as many tokens as the arrays. Each count is then copied
+  O(log(num_batches)) times over the whole `adapt`, instead of once per batch.
+
+  If `sketch` is set, the counts are kept in the sketch instead, and the arrays
+  only hold the `max_candidates` tokens with the highest estimated counts.
+
+  `base_vocab` is the vocabulary of the layer when the accumulator was restored
+  by an incremental `adapt`, or None.
+  """
+
+  def __init__(self, compute_idf=False, sketch=None, max_candidates=None):
+    self.num_documents = 0
+    self.base_vocab = None
+    self._compute_idf = compute_idf
+    self._sketch = sketch
+    self._max_candidates = max_candidates
+    self._tokens = None
+    self._counts = None
+    self._doc_counts = None
+    self._pending = []
+    self._pending_size = 0
+
+  @property
+  def tokens(self):
+    self._flush()
+    return self._tokens
+
+  @property
+  def counts(self):
+    self._flush()
+    return self._counts
+
+  @property
+  def doc_counts(self):
+    self._flush()
+    return self._doc_counts
+
+  @property
+  def count_dict(self):
+    """The count of each token, as a dict."""
+    if self.tokens is None:
+      return {}
+    return dict(zip(self.tokens.tolist(), self.counts.tolist()))
+
+  def update(self, tokens, counts, doc_counts=None, num_documents=0):
+    """Adds the counts of a batch of unique tokens."""
+    tokens = np.asarray(tokens)
+    counts = np.asarray(counts, dtype=np.int64)
+    if self._compute_idf:
+      doc_counts = (
+          np.zeros_like(counts) if doc_counts is None else
+          np.asarray(doc_counts, dtype=np.int64))
+    else:
+      doc_counts = None
+    if self._sketch is not None:
+      self._sketch.add(tokens, counts, doc_counts)
+    self.num_documents += num_documents
+    self._append(tokens, counts, doc_counts)
+
+  def merge(self, other):
+    """Adds the counts of another accumulator to this one."""
+    if self._sketch is not None:
+      self._sketch.merge(other._sketch)  # pylint: disable=protected-access
+    self.num_documents += other.num_documents
+    if self.base_vocab is None:
+      self.base_vocab = other.base_vocab
+    if other.tokens is not None:
+      self._append(other.tokens, other.counts, other.doc_counts)
+
+  def set_sorted_counts(self, tokens, counts, doc_counts=None):
+    """Replaces the counts with those of sorted, unique `tokens`."""
+    self._pending = []
+    self._pending_size = 0
+    self._tokens = tokens
+    self._counts = counts
+    self._doc_counts = doc_counts if self._compute_idf else None
+
+  def _append(self, tokens, counts, doc_counts):
+    if not tokens.size:
+      return
+    self._pending.append((tokens, counts, doc_counts))
+    self._pending_size += tokens.size
+    size = 0 if self._tokens is None else self._tokens.size
+    if self._pending_size >= max(size, _MIN_PENDING_TOKENS):
+      self._flush()
+
+  def _flush(self):
+    """Joins the buffered counts into the sorted arrays."""
+    if not self._pending:
+      return
+    pending = _sum_counts(self._pending)
+    self._pending = []
+    self._pending_size = 0
+    if self._tokens is None:
+      self._tokens, self._counts, self._doc_counts = pending
+    else:
+      self._tokens, self._counts, self._doc_counts = _join_counts(
+          (self._tokens, self._counts, self._doc_counts), pending)
+
+    if self._sketch is not None:
+      self._counts, self._doc_counts = self._sketch.estimate(self._tokens)
+      if self._tokens.size > self._max_candidates:
+        keep = np.argpartition(-self._counts, self._max_candidates - 1)
+        keep = np.sort(keep[:self._max_candidates])
+        self._tokens = self._tokens[keep]
+        self._counts = self._counts[keep]
+        if self._doc_counts is not None:
+          self._doc_counts = self._doc_counts[keep]
 
 
 class _IndexLookupCombiner(base_preprocessing_layer.Combiner):
@@ -566,43 +798,42 @@ class _IndexLookupCombiner(base_preprocessing_layer.Combiner):
       frequency across the dataset) are retained in the vocabulary. If None, or
       set to a value greater than the total number of distinct tokens in the
       dataset, all tokens are retained.
+    approximate: If True and `vocab_size` is set, the tokens are counted with a
+      count-min sketch, in memory bounded by `vocab_size` instead of the number
+      of distinct tokens.
   """
 
   def __init__(self,
                vocab_size=None,
                mask_value=None,
                oov_value=None,
-               compute_idf=False):
+               compute_idf=False,
+               approximate=False):
     self._vocab_size = vocab_size
     self._mask_value = mask_value
     self._oov_value = oov_value
     self._compute_idf = compute_idf
+    self._approximate = approximate and vocab_size is not None
 
   def compute(self, values, accumulator=None):
     """Compute a step in this computation, returning a new accumulator."""
-    values = base_preprocessing_layer.convert_to_list(
-        values, sparse_default_value=self._mask_value)
-
     if accumulator is None:
       accumulator = self._create_accumulator()
 
-    # TODO(momernick): Benchmark improvements to this algorithm.
-    if not isinstance(values, list):
-      values = [values]
-    for document in values:
-      if not isinstance(document, list):
-        document = [document]
-      if self._compute_idf:
-        current_doc_id = accumulator.data["next_doc_id"]
-        accumulator.data["next_doc_id"] += 1
-      for token in document:
-        accumulator.count_dict[token] += 1
-        if self._compute_idf:
-          doc_count = accumulator.per_doc_count_dict[token]
-          if doc_count["last_doc_id"] != current_doc_id:
-            doc_count["count"] += 1
-            doc_count["last_doc_id"] = current_doc_id
+    tokens, doc_ids, num_documents = self._flatten(values)
+    if not tokens.shape[0]:
+      accumulator.num_documents += num_documents
+      return accumulator
 
+    unique_tokens, indices, counts = _unique_with_counts(tokens)
+    if self._compute_idf:
+      # Count each (document, token) pair once.
+      num_tokens = unique_tokens.shape[0]
+      pairs = np.unique(doc_ids * num_tokens + indices)
+      doc_counts = np.bincount(pairs % num_tokens, minlength=num_tokens)
+    else:
+      doc_counts = None
+    accumulator.update(unique_tokens, counts, doc_counts, num_documents)
     return accumulator
 
   def merge(self, accumulators):
@@ -612,20 +843,7 @@ class _IndexLookupCombiner(base_preprocessing_layer.Combiner):
 
     base_accumulator = accumulators[0]
     for accumulator in accumulators[1:]:
-      for token, value in accumulator.count_dict.items():
-        base_accumulator.count_dict[token] += value
-
-      if self._compute_idf:
-        base_accumulator.data["next_doc_id"] += accumulator.data["next_doc_id"]
-        if self._compute_idf:
-          for token, value in accumulator.per_doc_count_dict.items():
-            # Any newly created token counts in 'base_accumulator''s
-            # per_doc_count_dict will have a last_doc_id of -1. This is always
-            # less than the next doc id (which are strictly positive), so any
-            # future occurrences are guaranteed to be counted.
-            base_accumulator.per_doc_count_dict[token]["count"] += value[
-                "count"]
-
+      base_accumulator.merge(accumulator)
     return base_accumulator
 
   def extract(self, accumulator):
@@ -638,36 +856,79 @@ class _IndexLookupCombiner(base_preprocessing_layer.Combiner):
       A dict of:
         "vocab": A list of the retained items in the vocabulary.
     """
-    vocab_counts = accumulator.count_dict
-
-    # Drop special tokens from our vocab.
-    if self._mask_value in vocab_counts:
-      del vocab_counts[self._mask_value]
-    if self._oov_value in vocab_counts:
-      del vocab_counts[self._oov_value]
-    # Data processed by the accumulator could be tensors, numpy arrays or lists.
-    # For tensor string input, values will have been converted into bytes. We
-    # need to check the bytes version of special tokens in this case.
-    if isinstance(self._mask_value, str):
-      mask_value_bytes = tf.compat.as_bytes(self._mask_value)
-      if mask_value_bytes in vocab_counts:
-        del vocab_counts[mask_value_bytes]
-    if isinstance(self._oov_value, str):
-      oov_value_bytes = tf.compat.as_bytes(self._oov_value)
-      if oov_value_bytes in vocab_counts:
-        del vocab_counts[oov_value_bytes]
-
-    sorted_counts = sorted(
-        vocab_counts.items(), key=operator.itemgetter(1, 0), reverse=True)
-    vocab_data = (
-        sorted_counts[:self._vocab_size] if self._vocab_size else sorted_counts)
-    vocab = [data[0] for data in vocab_data]
+    tokens = accumulator.tokens
+    if tokens is None and accumulator.base_vocab is not None:
+      empty_counts = np.zeros((0,), dtype=np.int64)
+      return self._extract_incremental(
+          accumulator, np.array([], dtype=object), empty_counts, empty_counts)
+    if tokens is None:
+      idf_weights = (
+          self._inverse_document_frequency([], accumulator.num_documents)
+          if self._compute_idf else None)
+      return {_VOCAB_NAME: [], _IDF_WEIGHTS_NAME: idf_weights}
+    counts = accumulator.counts
+    doc_counts = accumulator.doc_counts
+
+    # Drop special tokens from our vocab. Data processed by the accumulator
+    # could be tensors, numpy arrays or lists. For tensor string input, values
+    # will have been converted into bytes. We need to check the bytes version
+    # of special tokens in this case.
+    special_tokens = []
+    for value in (self._mask_value, self._oov_value):
+      if value is not None:
+        special_tokens.append(value)
+      if isinstance(value, str):
+        special_tokens.append(tf.compat.as_bytes(value))
+    keep = np.ones(tokens.shape, dtype=bool)
+    for token in special_tokens:
+      keep &= np.logical_not(_token_mask(tokens, token))
+    tokens = tokens[keep]
+    counts = counts[keep]
+    if self._compute_idf:
+      doc_counts = doc_counts[keep]
+
+    if accumulator.base_vocab is not None:
+      return self._extract_incremental(accumulator, tokens, counts, doc_counts)
+
+    # Sort by decreasing count, then decreasing token. The tokens are sorted
+    # already, so their positions stand in for them.
+    order = np.lexsort((np.arange(tokens.shape[0]), counts))[::-1]
+    if self._vocab_size:
+      order = order[:self._vocab_size]
+    vocab = tokens[order].tolist()
+
+    if self._compute_idf:
+      idf_weights = self._inverse_document_frequency(
+          doc_counts[order], accumulator.num_documents)
+    else:
+      idf_weights = None
+
+    return {_VOCAB_NAME: vocab, _IDF_WEIGHTS_NAME: idf_weights}
+
+  def _extract_incremental(self, accumulator, tokens, counts, doc_counts):
+    """Appends the most frequent new tokens to `accumulator.base_vocab`."""
+    base_vocab = accumulator.base_vocab
+    positions = {
+        _vocab_key(token): i for i, token in enumerate(tokens.tolist())
+    }
+    base_positions = np.array(
+        [positions.get(token, -1) for token in base_vocab], dtype=np.int64)
+    found = base_positions >= 0
+    is_new = np.ones(tokens.shape, dtype=bool)
+    is_new[base_positions[found]] = False
+
+    new = np.flatnonzero(is_new)
+    order = new[np.lexsort((new, counts[new]))[::-1]]
+    if self._vocab_size:
+      order = order[:max(self._vocab_size - len(base_vocab), 0)]
+    vocab = list(base_vocab) + [_vocab_key(token) for token in tokens[order]]
 
     if self._compute_idf:
-      num_documents = accumulator.data["next_doc_id"]
-      document_counts = accumulator.per_doc_count_dict
-      doc_counts = [document_counts[token]["count"] for token in vocab]
-      idf_weights = self._inverse_document_frequency(doc_counts, num_documents)
+      base_doc_counts = np.zeros(base_positions.shape, dtype=np.int64)
+      base_doc_counts[found] = doc_counts[base_positions[found]]
+      idf_weights = self._inverse_document_frequency(
+          np.concatenate([base_doc_counts, doc_counts[order]]),
+          accumulator.num_documents)
     else:
       idf_weights = None
 
@@ -675,56 +936,186 @@ class _IndexLookupCombiner(base_preprocessing_layer.Combiner):
 
   def restore(self, output):
     """Create an accumulator based on 'output'."""
-    raise NotImplementedError(
-        "IndexLookup does not restore or support streaming updates.")
+    accumulator = self._create_accumulator()
+    previous_accumulator = output.get(_ACCUMULATOR_NAME)
+    if previous_accumulator is not None:
+      # Merge into a new accumulator, which leaves the layer's one unchanged.
+      accumulator.merge(previous_accumulator)
+    elif self._compute_idf and len(output[_VOCAB_NAME]) > 0:
+      raise ValueError(
+          "The document frequencies of the vocabulary are unknown, so it "
+          "cannot be updated in TF-IDF mode. Create the layer with "
+          "`keep_adapt_counts=True` to keep them, or call `adapt` with "
+          "`reset_state=True` instead.")
+    accumulator.base_vocab = [
+        _vocab_key(token) for token in output[_VOCAB_NAME]
+    ]
+    return accumulator
 
   def serialize(self, accumulator):
     """Serialize an accumulator for a remote call."""
+    fields = {"num_documents": np.int64(accumulator.num_documents)}
+    tokens = accumulator.tokens
+    if tokens is not None:
+      fields["vocab"] = tokens
+      fields["vocab_counts"] = accumulator.counts
+      if self._compute_idf:
+        fields["doc_counts"] = accumulator.doc_counts
+    if self._approximate:
+      sketch = accumulator._sketch  # pylint: disable=protected-access
+      fields["sketch_counts"] = sketch.counts
+      if self._compute_idf:
+        fields["sketch_doc_counts"] = sketch.doc_counts
+    if accumulator.base_vocab is not None:
+      fields["base_vocab"] = accumulator.base_vocab
+    try:
+      return accumulator_utils.dumps(fields)
+    except TypeError:
+      # Vocabularies mixing token types can only be encoded as JSON.
+      return self._serialize_json(accumulator)
+
+  def deserialize(self, encoded_accumulator):
+    """Deserialize an accumulator received from 'serialize()'."""
+    if not accumulator_utils.is_binary(encoded_accumulator):
+      return self._deserialize_json(encoded_accumulator)
+    fields = accumulator_utils.loads(encoded_accumulator)
+
+    accumulator = self._create_accumulator()
+    accumulator.num_documents = int(fields["num_documents"])
+    if self._approximate:
+      sketch = accumulator._sketch  # pylint: disable=protected-access
+      sketch.counts[...] = fields["sketch_counts"]
+      if self._compute_idf:
+        sketch.doc_counts[...] = fields["sketch_doc_counts"]
+    if "vocab" in fields:
+      accumulator.set_sorted_counts(fields["vocab"], fields["vocab_counts"],
+                                    fields.get("doc_counts"))
+    if "base_vocab" in fields:
+      accumulator.base_vocab = fields["base_vocab"].tolist()
+    return accumulator
+
+  def _serialize_json(self, accumulator):
+    """Serialize an accumulator as JSON."""
     output_dict = {}
-    output_dict["vocab"] = list(accumulator.count_dict.keys())
-    output_dict["vocab_counts"] = list(accumulator.count_dict.values())
+    tokens = accumulator.tokens
+    output_dict["vocab"] = [] if tokens is None else tokens.tolist()
+    output_dict["vocab_counts"] = (
+        [] if tokens is None else accumulator.counts.tolist())
 
     if self._compute_idf:
-      output_dict["data"] = accumulator.data
-      output_dict["idf_vocab"] = list(accumulator.per_doc_count_dict.keys())
-      output_dict["idf_counts"] = [
-          counter["count"]
-          for counter in accumulator.per_doc_count_dict.values()
+      output_dict["data"] = {"next_doc_id": accumulator.num_documents}
+      output_dict["idf_vocab"] = output_dict["vocab"]
+      output_dict["idf_counts"] = (
+          [] if tokens is None else accumulator.doc_counts.tolist())
+    if self._approximate:
+      sketch = accumulator._sketch  # pylint: disable=protected-access
+      output_dict["sketch_counts"] = sketch.counts.tolist()
+      if self._compute_idf:
+        output_dict["sketch_doc_counts"] = sketch.doc_counts.tolist()
+    if accumulator.base_vocab is not None:
+      output_dict["base_vocab"] = [
+          tf.compat.as_text(token) if isinstance(token, bytes) else token
+          for token in accumulator.base_vocab
       ]
     return tf.compat.as_bytes(json.dumps(output_dict))
 
-  def deserialize(self, encoded_accumulator):
-    """Deserialize an accumulator received from 'serialize()'."""
+  def _deserialize_json(self, encoded_accumulator):
+    """Deserialize an accumulator serialized as JSON."""
     accumulator_dict = json.loads(tf.compat.as_text(encoded_accumulator))
 
     accumulator = self._create_accumulator()
-    count_dict = dict(
-        zip(accumulator_dict["vocab"], accumulator_dict["vocab_counts"]))
-    accumulator.count_dict.update(count_dict)
+    if self._approximate:
+      sketch = accumulator._sketch  # pylint: disable=protected-access
+      sketch.counts[...] = accumulator_dict["sketch_counts"]
+      if self._compute_idf:
+        sketch.doc_counts[...] = accumulator_dict["sketch_doc_counts"]
 
+    doc_counts = None
     if self._compute_idf:
-      accumulator.data = accumulator_dict["data"]
-      create_dict = lambda x: {"count": x, "last_doc_id": -1}
-      idf_count_dicts = [
-          create_dict(count) for count in accumulator_dict["idf_counts"]
+      accumulator.num_documents = accumulator_dict["data"]["next_doc_id"]
+      idf_counts = dict(
+          zip(accumulator_dict["idf_vocab"], accumulator_dict["idf_counts"]))
+      doc_counts = [idf_counts[token] for token in accumulator_dict["vocab"]]
+    # The counts are in the sketch already, if there is one.
+    accumulator._append(  # pylint: disable=protected-access
+        np.array(accumulator_dict["vocab"]),
+        np.array(accumulator_dict["vocab_counts"], dtype=np.int64),
+        None if doc_counts is None else np.array(doc_counts, dtype=np.int64))
+    if "base_vocab" in accumulator_dict:
+      accumulator.base_vocab = [
+          _vocab_key(token) for token in accumulator_dict["base_vocab"]
       ]
-      idf_dict = dict(zip(accumulator_dict["idf_vocab"], idf_count_dicts))
-      accumulator.per_doc_count_dict.update(idf_dict)
     return accumulator
 
   def _create_accumulator(self):
     """Accumulate a sorted array of vocab tokens and corresponding counts."""
+    if not self._approximate:
+      return _IndexLookupAccumulator(compute_idf=self._compute_idf)
+    width = max(_MIN_SKETCH_WIDTH, _SKETCH_WIDTH_PER_TOKEN * self._vocab_size)
+    sketch = _CountMinSketch(width=width, compute_idf=self._compute_idf)
+    max_candidates = _SKETCH_CANDIDATES_PER_TOKEN * self._vocab_size
+    return _IndexLookupAccumulator(
+        compute_idf=self._compute_idf,
+        sketch=sketch,
+        max_candidates=max_candidates)
+
+  def _flatten(self, values):
+    """Flattens a batch of documents.
 
-    if self._compute_idf:
-      create_default_dict = lambda: {"count": 0, "last_doc_id": -1}
-      per_doc_count_dict = collections.defaultdict(create_default_dict)
-      data = {"next_doc_id": 0}
-    else:
-      per_doc_count_dict = None
-      data = None
+    Args:
+      values: A batch of documents, or a single one. Documents are the rows of
+        a tensor, array or list, or its elements if it has a single dimension.
 
-    count_dict = collections.defaultdict(int)
-    return _IndexLookupAccumulator(data, count_dict, per_doc_count_dict)
+    Returns:
+      A tuple `(tokens, doc_ids, num_documents)`, of the tokens in the batch,
+      the index of the document of each token, and the number of documents.
+      The tokens are an eager tensor when executing eagerly, and otherwise a
+      NumPy array.
+    """
+    if tf_utils.is_ragged(values):
+      if isinstance(values, tf.RaggedTensor) and tf.executing_eagerly():
+        if values.ragged_rank > 1:
+          values = values.merge_dims(1, -1)
+        tokens = tf.reshape(values.flat_values, [-1])
+        doc_ids = values.value_rowids().numpy()
+        return tokens, doc_ids, int(values.nrows())
+      values = base_preprocessing_layer.convert_to_list(values)
+
+    if isinstance(values, (tf.SparseTensor, tf.compat.v1.SparseTensorValue)):
+      default_value = self._mask_value
+      if default_value is None:
+        is_string = tf.as_dtype(values.values.dtype) == tf.string
+        default_value = "" if is_string else -1
+      values = tf.sparse.to_dense(values, default_value=default_value)
+
+    if isinstance(values, tf.Tensor):
+      if not tf.executing_eagerly():
+        values = K.get_value(values)
+      else:
+        shape = values.shape.as_list()
+        tokens = tf.reshape(values, [-1])
+        return (tokens,) + _document_ids(shape, tokens.shape[0])
+
+    if isinstance(values, (list, tuple)) or (
+        isinstance(values, np.ndarray) and values.dtype == object):
+      try:
+        values = np.array(values)
+        is_ragged = values.dtype == object and any(
+            isinstance(v, (list, np.ndarray)) for v in values.flat)
+      except ValueError:
+        is_ragged = True
+      if is_ragged:
+        documents = [
+            v if isinstance(v, (list, np.ndarray)) else [v] for v in values
+        ]
+        tokens = np.array(list(itertools.chain.from_iterable(documents)))
+        doc_ids = np.repeat(
+            np.arange(len(documents)), [len(d) for d in documents])
+        return tokens, doc_ids, len(documents)
+
+    values = np.asarray(values)
+    tokens = values.reshape(-1)
+    return (tokens,) + _document_ids(values.shape, tokens.shape[0])
 
   def _inverse_document_frequency(self, document_counts, num_documents):
     """Computes the inverse-document-frequency (IDF) component of TFIDF.
@@ -740,3 +1131,152 @@ class _IndexLookupCombiner(base_preprocessing_layer.Combiner):
       An array of "inverse document frequency" weights.
     """
     return np.log(1 + num_documents / (1 + np.array(document_counts)))
+
+
+def _unique_with_counts(tokens):
+  """Returns the sorted unique tokens, the index of each token and counts."""
+  if isinstance(tokens, tf.Tensor):
+    unique, indices, counts = tf.unique_with_counts(tokens, out_idx=tf.int64)
+    unique, indices, counts = unique.numpy(), indices.numpy(), counts.numpy()
+    # The unique tokens are in order of first occurrence.
+    order = np.argsort(unique, kind="stable")
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(order.shape[0])
+    return unique[order], ranks[indices], counts[order]
+  unique, indices, counts = np.unique(
+      tokens, return_inverse=True, return_counts=True)
+  return unique, indices.reshape(-1), counts
+
+
+def _document_ids(shape, num_tokens):
+  """Returns the document ids and count of the flattened tokens of `shape`."""
+  if not shape:
+    return np.zeros((num_tokens,), dtype=np.int64), 1
+  num_documents = shape[0]
+  tokens_per_document = num_tokens // num_documents if num_documents else 0
+  return (np.repeat(np.arange(num_documents), tokens_per_document),
+          num_documents)
+
+
+def _sum_counts(chunks):
+  """Sums the counts of `(tokens, counts, doc_counts)` chunks by token."""
+  tokens = np.concatenate([chunk[0] for chunk in chunks])
+  unique, indices = np.unique(tokens, return_inverse=True)
+  indices = indices.reshape(-1)
+
+  def total(i):
+    if chunks[0][i] is None:
+      return None
+    weights = np.concatenate([chunk[i] for chunk in chunks])
+    return np.bincount(
+        indices, weights=weights, minlength=unique.shape[0]).astype(np.int64)
+
+  return unique, total(1), total(2)
+
+
+def _join_counts(base, new):
+  """Adds the counts of sorted unique tokens `new` to `base`."""
+  tokens, counts, doc_counts = base
+  new_tokens, new_counts, new_doc_counts = new
+  dtype = np.promote_types(tokens.dtype, new_tokens.dtype)
+  tokens = tokens.astype(dtype, copy=False)
+  new_tokens = new_tokens.astype(dtype, copy=False)
+
+  positions = np.searchsorted(tokens, new_tokens)
+  found = positions < tokens.shape[0]
+  found[found] = tokens[positions[found]] == new_tokens[found]
+  missing = np.logical_not(found)
+
+  def join(values, new_values):
+    if values is None:
+      return None
+    values = values.copy()
+    values[positions[found]] += new_values[found]
+    return np.insert(values, positions[missing], new_values[missing])
+
+  return (np.insert(tokens, positions[missing], new_tokens[missing]),
+          join(counts, new_counts), join(doc_counts, new_doc_counts))
+
+
+def _token_mask(tokens, token):
+  """Returns where `token` is in the array `tokens`."""
+  kind = tokens.dtype.kind
+  if ((kind in "iu" and not isinstance(token, (int, np.integer))) or
+      (kind == "U" and not isinstance(token, str)) or
+      (kind == "S" and not isinstance(token, bytes))):
+    return np.zeros(tokens.shape, dtype=bool)
+  return np.asarray(tokens == token, dtype=bool)
+
+
+def _vocab_key(token):
+  """Returns `token` as the layer's lookup table returns it.
+
+  String tokens are returned as `bytes` and integer tokens as `int`, so tokens
+  from the table and from NumPy inputs compare equal.
+  """
+  if isinstance(token, np.generic):
+    token = token.item()
+  if isinstance(token, str):
+    return token.encode("utf-8")
+  return token
+
+
+def _fingerprint(tokens):
+  """Returns stable 64-bit fingerprints of an array of tokens."""
+  if tokens.dtype.kind in "iub":
+    return tokens.astype(np.int64).view(np.uint64)
+  tokens = _as_fixed_width_bytes(tokens)
+  # Hash the tokens 8 bytes at a time, with one vectorized step per column of
+  # the zero-padded words of the fixed-width strings. All-zero words are only
+  # padding, so they are skipped and the fingerprint of a token does not depend
+  # on the width of the array.
+  width = tokens.dtype.itemsize
+  num_words = max(-(-width // 8), 1)
+  padded = np.zeros((tokens.shape[0], num_words * 8), dtype=np.uint8)
+  padded[:, :width] = tokens.view(np.uint8).reshape((tokens.shape[0], width))
+  words = padded.view("<u8")
+  fingerprints = np.zeros((tokens.shape[0],), dtype=np.uint64)
+  for column in range(num_words):
+    word = words[:, column].astype(np.uint64)
+    fingerprints = np.where(
+        word != 0, _mix64(fingerprints ^ word), fingerprints)
+  return fingerprints
+
+
+def _as_fixed_width_bytes(tokens):
+  """Returns an array of string tokens as a UTF-8 `np.bytes_` array."""
+  if tokens.dtype.kind == "S":
+    return tokens
+  try:
+    # NumPy copies `bytes` and ASCII `str` tokens, such as the tokens of
+    # tensors, without calling Python for each token.
+    return tokens.astype(np.bytes_)
+  except UnicodeEncodeError:
+    if tokens.dtype.kind == "U":
+      return np.char.encode(tokens, "utf-8")
+    # Only arrays mixing `bytes` with non-ASCII `str` tokens get here.
+    return np.array([tf.compat.as_bytes(token) for token in tokens.tolist()],
+                    dtype=np.bytes_)
+
+
+def _mix64(x):
+  """Mixes every bit of `x` into every bit of the result, as splitmix64."""
+  with np.errstate(over="ignore"):
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _hash_to_bucket(fingerprints, seed, num_buckets):
+  """Hashes fingerprints to `[0, num_buckets)`, independently for each seed."""
+  with np.errstate(over="ignore"):
+    x = fingerprints + np.uint64((seed + 1) * 0x9E3779B97F4A7C15 % 2**64)
+  return (_mix64(x) % np.uint64(num_buckets)).astype(np.intp)
+
+
+def _conservative_update(table, buckets, counts):
+  """Adds `counts` to a count-min sketch `table`, by conservative update."""
+  estimates = np.min([table[row][b] for row, b in enumerate(buckets)], axis=0)
+  estimates += counts
+  for row, b in enumerate(buckets):
+    np.maximum.at(table[row], b, estimates)
@@ -692,6 +692,126 @@ class CategoricalEncodingAdaptTest(
     layer.adapt(batched_ds)
 
 
+@keras_parameterized.run_all_keras_modes(always_skip_v1=True)
+class IndexLookupIncrementalAdaptTest(
+    keras_parameterized.TestCase,
+    preprocessing_test_utils.PreprocessingLayerTest):
+
+  def test_incremental_adapt_keeps_indices(self):
+    layer = get_layer_class()(
+        max_tokens=None,
+        num_oov_indices=1,
+        mask_token="",
+        oov_token="[OOV]",
+        dtype=tf.string)
+    layer.adapt(np.array([["earth", "wind", "earth"], ["fire", "earth", ""]]))
+    self.assertAllEqual(["", "[OOV]", "earth", "wind", "fire"],
+                        layer.get_vocabulary())
+
+    # "michigan" is now the most frequent token, but is appended after the
+    # existing tokens.
+    layer.adapt(
+        np.array([["michigan", "michigan", "fire"], ["michigan", "and", ""]]),
+        reset_state=False)
+    self.assertAllEqual(
+        ["", "[OOV]", "earth", "wind", "fire", "michigan", "and"],
+        layer.get_vocabulary())
+
+    # A full adapt ranks all the tokens again.
+    layer.adapt(np.array([["michigan", "michigan", "fire"]]))
+    self.assertAllEqual(["", "[OOV]", "michigan", "fire"],
+                        layer.get_vocabulary())
+
+  def test_incremental_adapt_respects_max_tokens(self):
+    layer = get_layer_class()(
+        max_tokens=5,
+        num_oov_indices=1,
+        mask_token="",
+        oov_token="[OOV]",
+        dtype=tf.string)
+    layer.adapt(np.array(["earth", "wind", "earth"]))
+    layer.adapt(
+        np.array(["fire", "michigan", "michigan", "wind"]), reset_state=False)
+    self.assertAllEqual(["", "[OOV]", "earth", "wind", "michigan"],
+                        layer.get_vocabulary())
+
+    layer.adapt(np.array(["fire", "fire", "fire"]), reset_state=False)
+    self.assertAllEqual(["", "[OOV]", "earth", "wind", "michigan"],
+                        layer.get_vocabulary())
+
+  def test_incremental_adapt_int_vocab(self):
+    layer = get_layer_class()(
+        max_tokens=None,
+        num_oov_indices=1,
+        mask_token=0,
+        oov_token=-1,
+        dtype=tf.int64)
+    layer.adapt(np.array([[42, 42, 1138]], dtype=np.int64))
+    layer.adapt(np.array([[1729, 1729, 42]], dtype=np.int64), reset_state=False)
+    self.assertAllEqual([0, -1, 42, 1138, 1729], layer.get_vocabulary())
+
+  def test_incremental_adapt_tfidf_uses_previous_counts(self):
+    layer = get_layer_class()(
+        max_tokens=None,
+        num_oov_indices=1,
+        mask_token="",
+        oov_token="[OOV]",
+        output_mode=index_lookup.TFIDF,
+        keep_adapt_counts=True,
+        dtype=tf.string)
+    layer.adapt(np.array([["earth", "wind"], ["earth", "fire"]]))
+    layer.adapt(np.array([["earth", "michigan"]]), reset_state=False)
+    self.assertAllEqual(["", "[OOV]", "earth", "wind", "fire", "michigan"],
+                        layer.get_vocabulary())
+
+    # The document frequencies are counted over the 3 documents.
+    expected_idf_weights = np.log(1 + 3 / (1 + np.array([3, 1, 1, 1])))
+    self.assertAllClose(expected_idf_weights,
+                        keras.backend.get_value(layer.tf_idf_weights)[2:])
+
+  def test_incremental_adapt_keeps_no_counts_by_default(self):
+    layer = get_layer_class()(
+        max_tokens=None,
+        num_oov_indices=1,
+        mask_token="",
+        oov_token="[OOV]",
+        dtype=tf.string)
+    layer.adapt(np.array([["earth", "wind", "wind", "fire", "fire", "fire"]]))
+    self.assertIsNone(layer._vocab_accumulator)
+    self.assertFalse(layer.get_config()["keep_adapt_counts"])
+
+    # The new tokens are ranked by their counts in the new data.
+    layer.adapt(
+        np.array([["and", "michigan", "michigan", "wind"]]), reset_state=False)
+    self.assertAllEqual(
+        ["", "[OOV]", "fire", "wind", "earth", "michigan", "and"],
+        layer.get_vocabulary())
+
+  def test_incremental_adapt_keep_adapt_counts(self):
+    layer = get_layer_class()(
+        max_tokens=None,
+        num_oov_indices=1,
+        mask_token="",
+        oov_token="[OOV]",
+        keep_adapt_counts=True,
+        dtype=tf.string)
+    layer.adapt(np.array([["earth", "wind", "wind", "fire", "fire", "fire"]]))
+    self.assertIsNotNone(layer._vocab_accumulator)
+    self.assertTrue(layer.get_config()["keep_adapt_counts"])
+
+  def test_incremental_adapt_tfidf_without_counts_fails(self):
+    layer = get_layer_class()(
+        max_tokens=None,
+        num_oov_indices=1,
+        mask_token="",
+        oov_token="[OOV]",
+        output_mode=index_lookup.TFIDF,
+        dtype=tf.string)
+    layer.set_vocabulary(["earth", "wind"], idf_weights=[.5, .5])
+    with self.assertRaisesRegex(ValueError, "document frequencies"):
+      layer.adapt(np.array([["earth", "michigan"]]), reset_state=False)
+
+
 @keras_parameterized.run_all_keras_modes
 class IndexLookupOutputTest(keras_parameterized.TestCase,
                             preprocessing_test_utils.PreprocessingLayerTest):
@@ -1533,7 +1653,7 @@ class IndexLookupStringCombinerTest(
   compare_accumulators = compare_text_accumulators
 
   def update_accumulator(self, accumulator, data):
-    accumulator.count_dict.update(dict(zip(data["vocab"], data["counts"])))
+    accumulator.update(data["vocab"], data["counts"])
 
     return accumulator
 
@@ -1655,6 +1775,64 @@ class IndexLookupStringCombinerTest(
     self.validate_accumulator_computation(combiner, data, expected_accumulator)
     self.validate_accumulator_extract(combiner, data, expected_extract_output)
 
+  def test_combiner_idf_weights(self):
+    data = np.array([["earth", "wind", "wind"], ["fire", "wind", ""],
+                     ["earth", "", ""]])
+    combiner = index_lookup._IndexLookupCombiner(
+        mask_value="", compute_idf=True)
+    accumulator = combiner.merge(
+        [combiner.compute(data[:1]),
+         combiner.compute(data[1:])])
+    accumulator = combiner.deserialize(combiner.serialize(accumulator))
+    output = combiner.extract(accumulator)
+    self.assertAllEqual(["wind", "earth", "fire"], output["vocab"])
+    self.assertAllClose(np.log(1 + 3 / (1 + np.array([2, 2, 1]))),
+                        output["idf_weights"])
+
+  def test_combiner_json_accumulator_fallback(self):
+    data = np.array([["earth", "wind", "and", "fire"],
+                     ["earth", "wind", "and", "michigan"]])
+    combiner = index_lookup._IndexLookupCombiner(compute_idf=True)
+    accumulator = combiner.compute(data)
+    encoded = combiner.serialize(accumulator)
+    json_encoded = combiner._serialize_json(accumulator)
+    self.compare_accumulators(accumulator, combiner.deserialize(encoded))
+    self.compare_accumulators(accumulator, combiner.deserialize(json_encoded))
+    self.assertAllClose(
+        combiner.extract(combiner.deserialize(encoded))["idf_weights"],
+        combiner.extract(combiner.deserialize(json_encoded))["idf_weights"])
+
+  def test_combiner_approximate_top_k(self):
+    # Few tokens are frequent, and many are rare.
+    frequent = ["token_%s" % i for i in range(10)]
+    rare = ["rare_%s" % i for i in range(1000)]
+    data = np.array(frequent * 20 + rare).reshape((-1, 10))
+    combiner = index_lookup._IndexLookupCombiner(vocab_size=10,
+                                                 approximate=True)
+    accumulator = combiner.compute(data)
+    # Only candidates for the vocab are kept.
+    self.assertLess(len(accumulator.count_dict), len(frequent) + len(rare))
+    accumulator = combiner.deserialize(combiner.serialize(accumulator))
+    output = combiner.extract(accumulator)
+    self.assertAllEqual(sorted(frequent), sorted(output["vocab"]))
+
+  def test_fingerprint(self):
+    tokens = ["earth", "wind", "\u00e9t\u00e9", "a" * 20, ""]
+    fingerprints = index_lookup._fingerprint(np.array(tokens))
+    self.assertLen(set(fingerprints.tolist()), len(tokens))
+    # Tokens have the same fingerprint as `str` or `bytes`, whatever the width
+    # of the array.
+    encoded = [token.encode("utf-8") for token in tokens]
+    self.assertAllEqual(fingerprints,
+                        index_lookup._fingerprint(np.array(encoded)))
+    self.assertAllEqual(
+        fingerprints,
+        index_lookup._fingerprint(np.array(encoded + ["x" * 50])[:-1]))
+    self.assertAllEqual(
+        fingerprints,
+        index_lookup._fingerprint(np.array(encoded[:2] + tokens[2:],
+                                           dtype=object)))
+
 
 @keras_parameterized.run_all_keras_modes
 class IndexLookupIntCombinerTest(keras_parameterized.TestCase,
@@ -1670,7 +1848,7 @@ class IndexLookupIntCombinerTest(keras_parameterized.TestCase,
   compare_accumulators = compare_text_accumulators
 
   def update_accumulator(self, accumulator, data):
-    accumulator.count_dict.update(dict(zip(data["vocab"], data["counts"])))
+    accumulator.update(data["vocab"], data["counts"])
 
     return accumulator
 
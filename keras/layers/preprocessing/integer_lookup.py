@@ -19,6 +19,8 @@ from __future__ import division
 from __future__ import print_function
 
 import tensorflow.compat.v2 as tf
+
+import numpy as np
 from keras.engine import base_preprocessing_layer
 from keras.layers.preprocessing import index_lookup
 from keras.layers.preprocessing import table_utils
@@ -79,8 +81,15 @@ class IntegerLookup(index_lookup.IndexLookup):
       the number of unique tokens in the vocabulary is less than max_tokens,
       resulting in a tensor of shape [batch_size, max_tokens] regardless of
       vocabulary size. Defaults to True.
-    sparse: Boolean. Only applicable to "binary" and "count" output modes.
-      If true, returns a `SparseTensor` instead of a dense `Tensor`.
+    sparse: Boolean. Only applicable to "binary", "count" and "tf-idf" output
+      modes. If true, returns a `SparseTensor` instead of a dense `Tensor`.
+      Defaults to `False`.
+    lazy_vocabulary_file: Boolean. Only applicable if `vocabulary` is a path
+      to a file, and `invert` is False. If true, the lookup table is
+      initialized from the file by TensorFlow, without reading the vocabulary
+      in Python, and `get_vocabulary()` returns a sequence reading the file a
+      page at a time. The file is then not checked for repeated tokens, and the
+      vocabulary cannot be changed. Not supported in "tf-idf" mode.
       Defaults to `False`.
 
   Examples:
@@ -257,6 +266,7 @@ class IntegerLookup(index_lookup.IndexLookup):
                output_mode=index_lookup.INT,
                sparse=False,
                pad_to_max_values=False,
+               lazy_vocabulary_file=False,
                **kwargs):
     allowed_dtypes = [tf.int64]
 
@@ -278,10 +288,20 @@ class IntegerLookup(index_lookup.IndexLookup):
           "num_oov_indices must be greater than or equal to 0. You passed %s" %
           (num_oov_indices,))
 
-    if vocabulary is not None:
-      if isinstance(vocabulary, str):
-        vocabulary = table_utils.get_vocabulary_from_file(vocabulary)
-        vocabulary = [int(v) for v in vocabulary]
+    vocabulary_path = None
+    if isinstance(vocabulary, str) and lazy_vocabulary_file:
+      if invert or output_mode == index_lookup.TFIDF:
+        raise ValueError("`lazy_vocabulary_file` is not supported with "
+                         "`invert=True` or in TF-IDF mode.")
+      vocabulary_path = vocabulary
+      num_special_tokens = (0 if mask_value is None else 1) + num_oov_indices
+      vocabulary = table_utils.get_vocabulary_file_initializer(
+          vocabulary_path, tf.int64, num_special_tokens)
+    elif isinstance(vocabulary, str):
+      vocabulary = table_utils.get_vocabulary_from_file(vocabulary)
+      vocabulary = [int(v) for v in vocabulary]
+
+    self.lazy_vocabulary_file = lazy_vocabulary_file
 
     super(IntegerLookup, self).__init__(
         max_tokens=max_values,
@@ -296,6 +316,12 @@ class IntegerLookup(index_lookup.IndexLookup):
         **kwargs)
     base_preprocessing_layer.keras_kpl_gauge.get_cell("IntegerLookup").set(True)
 
+    if vocabulary_path is not None:
+      special_values = [] if mask_value is None else [mask_value]
+      special_values.extend([oov_value] * num_oov_indices)
+      self._vocabulary_file = table_utils.VocabularyFile(
+          vocabulary_path, special_values, decode_fn=np.int64)
+
   def get_config(self):
     base_config = super(IntegerLookup, self).get_config()
     # Because the super config has a bunch of args we're also passing,
@@ -312,6 +338,7 @@ class IntegerLookup(index_lookup.IndexLookup):
     base_config["pad_to_max_values"] = base_config["pad_to_max_tokens"]
     del base_config["pad_to_max_tokens"]
 
+    base_config["lazy_vocabulary_file"] = self.lazy_vocabulary_file
     return base_config
 
   def set_vocabulary(self, vocab, idf_weights=None):
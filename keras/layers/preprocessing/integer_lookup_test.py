@@ -472,6 +472,21 @@ class IntegerLookupVocabularyTest(
     output_dataset = model.predict(input_array)
     self.assertAllEqual(expected_output, output_dataset)
 
+  def test_int_output_lazy_vocab_file(self):
+    vocab_list = [42, 1138, 725, 1729]
+    vocab_path = self._write_to_temp_file("vocab_file", vocab_list)
+
+    input_array = np.array([[42, 1138, 725, 1729], [1729, 725, 42, 203]])
+    expected_output = [[2, 3, 4, 5], [5, 4, 2, 1]]
+
+    input_data = keras.Input(shape=(None,), dtype=tf.int64)
+    layer = get_layer_class()(vocabulary=vocab_path, lazy_vocabulary_file=True)
+    int_data = layer(input_data)
+    model = keras.Model(inputs=input_data, outputs=int_data)
+    output_dataset = model.predict(input_array)
+    self.assertAllEqual(expected_output, output_dataset)
+    self.assertAllEqual([0, -1] + vocab_list, list(layer.get_vocabulary()))
+
   def test_int_output_explicit_vocab_from_file_via_setter(self):
     vocab_list = [42, 1138, 725, 1729]
     vocab_path = self._write_to_temp_file("vocab_file", vocab_list)
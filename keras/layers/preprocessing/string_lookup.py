@@ -19,6 +19,9 @@ from __future__ import division
 from __future__ import print_function
 
 import tensorflow.compat.v2 as tf
+
+import codecs
+
 from keras.engine import base_preprocessing_layer
 from keras.layers.preprocessing import index_lookup
 from keras.layers.preprocessing import table_utils
@@ -80,8 +83,16 @@ class StringLookup(index_lookup.IndexLookup):
       the number of unique tokens in the vocabulary is less than max_tokens,
       resulting in a tensor of shape [batch_size, max_tokens] regardless of
       vocabulary size. Defaults to True.
-    sparse: Boolean. Only applicable to "binary" and "count" output modes.
-      If true, returns a `SparseTensor` instead of a dense `Tensor`.
+    sparse: Boolean. Only applicable to "binary", "count" and "tf-idf" output
+      modes. If true, returns a `SparseTensor` instead of a dense `Tensor`.
+      Defaults to `False`.
+    lazy_vocabulary_file: Boolean. Only applicable if `vocabulary` is a path
+      to a file, and `invert` is False. If true, the lookup table is
+      initialized from the file by TensorFlow, without reading the vocabulary
+      in Python, and `get_vocabulary()` returns a sequence reading the file a
+      page at a time. The file is then not checked for repeated tokens, and the
+      vocabulary cannot be changed. Not supported in "tf-idf" mode, or with
+      an `encoding` other than UTF-8.
       Defaults to `False`.
 
   Examples:
@@ -258,6 +269,7 @@ class StringLookup(index_lookup.IndexLookup):
                output_mode=index_lookup.INT,
                sparse=False,
                pad_to_max_tokens=False,
+               lazy_vocabulary_file=False,
                **kwargs):
     allowed_dtypes = [tf.string]
 
@@ -271,11 +283,23 @@ class StringLookup(index_lookup.IndexLookup):
     if encoding is None:
       encoding = "utf-8"
 
-    if vocabulary is not None:
-      if isinstance(vocabulary, str):
-        vocabulary = table_utils.get_vocabulary_from_file(vocabulary, encoding)
+    vocabulary_path = None
+    if isinstance(vocabulary, str) and lazy_vocabulary_file:
+      if invert or output_mode == index_lookup.TFIDF:
+        raise ValueError("`lazy_vocabulary_file` is not supported with "
+                         "`invert=True` or in TF-IDF mode.")
+      if codecs.lookup(encoding).name != "utf-8":
+        raise ValueError("`lazy_vocabulary_file` requires a UTF-8 encoding, "
+                         "got {}.".format(encoding))
+      vocabulary_path = vocabulary
+      num_special_tokens = (0 if mask_token is None else 1) + num_oov_indices
+      vocabulary = table_utils.get_vocabulary_file_initializer(
+          vocabulary_path, tf.string, num_special_tokens)
+    elif isinstance(vocabulary, str):
+      vocabulary = table_utils.get_vocabulary_from_file(vocabulary, encoding)
 
     self.encoding = encoding
+    self.lazy_vocabulary_file = lazy_vocabulary_file
 
     super(StringLookup, self).__init__(
         max_tokens=max_tokens,
@@ -290,12 +314,23 @@ class StringLookup(index_lookup.IndexLookup):
         **kwargs)
     base_preprocessing_layer.keras_kpl_gauge.get_cell("StringLookup").set(True)
 
+    if vocabulary_path is not None:
+      special_tokens = [] if mask_token is None else [mask_token]
+      special_tokens.extend([oov_token] * num_oov_indices)
+      self._vocabulary_file = table_utils.VocabularyFile(
+          vocabulary_path, special_tokens, decode_fn=tf.compat.as_text)
+
   def get_config(self):
-    config = {"encoding": self.encoding}
+    config = {
+        "encoding": self.encoding,
+        "lazy_vocabulary_file": self.lazy_vocabulary_file,
+    }
     base_config = super(StringLookup, self).get_config()
     return dict(list(base_config.items()) + list(config.items()))
 
   def get_vocabulary(self):
+    if self._vocabulary_file is not None:
+      return self._vocabulary_file
     if self._table_handler.vocab_size() == 0:
       return []
 
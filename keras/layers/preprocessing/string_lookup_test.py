@@ -247,6 +247,32 @@ class StringLookupVocabularyTest(keras_parameterized.TestCase,
     output_data = model.predict(input_array)
     self.assertAllEqual(expected_output, output_data)
 
+  def test_int_output_lazy_vocab_file(self):
+    vocab_list = ["earth", "wind", "and", "fire"]
+    vocab_path = self._write_to_temp_file("vocab_file", vocab_list)
+
+    input_array = np.array([["earth", "wind", "and", "fire"],
+                            ["fire", "and", "earth", "michigan"]])
+    expected_output = [[2, 3, 4, 5], [5, 4, 2, 1]]
+
+    input_data = keras.Input(shape=(None,), dtype=tf.string)
+    layer = get_layer_class()(vocabulary=vocab_path, lazy_vocabulary_file=True)
+    int_data = layer(input_data)
+    model = keras.Model(inputs=input_data, outputs=int_data)
+    output_data = model.predict(input_array)
+    self.assertAllEqual(expected_output, output_data)
+
+    layer_vocab = layer.get_vocabulary()
+    self.assertAllEqual(["", "[UNK]"] + vocab_list, list(layer_vocab))
+    self.assertEqual("fire", layer_vocab[-1])
+    self.assertIsInstance(layer_vocab[2], six.text_type)
+
+  def test_lazy_vocab_file_with_invert_fails(self):
+    vocab_path = self._write_to_temp_file("vocab_file", ["earth", "wind"])
+    with self.assertRaisesRegex(ValueError, "lazy_vocabulary_file"):
+      _ = get_layer_class()(
+          vocabulary=vocab_path, lazy_vocabulary_file=True, invert=True)
+
   def test_non_unique_vocab_fails(self):
     vocab_data = ["earth", "wind", "and", "fire", "fire"]
     with self.assertRaisesRegex(ValueError, ".*repeated term.*fire.*"):
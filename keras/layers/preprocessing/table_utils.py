@@ -20,12 +20,18 @@ from __future__ import print_function
 import tensorflow.compat.v2 as tf
 
 import collections
+import collections.abc as collections_abc
 import os
 import numpy as np
 from keras import backend as K
 from keras.utils import tf_utils
 from tensorflow.python.ops import lookup_ops
 
+# Number of lines of a vocabulary file read at a time by `VocabularyFile`.
+_VOCABULARY_PAGE_SIZE = 2**14
+# Number of bytes read at a time when indexing the pages of a vocabulary file.
+_VOCABULARY_CHUNK_SIZE = 2**24
+
 
 class TableHandler(object):
   """Wrapper object that holds a lookup table and provides accessors."""
@@ -214,6 +220,136 @@ def get_vocabulary_from_file(vocabulary_path, encoding="utf-8"):
   return vocab
 
 
+def get_vocabulary_file_initializer(vocabulary_path, key_dtype,
+                                    num_special_tokens):
+  """Returns an initializer of a static table from a vocabulary file.
+
+  The table is initialized by TensorFlow from the file directly, without
+  reading the vocabulary in Python.
+
+  Args:
+    vocabulary_path: Path of a file with one token per line.
+    key_dtype: The dtype of the tokens.
+    num_special_tokens: The number of indices reserved for the mask and OOV
+      tokens, before the index of the first token of the file.
+
+  Returns:
+    A `tf.lookup.TextFileInitializer` mapping each token to its index.
+  """
+  return tf.lookup.TextFileInitializer(
+      filename=vocabulary_path,
+      key_dtype=key_dtype,
+      key_index=tf.lookup.TextFileIndex.WHOLE_LINE,
+      value_dtype=tf.int64,
+      value_index=tf.lookup.TextFileIndex.LINE_NUMBER,
+      value_index_offset=num_special_tokens)
+
+
+class VocabularyFile(collections_abc.Sequence):
+  """A vocabulary read lazily from a file with one token per line.
+
+  The first access indexes where each page of `page_size` lines starts in the
+  file, without decoding it. Tokens are then read and decoded a page at a time,
+  so only the offsets of the pages and the last page read are held in memory.
+
+  Args:
+    path: Path of the vocabulary file.
+    special_tokens: Tokens preceding the tokens of the file in the vocabulary,
+      e.g. the mask and OOV tokens.
+    decode_fn: A function converting the bytes of a line to a token. Defaults
+      to returning the bytes.
+    page_size: Number of lines read at a time.
+  """
+
+  def __init__(self,
+               path,
+               special_tokens=(),
+               decode_fn=None,
+               page_size=_VOCABULARY_PAGE_SIZE):
+    self.path = path
+    self._special_tokens = list(special_tokens)
+    self._decode_fn = decode_fn
+    self._page_size = page_size
+    self._num_lines = None
+    self._page_offsets = None
+    self._page = (None, None)
+
+  def __len__(self):
+    self._index_pages()
+    return len(self._special_tokens) + self._num_lines
+
+  def __getitem__(self, index):
+    if isinstance(index, slice):
+      return [self[i] for i in range(*index.indices(len(self)))]
+    size = len(self)
+    if index < 0:
+      index += size
+    if not 0 <= index < size:
+      raise IndexError("Vocabulary index out of range.")
+    if index < len(self._special_tokens):
+      return self._special_tokens[index]
+    line = index - len(self._special_tokens)
+    return self._read_page(line // self._page_size)[line % self._page_size]
+
+  def __iter__(self):
+    for token in self._special_tokens:
+      yield token
+    self._index_pages()
+    for page in range(len(self._page_offsets) - 1):
+      for token in self._read_page(page):
+        yield token
+
+  def _index_pages(self):
+    """Finds the offset in the file of the first line of each page."""
+    if self._num_lines is not None:
+      return
+    page_offsets = [0]
+    num_lines = 0
+    size = 0
+    last_byte = b""
+    with tf.io.gfile.GFile(self.path, "rb") as reader:
+      while True:
+        chunk = reader.read(_VOCABULARY_CHUNK_SIZE)
+        if not chunk:
+          break
+        newlines = np.flatnonzero(
+            np.frombuffer(chunk, dtype=np.uint8) == ord("\n"))
+        # The line after the i-th newline of the chunk starts a page if its
+        # number is a multiple of the page size.
+        line_numbers = num_lines + 1 + np.arange(newlines.size)
+        starts = newlines[line_numbers % self._page_size == 0] + size + 1
+        page_offsets.extend(starts.tolist())
+        num_lines += newlines.size
+        size += len(chunk)
+        last_byte = chunk[-1:]
+    if last_byte and last_byte != b"\n":
+      # The last line has no trailing newline.
+      num_lines += 1
+    if page_offsets[-1] == size:
+      # A page can't start at the end of the file.
+      page_offsets.pop()
+    self._page_offsets = np.array(page_offsets + [size], dtype=np.int64)
+    self._num_lines = num_lines
+
+  def _read_page(self, page):
+    """Returns the tokens of a page, as a list."""
+    if self._page[0] == page:
+      return self._page[1]
+    start, end = self._page_offsets[page:page + 2].tolist()
+    with tf.io.gfile.GFile(self.path, "rb") as reader:
+      reader.seek(start)
+      lines = reader.read(end - start).split(b"\n")
+    if lines and not lines[-1]:
+      lines.pop()
+    tokens = []
+    for line in lines:
+      if line.endswith(b"\r"):
+        line = line[:-1]
+      tokens.append(line if self._decode_fn is None else self._decode_fn(line))
+    self._page = (page, tokens)
+    return tokens
+
+
 def validate_vocabulary_is_unique(vocabulary):
   """Validate that a vocabulary contains no repeated tokens."""
   vocabulary_set = set(vocabulary)
@@ -441,5 +441,44 @@ class GetVocabularyFromFileTest(tf.test.TestCase):
     actual = table_utils.get_vocabulary_from_file(self._vocab_path)
     self.assertAllEqual(["line1", "line2", "line3"], actual)
 
+
+class VocabularyFileTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(VocabularyFileTest, self).setUp()
+    dir_path = tempfile.mkdtemp(prefix=tf.compat.v1.test.get_temp_dir())
+    self._vocab_path = os.path.join(dir_path, "vocab")
+
+  def _write(self, content):
+    with tf.io.gfile.GFile(self._vocab_path, "wb") as writer:
+      writer.write(content)
+
+  def test_pages(self):
+    tokens = ["token_%d" % i for i in range(10)]
+    self._write(("\n".join(tokens) + "\n").encode("utf-8"))
+    for page_size in [1, 3, 10, 100]:
+      vocab = table_utils.VocabularyFile(
+          self._vocab_path, ["[UNK]"],
+          decode_fn=tf.compat.as_text,
+          page_size=page_size)
+      self.assertLen(vocab, 11)
+      self.assertEqual(["[UNK]"] + tokens, list(vocab))
+      self.assertEqual("[UNK]", vocab[0])
+      self.assertEqual("token_9", vocab[-1])
+      self.assertEqual(["token_4", "token_6"], vocab[5:9:2])
+      with self.assertRaises(IndexError):
+        _ = vocab[11]
+
+  def test_windows_file_without_trailing_newline(self):
+    self._write(b"line1\r\n\r\nline3")
+    vocab = table_utils.VocabularyFile(self._vocab_path, page_size=2)
+    self.assertEqual([b"line1", b"", b"line3"], list(vocab))
+
+  def test_empty_file(self):
+    self._write(b"")
+    vocab = table_utils.VocabularyFile(self._vocab_path, ["", "[UNK]"])
+    self.assertEqual(["", "[UNK]"], list(vocab))
+
+
 if __name__ == "__main__":
   tf.test.main()
@@ -150,6 +150,9 @@ class TextVectorization(base_preprocessing_layer.CombinerPreprocessingLayer):
       containing a vocabulary to load into this layer. The file should contain
       one token per line. If the list or file contains the same token multiple
       times, an error will be thrown.
+    sparse: Boolean. Only applicable to "binary", "count" and "tf-idf" output
+      modes. If True, returns a `SparseTensor` instead of a dense `Tensor`,
+      which a `Dense` layer consumes with a sparse matmul. Defaults to False.
 
   Example:
 
@@ -242,6 +245,7 @@ class TextVectorization(base_preprocessing_layer.CombinerPreprocessingLayer):
                output_sequence_length=None,
                pad_to_max_tokens=True,
                vocabulary=None,
+               sparse=False,
                **kwargs):
 
     # This layer only applies to string processing, and so should only have
@@ -297,6 +301,10 @@ class TextVectorization(base_preprocessing_layer.CombinerPreprocessingLayer):
       raise ValueError("`output_sequence_length` must not be set if "
                        "`output_mode` is not 'int'.")
 
+    if sparse and output_mode in (None, INT):
+      raise ValueError("`sparse` may only be set if `output_mode` is "
+                       "'binary', 'count' or 'tf-idf'.")
+
     # If max_tokens is set, the value must be greater than 1 - otherwise we
     # are creating a 0-element vocab, which doesn't make sense.
     if max_tokens is not None and max_tokens < 1:
@@ -320,6 +328,7 @@ class TextVectorization(base_preprocessing_layer.CombinerPreprocessingLayer):
     self._output_mode = output_mode
     self._output_sequence_length = output_sequence_length
     self._pad_to_max = pad_to_max_tokens
+    self._sparse = sparse
     self._vocab_size = 0
 
     super(TextVectorization, self).__init__(
@@ -334,7 +343,8 @@ class TextVectorization(base_preprocessing_layer.CombinerPreprocessingLayer):
         mask_token=mask_token,
         vocabulary=vocabulary,
         pad_to_max_tokens=pad_to_max_tokens,
-        output_mode=output_mode if output_mode is not None else INT)
+        output_mode=output_mode if output_mode is not None else INT,
+        sparse=sparse)
 
   def _get_index_lookup_class(self):
     return string_lookup.StringLookup
@@ -365,6 +375,8 @@ class TextVectorization(base_preprocessing_layer.CombinerPreprocessingLayer):
   def compute_output_signature(self, input_spec):
     output_shape = self.compute_output_shape(input_spec.shape.as_list())
     output_dtype = tf.int64 if self._output_mode == INT else K.floatx()
+    if self._sparse:
+      return tf.SparseTensorSpec(shape=output_shape, dtype=output_dtype)
     return tf.TensorSpec(shape=output_shape, dtype=output_dtype)
 
   def adapt(self, data, reset_state=True):
@@ -412,6 +424,10 @@ class TextVectorization(base_preprocessing_layer.CombinerPreprocessingLayer):
           "adapt() requires a Dataset or an array as input, got {}".format(
               type(data)))
 
+    # The vocabulary is computed by the index lookup layer, in as many worker
+    # processes as this layer was compiled for.
+    if self._adapt_num_workers > 1:
+      self._index_lookup_layer.compile(num_workers=self._adapt_num_workers)
     self._index_lookup_layer.adapt(preprocessed_inputs)
 
   def get_vocabulary(self):
@@ -429,6 +445,7 @@ class TextVectorization(base_preprocessing_layer.CombinerPreprocessingLayer):
         "output_mode": self._output_mode,
         "output_sequence_length": self._output_sequence_length,
         "pad_to_max_tokens": self._pad_to_max,
+        "sparse": self._sparse,
     }
     base_config = super(TextVectorization, self).get_config()
     return dict(list(base_config.items()) + list(config.items()))
@@ -537,10 +554,47 @@ class TextVectorization(base_preprocessing_layer.CombinerPreprocessingLayer):
 
     return inputs
 
+  def _can_fuse(self, inputs):
+    """Returns whether `call` can use `_fused_int_output` on `inputs`."""
+    return (self._standardize == LOWER_AND_STRIP_PUNCTUATION and
+            self._split == SPLIT_ON_WHITESPACE and self._ngrams is None and
+            self._output_mode == INT and
+            self._output_sequence_length is not None and
+            not tf_utils.is_ragged(inputs) and inputs.shape.rank in (1, 2))
+
+  def _fused_int_output(self, inputs):
+    """Vectorizes dense `inputs` with the default configuration and INT output.
+
+    This is equivalent to `_preprocess` followed by the lookup and the padding
+    or trimming done in `call`, with fewer intermediate tensors: tokens past
+    `output_sequence_length` are dropped before they are looked up, only the
+    flat tokens are looked up, and a single `to_tensor` both pads and trims.
+
+    Args:
+      inputs: A dense string tensor of shape `(batch,)` or `(batch, 1)`.
+
+    Returns:
+      An int64 tensor of shape `(batch, output_sequence_length)`.
+    """
+    if inputs.shape.rank > 1:
+      inputs = tf.compat.v1.squeeze(inputs, axis=-1)
+    inputs = tf.strings.regex_replace(
+        tf.strings.lower(inputs), DEFAULT_STRIP_REGEX, "")
+    tokens = tf.strings.split(inputs)[:, :self._output_sequence_length]
+    ids = self._index_lookup_layer(tokens.flat_values)
+    output_tensor = tokens.with_flat_values(ids).to_tensor(
+        default_value=0, shape=[None, self._output_sequence_length])
+    output_tensor.set_shape(
+        tf.TensorShape([inputs.shape[0], self._output_sequence_length]))
+    return output_tensor
+
   def call(self, inputs):
     if isinstance(inputs, (list, tuple, np.ndarray)):
       inputs = tf.convert_to_tensor(inputs)
 
+    if self._can_fuse(inputs):
+      return self._fused_int_output(inputs)
+
     inputs = self._preprocess(inputs)
 
     # If we're not doing any output processing, return right away.
@@ -931,6 +931,48 @@ class TextVectorizationOutputTest(
     output_dataset = model.predict(input_array_2)
     self.assertAllEqual(expected_output_2, output_dataset)
 
+  def test_int_output_default_configuration_strips_and_pads(self):
+    vocab_data = ["earth", "wind", "and", "fire"]
+    input_array = np.array([["Earth, wind AND also fire!"],
+                            ["  fire   and earth  "], [""], ["michigan."]])
+    expected_output = [[2, 3, 4, 1], [5, 4, 2, 0], [0, 0, 0, 0], [1, 0, 0, 0]]
+    output_sequence_length = 4
+
+    input_data = keras.Input(shape=(1,), dtype=tf.string)
+    layer = get_layer_class()(
+        max_tokens=None,
+        output_sequence_length=output_sequence_length)
+    layer.set_vocabulary(vocab_data)
+    int_data = layer(input_data)
+    self.assertAllEqual([None, output_sequence_length],
+                        int_data.shape.as_list())
+
+    model = keras.Model(inputs=input_data, outputs=int_data)
+    output_dataset = model.predict(input_array)
+    self.assertAllEqual(expected_output, output_dataset)
+
+  def test_int_output_default_configuration_matches_unfused(self):
+    vocab_data = ["earth", "wind", "and", "fire"]
+    input_array = np.array([
+        "Earth, wind AND also fire!", "fire and earth", "",
+        "wind wind wind wind wind wind wind fire"
+    ])
+    fused_layer = get_layer_class()(output_sequence_length=5)
+    fused_layer.set_vocabulary(vocab_data)
+
+    def standardize(inputs):
+      return tf.strings.regex_replace(
+          tf.strings.lower(inputs), text_vectorization.DEFAULT_STRIP_REGEX, "")
+
+    # A callable standardization takes the unfused path.
+    unfused_layer = get_layer_class()(
+        standardize=standardize, output_sequence_length=5)
+    unfused_layer.set_vocabulary(vocab_data)
+
+    self.assertAllEqual(
+        self.evaluate(unfused_layer(input_array)),
+        self.evaluate(fused_layer(input_array)))
+
   def test_binary_output_hard_maximum(self):
     vocab_data = ["earth", "wind", "and", "fire"]
     input_array = np.array([["earth", "wind", "and", "earth"],
@@ -1215,6 +1257,56 @@ class TextVectorizationOutputTest(
     output_dataset = model.predict(input_array)
     self.assertAllClose(expected_output, output_dataset)
 
+  def test_tfidf_output_sparse(self):
+    vocab_data = ["earth", "wind", "and", "fire"]
+    idf_weights = [.4, .25, .75, .6]
+    input_array = np.array([["earth", "wind", "and", "earth"],
+                            ["ohio", "fire", "earth", "michigan"]])
+
+    # pyformat: disable
+    # pylint: disable=bad-whitespace
+    expected_output = [[ 0, .8, .25, .75,  0, 0],
+                       [ 1, .4,   0,   0, .6, 0]]
+    # pylint: enable=bad-whitespace
+    # pyformat: enable
+
+    layer = get_layer_class()(
+        max_tokens=6,
+        standardize=None,
+        split=None,
+        output_mode=text_vectorization.TFIDF,
+        pad_to_max_tokens=True,
+        sparse=True)
+    layer.set_vocabulary(vocab_data, idf_weights=idf_weights)
+    output = layer(input_array)
+    self.assertIsInstance(output, tf.SparseTensor)
+    self.assertAllClose(expected_output,
+                        self.evaluate(tf.sparse.to_dense(output)))
+
+  def test_tfidf_output_sparse_and_dense_layer(self):
+    vocab_data = ["earth", "wind", "and", "fire"]
+    idf_weights = [.4, .25, .75, .6]
+    input_array = np.array([["earth", "wind", "and", "earth"],
+                            ["ohio", "fire", "earth", "michigan"]])
+    # The row sums of the tf-idf output.
+    expected_output = [[1.8], [2.0]]
+
+    input_data = keras.Input(shape=(None,), dtype=tf.string)
+    layer = get_layer_class()(
+        max_tokens=6,
+        standardize=None,
+        split=None,
+        output_mode=text_vectorization.TFIDF,
+        pad_to_max_tokens=True,
+        sparse=True)
+    layer.set_vocabulary(vocab_data, idf_weights=idf_weights)
+    tfidf_data = layer(input_data)
+    output_data = keras.layers.Dense(1, kernel_initializer="ones")(tfidf_data)
+
+    model = keras.Model(inputs=input_data, outputs=output_data)
+    output_dataset = model.predict(input_array)
+    self.assertAllClose(expected_output, output_dataset)
+
   def test_tfidf_output_soft_maximum(self):
     vocab_data = ["earth", "wind", "and", "fire"]
     # OOV idf weight (bucket 0) should 0.5, the average of passed weights.
@@ -1486,6 +1578,10 @@ class TextVectorizationErrorTest(keras_parameterized.TestCase,
     with self.assertRaisesRegex(ValueError, ".*output_sequence_length.*2.0.*"):
       _ = get_layer_class()(output_mode="int", output_sequence_length=2.0)
 
+  def test_sparse_int_output_fails(self):
+    with self.assertRaisesRegex(ValueError, "`sparse` may only be set"):
+      _ = get_layer_class()(output_mode=text_vectorization.INT, sparse=True)
+
   def test_non_none_output_sequence_length_fails_if_output_type_not_int(self):
     with self.assertRaisesRegex(ValueError,
                                 ".*`output_sequence_length` must not be set.*"):
@@ -23,6 +23,7 @@ from __future__ import print_function
 import tensorflow.compat.v2 as tf
 
 import abc
+import math
 import types
 
 import numpy as np
@@ -262,6 +263,22 @@ class Metric(base_layer.Layer):
     """
     raise NotImplementedError('Must be implemented in subclasses.')
 
+  def _confusion_matrix_update_args(self):
+    """Returns the arguments of the confusion matrix update of this metric.
+
+    Metrics whose `update_state` is a single call of
+    `metrics_utils.update_confusion_matrix_variables` return its
+    `variables_to_update` and its keyword arguments other than
+    `sample_weight`, so that `compile_utils.MetricsContainer` can share one
+    update between the metrics with the same arguments. They return `None`
+    when a subclass overrides `update_state`, as the shared update would
+    skip the override.
+
+    Returns:
+      A `(variables_to_update, kwargs)` tuple, or `None`.
+    """
+    return None
+
   ### For use by subclasses ###
   @doc_controls.for_subclass_implementers
   def add_weight(self,
@@ -955,12 +972,17 @@ class _ConfusionMatrixConditionCount(Metric):
     Returns:
       Update op.
     """
+    variables_to_update, kwargs = self._confusion_matrix_update_args()
     return metrics_utils.update_confusion_matrix_variables(
-        {self._confusion_matrix_cond: self.accumulator},
-        y_true,
-        y_pred,
-        thresholds=self.thresholds,
-        sample_weight=sample_weight)
+        variables_to_update, y_true, y_pred, sample_weight=sample_weight,
+        **kwargs)
+
+  def _confusion_matrix_update_args(self):
+    if (type(self).update_state is not
+        _ConfusionMatrixConditionCount.update_state):
+      return None
+    return ({self._confusion_matrix_cond: self.accumulator},
+            dict(thresholds=self.thresholds))
 
   def result(self):
     if len(self.thresholds) == 1:
@@ -1259,6 +1281,8 @@ class Precision(Metric):
     default_threshold = 0.5 if top_k is None else metrics_utils.NEG_INF
     self.thresholds = metrics_utils.parse_init_thresholds(
         thresholds, default_threshold=default_threshold)
+    self._thresholds_distributed_evenly = (
+        metrics_utils.is_evenly_distributed_thresholds(self.thresholds))
     self.true_positives = self.add_weight(
         'true_positives',
         shape=(len(self.thresholds),),
@@ -1282,17 +1306,24 @@ class Precision(Metric):
     Returns:
       Update op.
     """
+    variables_to_update, kwargs = self._confusion_matrix_update_args()
     return metrics_utils.update_confusion_matrix_variables(
-        {
-            metrics_utils.ConfusionMatrix.TRUE_POSITIVES: self.true_positives,
-            metrics_utils.ConfusionMatrix.FALSE_POSITIVES: self.false_positives
-        },
-        y_true,
-        y_pred,
+        variables_to_update, y_true, y_pred, sample_weight=sample_weight,
+        **kwargs)
+
+  def _confusion_matrix_update_args(self):
+    if type(self).update_state is not Precision.update_state:
+      return None
+    variables_to_update = {
+        metrics_utils.ConfusionMatrix.TRUE_POSITIVES: self.true_positives,
+        metrics_utils.ConfusionMatrix.FALSE_POSITIVES: self.false_positives
+    }
+    kwargs = dict(
         thresholds=self.thresholds,
+        thresholds_distributed_evenly=self._thresholds_distributed_evenly,
         top_k=self.top_k,
-        class_id=self.class_id,
-        sample_weight=sample_weight)
+        class_id=self.class_id)
+    return variables_to_update, kwargs
 
   def result(self):
     result = tf.math.divide_no_nan(self.true_positives,
@@ -1384,6 +1415,8 @@ class Recall(Metric):
     default_threshold = 0.5 if top_k is None else metrics_utils.NEG_INF
     self.thresholds = metrics_utils.parse_init_thresholds(
         thresholds, default_threshold=default_threshold)
+    self._thresholds_distributed_evenly = (
+        metrics_utils.is_evenly_distributed_thresholds(self.thresholds))
     self.true_positives = self.add_weight(
         'true_positives',
         shape=(len(self.thresholds),),
@@ -1407,17 +1440,24 @@ class Recall(Metric):
     Returns:
       Update op.
     """
+    variables_to_update, kwargs = self._confusion_matrix_update_args()
     return metrics_utils.update_confusion_matrix_variables(
-        {
-            metrics_utils.ConfusionMatrix.TRUE_POSITIVES: self.true_positives,
-            metrics_utils.ConfusionMatrix.FALSE_NEGATIVES: self.false_negatives
-        },
-        y_true,
-        y_pred,
+        variables_to_update, y_true, y_pred, sample_weight=sample_weight,
+        **kwargs)
+
+  def _confusion_matrix_update_args(self):
+    if type(self).update_state is not Recall.update_state:
+      return None
+    variables_to_update = {
+        metrics_utils.ConfusionMatrix.TRUE_POSITIVES: self.true_positives,
+        metrics_utils.ConfusionMatrix.FALSE_NEGATIVES: self.false_negatives
+    }
+    kwargs = dict(
         thresholds=self.thresholds,
+        thresholds_distributed_evenly=self._thresholds_distributed_evenly,
         top_k=self.top_k,
-        class_id=self.class_id,
-        sample_weight=sample_weight)
+        class_id=self.class_id)
+    return variables_to_update, kwargs
 
   def result(self):
     result = tf.math.divide_no_nan(self.true_positives,
@@ -1476,6 +1516,7 @@ class SensitivitySpecificityBase(Metric):
       thresholds = [(i + 1) * 1.0 / (num_thresholds - 1)
                     for i in range(num_thresholds - 2)]
       self.thresholds = [0.0] + thresholds + [1.0]
+    self._thresholds_distributed_evenly = num_thresholds > 1
 
   def update_state(self, y_true, y_pred, sample_weight=None):
     """Accumulates confusion matrix statistics.
@@ -1490,17 +1531,24 @@ class SensitivitySpecificityBase(Metric):
     Returns:
       Update op.
     """
+    variables_to_update, kwargs = self._confusion_matrix_update_args()
     return metrics_utils.update_confusion_matrix_variables(
-        {
-            metrics_utils.ConfusionMatrix.TRUE_POSITIVES: self.true_positives,
-            metrics_utils.ConfusionMatrix.TRUE_NEGATIVES: self.true_negatives,
-            metrics_utils.ConfusionMatrix.FALSE_POSITIVES: self.false_positives,
-            metrics_utils.ConfusionMatrix.FALSE_NEGATIVES: self.false_negatives,
-        },
-        y_true,
-        y_pred,
+        variables_to_update, y_true, y_pred, sample_weight=sample_weight,
+        **kwargs)
+
+  def _confusion_matrix_update_args(self):
+    if type(self).update_state is not SensitivitySpecificityBase.update_state:
+      return None
+    variables_to_update = {
+        metrics_utils.ConfusionMatrix.TRUE_POSITIVES: self.true_positives,
+        metrics_utils.ConfusionMatrix.TRUE_NEGATIVES: self.true_negatives,
+        metrics_utils.ConfusionMatrix.FALSE_POSITIVES: self.false_positives,
+        metrics_utils.ConfusionMatrix.FALSE_NEGATIVES: self.false_negatives,
+    }
+    kwargs = dict(
         thresholds=self.thresholds,
-        sample_weight=sample_weight)
+        thresholds_distributed_evenly=self._thresholds_distributed_evenly)
+    return variables_to_update, kwargs
 
   def reset_states(self):
     num_thresholds = len(self.thresholds)
@@ -1967,6 +2015,9 @@ class AUC(Metric):
       # If specified, use the supplied thresholds.
       self.num_thresholds = len(thresholds) + 2
       thresholds = sorted(thresholds)
+      self._thresholds_distributed_evenly = (
+          metrics_utils.is_evenly_distributed_thresholds(
+              [0.0] + thresholds + [1.0]))
     else:
       if num_thresholds <= 1:
         raise ValueError('`num_thresholds` must be > 1.')
@@ -1976,6 +2027,7 @@ class AUC(Metric):
       self.num_thresholds = num_thresholds
       thresholds = [(i + 1) * 1.0 / (num_thresholds - 1)
                     for i in range(num_thresholds - 2)]
+      self._thresholds_distributed_evenly = True
 
     # Add an endpoint "threshold" below zero and above one for either
     # threshold method to account for floating point imprecisions.
@@ -2130,7 +2182,26 @@ class AUC(Metric):
           self._thresholds,
           sample_weight=sample_weight,
           multi_label=self.multi_label,
-          label_weights=label_weights)
+          label_weights=label_weights,
+          thresholds_distributed_evenly=self._thresholds_distributed_evenly,
+          thresholds_with_epsilon=True)
+
+  def _confusion_matrix_update_args(self):
+    # Other configurations transform the inputs or check their shapes first.
+    if (self.multi_label or self.label_weights is not None or
+        self._from_logits or type(self).update_state is not AUC.update_state):
+      return None
+    variables_to_update = {
+        metrics_utils.ConfusionMatrix.TRUE_POSITIVES: self.true_positives,
+        metrics_utils.ConfusionMatrix.TRUE_NEGATIVES: self.true_negatives,
+        metrics_utils.ConfusionMatrix.FALSE_POSITIVES: self.false_positives,
+        metrics_utils.ConfusionMatrix.FALSE_NEGATIVES: self.false_negatives,
+    }
+    kwargs = dict(
+        thresholds=self._thresholds,
+        thresholds_distributed_evenly=self._thresholds_distributed_evenly,
+        thresholds_with_epsilon=True)
+    return variables_to_update, kwargs
 
   def interpolate_pr_auc(self):
     """Interpolation formula inspired by section 4 of Davis & Goadrich 2006.
@@ -2294,6 +2365,202 @@ class AUC(Metric):
     return dict(list(base_config.items()) + list(config.items()))
 
 
+@keras_export('keras.metrics.SketchedAUC')
+class SketchedAUC(Metric):
+  """Computes the AUC of the ROC or PR curves from a histogram of log-odds.
+
+  Unlike `AUC`, which evaluates the curve at a fixed set of thresholds, this
+  metric accumulates the weights of the positive and negative examples in a
+  histogram whose buckets are evenly spaced in log-odds (logit) space. In
+  probability space, the buckets are narrow close to 0 and 1, so each one spans
+  a relative range of at most `relative_accuracy` of the prediction (or of one
+  minus the prediction, above 0.5). This keeps predictions apart even when they
+  are heavily skewed, e.g. click-through rates all below 0.01, for which
+  `AUC` would put most of them in its first bucket.
+
+  The curve is then evaluated between every pair of consecutive buckets: the
+  only error comes from pairs of predictions that fall in the same bucket,
+  which are counted as ties. Predictions equal to each other are always ties,
+  as in the exact AUC. The memory used is fixed by `relative_accuracy` and
+  does not grow with the number of examples. Predictions closer to 0 or 1 than
+  the fuzz factor `tf.keras.backend.epsilon()` (or logits beyond the matching
+  log-odds) share the first or last bucket.
+
+  The histograms are summed when the metric is merged across replicas, e.g.
+  with `tf.distribute.MirroredStrategy`, which gives the same result as
+  accumulating all the examples on a single replica.
+
+  For the ROC curve, the result is the probability for a positive example to
+  be ranked above a negative one, ties counting for one half. For the PR
+  curve, the result is the average precision: the precision at the threshold
+  of each positive example, averaged over the positive examples.
+
+  If `sample_weight` is `None`, weights default to 1.
+  Use `sample_weight` of 0 to mask values.
+
+  Args:
+    relative_accuracy: (Optional) Defaults to 1e-3. The relative width of the
+      buckets. Must be in (0, 1). The number of buckets, and so the memory
+      used, is inversely proportional to it: about 16000 buckets for the
+      default.
+    curve: (Optional) Specifies the name of the curve to be computed, 'ROC'
+      [default] or 'PR' for the Precision-Recall-curve.
+    from_logits: boolean indicating whether the predictions (`y_pred` in
+      `update_state`) are probabilities or sigmoid logits.
+    name: (Optional) string name of the metric instance.
+    dtype: (Optional) data type of the metric result.
+
+  Standalone usage:
+
+  >>> m = tf.keras.metrics.SketchedAUC()
+  >>> m.update_state([0, 0, 1, 1], [0, 0.5, 0.3, 0.9])
+  >>> # 3 of the 4 (positive, negative) pairs are ranked correctly.
+  >>> m.result().numpy()
+  0.75
+
+  >>> m.reset_states()
+  >>> m.update_state([0, 0, 1, 1], [0, 0.5, 0.3, 0.9],
+  ...                sample_weight=[1, 0, 0, 1])
+  >>> m.result().numpy()
+  1.0
+
+  Usage with `compile()` API:
+
+  ```python
+  model.compile(optimizer='sgd',
+                loss=tf.keras.losses.BinaryCrossentropy(from_logits=True),
+                metrics=[tf.keras.metrics.SketchedAUC(from_logits=True)])
+  ```
+  """
+
+  def __init__(self,
+               relative_accuracy=1e-3,
+               curve='ROC',
+               from_logits=False,
+               name=None,
+               dtype=None):
+    if not 0 < relative_accuracy < 1:
+      raise ValueError('`relative_accuracy` must be in (0, 1), got {}.'.format(
+          relative_accuracy))
+    if isinstance(curve, metrics_utils.AUCCurve) and curve not in list(
+        metrics_utils.AUCCurve):
+      raise ValueError('Invalid curve: "{}". Valid options are: "{}"'.format(
+          curve, list(metrics_utils.AUCCurve)))
+    super(SketchedAUC, self).__init__(name=name, dtype=dtype)
+    if isinstance(curve, metrics_utils.AUCCurve):
+      self.curve = curve
+    else:
+      self.curve = metrics_utils.AUCCurve.from_str(curve)
+    self.relative_accuracy = relative_accuracy
+    self._from_logits = from_logits
+
+    # Buckets spanning a ratio of (1 + a) / (1 - a) in odds, so that a
+    # prediction is within a relative `a` of the middle of its bucket.
+    self._bucket_width = math.log(
+        (1. + relative_accuracy) / (1. - relative_accuracy))
+    self._max_logit = math.log((1. - K.epsilon()) / K.epsilon())
+    self.num_buckets = int(
+        math.ceil(2. * self._max_logit / self._bucket_width))
+    self.positives = self.add_weight(
+        'positives',
+        shape=(self.num_buckets,),
+        initializer=tf.compat.v1.zeros_initializer)
+    self.negatives = self.add_weight(
+        'negatives',
+        shape=(self.num_buckets,),
+        initializer=tf.compat.v1.zeros_initializer)
+
+  def update_state(self, y_true, y_pred, sample_weight=None):
+    """Accumulates the histograms of positive and negative predictions.
+
+    Args:
+      y_true: The ground truth values.
+      y_pred: The predicted values.
+      sample_weight: Optional weighting of each example. Defaults to 1. Can be a
+        `Tensor` whose rank is either 0, or the same rank as `y_true`, and must
+        be broadcastable to `y_true`.
+
+    Returns:
+      Update op.
+    """
+    y_true = tf.cast(y_true, self._dtype)
+    y_pred = tf.cast(y_pred, self._dtype)
+    [y_true, y_pred], sample_weight = (
+        metrics_utils.ragged_assert_compatible_and_get_flat_values(
+            [y_true, y_pred], sample_weight))
+    if sample_weight is None:
+      y_pred, y_true = losses_utils.squeeze_or_expand_dimensions(
+          y_pred, y_true)
+      weights = tf.compat.v1.ones_like(y_pred)
+    else:
+      sample_weight = tf.cast(sample_weight, self._dtype)
+      y_pred, y_true, sample_weight = (
+          losses_utils.squeeze_or_expand_dimensions(
+              y_pred, y_true, sample_weight=sample_weight))
+      weights = tf.__internal__.ops.broadcast_weights(sample_weight, y_pred)
+
+    if self._from_logits:
+      logits = y_pred
+    else:
+      y_pred = tf.clip_by_value(y_pred, K.epsilon(), 1. - K.epsilon())
+      logits = tf.math.log(y_pred) - tf.math.log1p(-y_pred)
+    buckets = tf.cast(
+        tf.floor((logits + self._max_logit) / self._bucket_width), tf.int32)
+    buckets = tf.reshape(
+        tf.clip_by_value(buckets, 0, self.num_buckets - 1), [-1])
+
+    weights = tf.reshape(weights, [-1])
+    is_positive = tf.reshape(tf.cast(y_true, tf.bool), [-1])
+    zeros = tf.compat.v1.zeros_like(weights)
+    positives = tf.math.unsorted_segment_sum(
+        tf.compat.v1.where(is_positive, weights, zeros), buckets,
+        self.num_buckets)
+    negatives = tf.math.unsorted_segment_sum(
+        tf.compat.v1.where(is_positive, zeros, weights), buckets,
+        self.num_buckets)
+    return tf.group(
+        self.positives.assign_add(positives),
+        self.negatives.assign_add(negatives))
+
+  def result(self):
+    total_positives = tf.reduce_sum(self.positives)
+    if self.curve == metrics_utils.AUCCurve.ROC:
+      # Each positive example ranks above the negative ones in lower buckets,
+      # and ties with the ones in its own bucket.
+      negatives_below = tf.cumsum(self.negatives, exclusive=True)
+      correct_pairs = tf.reduce_sum(
+          self.positives * (negatives_below + 0.5 * self.negatives))
+      return tf.math.divide_no_nan(
+          correct_pairs,
+          total_positives * tf.reduce_sum(self.negatives),
+          name=self.name)
+
+    # curve == 'PR': the precision at the threshold of each bucket, averaged
+    # over the positive examples.
+    true_positives = tf.cumsum(self.positives, reverse=True)
+    false_positives = tf.cumsum(self.negatives, reverse=True)
+    precision = tf.math.divide_no_nan(true_positives,
+                                      true_positives + false_positives)
+    return tf.math.divide_no_nan(
+        tf.reduce_sum(self.positives * precision),
+        total_positives,
+        name=self.name)
+
+  def reset_states(self):
+    K.batch_set_value([
+        (v, np.zeros((self.num_buckets,))) for v in self.variables
+    ])
+
+  def get_config(self):
+    config = {
+        'relative_accuracy': self.relative_accuracy,
+        'curve': self.curve.value,
+        'from_logits': self._from_logits,
+    }
+    base_config = super(SketchedAUC, self).get_config()
+    return dict(list(base_config.items()) + list(config.items()))
+
+
 @keras_export('keras.metrics.CosineSimilarity')
 class CosineSimilarity(MeanMetricWrapper):
   """Computes the cosine similarity between the labels and predictions.
@@ -1421,6 +1421,124 @@ class AUCTest(tf.test.TestCase, parameterized.TestCase):
     self.assertEqual(self.evaluate(result), 0.5)
 
 
+@combinations.generate(combinations.combine(mode=['graph', 'eager']))
+class SketchedAUCTest(tf.test.TestCase, parameterized.TestCase):
+
+  def setup(self):
+    self.y_pred = tf.constant([0, 0.5, 0.3, 0.9], dtype=tf.float32)
+    epsilon = 1e-12
+    self.y_pred_logits = -tf.math.log(1.0 / (self.y_pred + epsilon) - 1.0)
+    self.y_true = tf.constant([0, 0, 1, 1])
+    self.sample_weight = [1, 2, 3, 4]
+
+  def test_config(self):
+    self.setup()
+    auc_obj = metrics.SketchedAUC(
+        relative_accuracy=1e-2, curve='PR', name='auc_1')
+    auc_obj.update_state(self.y_true, self.y_pred)
+    self.assertEqual(auc_obj.name, 'auc_1')
+    self.assertLen(auc_obj.variables, 2)
+    self.assertEqual(auc_obj.curve, metrics_utils.AUCCurve.PR)
+    old_config = auc_obj.get_config()
+    self.assertDictEqual(old_config, json.loads(json.dumps(old_config)))
+
+    # Check save and restore config.
+    auc_obj2 = metrics.SketchedAUC.from_config(auc_obj.get_config())
+    auc_obj2.update_state(self.y_true, self.y_pred)
+    self.assertEqual(auc_obj2.name, 'auc_1')
+    self.assertEqual(auc_obj2.num_buckets, auc_obj.num_buckets)
+    self.assertEqual(auc_obj2.curve, metrics_utils.AUCCurve.PR)
+    self.assertDictEqual(old_config, auc_obj2.get_config())
+
+  def test_num_buckets(self):
+    # The log-odds of predictions in [1e-7, 1 - 1e-7] span about 32.2.
+    self.assertEqual(metrics.SketchedAUC().num_buckets, 16119)
+    self.assertEqual(
+        metrics.SketchedAUC(relative_accuracy=1e-2).num_buckets, 1612)
+
+  def test_unweighted(self):
+    self.setup()
+    auc_obj = metrics.SketchedAUC()
+    self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+    result = auc_obj(self.y_true, self.y_pred)
+
+    # 0.3 ranks above 0 but below 0.5, 0.9 ranks above both.
+    self.assertAllClose(self.evaluate(result), 3. / 4)
+
+  def test_unweighted_from_logits(self):
+    self.setup()
+    auc_obj = metrics.SketchedAUC(from_logits=True)
+    self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+    result = auc_obj(self.y_true, self.y_pred_logits)
+    self.assertAllClose(self.evaluate(result), 3. / 4)
+
+  def test_weighted(self):
+    self.setup()
+    auc_obj = metrics.SketchedAUC()
+    self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+    result = auc_obj(
+        self.y_true, self.y_pred, sample_weight=self.sample_weight)
+
+    # (3 * 1 + 4 * (1 + 2)) / ((3 + 4) * (1 + 2))
+    self.assertAllClose(self.evaluate(result), 15. / 21)
+
+  def test_weighted_pr(self):
+    self.setup()
+    auc_obj = metrics.SketchedAUC(curve='PR')
+    self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+    result = auc_obj(
+        self.y_true, self.y_pred, sample_weight=self.sample_weight)
+
+    # precision at 0.9 = 4 / 4, precision at 0.3 = (4 + 3) / (4 + 3 + 2)
+    # average precision = (4 * 1 + 3 * 7 / 9) / (4 + 3)
+    self.assertAllClose(self.evaluate(result), (4. + 3. * 7. / 9) / 7)
+
+  def test_ties(self):
+    auc_obj = metrics.SketchedAUC()
+    self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+    result = auc_obj([0, 1, 0, 1], [0.2, 0.2, 0.2, 0.2])
+    self.assertAllClose(self.evaluate(result), 0.5)
+
+  def test_skewed_predictions_close_to_exact(self):
+    np.random.seed(1337)
+    logits = np.random.normal(-6., 1.5, size=(2000,))
+    y_true = np.random.random(2000) < expit(logits + np.random.normal(
+        size=(2000,)))
+    y_pred = expit(logits).astype(np.float32)
+
+    # The exact AUC, from all the (positive, negative) pairs.
+    pos = y_pred[y_true][:, np.newaxis]
+    neg = y_pred[~y_true][np.newaxis, :]
+    expected = np.mean((pos > neg) + 0.5 * (pos == neg))
+
+    auc_obj = metrics.SketchedAUC()
+    self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+    result = auc_obj(y_true, y_pred)
+    self.assertAllClose(self.evaluate(result), expected, atol=1e-4)
+
+  def test_reset_states(self):
+    self.setup()
+    auc_obj = metrics.SketchedAUC()
+    self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+    self.evaluate(auc_obj.update_state(self.y_true, self.y_pred))
+    auc_obj.reset_states()
+    self.assertAllEqual(
+        self.evaluate(auc_obj.positives), np.zeros((auc_obj.num_buckets,)))
+    self.assertAllEqual(
+        self.evaluate(auc_obj.negatives), np.zeros((auc_obj.num_buckets,)))
+
+  def test_invalid_relative_accuracy(self):
+    with self.assertRaisesRegex(ValueError, '`relative_accuracy` must be'):
+      metrics.SketchedAUC(relative_accuracy=0)
+    with self.assertRaisesRegex(ValueError, '`relative_accuracy` must be'):
+      metrics.SketchedAUC(relative_accuracy=1.)
+
+  def test_invalid_curve(self):
+    with self.assertRaisesRegex(ValueError,
+                                'Invalid AUC curve value "Invalid".'):
+      metrics.SketchedAUC(curve='Invalid')
+
+
 @combinations.generate(combinations.combine(mode=['graph', 'eager']))
 class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
 
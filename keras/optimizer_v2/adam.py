@@ -55,6 +55,9 @@ class Adam(optimizer_v2.OptimizerV2):
       1e-7.
     amsgrad: Boolean. Whether to apply AMSGrad variant of this algorithm from
       the paper "On the Convergence of Adam and beyond". Defaults to `False`.
+    lazy_sparse: Boolean. Whether sparse gradients only update the rows of
+      the variable and of its moments that they index, see the notes below.
+      Defaults to `False`.
     name: Optional name for the operations created when applying gradients.
       Defaults to `"Adam"`.
     **kwargs: Keyword arguments. Allowed to be one of
@@ -94,6 +97,15 @@ class Adam(optimizer_v2.OptimizerV2):
   accumulator. This means that the sparse behavior is equivalent to the dense
   behavior (in contrast to some momentum implementations which ignore momentum
   unless a variable slice was actually used).
+
+  With `lazy_sparse=True`, the sparse implementation only reads and writes
+  the variable slices used in the forward pass, and their moments, so its cost
+  does not depend on the size of large embedding tables. An additional
+  `"last_step"` slot records the iteration at which each slice was last
+  updated, and the moments of a slice are decayed by the iterations it missed
+  before being updated, so they are the same as with the dense behavior.
+  Unlike with the dense behavior, the variable slices are not moved by their
+  momentum in the iterations they are not used.
   """
 
   _HAS_AGGREGATE_GRAD = True
@@ -104,6 +116,7 @@ class Adam(optimizer_v2.OptimizerV2):
                beta_2=0.999,
                epsilon=1e-7,
                amsgrad=False,
+               lazy_sparse=False,
                name='Adam',
                **kwargs):
     super(Adam, self).__init__(name, **kwargs)
@@ -113,6 +126,7 @@ class Adam(optimizer_v2.OptimizerV2):
     self._set_hyper('beta_2', beta_2)
     self.epsilon = epsilon or backend_config.epsilon()
     self.amsgrad = amsgrad
+    self.lazy_sparse = lazy_sparse
 
   def _create_slots(self, var_list):
     # Create slots for the first and second moments.
@@ -124,6 +138,8 @@ class Adam(optimizer_v2.OptimizerV2):
     if self.amsgrad:
       for var in var_list:
         self.add_slot(var, 'vhat')
+    if self.lazy_sparse:
+      self._create_row_step_slots(var_list)
 
   def _prepare_local(self, var_device, var_dtype, apply_state):
     super(Adam, self)._prepare_local(var_device, var_dtype, apply_state)
@@ -166,7 +182,7 @@ class Adam(optimizer_v2.OptimizerV2):
     v = self.get_slot(var, 'v')
 
     if not self.amsgrad:
-      return tf.raw_ops.ResourceApplyAdam(
+      update = tf.raw_ops.ResourceApplyAdam(
           var=var.handle,
           m=m.handle,
           v=v.handle,
@@ -180,7 +196,7 @@ class Adam(optimizer_v2.OptimizerV2):
           use_locking=self._use_locking)
     else:
       vhat = self.get_slot(var, 'vhat')
-      return tf.raw_ops.ResourceApplyAdamWithAmsgrad(
+      update = tf.raw_ops.ResourceApplyAdamWithAmsgrad(
           var=var.handle,
           m=m.handle,
           v=v.handle,
@@ -193,12 +209,19 @@ class Adam(optimizer_v2.OptimizerV2):
           epsilon=coefficients['epsilon'],
           grad=grad,
           use_locking=self._use_locking)
+    if self.lazy_sparse:
+      # A dense gradient updates all the rows of `var`.
+      return tf.group(update, self._assign_row_steps(var))
+    return update
 
   def _resource_apply_sparse(self, grad, var, indices, apply_state=None):
     var_device, var_dtype = var.device, var.dtype.base_dtype
     coefficients = ((apply_state or {}).get((var_device, var_dtype))
                     or self._fallback_apply_state(var_device, var_dtype))
 
+    if self.lazy_sparse:
+      return self._resource_apply_sparse_lazy(grad, var, indices, coefficients)
+
     # m_t = beta1 * m + (1 - beta1) * g_t
     m = self.get_slot(var, 'm')
     m_scaled_g_values = grad * coefficients['one_minus_beta_1_t']
@@ -234,6 +257,40 @@ class Adam(optimizer_v2.OptimizerV2):
           use_locking=self._use_locking)
       return tf.group(*[var_update, m_t, v_t, v_hat_t])
 
+  def _resource_apply_sparse_lazy(self, grad, var, indices, coefficients):
+    """Updates the rows `indices` of `var` and of its slots only."""
+    steps, steps_update = self._steps_since_row_update(var, indices, grad)
+    # Without gradients, the moments of the rows decayed in each of the
+    # iterations since their last update.
+    m = self.get_slot(var, 'm')
+    m_slice = (tf.gather(m, indices) * tf.pow(coefficients['beta_1_t'], steps)
+               + grad * coefficients['one_minus_beta_1_t'])
+    v = self.get_slot(var, 'v')
+    v_slice = (tf.gather(v, indices) * tf.pow(coefficients['beta_2_t'], steps)
+               + (grad * grad) * coefficients['one_minus_beta_2_t'])
+    update_ops = [
+        steps_update,
+        tf.raw_ops.ResourceScatterUpdate(
+            resource=m.handle, indices=indices, updates=m_slice),
+        tf.raw_ops.ResourceScatterUpdate(
+            resource=v.handle, indices=indices, updates=v_slice),
+    ]
+
+    if self.amsgrad:
+      # `v` only decreases without gradients, so `vhat` needs no correction.
+      v_hat = self.get_slot(var, 'vhat')
+      v_slice = tf.maximum(tf.gather(v_hat, indices), v_slice)
+      update_ops.append(
+          tf.raw_ops.ResourceScatterUpdate(
+              resource=v_hat.handle, indices=indices, updates=v_slice))
+    update_ops.append(
+        tf.raw_ops.ResourceScatterSub(
+            resource=var.handle,
+            indices=indices,
+            updates=coefficients['lr'] * m_slice /
+            (tf.sqrt(v_slice) + coefficients['epsilon'])))
+    return tf.group(*update_ops)
+
   def get_config(self):
     config = super(Adam, self).get_config()
     config.update({
@@ -244,6 +301,8 @@ class Adam(optimizer_v2.OptimizerV2):
         'epsilon': self.epsilon,
         'amsgrad': self.amsgrad,
     })
+    if self.lazy_sparse:
+      config['lazy_sparse'] = self.lazy_sparse
     return config
 
 
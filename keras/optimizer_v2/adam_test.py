@@ -20,6 +20,8 @@ from __future__ import print_function
 
 import tensorflow.compat.v2 as tf
 
+import os
+
 from absl.testing import parameterized
 import numpy as np
 from keras import combinations
@@ -518,6 +520,78 @@ class AdamOptimizerTest(tf.test.TestCase, parameterized.TestCase):
           self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
           self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
 
+  @combinations.generate(
+      combinations.combine(mode=["eager"], amsgrad=[False, True]))
+  def testLazySparse(self, amsgrad):
+    var_np = np.arange(8, dtype=np.float32).reshape((4, 2))
+    var = tf.Variable(var_np)
+    opt = adam.Adam(learning_rate=0.1, amsgrad=amsgrad, lazy_sparse=True)
+    self.assertTrue(opt.get_config()["lazy_sparse"])
+
+    m, v, vhat = np.zeros_like(var_np), np.zeros_like(var_np), np.zeros_like(
+        var_np)
+    for t, indices in enumerate([[0, 1], [1], [0, 2]]):
+      grad_np = np.zeros_like(var_np)
+      grad_np[indices] = np.random.uniform(size=(len(indices), 2))
+      opt.apply_gradients([(tf.IndexedSlices(
+          tf.constant(grad_np[indices]), tf.constant(indices),
+          tf.constant([4, 2])), var)])
+
+      # The moments are the same as with dense updates, but only the rows
+      # with a gradient are updated.
+      m = 0.9 * m + 0.1 * grad_np
+      v = 0.999 * v + 0.001 * grad_np * grad_np
+      vhat = np.maximum(vhat, v)
+      lr_t = 0.1 * np.sqrt(1 - 0.999**(t + 1)) / (1 - 0.9**(t + 1))
+      denom = vhat if amsgrad else v
+      var_np[indices] -= lr_t * m[indices] / (
+          np.sqrt(denom[indices]) + 1e-7)
+      self.assertAllClose(var_np, self.evaluate(var))
+      self.assertAllClose(m[indices],
+                          self.evaluate(opt.get_slot(var, "m"))[indices])
+      self.assertAllClose(v[indices],
+                          self.evaluate(opt.get_slot(var, "v"))[indices])
+    self.assertAllEqual([3, 2, 3, 0],
+                        self.evaluate(opt.get_slot(var, "last_step")))
+
+    # A dense gradient updates all the rows.
+    opt.apply_gradients([(tf.ones_like(var), var)])
+    self.assertAllEqual([4, 4, 4, 4],
+                        self.evaluate(opt.get_slot(var, "last_step")))
+
+  @combinations.generate(combinations.combine(mode=["eager"]))
+  def testLazySparseCountsStepsExactly(self):
+    # float16 only counts integers exactly up to 2048.
+    var = tf.Variable(np.zeros((3, 2)), dtype=tf.float16)
+    opt = adam.Adam(learning_rate=0.1, lazy_sparse=True)
+    opt.iterations.assign(5000)
+    for indices in [[0], [0, 1]]:
+      opt.apply_gradients([(tf.IndexedSlices(
+          tf.ones((len(indices), 2), dtype=tf.float16), tf.constant(indices),
+          tf.constant([3, 2])), var)])
+    last_step = opt.get_slot(var, "last_step")
+    self.assertEqual(tf.int64, last_step.dtype)
+    self.assertAllEqual([5002, 5002, 0], self.evaluate(last_step))
+
+  @combinations.generate(combinations.combine(mode=["eager"]))
+  def testLazySparseRestoresStepSlots(self):
+    var = tf.Variable(np.zeros((3, 2)), dtype=tf.float32)
+    opt = adam.Adam(learning_rate=0.1, lazy_sparse=True)
+    opt.apply_gradients([(tf.IndexedSlices(
+        tf.ones((1, 2)), tf.constant([1]), tf.constant([3, 2])), var)])
+    save_path = tf.train.Checkpoint(var=var, optimizer=opt).save(
+        os.path.join(self.get_temp_dir(), "ckpt"))
+
+    # The slots are created when `var` is restored, before any update.
+    new_var = tf.Variable(np.zeros((3, 2)), dtype=tf.float32)
+    new_opt = adam.Adam(learning_rate=0.1, lazy_sparse=True)
+    checkpoint = tf.train.Checkpoint(optimizer=new_opt)
+    checkpoint.restore(save_path)
+    checkpoint.var = new_var
+    last_step = new_opt.get_slot(new_var, "last_step")
+    self.assertEqual(tf.int64, last_step.dtype)
+    self.assertAllEqual([0, 1, 0], self.evaluate(last_step))
+
   @combinations.generate(combinations.combine(mode=["eager"]))
   def testSlotsUniqueEager(self):
     v1 = tf.Variable(1.)
@@ -684,6 +684,17 @@ class OptimizerV2(tf.__internal__.tracking.Trackable):
       else:
         return update_op
 
+    # Each variable is updated by its own ops, e.g. a single fused
+    # `ResourceApplyAdam` kernel, so a step dispatches at least one op per
+    # variable. A multi-tensor apply would update all the variables of a dtype
+    # with one op on a flat buffer, which needs the variables and their slots
+    # to be views into that buffer. `tf.Variable`s own their memory, and they
+    # and their slots are checkpointed one by one, so the buffer would have to
+    # be concatenated from the variables and split back into them at every
+    # step: that trades one op per variable for a read, a slice and an assign
+    # per variable and per slot. `KerasOptimizerDispatchBenchmark` in
+    # keras/benchmarks/optimizer_benchmarks_test.py measures the per-variable
+    # cost, and compares SGD with such a grouped update.
     eagerly_outside_functions = tf.compat.v1.executing_eagerly_outside_functions()
     update_ops = []
     with name_scope_only_in_function_or_graph(name or self._name):
@@ -842,7 +853,8 @@ class OptimizerV2(tf.__internal__.tracking.Trackable):
     """A list of names for this optimizer's slots."""
     return self._slot_names
 
-  def add_slot(self, var, slot_name, initializer="zeros", shape=None):
+  def add_slot(self, var, slot_name, initializer="zeros", shape=None,
+               dtype=None):
     """Add a new slot variable for `var`.
 
     A slot variable is an additional variable associated with `var` to train.
@@ -854,6 +866,8 @@ class OptimizerV2(tf.__internal__.tracking.Trackable):
       initializer: initializer of the slot variable
       shape: (Optional) shape of the slot variable. If not set, it will default
       to the shape of `var`.
+      dtype: (Optional) dtype of the slot variable. If not set, it will default
+      to the dtype of `var`.
 
     Returns:
       A slot variable.
@@ -864,16 +878,22 @@ class OptimizerV2(tf.__internal__.tracking.Trackable):
     slot_dict = self._slots.setdefault(var_key, {})
     weight = slot_dict.get(slot_name, None)
     if weight is None:
+      slot_dtype = var.dtype if dtype is None else dtype
       if isinstance(initializer, six.string_types) or callable(initializer):
         initializer = initializers.get(initializer)
-        if isinstance(
-            initializer,
-            trackable.CheckpointInitialValueCallable) or (shape is not None):
+        if isinstance(initializer, trackable.CheckpointInitialValueCallable):
+          # Like its shape, the dtype of a restored slot is the one it was
+          # saved with, which differs from the dtype of `var` if the slot was
+          # created with `dtype`.
+          slot_shape = shape
+          if dtype is None:
+            slot_dtype = None
+        elif shape is not None:
           slot_shape = shape
         else:
           slot_shape = var.shape
         initial_value = functools.partial(
-            initializer, shape=slot_shape, dtype=var.dtype)
+            initializer, shape=slot_shape, dtype=slot_dtype)
       else:
         initial_value = initializer
 
@@ -891,7 +911,7 @@ class OptimizerV2(tf.__internal__.tracking.Trackable):
         with strategy.extended.colocate_vars_with(var):
           weight = tf.Variable(
               name="%s/%s" % (var._shared_name, slot_name),  # pylint: disable=protected-access
-              dtype=var.dtype,
+              dtype=slot_dtype,
               trainable=False,
               initial_value=initial_value)
       backend.track_variable(weight)
@@ -1293,6 +1313,54 @@ class OptimizerV2(tf.__internal__.tracking.Trackable):
             resource=x.handle, indices=i, updates=v)]):
       return x.value()
 
+  def _create_row_step_slots(self, var_list):
+    """Creates the `"last_step"` slots of lazy sparse updates.
+
+    The slot of a variable holds, for each row of the variable, the iteration
+    (counting from 1) at which the row was last updated, or 0 if it never was.
+    The slot is `int64` like `iterations`, whatever the dtype of the variable,
+    so that it counts iterations exactly.
+
+    Args:
+      var_list: List of variables.
+    """
+    for var in var_list:
+      self.add_slot(var, "last_step", shape=var.shape[:1], dtype=tf.int64)
+
+  def _steps_since_row_update(self, var, indices, grad):
+    """Returns the iterations since the rows `indices` of `var` were updated.
+
+    Args:
+      var: A variable with `"last_step"` slots.
+      indices: The unique indices of the rows updated at this iteration.
+      grad: The gradient of the rows, which the result broadcasts against.
+
+    Returns:
+      A tuple of the number of iterations since the last update of each row,
+      at least 1, in the dtype of `var`, and of the op recording that the rows
+      are updated at the current iteration.
+    """
+    last_step = self.get_slot(var, "last_step")
+    local_step = self.iterations + 1
+    steps = local_step - tf.gather(last_step, indices)
+    with tf.control_dependencies([steps]):
+      update = tf.raw_ops.ResourceScatterUpdate(
+          resource=last_step.handle,
+          indices=indices,
+          updates=tf.fill(tf.shape(indices), local_step))
+    steps = tf.reshape(
+        tf.cast(steps, var.dtype),
+        tf.concat([tf.shape(steps), tf.ones([tf.rank(grad) - 1], tf.int32)],
+                  axis=0))
+    return steps, update
+
+  def _assign_row_steps(self, var):
+    """Records that all the rows of `var` are updated at this iteration."""
+    last_step = self.get_slot(var, "last_step")
+    return last_step.assign(
+        tf.fill(tf.shape(last_step), self.iterations + 1),
+        use_locking=self._use_locking, read_value=False)
+
   @property
   @layer_utils.cached_per_instance
   def _dense_apply_args(self):
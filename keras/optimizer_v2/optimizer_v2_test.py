@@ -272,6 +272,13 @@ class OptimizerTest(tf.test.TestCase, parameterized.TestCase):
       self.evaluate(sgd.iterations.initializer)
       self.assertEqual(0, self.evaluate(sgd.iterations))
 
+  @combinations.generate(combinations.combine(mode=['graph', 'eager']))
+  def testSlotDtype(self):
+    var = tf.Variable([1.0, 2.0], dtype=tf.float16)
+    opt = gradient_descent.SGD(3.0)
+    self.assertEqual(tf.float16, opt.add_slot(var, 'a').dtype)
+    self.assertEqual(tf.int64, opt.add_slot(var, 'b', dtype=tf.int64).dtype)
+
   @combinations.generate(combinations.combine(mode=['graph', 'eager']))
   def testConfig(self):
     with testing_utils.use_gpu():
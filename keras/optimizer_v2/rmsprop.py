@@ -55,6 +55,9 @@ class RMSprop(optimizer_v2.OptimizerV2):
       variance of the gradient; if False, by the uncentered second moment.
       Setting this to `True` may help with training, but is slightly more
       expensive in terms of computation and memory. Defaults to `False`.
+    lazy_sparse: Boolean. Whether the sparse implementation corrects the
+      accumulators of the slices it updates for the iterations they were not
+      used in, see the note below. Defaults to `False`.
     name: Optional name prefix for the operations created when applying
       gradients. Defaults to `"RMSprop"`.
     **kwargs: Keyword arguments. Allowed to be one of
@@ -73,6 +76,16 @@ class RMSprop(optimizer_v2.OptimizerV2):
   account for these omitted updates). This leads to more efficient updates for
   large embedding lookup tables (where most of the slices are not accessed in
   a particular graph execution), but differs from the published algorithm.
+  Without momentum, the sparse implementation decays the whole accumulators
+  instead, as the dense one does.
+
+  With `lazy_sparse=True`, the sparse implementation only reads and writes
+  the slices used in the forward pass and their accumulators, with or without
+  momentum. An additional `"last_step"` slot records the iteration at which
+  each slice was last updated, and the accumulators of a slice are decayed by
+  the iterations it missed before being updated, so they are the same as with
+  the dense implementation. The variable slices are still not moved by their
+  momentum in the iterations they are not used.
 
   Usage:
 
@@ -96,6 +109,7 @@ class RMSprop(optimizer_v2.OptimizerV2):
                momentum=0.0,
                epsilon=1e-7,
                centered=False,
+               lazy_sparse=False,
                name="RMSprop",
                **kwargs):
     """Construct a new RMSprop optimizer.
@@ -115,6 +129,9 @@ class RMSprop(optimizer_v2.OptimizerV2):
         variance of the gradient; if False, by the uncentered second moment.
         Setting this to `True` may help with training, but is slightly more
         expensive in terms of computation and memory. Defaults to `False`.
+      lazy_sparse: Boolean. Whether the sparse implementation corrects the
+        accumulators of the slices it updates for the iterations they were not
+        used in. Defaults to `False`.
       name: Optional name prefix for the operations created when applying
         gradients. Defaults to "RMSprop".
       **kwargs: keyword arguments. Allowed to be {`clipnorm`, `clipvalue`, `lr`,
@@ -144,6 +161,7 @@ class RMSprop(optimizer_v2.OptimizerV2):
 
     self.epsilon = epsilon or backend_config.epsilon()
     self.centered = centered
+    self.lazy_sparse = lazy_sparse
 
   def _create_slots(self, var_list):
     for var in var_list:
@@ -154,6 +172,8 @@ class RMSprop(optimizer_v2.OptimizerV2):
     if self.centered:
       for var in var_list:
         self.add_slot(var, "mg")
+    if self.lazy_sparse:
+      self._create_row_step_slots(var_list)
 
   def _prepare_local(self, var_device, var_dtype, apply_state):
     super(RMSprop, self)._prepare_local(var_device, var_dtype, apply_state)
@@ -178,7 +198,7 @@ class RMSprop(optimizer_v2.OptimizerV2):
       mom = self.get_slot(var, "momentum")
       if self.centered:
         mg = self.get_slot(var, "mg")
-        return tf.raw_ops.ResourceApplyCenteredRMSProp(
+        update = tf.raw_ops.ResourceApplyCenteredRMSProp(
             var=var.handle,
             mg=mg.handle,
             ms=rms.handle,
@@ -190,7 +210,7 @@ class RMSprop(optimizer_v2.OptimizerV2):
             grad=grad,
             use_locking=self._use_locking)
       else:
-        return tf.raw_ops.ResourceApplyRMSProp(
+        update = tf.raw_ops.ResourceApplyRMSProp(
             var=var.handle,
             ms=rms.handle,
             mom=mom.handle,
@@ -212,13 +232,21 @@ class RMSprop(optimizer_v2.OptimizerV2):
         denom_t = rms_t - tf.square(mg_t)
       var_t = var - coefficients["lr_t"] * grad / (
           tf.sqrt(denom_t) + coefficients["epsilon"])
-      return tf.compat.v1.assign(var, var_t, use_locking=self._use_locking).op
+      update = tf.compat.v1.assign(
+          var, var_t, use_locking=self._use_locking).op
+    if self.lazy_sparse:
+      # A dense gradient updates all the rows of `var`.
+      return tf.group(update, self._assign_row_steps(var))
+    return update
 
   def _resource_apply_sparse(self, grad, var, indices, apply_state=None):
     var_device, var_dtype = var.device, var.dtype.base_dtype
     coefficients = ((apply_state or {}).get((var_device, var_dtype))
                     or self._fallback_apply_state(var_device, var_dtype))
 
+    if self.lazy_sparse:
+      return self._resource_apply_sparse_lazy(grad, var, indices, coefficients)
+
     rms = self.get_slot(var, "rms")
     if self._momentum:
       mom = self.get_slot(var, "momentum")
@@ -272,6 +300,49 @@ class RMSprop(optimizer_v2.OptimizerV2):
         return tf.group(*[var_update, rms_t, mg_t])
       return tf.group(*[var_update, rms_t])
 
+  def _resource_apply_sparse_lazy(self, grad, var, indices, coefficients):
+    """Updates the rows `indices` of `var` and of its slots only."""
+    steps, steps_update = self._steps_since_row_update(var, indices, grad)
+    # Without gradients, the accumulators of the rows decayed in each of the
+    # iterations since their last update.
+    rho_power = tf.pow(coefficients["rho"], steps)
+    rms = self.get_slot(var, "rms")
+    rms_slice = (rho_power * tf.gather(rms, indices) +
+                 coefficients["one_minus_rho"] * tf.square(grad))
+    update_ops = [
+        steps_update,
+        tf.raw_ops.ResourceScatterUpdate(
+            resource=rms.handle, indices=indices, updates=rms_slice),
+    ]
+    denom_slice = rms_slice
+    if self.centered:
+      mg = self.get_slot(var, "mg")
+      mg_slice = (rho_power * tf.gather(mg, indices) +
+                  coefficients["one_minus_rho"] * grad)
+      update_ops.append(
+          tf.raw_ops.ResourceScatterUpdate(
+              resource=mg.handle, indices=indices, updates=mg_slice))
+      denom_slice = rms_slice - tf.square(mg_slice)
+
+    if self._momentum:
+      # As `ResourceSparseApplyRMSProp`, adds epsilon under the square root.
+      mom = self.get_slot(var, "momentum")
+      mom_slice = (
+          tf.pow(coefficients["momentum"], steps) * tf.gather(mom, indices) +
+          coefficients["lr_t"] * grad /
+          tf.sqrt(denom_slice + coefficients["epsilon"]))
+      update_ops.append(
+          tf.raw_ops.ResourceScatterUpdate(
+              resource=mom.handle, indices=indices, updates=mom_slice))
+      var_delta = -mom_slice
+    else:
+      var_delta = coefficients["neg_lr_t"] * grad / (
+          tf.sqrt(denom_slice) + coefficients["epsilon"])
+    update_ops.append(
+        tf.raw_ops.ResourceScatterAdd(
+            resource=var.handle, indices=indices, updates=var_delta))
+    return tf.group(*update_ops)
+
   def set_weights(self, weights):
     params = self.weights
     # Override set_weights for backward compatibility of Keras V1 optimizer
@@ -291,6 +362,8 @@ class RMSprop(optimizer_v2.OptimizerV2):
         "epsilon": self.epsilon,
         "centered": self.centered,
     })
+    if self.lazy_sparse:
+      config["lazy_sparse"] = self.lazy_sparse
     return config
 
 
@@ -452,6 +452,49 @@ class RMSpropOptimizerTest(tf.test.TestCase, parameterized.TestCase):
           self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
           self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
 
+  @combinations.generate(combinations.combine(mode=["eager"]))
+  def testLazySparse(self):
+    for (learning_rate, rho, momentum, epsilon,
+         centered) in _TEST_PARAM_VALUES:
+      var_np = np.arange(8, dtype=np.float32).reshape((4, 2))
+      var = tf.Variable(var_np)
+      opt = rmsprop.RMSprop(
+          learning_rate=learning_rate,
+          rho=rho,
+          momentum=momentum,
+          epsilon=epsilon,
+          centered=centered,
+          lazy_sparse=True)
+
+      mg_np, rms_np, mom_np = (
+          np.zeros_like(var_np), np.zeros_like(var_np), np.zeros_like(var_np))
+      for indices in [[0, 1], [1], [0, 2]]:
+        grad_np = np.zeros_like(var_np)
+        grad_np[indices] = np.random.uniform(size=(len(indices), 2))
+        opt.apply_gradients([(tf.IndexedSlices(
+            tf.constant(grad_np[indices]), tf.constant(indices),
+            tf.constant([4, 2])), var)])
+
+        # The accumulators are the same as with dense updates, but only the
+        # rows with a gradient are updated.
+        new_var_np, mg_np, rms_np, mom_np = self._rmsprop_update_numpy(
+            var_np, grad_np, mg_np, rms_np, mom_np, learning_rate, rho,
+            momentum, epsilon, centered)
+        var_np[indices] = new_var_np[indices]
+        self.assertAllClose(var_np, self.evaluate(var))
+        self.assertAllClose(rms_np[indices],
+                            self.evaluate(opt.get_slot(var, "rms"))[indices])
+        if centered:
+          self.assertAllClose(mg_np[indices],
+                              self.evaluate(opt.get_slot(var, "mg"))[indices])
+        if momentum > 0.:
+          self.assertAllClose(
+              mom_np[indices],
+              self.evaluate(opt.get_slot(var, "momentum"))[indices])
+      self.assertAllEqual([3, 2, 3, 0],
+                          self.evaluate(opt.get_slot(var, "last_step")))
+      self.assertTrue(opt.get_config()["lazy_sparse"])
+
   @combinations.generate(combinations.combine(mode=["eager"]))
   def testCallableParams(self):
     for dtype in _DATA_TYPES:
@@ -0,0 +1,164 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Utilities for writing checkpoints in a background thread.
+
+Saving is split in two steps: a snapshot of the values to save is copied into
+host memory on the training thread, then serialized and written to disk by an
+`AsyncCheckpointWriter` while training continues.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow.compat.v2 as tf
+
+import collections
+from multiprocessing.pool import ThreadPool
+import os
+
+from tensorflow.python.training.tracking import base as trackable
+from tensorflow.python.training.tracking import graph_view
+
+# pylint: disable=g-import-not-at-top
+try:
+  import h5py
+except ImportError:
+  h5py = None
+# pylint: enable=g-import-not-at-top
+
+# Suffix of the files written before they are moved to their final path.
+_TEMP_SUFFIX = '.tmp'
+
+
+class AsyncCheckpointWriter(object):
+  """Runs checkpoint writes in order in a background thread.
+
+  At most `max_pending` writes are outstanding: `submit` blocks until the
+  oldest one finishes, which bounds the host memory held by snapshots waiting
+  to be written. Errors raised by a write are raised again on the calling
+  thread, by the `submit` or `wait` call that collects it.
+
+  Args:
+    max_pending: Maximum number of writes submitted but not finished.
+  """
+
+  def __init__(self, max_pending=1):
+    if max_pending < 1:
+      raise ValueError(
+          '`max_pending` should be at least 1, got {}'.format(max_pending))
+    self.max_pending = max_pending
+    # A single thread, so checkpoints are written in the order of the saves.
+    self._pool = ThreadPool(1)
+    self._pending = collections.deque()
+
+  def submit(self, fn, *args):
+    """Schedules a call of `fn(*args)` in the background thread."""
+    while len(self._pending) >= self.max_pending:
+      self._pending.popleft().get()
+    self._pending.append(self._pool.apply_async(fn, args))
+
+  def wait(self):
+    """Blocks until all the submitted writes are finished."""
+    while self._pending:
+      self._pending.popleft().get()
+
+  def close(self):
+    """Waits for the submitted writes, then stops the background thread."""
+    try:
+      self.wait()
+    finally:
+      self._pool.close()
+      self._pool.join()
+
+
+def snapshot_checkpoint(root):
+  """Copies the values a TF-format checkpoint of `root` contains to the host.
+
+  Only supported when executing eagerly.
+
+  Args:
+    root: A trackable object, e.g. a `tf.keras.Model` or `tf.train.Checkpoint`.
+
+  Returns:
+    A `(tensor_names, shape_and_slices, values)` tuple of lists to pass to
+    `write_checkpoint`.
+  """
+  named_saveables, graph_proto, _ = (
+      graph_view.ObjectGraphView(root).serialize_object_graph())
+  tensor_names = []
+  shape_and_slices = []
+  values = []
+  for saveable in named_saveables:
+    for spec in saveable.specs:
+      tensor_names.append(spec.name)
+      shape_and_slices.append(spec.slice_spec)
+      values.append(spec.tensor.numpy())
+  tensor_names.append(trackable.OBJECT_GRAPH_PROTO_KEY)
+  shape_and_slices.append('')
+  values.append(graph_proto.SerializeToString())
+  return tensor_names, shape_and_slices, values
+
+
+def write_checkpoint(snapshot, file_prefix, options=None):
+  """Writes a snapshot from `snapshot_checkpoint` as a TF-format checkpoint.
+
+  The checkpoint is written as a single shard in a temporary directory, then
+  merged into `file_prefix`. The index file is moved into place last, so a
+  checkpoint interrupted while being written is never found by readers.
+
+  Args:
+    snapshot: Snapshot returned by `snapshot_checkpoint`.
+    file_prefix: Prefix of the checkpoint files, as passed to
+      `tf.train.Checkpoint.write`.
+    options: Optional `tf.train.CheckpointOptions`.
+  """
+  tensor_names, shape_and_slices, values = snapshot
+  io_device = (options and options.experimental_io_device) or 'cpu:0'
+  shard_prefix = os.path.join(file_prefix + '_temp', 'part-00000-of-00001')
+  with tf.device(io_device):
+    tf.raw_ops.SaveV2(
+        prefix=shard_prefix,
+        tensor_names=tensor_names,
+        shape_and_slices=shape_and_slices,
+        tensors=[tf.constant(value) for value in values])
+    tf.raw_ops.MergeV2Checkpoints(
+        checkpoint_prefixes=[shard_prefix],
+        destination_prefix=file_prefix,
+        delete_old_dirs=True)
+
+
+def write_hdf5(write_fn, snapshot, filepath):
+  """Writes a snapshot to a new HDF5 file, then moves it to `filepath`.
+
+  Args:
+    write_fn: Function writing the snapshot to a HDF5 group, e.g.
+      `hdf5_format.save_weights_snapshot_to_hdf5_group`.
+    snapshot: Snapshot passed to `write_fn`.
+    filepath: Path of the HDF5 file.
+  """
+  if h5py is None:
+    raise ImportError('Writing HDF5 files requires h5py.')
+  dirpath = os.path.dirname(filepath)
+  if dirpath and not tf.io.gfile.exists(dirpath):
+    tf.io.gfile.makedirs(dirpath)
+  temp_filepath = filepath + _TEMP_SUFFIX
+  try:
+    with h5py.File(temp_filepath, mode='w') as f:
+      write_fn(f, snapshot)
+    # The previous file stays in place until the new one is complete.
+    tf.io.gfile.rename(temp_filepath, filepath, overwrite=True)
+  finally:
+    if tf.io.gfile.exists(temp_filepath):
+      tf.io.gfile.remove(temp_filepath)
@@ -22,6 +22,7 @@ from __future__ import print_function
 import tensorflow.compat.v2 as tf
 
 import json
+from multiprocessing.pool import ThreadPool
 import os
 
 import numpy as np
@@ -45,6 +46,11 @@ except ImportError:
   h5py = None
 # pylint: enable=g-import-not-at-top
 
+# Bytes of weight values read from HDF5 before they are assigned to variables.
+LOAD_WEIGHTS_MEMORY_BUDGET = 256 * 2**20
+# Alignment of the weight values in the staging buffers.
+_STAGING_ALIGNMENT = 64
+
 # TODO(b/134426265): Switch back to single-quotes to match the rest of the file
 # once the issue with copybara is fixed.
 # pylint:disable=g-inconsistent-quotes
@@ -113,12 +119,7 @@ def save_model_to_hdf5(model, filepath, overwrite=True, include_optimizer=True):
 
   try:
     model_metadata = saving_utils.model_metadata(model, include_optimizer)
-    for k, v in model_metadata.items():
-      if isinstance(v, (dict, list, tuple)):
-        f.attrs[k] = json.dumps(
-            v, default=json_utils.get_json_type).encode('utf8')
-      else:
-        f.attrs[k] = v
+    _save_model_metadata_to_hdf5_group(f, model_metadata)
 
     model_weights_group = f.create_group('model_weights')
     model_layers = model.layers
@@ -136,6 +137,58 @@ def save_model_to_hdf5(model, filepath, overwrite=True, include_optimizer=True):
       f.close()
 
 
+def get_model_snapshot(model, include_optimizer=True):
+  """Copies the state `save_model_to_hdf5` saves into host memory.
+
+  The snapshot can be written with `save_model_snapshot_to_hdf5_group` while
+  the model keeps training, e.g. from a background thread. It holds a copy of
+  all the weights, so `save_model_to_hdf5` should be used for synchronous
+  saves.
+
+  Args:
+      model: Keras model instance.
+      include_optimizer: If True, the snapshot includes the optimizer's state.
+
+  Returns:
+      An opaque snapshot of the model.
+  """
+  model_metadata = saving_utils.model_metadata(model, include_optimizer)
+  # TODO(b/128683857): Add integration tests between tf.keras and external
+  # Keras, to avoid breaking TF.js users.
+  if (include_optimizer and model.optimizer and
+      not isinstance(model.optimizer, optimizer_v1.TFOptimizer)):
+    optimizer_weights = _get_optimizer_weights_snapshot(model.optimizer)
+  else:
+    optimizer_weights = None
+  return model_metadata, get_weights_snapshot(model.layers), optimizer_weights
+
+
+def save_model_snapshot_to_hdf5_group(f, snapshot):
+  """Writes a snapshot from `get_model_snapshot` to a HDF5 group.
+
+  Args:
+      f: HDF5 group.
+      snapshot: Snapshot returned by `get_model_snapshot`.
+  """
+  model_metadata, layer_weights, optimizer_weights = snapshot
+  _save_model_metadata_to_hdf5_group(f, model_metadata)
+
+  model_weights_group = f.create_group('model_weights')
+  save_weights_snapshot_to_hdf5_group(model_weights_group, layer_weights)
+
+  if optimizer_weights is not None:
+    _save_optimizer_weights_snapshot_to_hdf5_group(f, optimizer_weights)
+
+
+def _save_model_metadata_to_hdf5_group(f, model_metadata):
+  for k, v in model_metadata.items():
+    if isinstance(v, (dict, list, tuple)):
+      f.attrs[k] = json.dumps(
+          v, default=json_utils.get_json_type).encode('utf8')
+    else:
+      f.attrs[k] = v
+
+
 def load_model_from_hdf5(filepath, custom_objects=None, compile=True):  # pylint: disable=redefined-builtin
   """Loads a model saved via `save_model_to_hdf5`.
 
@@ -589,20 +642,35 @@ def save_optimizer_weights_to_hdf5_group(hdf5_group, optimizer):
       optimizer: optimizer instance.
   """
 
+  _save_optimizer_weights_snapshot_to_hdf5_group(
+      hdf5_group, _get_optimizer_weights_snapshot(optimizer))
+
+
+def _get_optimizer_weights_snapshot(optimizer):
+  """Returns the names and values of the weights of an optimizer."""
   symbolic_weights = getattr(optimizer, 'weights')
-  if symbolic_weights:
+  weight_names = [str(w.name).encode('utf8') for w in symbolic_weights]
+  return weight_names, K.batch_get_value(symbolic_weights)
+
+
+def _save_optimizer_weights_snapshot_to_hdf5_group(hdf5_group, snapshot):
+  """Writes the names and values of the weights of an optimizer."""
+  weight_names, weight_values = snapshot
+  if weight_names:
     weights_group = hdf5_group.create_group('optimizer_weights')
-    weight_names = [str(w.name).encode('utf8') for w in symbolic_weights]
     save_attributes_to_hdf5_group(weights_group, 'weight_names', weight_names)
-    weight_values = K.batch_get_value(symbolic_weights)
-    for name, val in zip(weight_names, weight_values):
-      param_dset = weights_group.create_dataset(
-          name, val.shape, dtype=val.dtype)
-      if not val.shape:
-        # scalar
-        param_dset[()] = val
-      else:
-        param_dset[:] = val
+    _save_values_to_hdf5_group(weights_group, weight_names, weight_values)
+
+
+def _save_values_to_hdf5_group(hdf5_group, names, values):
+  """Creates a dataset of the group for each of the values."""
+  for name, val in zip(names, values):
+    param_dset = hdf5_group.create_dataset(name, val.shape, dtype=val.dtype)
+    if not val.shape:
+      # scalar
+      param_dset[()] = val
+    else:
+      param_dset[:] = val
 
 
 def load_optimizer_weights_from_hdf5_group(hdf5_group):
@@ -627,36 +695,96 @@ def save_weights_to_hdf5_group(f, layers):
       f: HDF5 group.
       layers: List of layer instances.
   """
+  _save_layer_names_to_hdf5_group(f, [layer.name for layer in layers])
+
+  # Sort model layers by layer name to ensure that group names are strictly
+  # growing to avoid prefix issues. The weights are fetched one layer at a
+  # time, so saving doesn't need memory for a copy of all of them.
+  for layer in sorted(layers, key=lambda x: x.name):
+    weights = _legacy_weights(layer)
+    weight_names = [w.name.encode('utf8') for w in weights]
+    _save_layer_weights_to_hdf5_group(
+        f, layer.name, weight_names, K.batch_get_value(weights))
+
+
+def get_weights_snapshot(layers):
+  """Copies the weights of a list of layers into host memory.
+
+  All the weights are read with a single `batch_get_value` call, so the
+  snapshot is consistent and can be written with
+  `save_weights_snapshot_to_hdf5_group` while the weights keep changing. It
+  holds a copy of all the weights, so `save_weights_to_hdf5_group` should be
+  used for synchronous saves.
+
+  Args:
+      layers: List of layer instances.
+
+  Returns:
+      A list of `(layer_name, weight_names, weight_values)` tuples.
+  """
+  layer_weights = [_legacy_weights(layer) for layer in layers]
+  values = K.batch_get_value([w for weights in layer_weights for w in weights])
+  snapshot = []
+  start = 0
+  for layer, weights in zip(layers, layer_weights):
+    weight_names = [w.name.encode('utf8') for w in weights]
+    snapshot.append(
+        (layer.name, weight_names, values[start:start + len(weights)]))
+    start += len(weights)
+  return snapshot
+
+
+def save_weights_snapshot_to_hdf5_group(f, snapshot):
+  """Writes a snapshot from `get_weights_snapshot` to a HDF5 group.
+
+  Args:
+      f: HDF5 group.
+      snapshot: List of `(layer_name, weight_names, weight_values)` tuples.
+  """
+  _save_layer_names_to_hdf5_group(
+      f, [layer_name for layer_name, _, _ in snapshot])
+
+  # Sort model layers by layer name to ensure that group names are strictly
+  # growing to avoid prefix issues.
+  for layer_name, weight_names, weight_values in sorted(
+      snapshot, key=lambda x: x[0]):
+    _save_layer_weights_to_hdf5_group(
+        f, layer_name, weight_names, weight_values)
+
+
+def _save_layer_names_to_hdf5_group(f, layer_names):
   from keras import __version__ as keras_version  # pylint: disable=g-import-not-at-top
 
   save_attributes_to_hdf5_group(
-      f, 'layer_names', [layer.name.encode('utf8') for layer in layers])
+      f, 'layer_names', [name.encode('utf8') for name in layer_names])
   f.attrs['backend'] = K.backend().encode('utf8')
   f.attrs['keras_version'] = str(keras_version).encode('utf8')
 
-  # Sort model layers by layer name to ensure that group names are strictly
-  # growing to avoid prefix issues.
-  for layer in sorted(layers, key=lambda x: x.name):
-    g = f.create_group(layer.name)
-    weights = _legacy_weights(layer)
-    weight_values = K.batch_get_value(weights)
-    weight_names = [w.name.encode('utf8') for w in weights]
-    save_attributes_to_hdf5_group(g, 'weight_names', weight_names)
-    for name, val in zip(weight_names, weight_values):
-      param_dset = g.create_dataset(name, val.shape, dtype=val.dtype)
-      if not val.shape:
-        # scalar
-        param_dset[()] = val
-      else:
-        param_dset[:] = val
 
+def _save_layer_weights_to_hdf5_group(f, layer_name, weight_names,
+                                      weight_values):
+  g = f.create_group(layer_name)
+  save_attributes_to_hdf5_group(g, 'weight_names', weight_names)
+  _save_values_to_hdf5_group(g, weight_names, weight_values)
 
-def load_weights_from_hdf5_group(f, layers):
+
+def load_weights_from_hdf5_group(f, layers, memory_budget=None,
+                                 read_ahead=False):
   """Implements topological (order-based) weight loading.
 
+  Weights are read and assigned in batches of layers of up to `memory_budget`
+  bytes, so loading a model doesn't need memory for a copy of all its weights.
+  The number and shapes of the weights of every layer are checked against the
+  metadata of the file before any weight is assigned.
+
   Args:
       f: A pointer to a HDF5 group.
       layers: a list of target layers.
+      memory_budget: Bytes of weight values to read before assigning them.
+          Defaults to `LOAD_WEIGHTS_MEMORY_BUDGET`.
+      read_ahead: Whether to read the next batch of weights in a background
+          thread while the current one is assigned. The memory budget is split
+          between the two batches.
 
   Raises:
       ValueError: in case of mismatch between provided layers
@@ -695,17 +823,15 @@ def load_weights_from_hdf5_group(f, layers):
                      ' layers into a model with ' + str(len(filtered_layers)) +
                      ' layers.')
 
-  # We batch weight value assignments in a single backend call
-  # which provides a speedup in TensorFlow.
-  weight_value_tuples = []
+  # Check the weights of every layer against the metadata of the file before
+  # assigning any of them, so that a mismatched file doesn't leave the model
+  # partly loaded.
   for k, name in enumerate(layer_names):
-    g = f[name]
-    weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
-    weight_values = [np.asarray(g[weight_name]) for weight_name in weight_names]
     layer = filtered_layers[k]
     symbolic_weights = _legacy_weights(layer)
     weight_values = preprocess_weights_for_loading(
-        layer, weight_values, original_keras_version, original_backend)
+        layer, _weight_placeholders(f[name]), original_keras_version,
+        original_backend)
     if len(weight_values) != len(symbolic_weights):
       raise ValueError('Layer #' + str(k) + ' (named "' + layer.name +
                        '" in the current model) was found to '
@@ -714,17 +840,36 @@ def load_weights_from_hdf5_group(f, layers):
                        str(len(symbolic_weights)) +
                        ' weights, but the saved weights have ' +
                        str(len(weight_values)) + ' elements.')
-    weight_value_tuples += zip(symbolic_weights, weight_values)
-  K.batch_set_value(weight_value_tuples)
+    for symbolic_weight, weight_value in zip(symbolic_weights, weight_values):
+      if not tf.TensorShape(K.int_shape(symbolic_weight)).is_compatible_with(
+          weight_value.shape):
+        raise ValueError('Layer #' + str(k) + ' (named "' + layer.name +
+                         '"), weight ' + str(symbolic_weight) +
+                         ' has shape {}'.format(K.int_shape(symbolic_weight)) +
+                         ', but the saved weight has shape ' +
+                         str(weight_value.shape) + '.')
+
+  # We batch weight value assignments in a backend call per batch of layers,
+  # which provides a speedup in TensorFlow.
+  for batch in _read_weight_batches(f, list(enumerate(layer_names)),
+                                    memory_budget, read_ahead):
+    weight_value_tuples = []
+    for k, name, weight_values in batch:
+      layer = filtered_layers[k]
+      weight_values = preprocess_weights_for_loading(
+          layer, weight_values, original_keras_version, original_backend)
+      weight_value_tuples += zip(_legacy_weights(layer), weight_values)
+    K.batch_set_value(weight_value_tuples)
 
 
 def load_weights_from_hdf5_group_by_name(
-    f, layers, skip_mismatch=False):
+    f, layers, skip_mismatch=False, memory_budget=None, read_ahead=False):
   """Implements name-based weight loading.
 
   (instead of topological weight loading).
 
-  Layers that have no matching name are skipped.
+  Layers that have no matching name are skipped. Mismatches are found from the
+  metadata of the file before any weight is assigned.
 
   Args:
       f: A pointer to a HDF5 group.
@@ -732,6 +877,10 @@ def load_weights_from_hdf5_group_by_name(
       skip_mismatch: Boolean, whether to skip loading of layers
           where there is a mismatch in the number of weights,
           or a mismatch in the shape of the weights.
+      memory_budget: Bytes of weight values to read before assigning them.
+          Defaults to `LOAD_WEIGHTS_MEMORY_BUDGET`.
+      read_ahead: Whether to read the next batch of weights in a background
+          thread while the current one is assigned.
 
   Raises:
       ValueError: in case of mismatch between provided layers
@@ -759,18 +908,23 @@ def load_weights_from_hdf5_group_by_name(
     if layer.name:
       index.setdefault(layer.name, []).append(layer)
 
-  # We batch weight value assignments in a single backend call
-  # which provides a speedup in TensorFlow.
-  weight_value_tuples = []
-  for k, name in enumerate(layer_names):
-    g = f[name]
-    weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
-    weight_values = [np.asarray(g[weight_name]) for weight_name in weight_names]
-
-    for layer in index.get(name, []):
+  # Layers that have no matching name aren't read.
+  layer_names = [(k, name) for k, name in enumerate(layer_names)
+                 if name in index]
+
+  # Check the weights of every layer against the metadata of the file before
+  # assigning any of them, so that a mismatched file doesn't leave the model
+  # partly loaded. `loaded_weights[k]` holds the indices of the weights to set
+  # for each layer named like layer #k of the file.
+  loaded_weights = {}
+  for k, name in layer_names:
+    placeholders = _weight_placeholders(f[name])
+    loaded_weights[k] = []
+    for layer in index[name]:
+      loaded_weights[k].append([])
       symbolic_weights = _legacy_weights(layer)
       weight_values = preprocess_weights_for_loading(
-          layer, weight_values, original_keras_version, original_backend)
+          layer, placeholders, original_keras_version, original_backend)
       if len(weight_values) != len(symbolic_weights):
         if skip_mismatch:
           logging.warning('Skipping loading of weights for '
@@ -782,7 +936,6 @@ def load_weights_from_hdf5_group_by_name(
                          '") expects ' + str(len(symbolic_weights)) +
                          ' weight(s), but the saved weights' + ' have ' +
                          str(len(weight_values)) + ' element(s).')
-      # Set values.
       for i in range(len(weight_values)):
         if K.int_shape(symbolic_weights[i]) != weight_values[i].shape:
           if skip_mismatch:
@@ -798,10 +951,150 @@ def load_weights_from_hdf5_group_by_name(
                                symbolic_weights[i])) +
                            ', but the saved weight has shape ' +
                            str(weight_values[i].shape) + '.')
+        loaded_weights[k][-1].append(i)
+
+  # We batch weight value assignments in a backend call per batch of layers,
+  # which provides a speedup in TensorFlow.
+  for batch in _read_weight_batches(f, layer_names, memory_budget, read_ahead):
+    weight_value_tuples = []
+    for k, name, weight_values in batch:
+      for layer, indices in zip(index[name], loaded_weights[k]):
+        symbolic_weights = _legacy_weights(layer)
+        layer_weight_values = preprocess_weights_for_loading(
+            layer, weight_values, original_keras_version, original_backend)
+        weight_value_tuples += [
+            (symbolic_weights[i], layer_weight_values[i]) for i in indices
+        ]
+    K.batch_set_value(weight_value_tuples)
+
+
+def _weight_placeholders(g):
+  """Returns arrays of zeros like the weights of a layer's HDF5 group.
+
+  They are made from the metadata of the datasets without reading them, and
+  their memory isn't touched unless they are written, so checking the weights
+  of a file with them is cheap.
 
-        else:
-          weight_value_tuples.append((symbolic_weights[i], weight_values[i]))
-  K.batch_set_value(weight_value_tuples)
+  Args:
+    g: The HDF5 group of a layer.
+
+  Returns:
+    A list of arrays with the shapes and dtypes of the weights of the layer.
+  """
+  weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
+  return [
+      np.zeros(g[weight_name].shape, dtype=g[weight_name].dtype)
+      for weight_name in weight_names
+  ]
+
+
+class _StagingBuffer(object):
+  """Memory reused to read the weight values of successive batches of layers.
+
+  Args:
+    size: Size of the buffer in bytes.
+  """
+
+  def __init__(self, size):
+    self._buffer = np.empty(size, dtype=np.uint8)
+    self._offset = 0
+
+  def reset(self):
+    """Makes the memory of the values read so far available again."""
+    self._offset = 0
+
+  def read(self, dataset):
+    """Reads a HDF5 dataset, in the buffer if it fits."""
+    start = _align(self._offset)
+    nbytes = _dataset_nbytes(dataset)
+    if (not dataset.shape or dataset.dtype.hasobject or
+        start + nbytes > len(self._buffer)):
+      return np.asarray(dataset)
+    value = self._buffer[start:start + nbytes].view(dataset.dtype)
+    value = value.reshape(dataset.shape)
+    if nbytes:
+      dataset.read_direct(value)
+    self._offset = start + nbytes
+    return value
+
+
+def _align(nbytes):
+  return -(-nbytes // _STAGING_ALIGNMENT) * _STAGING_ALIGNMENT
+
+
+def _dataset_nbytes(dataset):
+  return int(np.prod(dataset.shape)) * dataset.dtype.itemsize
+
+
+def _read_weight_batches(f, layer_names, memory_budget=None, read_ahead=False):
+  """Reads the weight values of the layers of a HDF5 group in batches.
+
+  Consecutive layers are batched while their values fit in a staging buffer of
+  `memory_budget` bytes, which is reused by every batch. Each batch must be
+  consumed before the next one is requested.
+
+  Args:
+    f: A pointer to a HDF5 group.
+    layer_names: List of `(index, name)` of the layers to read.
+    memory_budget: Size of the staging buffers. Defaults to
+      `LOAD_WEIGHTS_MEMORY_BUDGET`.
+    read_ahead: Whether to read the next batch in a background thread while
+      the current one is consumed, with the budget split between two buffers.
+
+  Yields:
+    Lists of `(index, name, weight_values)` for the layers of each batch.
+  """
+  if memory_budget is None:
+    memory_budget = LOAD_WEIGHTS_MEMORY_BUDGET
+  num_buffers = 2 if read_ahead else 1
+  buffer_size = memory_budget // num_buffers
+
+  batches = []
+  total_nbytes = 0
+  batch_nbytes = 0
+  for k, name in layer_names:
+    g = f[name]
+    weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
+    nbytes = sum(
+        _align(_dataset_nbytes(g[weight_name])) for weight_name in weight_names)
+    if not batches or batch_nbytes + nbytes > buffer_size:
+      batches.append([])
+      batch_nbytes = 0
+    batches[-1].append((k, name, weight_names))
+    batch_nbytes += nbytes
+    total_nbytes += nbytes
+
+  # Small models don't need buffers as big as the budget.
+  buffers = [
+      _StagingBuffer(min(buffer_size, total_nbytes))
+      for _ in range(num_buffers)
+  ]
+
+  def _read_batch(batch, staging_buffer):
+    staging_buffer.reset()
+    return [(k, name, [staging_buffer.read(f[name][weight_name])
+                       for weight_name in weight_names])
+            for k, name, weight_names in batch]
+
+  if not read_ahead:
+    for batch in batches:
+      yield _read_batch(batch, buffers[0])
+    return
+
+  # h5py serializes its calls, so a single thread reads the batches.
+  pool = ThreadPool(1)
+  try:
+    next_batch = None
+    if batches:
+      next_batch = pool.apply_async(_read_batch, (batches[0], buffers[0]))
+    for i in range(len(batches)):
+      batch = next_batch.get()
+      if i + 1 < len(batches):
+        next_batch = pool.apply_async(
+            _read_batch, (batches[i + 1], buffers[(i + 1) % num_buffers]))
+      yield batch
+  finally:
+    pool.terminate()
 
 
 def save_attributes_to_hdf5_group(group, name, data):
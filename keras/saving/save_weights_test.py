@@ -231,6 +231,103 @@ class TestWeightSavingAndLoading(tf.test.TestCase, parameterized.TestCase):
 
       self.assertAllClose(y, ref_y)
 
+  @parameterized.named_parameters(
+      ('layer_by_layer', 0, False),
+      ('small_budget', 200, False),
+      ('small_budget_read_ahead', 200, True),
+      ('default_budget_read_ahead', None, True))
+  def test_weight_loading_memory_budget(self, memory_budget, read_ahead):
+    if h5py is None:
+      return
+
+    h5_path = self._save_model_dir('test.h5')
+
+    with self.cached_session():
+      ref_model = keras.models.Sequential()
+      ref_model.add(keras.layers.Dense(8, input_dim=3, name='d1'))
+      ref_model.add(keras.layers.BatchNormalization(name='bn'))
+      ref_model.add(keras.layers.Dense(4, name='d2'))
+      ref_model.add(keras.layers.Dense(2, name='d3'))
+      ref_model.set_weights(
+          [np.random.random(w.shape) for w in ref_model.get_weights()])
+      ref_model.save_weights(h5_path)
+
+      for by_name in (False, True):
+        model = keras.models.Sequential()
+        model.add(keras.layers.Dense(8, input_dim=3, name='d1'))
+        model.add(keras.layers.BatchNormalization(name='bn'))
+        model.add(keras.layers.Dense(4, name='d2'))
+        model.add(keras.layers.Dense(2, name='d3'))
+        with h5py.File(h5_path, 'r') as f:
+          if by_name:
+            hdf5_format.load_weights_from_hdf5_group_by_name(
+                f, model.layers, memory_budget=memory_budget,
+                read_ahead=read_ahead)
+          else:
+            hdf5_format.load_weights_from_hdf5_group(
+                f, model.layers, memory_budget=memory_budget,
+                read_ahead=read_ahead)
+        # Values read in reused staging buffers must not alias the weights.
+        for ref_weight, weight in zip(ref_model.get_weights(),
+                                      model.get_weights()):
+          self.assertAllClose(ref_weight, weight)
+
+  def test_weight_loading_mismatch_assigns_nothing(self):
+    if h5py is None:
+      return
+
+    h5_path = self._save_model_dir('test.h5')
+
+    with self.cached_session():
+      ref_model = keras.models.Sequential()
+      ref_model.add(keras.layers.Dense(8, input_dim=3, name='d1'))
+      ref_model.add(keras.layers.Dense(4, name='d2'))
+      ref_model.save_weights(h5_path)
+
+      for by_name in (False, True):
+        model = keras.models.Sequential()
+        model.add(keras.layers.Dense(8, input_dim=3, name='d1'))
+        model.add(keras.layers.Dense(5, name='d2'))
+        weights = model.get_weights()
+        with h5py.File(h5_path, 'r') as f:
+          with self.assertRaisesRegex(ValueError, 'shape'):
+            # Reading a layer at a time, d1 would be assigned before d2 is
+            # read without the checks on the metadata.
+            if by_name:
+              hdf5_format.load_weights_from_hdf5_group_by_name(
+                  f, model.layers, memory_budget=0)
+            else:
+              hdf5_format.load_weights_from_hdf5_group(
+                  f, model.layers, memory_budget=0)
+        for weight, current_weight in zip(weights, model.get_weights()):
+          self.assertAllClose(weight, current_weight)
+
+  def test_weight_saving_fetches_layer_by_layer(self):
+    if h5py is None:
+      return
+
+    h5_path = self._save_model_dir('test.h5')
+
+    with self.cached_session():
+      model = keras.models.Sequential()
+      model.add(keras.layers.Dense(8, input_dim=3, name='d1'))
+      model.add(keras.layers.Dense(4, name='d2'))
+      model.compile(loss='mse', optimizer='adam')
+      model.train_on_batch(np.zeros((2, 3)), np.zeros((2, 4)))
+      with tf.compat.v1.test.mock.patch.object(
+          hdf5_format.K, 'batch_get_value',
+          wraps=hdf5_format.K.batch_get_value) as batch_get_value:
+        model.save(h5_path, save_format='h5')
+      # A call per layer, and one for the optimizer.
+      self.assertEqual(3, batch_get_value.call_count)
+      for args, _ in batch_get_value.call_args_list[:2]:
+        self.assertLen(args[0], 2)
+
+      loaded_model = keras.models.load_model(h5_path)
+      for weight, loaded_weight in zip(model.get_weights(),
+                                       loaded_model.get_weights()):
+        self.assertAllClose(weight, loaded_weight)
+
   @keras_parameterized.run_with_all_saved_model_formats(
       exclude_formats=['tf_no_traces'])
   def test_nested_model_weight_loading(self):
@@ -22,6 +22,7 @@ from __future__ import print_function
 import tensorflow.compat.v2 as tf
 
 from abc import abstractmethod
+import collections
 from contextlib import closing
 import errno
 import functools
@@ -34,6 +35,7 @@ import sys
 import tarfile
 import threading
 import time
+import uuid
 import weakref
 import zipfile
 
@@ -41,6 +43,7 @@ import numpy as np
 import six
 from six.moves.urllib.error import HTTPError
 from six.moves.urllib.error import URLError
+from six.moves.urllib.request import Request
 from six.moves.urllib.request import urlopen
 from keras.utils import tf_inspect
 from keras.utils.generic_utils import Progbar
@@ -53,6 +56,11 @@ try:
 except ImportError:
   import Queue as queue
 
+try:
+  from multiprocessing import shared_memory
+except ImportError:
+  shared_memory = None
+
 try:
   import typing
   is_iterator = lambda x: isinstance(x, typing.Iterator)
@@ -61,46 +69,15 @@ except ImportError:
   is_iterator = lambda x: hasattr(x, '__iter__') and hasattr(x, 'next')
 
 
-if True:  # This gets transformed to `if sys.version_info[0] == 2:` in OSS.  # pylint: disable=using-constant-test
-
-  def urlretrieve(url, filename, reporthook=None, data=None):
-    """Replacement for `urlretrieve` for Python 2.
-
-    Under Python 2, `urlretrieve` relies on `FancyURLopener` from legacy
-    `urllib` module, known to have issues with proxy management.
-
-    Args:
-        url: url to retrieve.
-        filename: where to store the retrieved data locally.
-        reporthook: a hook function that will be called once on establishment of
-          the network connection and once after each block read thereafter. The
-          hook will be passed three arguments; a count of blocks transferred so
-          far, a block size in bytes, and the total size of the file.
-        data: `data` argument passed to `urlopen`.
-    """
-
-    def chunk_read(response, chunk_size=8192, reporthook=None):
-      content_type = response.info().get('Content-Length')
-      total_size = -1
-      if content_type is not None:
-        total_size = int(content_type.strip())
-      count = 0
-      while True:
-        chunk = response.read(chunk_size)
-        count += 1
-        if reporthook is not None:
-          reporthook(count, chunk_size, total_size)
-        if chunk:
-          yield chunk
-        else:
-          break
-
-    response = urlopen(url, data)
-    with open(filename, 'wb') as fd:
-      for chunk in chunk_read(response, reporthook=reporthook):
-        fd.write(chunk)
-else:
-  from six.moves.urllib.request import urlretrieve
+# Size of the byte ranges fetched in parallel by `get_file`.
+_DOWNLOAD_CHUNK_SIZE = 8 * 2**20
+_DOWNLOAD_WORKERS = 4
+# Suffix of the file holding the `ETag` or `Last-Modified` date of a download.
+_VALIDATOR_SUFFIX = '.validator'
+# Size of the reads of sequential downloads and of local files being hashed.
+_STREAM_CHUNK_SIZE = 65535
+# Subdirectory of the Keras cache dir holding the content-addressed files.
+_CONTENT_CACHE_SUBDIR = 'content'
 
 
 def is_generator_or_sequence(x):
@@ -182,6 +159,12 @@ def get_file(fname,
   Passing a hash will verify the file after download. The command line
   programs `shasum` and `sha256sum` can compute the hash.
 
+  Servers supporting HTTP range requests are downloaded in parallel chunks,
+  and interrupted downloads are resumed by the next call. Downloaded files are
+  stored under their sha256 hash in the `content` subdirectory of `cache_dir`
+  and linked to their final location, so a file passed with the same sha256
+  `file_hash` to another `cache_subdir` isn't downloaded again.
+
   Example:
 
   ```python
@@ -218,6 +201,9 @@ def get_file(fname,
 
   Returns:
       Path to the downloaded file
+
+  Raises:
+      ValueError: If the downloaded file doesn't match `file_hash`.
   """
   if cache_dir is None:
     cache_dir = os.path.join(os.path.expanduser('~'), '.keras')
@@ -238,17 +224,25 @@ def get_file(fname,
   else:
     fpath = os.path.join(datadir, fname)
 
+  content_cache = _ContentCache(
+      os.path.join(datadir_base, _CONTENT_CACHE_SUBDIR))
+
   download = False
   if os.path.exists(fpath):
-    # File found; verify integrity if a hash was provided.
-    if file_hash is not None:
+    # File found; verify integrity if a hash was provided. Files linked from
+    # the content cache are stored under their sha256 hash, so they don't
+    # need to be hashed again.
+    if file_hash is not None and not content_cache.contains(
+        fpath, file_hash, hash_algorithm):
       if not validate_file(fpath, file_hash, algorithm=hash_algorithm):
         print('A local file was found, but it seems to be '
               'incomplete or outdated because the ' + hash_algorithm +
               ' file hash does not match the original value of ' + file_hash +
               ' so we will re-download the data.')
         download = True
-  else:
+  elif file_hash is None or not content_cache.link(fpath, file_hash,
+                                                    hash_algorithm):
+    # An identical file downloaded to another `cache_subdir` is reused.
     download = True
 
   if download:
@@ -259,26 +253,19 @@ def get_file(fname,
       # This design was chosen for Python 2.7 compatibility.
       progbar = None
 
-    def dl_progress(count, block_size, total_size):
+    def dl_progress(downloaded_size, total_size):
       if ProgressTracker.progbar is None:
-        if total_size == -1:
-          total_size = None
         ProgressTracker.progbar = Progbar(total_size)
-      else:
-        ProgressTracker.progbar.update(count * block_size)
+      ProgressTracker.progbar.update(downloaded_size)
 
     error_msg = 'URL fetch failure on {}: {} -- {}'
     try:
-      try:
-        urlretrieve(origin, fpath, dl_progress)
-      except HTTPError as e:
-        raise Exception(error_msg.format(origin, e.code, e.msg))
-      except URLError as e:
-        raise Exception(error_msg.format(origin, e.errno, e.reason))
-    except (Exception, KeyboardInterrupt) as e:
-      if os.path.exists(fpath):
-        os.remove(fpath)
-      raise
+      content_cache.download(origin, fpath, file_hash, hash_algorithm,
+                             dl_progress)
+    except HTTPError as e:
+      raise Exception(error_msg.format(origin, e.code, e.msg))
+    except URLError as e:
+      raise Exception(error_msg.format(origin, e.errno, e.reason))
     ProgressTracker.progbar = None
 
   if untar:
@@ -360,6 +347,279 @@ def validate_file(fpath, file_hash, algorithm='auto', chunk_size=65535):
     return False
 
 
+def _get_hasher(file_hash, algorithm='auto'):
+  """Returns a new hash object for the algorithm of `file_hash`."""
+  if (algorithm == 'sha256') or (algorithm == 'auto' and len(file_hash) == 64):
+    return hashlib.sha256()
+  return hashlib.md5()
+
+
+def _open_url(url, start=None, stop=None, validator=None):
+  """Opens `url`, requesting the bytes `[start, stop)` if `start` is set.
+
+  If `validator` is set, the range is only requested from the version of the
+  file with this `ETag` or `Last-Modified` date, and the server sends the
+  whole file otherwise.
+  """
+  request = Request(url)
+  if start is not None:
+    request.add_header(
+        'Range', 'bytes={}-{}'.format(start, '' if stop is None else stop - 1))
+    if validator is not None:
+      request.add_header('If-Range', validator)
+  return urlopen(request)
+
+
+def _get_validator(response):
+  """Returns the `ETag` or `Last-Modified` date of a response, or `None`."""
+  etag = response.info().get('ETag')
+  # Weak entity tags can't be used in `If-Range`.
+  if etag is not None and not etag.startswith('W/'):
+    return etag
+  return response.info().get('Last-Modified')
+
+
+def _get_range_total_size(response):
+  """Returns the size of the file of a partial content response, or `None`."""
+  if response.getcode() != 206:
+    return None
+  # e.g. "bytes 0-1023/4096".
+  total_size = response.info().get('Content-Range', '').rpartition('/')[2]
+  return int(total_size) if total_size.isdigit() else None
+
+
+def _fetch_range(url, start, stop, validator):
+  """Returns the bytes `[start, stop)` of the version `validator` of `url`."""
+  with closing(_open_url(url, start, stop, validator)) as response:
+    if response.getcode() != 206:
+      raise IOError('{} changed or stopped serving range requests.'.format(
+          url))
+    data = response.read()
+  if len(data) != stop - start:
+    raise IOError('Expected {} bytes from {} but received {}.'.format(
+        stop - start, url, len(data)))
+  return data
+
+
+def _download_file(origin,
+                   fpath,
+                   hashers=(),
+                   progress=None,
+                   workers=None,
+                   chunk_size=None):
+  """Downloads `origin` to `fpath`, resuming from a partial `fpath` if any.
+
+  Servers supporting HTTP range requests are downloaded by `workers` threads,
+  each fetching `chunk_size` bytes at a time. The chunks are written and
+  hashed in order, so `fpath` always holds a prefix of the file to resume from,
+  and the file doesn't need to be read again to be validated.
+
+  The `ETag` or `Last-Modified` date of the file is written next to `fpath`,
+  and sent in the `If-Range` header of the requests. A partial `fpath` is only
+  resumed if it has one, and the download starts over if the file changed.
+
+  Args:
+      origin: URL of the file.
+      fpath: Path to download the file to.
+      hashers: `hashlib` hash objects to update with the content of the file.
+      progress: Function called with the number of bytes downloaded so far and
+          the size of the file, or `None` if unknown.
+      workers: Maximum number of concurrent range requests. Defaults to
+          `_DOWNLOAD_WORKERS`.
+      chunk_size: Size of the range requests. Defaults to
+          `_DOWNLOAD_CHUNK_SIZE`.
+  """
+  workers = workers or _DOWNLOAD_WORKERS
+  chunk_size = chunk_size or _DOWNLOAD_CHUNK_SIZE
+  validator_path = fpath + _VALIDATOR_SUFFIX
+  offset = 0
+  validator = None
+  if os.path.exists(fpath) and os.path.exists(validator_path):
+    with open(validator_path) as f:
+      validator = f.read()
+    offset = os.path.getsize(fpath)
+  try:
+    response = _open_url(origin, offset, validator=validator)
+  except HTTPError as e:
+    # The range is past the end of the file, which must have changed.
+    if e.code != 416:
+      raise
+    offset = 0
+    response = _open_url(origin, offset)
+
+  with closing(response):
+    validator = _get_validator(response)
+    if validator is None:
+      # Without a validator, a partial file can't be resumed safely.
+      if os.path.exists(validator_path):
+        os.remove(validator_path)
+    else:
+      with open(validator_path, 'w') as f:
+        f.write(validator)
+    total_size = _get_range_total_size(response)
+    if total_size is None:
+      # The server sent the whole file.
+      offset = 0
+      content_length = response.info().get('Content-Length')
+      if content_length is not None:
+        content_length = int(content_length.strip())
+    else:
+      content_length = total_size
+
+    with open(fpath, 'ab' if offset else 'wb') as f:
+      if offset:
+        with open(fpath, 'rb') as prefix:
+          for chunk in iter(lambda: prefix.read(_STREAM_CHUNK_SIZE), b''):
+            for hasher in hashers:
+              hasher.update(chunk)
+
+      def _write(chunk):
+        f.write(chunk)
+        for hasher in hashers:
+          hasher.update(chunk)
+        if progress is not None:
+          progress(f.tell(), content_length)
+
+      if progress is not None:
+        progress(offset, content_length)
+      if total_size is None or workers <= 1:
+        for chunk in iter(lambda: response.read(_STREAM_CHUNK_SIZE), b''):
+          _write(chunk)
+        return
+      # The first chunk comes from the response to the probing request.
+      first_chunk = response.read(min(chunk_size, total_size - offset))
+      _write(first_chunk)
+      response.close()
+
+      pool = multiprocessing.dummy.Pool(workers)
+      try:
+        pending = collections.deque()
+        for start in range(offset + len(first_chunk), total_size, chunk_size):
+          stop = min(start + chunk_size, total_size)
+          pending.append(pool.apply_async(
+              _fetch_range, (origin, start, stop, validator)))
+          # Bounds the chunks held in memory while an earlier one is fetched.
+          if len(pending) >= 2 * workers:
+            _write(pending.popleft().get())
+        while pending:
+          _write(pending.popleft().get())
+      finally:
+        pool.terminate()
+
+
+class _ContentCache(object):
+  """Files stored under their sha256 hash, shared by all `cache_subdir`s.
+
+  Files downloaded by `get_file` are linked from the cache into their
+  `cache_subdir`, so identical files are only downloaded and stored once.
+  Interrupted downloads are kept in the cache, keyed by their URL, to be
+  resumed. A download claims the partial download of its URL by renaming its
+  directory, so concurrent downloads of the same URL don't write to the same
+  file: only one of them resumes it, and the others start over.
+
+  Args:
+      directory: Path to the cache directory.
+  """
+
+  def __init__(self, directory):
+    self.directory = directory
+
+  def _object_path(self, sha256):
+    return os.path.join(self.directory, 'sha256', sha256)
+
+  def _partial_path(self, origin):
+    key = hashlib.sha256(origin.encode('utf-8')).hexdigest()
+    return os.path.join(self.directory, 'partial', key)
+
+  def _is_sha256(self, file_hash, algorithm):
+    return _get_hasher(file_hash, algorithm).name == 'sha256'
+
+  def contains(self, fpath, file_hash, algorithm='auto'):
+    """Whether `fpath` is linked to the cached file of hash `file_hash`."""
+    if not self._is_sha256(file_hash, algorithm):
+      return False
+    object_path = self._object_path(file_hash)
+    return os.path.exists(object_path) and os.path.samefile(fpath, object_path)
+
+  def link(self, fpath, file_hash, algorithm='auto'):
+    """Links `fpath` to the cached file of hash `file_hash`, if any."""
+    if not self._is_sha256(file_hash, algorithm):
+      return False
+    object_path = self._object_path(file_hash)
+    if not os.path.exists(object_path):
+      return False
+    _link_or_copy(object_path, fpath)
+    return True
+
+  def download(self, origin, fpath, file_hash=None, algorithm='auto',
+               progress=None):
+    """Downloads `origin` into the cache and links `fpath` to it.
+
+    Args:
+        origin: URL of the file.
+        fpath: Path to link to the downloaded file.
+        file_hash: Expected sha256 or md5 hash of the file, if any.
+        algorithm: Algorithm of `file_hash`, one of `'auto'`, `'sha256'` or
+            `'md5'`.
+        progress: Progress function passed to `_download_file`.
+
+    Raises:
+        ValueError: If the downloaded file doesn't match `file_hash`.
+    """
+    partial_dir = self._partial_path(origin)
+    _makedirs_exist_ok(os.path.dirname(partial_dir))
+    _makedirs_exist_ok(os.path.dirname(self._object_path('')))
+    download_dir = '{}.{}'.format(partial_dir, uuid.uuid4().hex)
+    try:
+      os.rename(partial_dir, download_dir)
+    except OSError:
+      # There is no partial download, or another download claimed it.
+      os.mkdir(download_dir)
+    partial_path = os.path.join(download_dir, 'data')
+    sha256 = hashlib.sha256()
+    hashers = [sha256]
+    expected_hasher = None
+    if file_hash is not None:
+      expected_hasher = _get_hasher(file_hash, algorithm)
+      if expected_hasher.name != 'sha256':
+        hashers.append(expected_hasher)
+      else:
+        expected_hasher = sha256
+    try:
+      _download_file(origin, partial_path, hashers, progress)
+    except BaseException:
+      # Keeps the partial download to be resumed, unless another one was.
+      try:
+        os.rename(download_dir, partial_dir)
+      except OSError:
+        shutil.rmtree(download_dir, ignore_errors=True)
+      raise
+
+    if (expected_hasher is not None and
+        expected_hasher.hexdigest() != str(file_hash)):
+      shutil.rmtree(download_dir, ignore_errors=True)
+      raise ValueError(
+          'The file downloaded from {} has the {} hash {}, but {} was '
+          'expected.'.format(origin, expected_hasher.name,
+                             expected_hasher.hexdigest(), file_hash))
+
+    object_path = self._object_path(sha256.hexdigest())
+    if not os.path.exists(object_path):
+      os.replace(partial_path, object_path)
+    shutil.rmtree(download_dir, ignore_errors=True)
+    _link_or_copy(object_path, fpath)
+
+
+def _link_or_copy(src, dst):
+  """Replaces `dst` by a hard link to `src`, or by a copy if not supported."""
+  tmp_path = '{}.{}.tmp'.format(dst, os.getpid())
+  try:
+    os.link(src, tmp_path)
+  except (AttributeError, OSError):
+    shutil.copyfile(src, tmp_path)
+  os.replace(tmp_path, dst)
+
+
 class ThreadsafeIter(object):
   """Wrap an iterator with a lock and propagate exceptions to all threads."""
 
@@ -561,6 +821,185 @@ def get_index(uid, i):
   return _SHARED_SEQUENCES[uid][i]
 
 
+# Shared memory blocks the current worker has attached to, keyed by name.
+_SHARED_MEMORY_BLOCKS = {}
+# Arrays written to shared memory start on a cache line boundary.
+_SHARED_MEMORY_ALIGNMENT = 64
+
+# A batch written to a slot of the shared memory ring. `structure` is the
+# nested structure of the batch and `leaves` its flattened values, where each
+# array written to shared memory is replaced by an `(offset, shape, dtype)`
+# tuple wrapped in `_SharedMemoryArray`.
+_SharedMemoryBatch = collections.namedtuple(
+    '_SharedMemoryBatch', ['slot', 'structure', 'leaves'])
+_SharedMemoryArray = collections.namedtuple(
+    '_SharedMemoryArray', ['offset', 'shape', 'dtype'])
+
+
+def _get_shared_memory_block(name):
+  """Attaches to the shared memory block `name`, caching the attachment."""
+  block = _SHARED_MEMORY_BLOCKS.get(name)
+  if block is None:
+    block = shared_memory.SharedMemory(name=name)
+    _SHARED_MEMORY_BLOCKS[name] = block
+  return block
+
+
+def get_index_shared_memory(uid, i, slot, block_name, block_size):
+  """Writes the value from the Sequence `uid` at index `i` to shared memory.
+
+  NumPy arrays in the batch are copied into the shared memory block
+  `block_name`, and only their offsets, shapes and dtypes are sent back to the
+  consumer. Values that are not arrays, or that do not fit in the block, are
+  sent back as is.
+
+  Args:
+      uid: int, Sequence identifier
+      i: index
+      slot: int, index of the block in the ring of the enqueuer.
+      block_name: name of the shared memory block to write into.
+      block_size: usable size in bytes of the block.
+
+  Returns:
+      A `_SharedMemoryBatch` describing the value at index `i`.
+  """
+  batch = _SHARED_SEQUENCES[uid][i]
+  block = _get_shared_memory_block(block_name)
+  leaves = []
+  offset = 0
+  for value in tf.nest.flatten(batch):
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+      start = -(-offset // _SHARED_MEMORY_ALIGNMENT) * _SHARED_MEMORY_ALIGNMENT
+      if start + value.nbytes <= block_size:
+        np.copyto(
+            np.ndarray(
+                value.shape, value.dtype, buffer=block.buf, offset=start),
+            value)
+        offset = start + value.nbytes
+        value = _SharedMemoryArray(start, value.shape, value.dtype)
+    leaves.append(value)
+  structure = tf.nest.map_structure(lambda _: None, batch)
+  return _SharedMemoryBatch(slot, structure, leaves)
+
+
+# Fraction of the time the consumer may wait for batches before the
+# autoscaler adds a worker.
+_AUTOSCALE_GROW_THRESHOLD = 0.05
+# Fraction of the time producers have to be blocked on a full queue, while the
+# consumer waits less than `_AUTOSCALE_IDLE_THRESHOLD` of the time, before the
+# autoscaler removes a worker.
+_AUTOSCALE_SHRINK_THRESHOLD = 0.5
+_AUTOSCALE_IDLE_THRESHOLD = 0.01
+
+
+class _WorkerAutoscaler(object):
+  """Picks the number of active workers of a `SequenceEnqueuer`.
+
+  Every `interval` seconds, one worker is added if the consumer spent more
+  than `_AUTOSCALE_GROW_THRESHOLD` of the time waiting on the queue, and one
+  worker is removed if producers spent more than `_AUTOSCALE_SHRINK_THRESHOLD`
+  of the time blocked on a full queue while the consumer barely waited.
+
+  Args:
+      min_workers: Lower bound on the number of active workers.
+      max_workers: Upper bound on the number of active workers.
+      interval: Time in seconds between two scaling decisions.
+  """
+
+  def __init__(self, min_workers, max_workers, interval=1.):
+    if not 1 <= min_workers <= max_workers:
+      raise ValueError('Expected `workers` to be a `(min_workers, '
+                       'max_workers)` tuple with 1 <= min_workers <= '
+                       'max_workers, got: {}'.format((min_workers,
+                                                      max_workers)))
+    self.min_workers = min_workers
+    self.max_workers = max_workers
+    self.interval = interval
+    self.workers = min_workers
+    self._lock = threading.Lock()
+    self._window_start = time.time()
+    self._window_consumer_wait = 0.
+    self._window_producer_block = 0.
+    self._total_consumer_wait = 0.
+    self._total_producer_block = 0.
+    self._decisions = []
+
+  def record_consumer_wait(self, seconds):
+    """Records time spent by the consumer waiting for a batch."""
+    with self._lock:
+      self._window_consumer_wait += seconds
+      self._total_consumer_wait += seconds
+      self._maybe_rescale()
+
+  def record_producer_block(self, seconds):
+    """Records time spent by producers waiting on a full queue."""
+    with self._lock:
+      self._window_producer_block += seconds
+      self._total_producer_block += seconds
+
+  def _maybe_rescale(self):
+    now = time.time()
+    elapsed = now - self._window_start
+    if elapsed < self.interval:
+      return
+    wait_fraction = self._window_consumer_wait / elapsed
+    block_fraction = self._window_producer_block / elapsed
+    workers = self.workers
+    if wait_fraction > _AUTOSCALE_GROW_THRESHOLD:
+      workers = min(workers + 1, self.max_workers)
+    elif (block_fraction > _AUTOSCALE_SHRINK_THRESHOLD and
+          wait_fraction < _AUTOSCALE_IDLE_THRESHOLD):
+      workers = max(workers - 1, self.min_workers)
+    if workers != self.workers:
+      self._decisions.append({
+          'time': now,
+          'workers': workers,
+          'consumer_wait_fraction': wait_fraction,
+          'producer_block_fraction': block_fraction,
+      })
+      self.workers = workers
+    self._window_start = now
+    self._window_consumer_wait = 0.
+    self._window_producer_block = 0.
+
+  def get_stats(self):
+    """Returns a dict describing the scaling decisions made so far."""
+    with self._lock:
+      return {
+          'workers': self.workers,
+          'min_workers': self.min_workers,
+          'max_workers': self.max_workers,
+          'consumer_wait_time': self._total_consumer_wait,
+          'producer_block_time': self._total_producer_block,
+          'decisions': list(self._decisions),
+      }
+
+
+class _TaskLimiter(object):
+  """Bounds the number of tasks running concurrently in an executor."""
+
+  def __init__(self, autoscaler):
+    self._autoscaler = autoscaler
+    self._condition = threading.Condition()
+    self._running = 0
+
+  def acquire(self, stop_signal):
+    """Waits until a task can be started, returns False if stopped."""
+    with self._condition:
+      while self._running >= self._autoscaler.workers:
+        if stop_signal.is_set():
+          return False
+        self._condition.wait(0.1)
+      self._running += 1
+      return True
+
+  def release(self, _=None):
+    """Marks a task as done, used as the callback of `apply_async`."""
+    with self._condition:
+      self._running -= 1
+      self._condition.notify()
+
+
 @keras_export('keras.utils.SequenceEnqueuer')
 class SequenceEnqueuer(object):
   """Base class to enqueue inputs.
@@ -612,6 +1051,10 @@ class SequenceEnqueuer(object):
     self.queue = None
     self.run_thread = None
     self.stop_signal = None
+    # Set by `start` when `workers` is a `(min_workers, max_workers)` tuple.
+    # Assigning one before `start` carries its state over from a previous run.
+    self.autoscaler = None
+    self._task_limiter = None
 
   def is_running(self):
     return self.stop_signal is not None and not self.stop_signal.is_set()
@@ -619,11 +1062,23 @@ class SequenceEnqueuer(object):
   def start(self, workers=1, max_queue_size=10):
     """Starts the handler's workers.
 
+    When `workers` is a `(min_workers, max_workers)` tuple, the pool is
+    created with `max_workers` workers but only as many tasks as there are
+    active workers run at a time. The number of active workers starts at
+    `min_workers` and is adjusted based on how long the consumer waits for
+    batches and how long producers block on a full queue. The decisions are
+    reported by `autoscaling_stats()`.
+
     Args:
-        workers: Number of workers.
+        workers: Number of workers, or a `(min_workers, max_workers)` tuple.
         max_queue_size: queue size
             (when full, workers could block on `put()`)
     """
+    if isinstance(workers, (tuple, list)) and self.autoscaler is None:
+      self.autoscaler = _WorkerAutoscaler(*workers)
+    if self.autoscaler is not None:
+      self._task_limiter = _TaskLimiter(self.autoscaler)
+      workers = self.autoscaler.max_workers
     if self.use_multiprocessing:
       self.executor_fn = self._get_executor_init(workers)
     else:
@@ -636,6 +1091,45 @@ class SequenceEnqueuer(object):
     self.run_thread.daemon = True
     self.run_thread.start()
 
+  def autoscaling_stats(self):
+    """Returns the autoscaling decisions, or `None` if not autoscaling."""
+    if self.autoscaler is None:
+      return None
+    return self.autoscaler.get_stats()
+
+  def _submit(self, executor, func, args):
+    """Submits `func(*args)` to the executor and queues the `Future`.
+
+    Args:
+        executor: the pool running the tasks.
+        func: the function to run.
+        args: the arguments of `func`.
+
+    Returns:
+        False if the enqueuer was stopped while waiting for a worker.
+    """
+    if self.autoscaler is None:
+      self.queue.put(executor.apply_async(func, args), block=True)
+      return True
+    if not self._task_limiter.acquire(self.stop_signal):
+      return False
+    future = executor.apply_async(
+        func, args, callback=self._task_limiter.release,
+        error_callback=self._task_limiter.release)
+    start = time.time()
+    self.queue.put(future, block=True)
+    self.autoscaler.record_producer_block(time.time() - start)
+    return True
+
+  def _get_from_queue(self, timeout=None):
+    """Gets the next batch from the queue, timing the wait if autoscaling."""
+    start = time.time()
+    try:
+      return self.queue.get(block=True, timeout=timeout).get()
+    finally:
+      if self.autoscaler is not None:
+        self.autoscaler.record_consumer_wait(time.time() - start)
+
   def _send_sequence(self):
     """Sends current Iterable to all workers."""
     # For new processes that may spawn
@@ -696,15 +1190,112 @@ class OrderedEnqueuer(SequenceEnqueuer):
 
   Used in `fit_generator`, `evaluate_generator`, `predict_generator`.
 
+  When `use_multiprocessing=True` and `shared_memory_size` is set, workers
+  write the NumPy arrays of each batch into a ring of preallocated shared
+  memory blocks instead of pickling them back to the consumer, and `get()`
+  yields views into those blocks. A yielded batch is only valid until the next
+  batch is requested; copy it if it needs to outlive that.
+
   Args:
       sequence: A `tf.keras.utils.data_utils.Sequence` object.
       use_multiprocessing: use multiprocessing if True, otherwise threading
       shuffle: whether to shuffle the data at the beginning of each epoch
+      shared_memory_size: Size in bytes of each shared memory block, which
+          should fit a full batch. Arrays which do not fit are pickled.
+          Defaults to `None`, which disables the shared memory transport.
+          Requires Python 3.8 or later.
   """
 
-  def __init__(self, sequence, use_multiprocessing=False, shuffle=False):
+  def __init__(self, sequence, use_multiprocessing=False, shuffle=False,
+               shared_memory_size=None):
     super(OrderedEnqueuer, self).__init__(sequence, use_multiprocessing)
     self.shuffle = shuffle
+    if shared_memory_size is not None:
+      if shared_memory is None:
+        raise ValueError('`shared_memory_size` requires the '
+                         '`multiprocessing.shared_memory` module, which is '
+                         'only available in Python 3.8 or later.')
+      if shared_memory_size <= 0:
+        raise ValueError('`shared_memory_size` should be a positive number '
+                         'of bytes, got: {}'.format(shared_memory_size))
+    self.shared_memory_size = shared_memory_size
+    self._shared_memory_blocks = []
+    self._free_slots = None
+
+  def start(self, workers=1, max_queue_size=10):
+    """Starts the handler's workers.
+
+    Args:
+        workers: Number of workers, or a `(min_workers, max_workers)` tuple
+            to autoscale them, see `SequenceEnqueuer.start`.
+        max_queue_size: queue size
+            (when full, workers could block on `put()`)
+    """
+    if self.use_multiprocessing and self.shared_memory_size:
+      self._create_shared_memory_ring(max_queue_size)
+    super(OrderedEnqueuer, self).start(workers, max_queue_size)
+
+  def stop(self, timeout=None):
+    """Stops running threads and wait for them to exit, if necessary.
+
+    Should be called by the same thread which called `start()`.
+
+    Args:
+        timeout: maximum time to wait on `thread.join()`
+    """
+    super(OrderedEnqueuer, self).stop(timeout)
+    self._release_shared_memory_ring()
+
+  def _create_shared_memory_ring(self, max_queue_size):
+    """Allocates the shared memory blocks batches are written into."""
+    self._release_shared_memory_ring()
+    # Every queued batch holds a block, plus the one being submitted by
+    # `_run` and the one last yielded by `get`.
+    num_slots = max_queue_size + 2
+    self._shared_memory_blocks = [
+        shared_memory.SharedMemory(create=True, size=self.shared_memory_size)
+        for _ in range(num_slots)
+    ]
+    self._free_slots = queue.Queue()
+    for slot in range(num_slots):
+      self._free_slots.put(slot)
+
+  def _release_shared_memory_ring(self):
+    """Closes and unlinks the shared memory blocks of this enqueuer."""
+    for block in self._shared_memory_blocks:
+      attached = _SHARED_MEMORY_BLOCKS.pop(block.name, None)
+      for shm in (attached, block):
+        if shm is None:
+          continue
+        try:
+          shm.close()
+        except BufferError:
+          # A batch yielded by `get` still references the block; the mapping
+          # is released once that batch is garbage collected.
+          pass
+      block.unlink()
+    self._shared_memory_blocks = []
+    self._free_slots = None
+
+  def _acquire_slot(self):
+    """Waits for a free shared memory block, or `None` if stopped."""
+    while not self.stop_signal.is_set():
+      try:
+        return self._free_slots.get(block=True, timeout=0.1)
+      except queue.Empty:
+        pass
+    return None
+
+  def _read_from_shared_memory(self, batch):
+    """Rebuilds a `_SharedMemoryBatch` as views into its block."""
+    buf = self._shared_memory_blocks[batch.slot].buf
+    leaves = []
+    for value in batch.leaves:
+      if isinstance(value, _SharedMemoryArray):
+        value = np.ndarray(
+            value.shape, value.dtype, buffer=buf, offset=value.offset)
+      leaves.append(value)
+    return tf.nest.pack_sequence_as(batch.structure, leaves)
 
   def _get_executor_init(self, workers):
     """Gets the Pool initializer for multiprocessing.
@@ -744,8 +1335,18 @@ class OrderedEnqueuer(SequenceEnqueuer):
           if self.stop_signal.is_set():
             return
 
-          self.queue.put(
-              executor.apply_async(get_index, (self.uid, i)), block=True)
+          if self._shared_memory_blocks:
+            slot = self._acquire_slot()
+            if slot is None:
+              return
+            block = self._shared_memory_blocks[slot]
+            submitted = self._submit(
+                executor, get_index_shared_memory,
+                (self.uid, i, slot, block.name, self.shared_memory_size))
+          else:
+            submitted = self._submit(executor, get_index, (self.uid, i))
+          if not submitted:
+            return
 
         # Done with the current epoch, waiting for the final batches
         self._wait_queue()
@@ -770,11 +1371,19 @@ class OrderedEnqueuer(SequenceEnqueuer):
     """
     while self.is_running():
       try:
-        inputs = self.queue.get(block=True, timeout=5).get()
+        inputs = self._get_from_queue(timeout=5)
         if self.is_running():
           self.queue.task_done()
+        slot = None
+        if isinstance(inputs, _SharedMemoryBatch):
+          slot = inputs.slot
+          inputs = self._read_from_shared_memory(inputs)
         if inputs is not None:
           yield inputs
+        if slot is not None and self._free_slots is not None:
+          # The consumer is done with the previous batch, so its block can be
+          # reused.
+          self._free_slots.put(slot)
       except queue.Empty:
         pass
       except Exception:  # pylint: disable=broad-except
@@ -873,8 +1482,8 @@ class GeneratorEnqueuer(SequenceEnqueuer):
         if self.stop_signal.is_set():
           return
 
-        self.queue.put(
-            executor.apply_async(next_sample, (self.uid,)), block=True)
+        if not self._submit(executor, next_sample, (self.uid,)):
+          return
 
   def get(self):
     """Creates a generator to extract data from the queue.
@@ -888,7 +1497,7 @@ class GeneratorEnqueuer(SequenceEnqueuer):
     """
     try:
       while self.is_running():
-        inputs = self.queue.get(block=True).get()
+        inputs = self._get_from_queue()
         self.queue.task_done()
         if inputs is not None:
           yield inputs
@@ -20,9 +20,15 @@ from __future__ import print_function
 
 import tensorflow.compat.v2 as tf
 
+import functools
+import hashlib
+import http.server
 from itertools import cycle
 import os
+import re
 import tarfile
+import threading
+import time
 import zipfile
 
 import numpy as np
@@ -89,6 +95,168 @@ class TestGetFileAndValidateIt(tf.test.TestCase):
     self.assertTrue(keras.utils.data_utils.validate_file(path, hashval_md5))
 
 
+class RangeRequestHandler(http.server.SimpleHTTPRequestHandler):
+  """Serves files of the working directory with support for range requests.
+
+  The server records the ranges it serves in `server.served_ranges` and fails
+  the requests after the first `server.max_requests`, if set. Files are served
+  with the md5 hash of their content as `ETag`, which `If-Range` is checked
+  against.
+  """
+
+  def do_GET(self):  # pylint: disable=invalid-name
+    server = self.server
+    if (server.max_requests is not None and
+        len(server.served_ranges) >= server.max_requests):
+      self.send_error(503)
+      return
+    path = self.translate_path(self.path)
+    with open(path, 'rb') as f:
+      content = f.read()
+    etag = '"{}"'.format(hashlib.md5(content).hexdigest())
+    if_range = self.headers.get('If-Range')
+    match = re.match(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+    if server.supports_ranges and match and if_range in (None, etag):
+      start = int(match.group(1))
+      stop = int(match.group(2)) + 1 if match.group(2) else len(content)
+      if start >= len(content):
+        self.send_error(416)
+        return
+      stop = min(stop, len(content))
+      self.send_response(206)
+      self.send_header('Content-Range', 'bytes {}-{}/{}'.format(
+          start, stop - 1, len(content)))
+    else:
+      start, stop = 0, len(content)
+      self.send_response(200)
+    self.send_header('ETag', etag)
+    self.send_header('Content-Length', str(stop - start))
+    self.end_headers()
+    server.served_ranges.append((start, stop))
+    self.wfile.write(content[start:stop])
+
+  def log_message(self, *args):
+    pass
+
+
+class TestGetFileFromServer(tf.test.TestCase):
+
+  def setUp(self):
+    super(TestGetFileFromServer, self).setUp()
+    self.serve_dir = self.get_temp_dir()
+    self.cache_dir = os.path.join(self.get_temp_dir(), 'cache')
+    os.mkdir(self.cache_dir)
+    self.content = os.urandom(10000)
+    with open(os.path.join(self.serve_dir, 'data.bin'), 'wb') as f:
+      f.write(self.content)
+    self.server = http.server.ThreadingHTTPServer(
+        ('localhost', 0),
+        functools.partial(RangeRequestHandler, directory=self.serve_dir))
+    self.server.supports_ranges = True
+    self.server.max_requests = None
+    self.server.served_ranges = []
+    thread = threading.Thread(target=self.server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    self.addCleanup(self.server.server_close)
+    self.addCleanup(self.server.shutdown)
+    self.origin = 'http://localhost:{}/data.bin'.format(
+        self.server.server_address[1])
+    patch = tf.compat.v1.test.mock.patch.object(
+        data_utils, '_DOWNLOAD_CHUNK_SIZE', 1024)
+    patch.start()
+    self.addCleanup(patch.stop)
+
+  def _get_file(self, cache_subdir='datasets', **kwargs):
+    return data_utils.get_file(
+        'data.bin', self.origin, cache_subdir=cache_subdir,
+        cache_dir=self.cache_dir, **kwargs)
+
+  def _read(self, path):
+    with open(path, 'rb') as f:
+      return f.read()
+
+  def test_parallel_range_download(self):
+    path = self._get_file()
+    self.assertEqual(self._read(path), self.content)
+    # The first chunk is read from the response to the probing request.
+    self.assertEqual(
+        sorted(self.server.served_ranges),
+        [(0, 10000)] + [(i, min(i + 1024, 10000))
+                        for i in range(1024, 10000, 1024)])
+
+  def test_download_without_range_support(self):
+    self.server.supports_ranges = False
+    path = self._get_file(
+        file_hash=hashlib.md5(self.content).hexdigest())
+    self.assertEqual(self._read(path), self.content)
+    self.assertEqual(self.server.served_ranges, [(0, 10000)])
+
+  def test_resume_interrupted_download(self):
+    self.server.max_requests = 3
+    with self.assertRaisesRegex(Exception, 'URL fetch failure'):
+      self._get_file()
+    self.assertFalse(os.path.exists(
+        os.path.join(self.cache_dir, 'datasets', 'data.bin')))
+    downloaded = sum(stop - start for start, stop in self.server.served_ranges)
+
+    self.server.max_requests = None
+    self.server.served_ranges = []
+    path = self._get_file(file_hash=hashlib.sha256(self.content).hexdigest())
+    self.assertEqual(self._read(path), self.content)
+    # Only the chunks written by the first call are reused.
+    resumed_at = min(start for start, _ in self.server.served_ranges)
+    self.assertGreater(resumed_at, 0)
+    self.assertLessEqual(resumed_at, downloaded)
+
+  def test_restart_download_of_changed_file(self):
+    self.server.max_requests = 3
+    with self.assertRaisesRegex(Exception, 'URL fetch failure'):
+      self._get_file()
+
+    self.content = os.urandom(10000)
+    with open(os.path.join(self.serve_dir, 'data.bin'), 'wb') as f:
+      f.write(self.content)
+    self.server.max_requests = None
+    self.server.served_ranges = []
+    path = self._get_file()
+    self.assertEqual(self._read(path), self.content)
+    # The range request failed `If-Range`, so the whole file was sent.
+    self.assertEqual(self.server.served_ranges[0], (0, 10000))
+
+  def test_concurrent_downloads(self):
+    paths = [None] * 4
+
+    def get_file(i):
+      paths[i] = self._get_file(cache_subdir='dir_{}'.format(i))
+
+    threads = [threading.Thread(target=get_file, args=(i,)) for i in range(4)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    for path in paths:
+      self.assertEqual(self._read(path), self.content)
+
+  def test_identical_files_are_deduplicated(self):
+    file_hash = hashlib.sha256(self.content).hexdigest()
+    path = self._get_file(file_hash=file_hash)
+    self.server.served_ranges = []
+    other_path = self._get_file(cache_subdir='other', file_hash=file_hash)
+    self.assertNotEqual(path, other_path)
+    self.assertTrue(os.path.samefile(path, other_path))
+    self.assertEqual(self.server.served_ranges, [])
+    # Linked files are valid without hashing them again.
+    self.assertEqual(self._get_file(file_hash=file_hash), path)
+    self.assertEqual(self.server.served_ranges, [])
+
+  def test_hash_mismatch(self):
+    with self.assertRaisesRegex(ValueError, 'was expected'):
+      self._get_file(file_hash='0' * 64)
+    self.assertFalse(os.path.exists(
+        os.path.join(self.cache_dir, 'datasets', 'data.bin')))
+
+
 class TestSequence(keras.utils.data_utils.Sequence):
 
   def __init__(self, shape, value=1.):
@@ -195,6 +363,90 @@ class TestEnqueuers(tf.test.TestCase):
     self.assertEqual(acc, list(range(100)))
     enqueuer.stop()
 
+  @data_utils.dont_use_multiprocessing_pool
+  def test_ordered_enqueuer_shared_memory(self):
+    if data_utils.shared_memory is None:
+      self.skipTest('Requires multiprocessing.shared_memory.')
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        TestSequence([3, 200, 200, 3]), use_multiprocessing=True,
+        shared_memory_size=3 * 200 * 200 * 3 * 8)
+    enqueuer.start(3, 10)
+    gen_output = enqueuer.get()
+    acc = []
+    for _ in range(200):
+      batch = next(gen_output)
+      self.assertEqual(batch.shape, (3, 200, 200, 3))
+      # The batch is a view into a shared memory block, not a pickled copy.
+      self.assertFalse(batch.flags.owndata)
+      acc.append(batch[0, 0, 0, 0])
+    self.assertEqual(acc[:100], list(range(100)))
+    self.assertEqual(acc[100:], list([k * 5 for k in range(100)]))
+    enqueuer.stop()
+
+  @data_utils.dont_use_multiprocessing_pool
+  def test_ordered_enqueuer_shared_memory_too_small(self):
+    if data_utils.shared_memory is None:
+      self.skipTest('Requires multiprocessing.shared_memory.')
+    # Batches that do not fit in a block fall back to being pickled.
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        TestSequence([3, 200, 200, 3]), use_multiprocessing=True,
+        shared_memory_size=1024)
+    enqueuer.start(3, 10)
+    gen_output = enqueuer.get()
+    acc = []
+    for _ in range(100):
+      batch = next(gen_output)
+      self.assertTrue(batch.flags.owndata)
+      acc.append(batch[0, 0, 0, 0])
+    self.assertEqual(acc, list(range(100)))
+    enqueuer.stop()
+
+  def test_ordered_enqueuer_autoscaling_grows_when_starved(self):
+
+    class SlowSequence(TestSequence):
+
+      def __getitem__(self, item):
+        time.sleep(0.02)
+        return super(SlowSequence, self).__getitem__(item)
+
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        SlowSequence([3, 10]), use_multiprocessing=False)
+    enqueuer.autoscaler = data_utils._WorkerAutoscaler(1, 4, interval=0.1)
+    enqueuer.start((1, 4), 10)
+    gen_output = enqueuer.get()
+    acc = []
+    for _ in range(100):
+      acc.append(next(gen_output)[0, 0])
+    self.assertEqual(acc, list(range(100)))
+    stats = enqueuer.autoscaling_stats()
+    self.assertGreater(stats['workers'], 1)
+    self.assertLessEqual(stats['workers'], 4)
+    self.assertGreater(stats['consumer_wait_time'], 0)
+    self.assertNotEmpty(stats['decisions'])
+    enqueuer.stop()
+
+  def test_ordered_enqueuer_autoscaling_shrinks_when_blocked(self):
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        TestSequence([3, 10]), use_multiprocessing=False)
+    enqueuer.autoscaler = data_utils._WorkerAutoscaler(1, 4, interval=0.1)
+    enqueuer.autoscaler.workers = 4
+    enqueuer.start((1, 4), 2)
+    gen_output = enqueuer.get()
+    # Let the workers fill the queue before consuming slowly.
+    time.sleep(0.2)
+    for _ in range(20):
+      time.sleep(0.05)
+      next(gen_output)
+    stats = enqueuer.autoscaling_stats()
+    self.assertLess(stats['workers'], 4)
+    self.assertGreater(stats['producer_block_time'], 0)
+    enqueuer.stop()
+
+  def test_autoscaling_invalid_bounds(self):
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(TestSequence([3, 10]))
+    with self.assertRaisesRegex(ValueError, 'min_workers'):
+      enqueuer.start((4, 2), 10)
+
   def test_ordered_enqueuer_fail_threads(self):
     enqueuer = keras.utils.data_utils.OrderedEnqueuer(
         FaultSequence(), use_multiprocessing=False)
@@ -578,6 +578,28 @@ def class_and_config_for_serialized_keras_object(
   return (cls, cls_config)
 
 
+# Whether `from_config` functions take a `custom_objects` argument, keyed by
+# the function, as inspecting their arguments is slow next to deserializing
+# a layer.
+_FROM_CONFIG_ACCEPTS_CUSTOM_OBJECTS = weakref.WeakKeyDictionary()
+
+
+def _from_config_accepts_custom_objects(cls):
+  """Returns whether `cls.from_config` takes a `custom_objects` argument."""
+  from_config = getattr(cls.from_config, '__func__', cls.from_config)
+  try:
+    return _FROM_CONFIG_ACCEPTS_CUSTOM_OBJECTS[from_config]
+  except (KeyError, TypeError):
+    pass
+  accepts = 'custom_objects' in tf_inspect.getfullargspec(cls.from_config).args
+  try:
+    _FROM_CONFIG_ACCEPTS_CUSTOM_OBJECTS[from_config] = accepts
+  except TypeError:
+    # Not weakly referenceable.
+    pass
+  return accepts
+
+
 @keras_export('keras.utils.deserialize_keras_object')
 def deserialize_keras_object(identifier,
                              module_objects=None,
@@ -618,10 +640,9 @@ def deserialize_keras_object(identifier,
       return shared_object
 
     if hasattr(cls, 'from_config'):
-      arg_spec = tf_inspect.getfullargspec(cls.from_config)
       custom_objects = custom_objects or {}
 
-      if 'custom_objects' in arg_spec.args:
+      if _from_config_accepts_custom_objects(cls):
         deserialized_obj = cls.from_config(
             cls_config,
             custom_objects=dict(
@@ -0,0 +1,153 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+# pylint: disable=g-classes-have-attributes
+"""Utilities for reading memory-mapped NumPy arrays from disk."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import bisect
+import mmap
+import os
+
+import numpy as np
+
+
+class NpyDirectory(object):
+  """Memory-maps the `.npy` files of a directory as a single array.
+
+  The files are sorted by name and concatenated along their first axis, so a
+  feature matrix too big for memory can be written as a directory of shards
+  and passed to `tf.keras.Model.fit` without being loaded:
+
+  ```python
+  for i, shard in enumerate(shards):
+    np.save(os.path.join('features', 'part-%05d.npy' % i), shard)
+
+  model.fit(NpyDirectory('features'), np.load('labels.npy'), batch_size=1024)
+  ```
+
+  All the files must have the same dtype and the same shape, except for the
+  first dimension.
+
+  Args:
+    directory: Path to a directory of `.npy` files.
+  """
+
+  def __init__(self, directory):
+    filenames = sorted(
+        f for f in os.listdir(directory) if f.endswith('.npy'))
+    if not filenames:
+      raise ValueError('No `.npy` files found in {}'.format(directory))
+    self.directory = directory
+    self.shards = [
+        np.load(os.path.join(directory, f), mmap_mode='r') for f in filenames
+    ]
+    first = self.shards[0]
+    for f, shard in zip(filenames, self.shards):
+      if shard.dtype != first.dtype or shard.shape[1:] != first.shape[1:]:
+        raise ValueError(
+            'All the `.npy` files of {} should have the same dtype and '
+            'trailing dimensions. {} has dtype {} and shape {}, {} has dtype '
+            '{} and shape {}.'.format(directory, filenames[0], first.dtype,
+                                      first.shape, f, shard.dtype,
+                                      shard.shape))
+    # Index of the first row of each shard, plus the total number of rows.
+    self.offsets = [0]
+    for shard in self.shards:
+      self.offsets.append(self.offsets[-1] + len(shard))
+    self.dtype = first.dtype
+    self.shape = (self.offsets[-1],) + first.shape[1:]
+
+  def __len__(self):
+    return self.shape[0]
+
+  def __getitem__(self, key):
+    if isinstance(key, slice):
+      start, stop, step = key.indices(len(self))
+      if step == 1:
+        out = np.empty((max(stop - start, 0),) + self.shape[1:], self.dtype)
+        read_rows(self, start, stop, out)
+        return out
+      key = np.arange(start, stop, step)
+    if np.ndim(key) == 0:
+      key = int(key)
+      if key < 0:
+        key += len(self)
+      shard = bisect.bisect_right(self.offsets, key) - 1
+      return self.shards[shard][key - self.offsets[shard]]
+    key = np.asarray(key)
+    key = np.where(key < 0, key + len(self), key)
+    shard_ids = np.searchsorted(self.offsets, key, side='right') - 1
+    out = np.empty(key.shape + self.shape[1:], self.dtype)
+    for shard in np.unique(shard_ids):
+      mask = shard_ids == shard
+      out[mask] = self.shards[shard][key[mask] - self.offsets[shard]]
+    return out
+
+
+def is_memmap(x):
+  """Whether `x` is an `np.memmap` or an `NpyDirectory`."""
+  return isinstance(x, (np.memmap, NpyDirectory))
+
+
+def read_rows(array, start, stop, out):
+  """Copies the rows `[start, stop)` of a memory-mapped array into `out`.
+
+  Rows of `np.memmap` arrays backed by a file are read with `readinto`, which
+  fills `out` directly with a single sequential read that releases the GIL,
+  instead of faulting in the pages of the mapping one at a time.
+
+  Args:
+    array: An `np.memmap` or `NpyDirectory`.
+    start: Index of the first row to read.
+    stop: Index after the last row to read.
+    out: A C-contiguous NumPy array of `stop - start` rows to read into.
+  """
+  if isinstance(array, NpyDirectory):
+    first = bisect.bisect_right(array.offsets, start) - 1
+    for shard in range(max(first, 0), len(array.shards)):
+      shard_start = array.offsets[shard]
+      if shard_start >= stop:
+        break
+      lo = max(start, shard_start)
+      hi = min(stop, array.offsets[shard + 1])
+      if lo < hi:
+        _read_memmap_rows(array.shards[shard], lo - shard_start,
+                          hi - shard_start, out[lo - start:hi - start])
+  else:
+    _read_memmap_rows(array, start, stop, out)
+
+
+def _read_memmap_rows(array, start, stop, out):
+  """Copies the rows `[start, stop)` of an `np.memmap` into `out`."""
+  # Only memmaps which directly wrap their mapping have an `offset` matching
+  # their first row; views of a memmap keep the offset of their parent.
+  if (isinstance(array, np.memmap) and isinstance(array.base, mmap.mmap) and
+      array.filename and array.flags.c_contiguous and
+      out.flags.c_contiguous and out.dtype == array.dtype):
+    row_bytes = array.itemsize * int(np.prod(array.shape[1:]))
+    buf = memoryview(out.reshape(-1).view(np.uint8))
+    with open(array.filename, 'rb', buffering=0) as f:
+      f.seek(array.offset + start * row_bytes)
+      filled = 0
+      while filled < len(buf):
+        n = f.readinto(buf[filled:])
+        if not n:
+          raise IOError('Unexpected end of file while reading {}'.format(
+              array.filename))
+        filled += n
+  else:
+    np.copyto(out, array[start:stop], casting='unsafe')
@@ -0,0 +1,97 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for memmap_utils."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow.compat.v2 as tf
+
+import os
+
+import numpy as np
+
+from keras.utils import memmap_utils
+
+
+class NpyDirectoryTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(NpyDirectoryTest, self).setUp()
+    self.data = np.arange(60, dtype=np.float32).reshape((20, 3))
+    self.directory = os.path.join(self.get_temp_dir(), 'shards')
+    os.mkdir(self.directory)
+    for i, (start, stop) in enumerate([(0, 7), (7, 8), (8, 20)]):
+      np.save(os.path.join(self.directory, 'part-%d.npy' % i),
+              self.data[start:stop])
+
+  def test_shape_and_dtype(self):
+    array = memmap_utils.NpyDirectory(self.directory)
+    self.assertEqual(array.shape, (20, 3))
+    self.assertEqual(array.dtype, np.float32)
+    self.assertLen(array, 20)
+    self.assertTrue(memmap_utils.is_memmap(array))
+
+  def test_getitem(self):
+    array = memmap_utils.NpyDirectory(self.directory)
+    self.assertAllEqual(array[3], self.data[3])
+    self.assertAllEqual(array[-1], self.data[-1])
+    self.assertAllEqual(array[5:15], self.data[5:15])
+    self.assertAllEqual(array[::4], self.data[::4])
+    self.assertAllEqual(array[[19, 0, 7, 7, -2]], self.data[[19, 0, 7, 7, -2]])
+
+  def test_read_rows(self):
+    array = memmap_utils.NpyDirectory(self.directory)
+    out = np.empty((12, 3), dtype=np.float32)
+    memmap_utils.read_rows(array, 6, 18, out)
+    self.assertAllEqual(out, self.data[6:18])
+
+  def test_mismatched_shards(self):
+    np.save(os.path.join(self.directory, 'part-3.npy'), np.zeros((2, 4)))
+    with self.assertRaisesRegex(ValueError, 'same dtype'):
+      memmap_utils.NpyDirectory(self.directory)
+
+  def test_empty_directory(self):
+    directory = os.path.join(self.get_temp_dir(), 'empty')
+    os.mkdir(directory)
+    with self.assertRaisesRegex(ValueError, 'No `.npy` files'):
+      memmap_utils.NpyDirectory(directory)
+
+
+class ReadRowsTest(tf.test.TestCase):
+
+  def test_read_rows_from_file(self):
+    data = np.arange(40, dtype=np.int64).reshape((10, 4))
+    path = os.path.join(self.get_temp_dir(), 'data.npy')
+    np.save(path, data)
+    array = np.load(path, mmap_mode='r')
+    out = np.empty((4, 4), dtype=np.int64)
+    memmap_utils.read_rows(array, 3, 7, out)
+    self.assertAllEqual(out, data[3:7])
+
+  def test_read_rows_from_memmap_view(self):
+    data = np.arange(40, dtype=np.int64).reshape((10, 4))
+    path = os.path.join(self.get_temp_dir(), 'data.npy')
+    np.save(path, data)
+    # Views of a memmap can't be read from the file at their recorded offset.
+    array = np.load(path, mmap_mode='r')[2:]
+    out = np.empty((4, 4), dtype=np.int64)
+    memmap_utils.read_rows(array, 3, 7, out)
+    self.assertAllEqual(out, data[5:9])
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -25,6 +25,7 @@ import functools
 import weakref
 
 from enum import Enum
+import numpy as np
 from keras import backend
 from keras.utils import losses_utils
 from keras.utils import tf_utils
@@ -170,6 +171,28 @@ def parse_init_thresholds(thresholds, default_threshold=0.5):
   return thresholds
 
 
+def is_evenly_distributed_thresholds(thresholds):
+  """Returns whether `thresholds` are sorted and evenly spaced.
+
+  Confusion matrix variables for such thresholds can be updated in
+  `O(num_predictions + num_thresholds)`, see
+  `update_confusion_matrix_variables`.
+
+  Args:
+    thresholds: A python list or NumPy array of thresholds.
+
+  Returns:
+    True if there are at least 2 thresholds, increasing by a constant step.
+  """
+  thresholds = np.asarray(thresholds, dtype=np.float64)
+  if thresholds.ndim != 1 or len(thresholds) < 2:
+    return False
+  if not thresholds[-1] > thresholds[0]:
+    return False
+  even_thresholds = np.linspace(thresholds[0], thresholds[-1], len(thresholds))
+  return np.allclose(thresholds, even_thresholds, rtol=0, atol=backend.epsilon())
+
+
 class ConfusionMatrix(Enum):
   TRUE_POSITIVES = 'tp'
   FALSE_POSITIVES = 'fp'
@@ -230,7 +253,9 @@ def update_confusion_matrix_variables(variables_to_update,
                                       class_id=None,
                                       sample_weight=None,
                                       multi_label=False,
-                                      label_weights=None):
+                                      label_weights=None,
+                                      thresholds_distributed_evenly=False,
+                                      thresholds_with_epsilon=False):
   """Returns op to update the given confusion matrix variables.
 
   For every pair of values in y_true and y_pred:
@@ -241,7 +266,11 @@ def update_confusion_matrix_variables(variables_to_update,
   false_positive: y_true == False and y_pred > thresholds
 
   The results will be weighted and added together. When multiple thresholds are
-  provided, we will repeat the same for every threshold.
+  provided, we will repeat the same for every threshold, which compares a
+  `num_thresholds x num_predictions` tensor. If the thresholds are evenly
+  spaced, `thresholds_distributed_evenly` enables an update which instead
+  buckets the predictions and counts them in `O(num_predictions +
+  num_thresholds)` time and memory.
 
   For estimation of these metrics over a stream of data, the function creates an
   `update_op` operation that updates the given variables.
@@ -251,7 +280,9 @@ def update_confusion_matrix_variables(variables_to_update,
 
   Args:
     variables_to_update: Dictionary with 'tp', 'fn', 'tn', 'fp' as valid keys
-      and corresponding variables to update as values.
+      and corresponding variables to update as values. A value can also be a
+      list of variables of the same dtype and shape, which are all updated
+      with the same counts.
     y_true: A `Tensor` whose shape matches `y_pred`. Will be cast to `bool`.
     y_pred: A floating point `Tensor` of arbitrary shape and whose values are in
       the range `[0, 1]`.
@@ -272,6 +303,13 @@ def update_confusion_matrix_variables(variables_to_update,
     label_weights: (optional) tensor of non-negative weights for multilabel
       data. The weights are applied when calculating TP, FP, FN, and TN without
       explicit multilabel handling (i.e. when the data is to be flattened).
+    thresholds_distributed_evenly: Optional boolean indicating whether
+      `thresholds` are evenly spaced (see `is_evenly_distributed_thresholds`),
+      to use the bucketed update. Ignored if `top_k` is set.
+    thresholds_with_epsilon: Optional boolean indicating whether `thresholds`
+      are evenly spaced in `[0, 1]` except for the first and last ones, which
+      are moved below 0 and above 1 by an epsilon, as in `AUC`. Only used with
+      `thresholds_distributed_evenly`.
 
   Returns:
     Update op.
@@ -295,7 +333,7 @@ def update_confusion_matrix_variables(variables_to_update,
         'Received: "{}"'.format(
             list(ConfusionMatrix), variables_to_update.keys()))
 
-  variable_dtype = list(variables_to_update.values())[0].dtype
+  variable_dtype = tf.nest.flatten(list(variables_to_update.values()))[0].dtype
 
   y_true = tf.cast(y_true, dtype=variable_dtype)
   y_pred = tf.cast(y_pred, dtype=variable_dtype)
@@ -347,6 +385,17 @@ def update_confusion_matrix_variables(variables_to_update,
     y_true = y_true[..., class_id]
     y_pred = y_pred[..., class_id]
 
+  if thresholds_distributed_evenly and top_k is None:
+    return _update_confusion_matrix_variables_bucketed(
+        variables_to_update,
+        y_true,
+        y_pred,
+        thresholds,
+        multi_label=multi_label,
+        sample_weight=sample_weight,
+        label_weights=label_weights,
+        thresholds_with_epsilon=thresholds_with_epsilon)
+
   pred_shape = tf.compat.v1.shape(y_pred)
   num_predictions = pred_shape[0]
   if y_pred.shape.ndims == 1:
@@ -412,12 +461,14 @@ def update_confusion_matrix_variables(variables_to_update,
 
   update_ops = []
 
-  def weighted_assign_add(label, pred, weights, var):
+  def weighted_assign_add(label, pred, weights, variables):
     label_and_pred = tf.cast(
-        tf.logical_and(label, pred), dtype=var.dtype)
+        tf.logical_and(label, pred), dtype=variable_dtype)
     if weights is not None:
-      label_and_pred *= tf.cast(weights, dtype=var.dtype)
-    return var.assign_add(tf.reduce_sum(label_and_pred, 1))
+      label_and_pred *= tf.cast(weights, dtype=variable_dtype)
+    counts = tf.reduce_sum(label_and_pred, 1)
+    return tf.group([var.assign_add(counts)
+                     for var in tf.nest.flatten(variables)])
 
   loop_vars = {
       ConfusionMatrix.TRUE_POSITIVES: (label_is_pos, pred_is_pos),
@@ -446,6 +497,125 @@ def update_confusion_matrix_variables(variables_to_update,
   return tf.group(update_ops)
 
 
+def _update_confusion_matrix_variables_bucketed(variables_to_update,
+                                                y_true,
+                                                y_pred,
+                                                thresholds,
+                                                multi_label=False,
+                                                sample_weight=None,
+                                                label_weights=None,
+                                                thresholds_with_epsilon=False):
+  """Updates confusion matrix variables for evenly spaced thresholds.
+
+  With thresholds `t_j = t_0 + j * step`, a prediction `p` is above the
+  thresholds `j <= ceil((p - t_0) / step) - 1`. Each prediction is weighted
+  into the bucket of that index, and a reverse cumulative sum of the buckets
+  gives the true and false positives at each threshold, without comparing
+  every prediction to every threshold. The index is then checked against the
+  thresholds around it, so that `p` is counted by the same thresholds as with
+  `p > t_j`.
+
+  Args:
+    variables_to_update: As in `update_confusion_matrix_variables`.
+    y_true: A `Tensor` of labels, cast to the dtype of the variables.
+    y_pred: A `Tensor` of predictions in `[0, 1]`, of the same shape.
+    thresholds: A 1D `Tensor` of evenly spaced thresholds.
+    multi_label: As in `update_confusion_matrix_variables`.
+    sample_weight: As in `update_confusion_matrix_variables`.
+    label_weights: As in `update_confusion_matrix_variables`.
+    thresholds_with_epsilon: As in `update_confusion_matrix_variables`.
+
+  Returns:
+    Update op.
+  """
+  num_thresholds = thresholds.shape[0]
+  if thresholds_with_epsilon:
+    # The thresholds are 0 and 1 moved by an epsilon at the ends, so every
+    # prediction is above the first one, and none is above the last one.
+    start = tf.cast(0., y_pred.dtype)
+    step = tf.cast(1. / (num_thresholds - 1), y_pred.dtype)
+  else:
+    start = thresholds[0]
+    step = (thresholds[-1] - thresholds[0]) / (num_thresholds - 1)
+
+  weights = None
+  if sample_weight is not None:
+    weights = tf.__internal__.ops.broadcast_weights(
+        tf.cast(sample_weight, dtype=y_pred.dtype), y_pred)
+  if label_weights is not None and not multi_label:
+    label_weights = tf.__internal__.ops.broadcast_weights(
+        tf.compat.v1.expand_dims(label_weights, 0), y_pred)
+    weights = label_weights if weights is None else weights * label_weights
+
+  # Count the predictions of each label separately when multilabel, and all
+  # predictions as a single label otherwise.
+  if multi_label:
+    num_labels = tf.compat.v1.shape(y_pred)[-1]
+  else:
+    num_labels = 1
+  y_pred = tf.reshape(y_pred, [-1, num_labels])
+  y_true = tf.reshape(
+      tf.cast(tf.cast(y_true, dtype=tf.bool), dtype=y_pred.dtype),
+      [-1, num_labels])
+  true_labels = y_true
+  false_labels = 1. - y_true
+  if weights is not None:
+    weights = tf.reshape(weights, [-1, num_labels])
+    true_labels *= weights
+    false_labels *= weights
+
+  # Predictions below the first threshold are in bucket -1, and dropped by the
+  # segment sum. Predictions above the last one are counted by all thresholds.
+  bucket_indices = tf.math.ceil((y_pred - start) / step) - 1.
+  bucket_indices = tf.cast(
+      tf.clip_by_value(bucket_indices, -1., num_thresholds - 1.),
+      dtype=tf.int32)
+  # Rounding errors can put a prediction equal or close to a threshold in the
+  # neighbouring bucket, so move it by one bucket if it is not above the
+  # threshold of its bucket, or if it is above the next one.
+  lower_thresholds = tf.gather(thresholds, tf.maximum(bucket_indices, 0))
+  bucket_indices = tf.compat.v1.where(
+      tf.logical_and(bucket_indices >= 0, y_pred <= lower_thresholds),
+      bucket_indices - 1, bucket_indices)
+  upper_thresholds = tf.gather(
+      thresholds, tf.minimum(bucket_indices + 1, num_thresholds - 1))
+  bucket_indices = tf.compat.v1.where(
+      tf.logical_and(bucket_indices < num_thresholds - 1,
+                     y_pred > upper_thresholds),
+      bucket_indices + 1, bucket_indices)
+  segment_ids = tf.compat.v1.where(
+      bucket_indices >= 0,
+      bucket_indices + tf.range(num_labels) * num_thresholds,
+      -tf.ones_like(bucket_indices))
+
+  def count_above_thresholds(labels):
+    buckets = tf.math.unsorted_segment_sum(
+        labels, segment_ids, num_segments=num_labels * num_thresholds)
+    buckets = tf.reshape(buckets, [num_labels, num_thresholds])
+    counts = tf.transpose(tf.cumsum(buckets, axis=1, reverse=True))
+    return counts if multi_label else tf.reshape(counts, [num_thresholds])
+
+  def total(labels):
+    totals = tf.reduce_sum(labels, axis=0)
+    return totals if multi_label else tf.reshape(totals, [])
+
+  tp = count_above_thresholds(true_labels)
+  fp = count_above_thresholds(false_labels)
+  counts = {
+      ConfusionMatrix.TRUE_POSITIVES: lambda: tp,
+      ConfusionMatrix.FALSE_POSITIVES: lambda: fp,
+      ConfusionMatrix.FALSE_NEGATIVES: lambda: total(true_labels) - tp,
+      ConfusionMatrix.TRUE_NEGATIVES: lambda: total(false_labels) - fp,
+  }
+
+  update_ops = []
+  for matrix_cond, variables in variables_to_update.items():
+    variables = tf.nest.flatten(variables)
+    count = tf.cast(counts[matrix_cond](), dtype=variables[0].dtype)
+    update_ops.extend(var.assign_add(count) for var in variables)
+  return tf.group(update_ops)
+
+
 def _filter_top_k(x, k):
   """Filters top-k values in the last dim of x and set the rest to NEG_INF.
 
@@ -21,6 +21,8 @@ from __future__ import print_function
 import tensorflow.compat.v2 as tf
 
 from absl.testing import parameterized
+import numpy as np
+from keras import backend
 from keras import combinations
 from keras.utils import metrics_utils
 
@@ -294,5 +296,97 @@ class FilterTopKTest(tf.test.TestCase, parameterized.TestCase):
     ])
 
 
+@combinations.generate(combinations.combine(mode=['graph', 'eager']))
+class ConfusionMatrixBucketsTest(tf.test.TestCase, parameterized.TestCase):
+
+  def _update(self, y_true, y_pred, thresholds, num_labels=None, **kwargs):
+    shape = (len(thresholds),) if num_labels is None else (len(thresholds),
+                                                             num_labels)
+    variables = {
+        key: tf.Variable(np.zeros(shape), dtype=tf.float32)
+        for key in metrics_utils.ConfusionMatrix
+    }
+    self.evaluate([v.initializer for v in variables.values()])
+    self.evaluate(
+        metrics_utils.update_confusion_matrix_variables(
+            variables, y_true, y_pred, thresholds, **kwargs))
+    return {key: self.evaluate(v) for key, v in variables.items()}
+
+  def _assert_same_updates(self, y_true, y_pred, thresholds, **kwargs):
+    expected = self._update(y_true, y_pred, thresholds, **kwargs)
+    bucketed = self._update(
+        y_true, y_pred, thresholds, thresholds_distributed_evenly=True,
+        **kwargs)
+    for key in metrics_utils.ConfusionMatrix:
+      self.assertAllClose(expected[key], bucketed[key], atol=1e-4)
+
+  def _random_data(self, shape):
+    np.random.seed(1337)
+    y_true = np.random.randint(0, 2, size=shape)
+    y_pred = np.random.random(shape).astype(np.float32)
+    sample_weight = np.random.random(shape[:1]).astype(np.float32)
+    return y_true, y_pred, sample_weight
+
+  @parameterized.named_parameters(('two', 2), ('three', 3), ('many', 200))
+  def test_thresholds_with_epsilon(self, num_thresholds):
+    y_true, y_pred, sample_weight = self._random_data((1000,))
+    y_pred[:3] = [0., 1., .5]
+    thresholds = [(i + 1) * 1.0 / (num_thresholds - 1)
+                  for i in range(num_thresholds - 2)]
+    thresholds = ([0.0 - backend.epsilon()] + thresholds +
+                  [1.0 + backend.epsilon()])
+    self._assert_same_updates(
+        y_true, y_pred, thresholds, sample_weight=sample_weight,
+        thresholds_with_epsilon=True)
+
+  @parameterized.named_parameters(
+      ('62', 62, False), ('110', 110, False), ('116', 116, False),
+      ('122', 122, False), ('62_with_epsilon', 62, True),
+      ('200_with_epsilon', 200, True))
+  def test_predictions_on_thresholds(self, num_thresholds, with_epsilon):
+    # Predictions equal to a threshold are not above it.
+    thresholds = [(i + 1) * 1.0 / (num_thresholds - 1)
+                  for i in range(num_thresholds - 2)]
+    epsilon = backend.epsilon() if with_epsilon else 0.
+    thresholds = [0.0 - epsilon] + thresholds + [1.0 + epsilon]
+    y_pred = np.clip(np.array(thresholds, dtype=np.float32), 0., 1.)
+    y_pred = np.concatenate([
+        y_pred,
+        np.nextafter(y_pred, np.float32(0.)),
+        np.nextafter(y_pred, np.float32(1.))
+    ])
+    y_true = np.arange(len(y_pred)) % 2
+    self._assert_same_updates(
+        y_true, y_pred, thresholds, thresholds_with_epsilon=with_epsilon)
+
+  def test_thresholds_in_range(self):
+    y_true, y_pred, sample_weight = self._random_data((1000, 2))
+    self._assert_same_updates(
+        y_true, y_pred, [.2, .4, .6, .8], sample_weight=sample_weight)
+
+  def test_multi_label(self):
+    y_true, y_pred, sample_weight = self._random_data((500, 3))
+    thresholds = [0.0 - backend.epsilon(), .25, .5, .75,
+                  1.0 + backend.epsilon()]
+    self._assert_same_updates(
+        y_true, y_pred, thresholds, num_labels=3, multi_label=True,
+        sample_weight=sample_weight, thresholds_with_epsilon=True)
+
+  def test_label_weights(self):
+    y_true, y_pred, _ = self._random_data((500, 3))
+    self._assert_same_updates(
+        y_true, y_pred, [0., .5, 1.], label_weights=[.2, 1., .5])
+
+  def test_is_evenly_distributed_thresholds(self):
+    self.assertTrue(metrics_utils.is_evenly_distributed_thresholds([0., 1.]))
+    self.assertTrue(
+        metrics_utils.is_evenly_distributed_thresholds([.2, .4, .6, .8]))
+    self.assertFalse(metrics_utils.is_evenly_distributed_thresholds([.5]))
+    self.assertFalse(
+        metrics_utils.is_evenly_distributed_thresholds([.2, .5, .6]))
+    self.assertFalse(
+        metrics_utils.is_evenly_distributed_thresholds([.6, .4, .2]))
+
+
 if __name__ == '__main__':
   tf.test.main()